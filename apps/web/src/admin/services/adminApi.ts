@@ -892,6 +892,14 @@ export interface HousekeepingTaskRunResult {
   error_message: string | null;
 }
 
+export interface IndexUsageStats {
+  name: string;
+  size_mb: number;
+  accesses: number;
+  accesses_since: string | null;
+  unused: boolean;
+}
+
 export interface CollectionStats {
   collection_name: string;
   document_count: number;
@@ -899,6 +907,7 @@ export interface CollectionStats {
   avg_document_size_bytes: number;
   index_count: number;
   index_size_mb: number;
+  indexes: IndexUsageStats[];
 }
 
 export interface DatabaseStatsResponse {
@@ -906,8 +915,11 @@ export interface DatabaseStatsResponse {
   total_collections: number;
   total_documents: number;
   total_storage_mb: number;
+  total_index_size_mb: number;
   collections: CollectionStats[];
+  unused_indexes: string[];
   generated_at: string;
+  cached: boolean;
 }
 
 // Admin user type
@@ -70,6 +70,16 @@ export interface ConfigTestResponse {
 export interface ConfigImportRequest {
   configs: ConfigCreate[];
   overwrite?: boolean;
+  dry_run?: boolean;
+  transactional?: boolean;
+}
+
+export type ConfigImportAction = 'create' | 'update' | 'unchanged' | 'skip';
+
+export interface ConfigImportChange {
+  key: string;
+  action: ConfigImportAction;
+  changed_fields: string[];
 }
 
 export interface ConfigImportResponse {
@@ -77,6 +87,9 @@ export interface ConfigImportResponse {
   updated: number;
   skipped: number;
   errors: string[];
+  dry_run: boolean;
+  transactional: boolean;
+  changes: ConfigImportChange[];
 }
 
 export interface ConfigExport {
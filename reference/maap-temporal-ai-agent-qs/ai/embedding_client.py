@@ -83,6 +83,69 @@ class EmbeddingClient:
 
         raise Exception("No embedding providers available")
 
+    async def get_embeddings(self, texts: List[str]) -> List[EmbeddingResult]:
+        """
+        Generate embeddings for many texts, BATCH_EMBEDDING_SIZE texts per API call.
+
+        Same provider order as get_embedding; a chunk that fails on Voyage is
+        retried on Cohere.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One EmbeddingResult per text, in order
+
+        Raises:
+            Exception: If both Voyage and Cohere fail for a chunk
+        """
+        size = max(1, config.BATCH_EMBEDDING_SIZE)
+        results: List[EmbeddingResult] = []
+        for start in range(0, len(texts), size):
+            chunk = texts[start:start + size]
+            voyage_error = None
+            if self._voyage_client:
+                try:
+                    results.extend(self._embed_voyage(chunk))
+                    continue
+                except Exception as e:
+                    voyage_error = e
+                    logger.warning(f"Voyage batch embedding failed, falling back to Cohere: {e}")
+            if not self._bedrock_client:
+                raise Exception(f"No embedding providers available (Voyage: {voyage_error or 'Not configured'})")
+            try:
+                results.extend(self._embed_cohere(chunk))
+            except Exception as cohere_error:
+                logger.error(f"Cohere batch embedding failed: {cohere_error}")
+                raise Exception(f"Both embedding providers failed. Voyage: {voyage_error or 'Not attempted'}, Cohere: {cohere_error}")
+        return results
+
+    def _embed_voyage(self, texts: List[str]) -> List[EmbeddingResult]:
+        result = self._voyage_client.embed(
+            texts=texts,
+            model=config.VOYAGE_MODEL,
+            input_type="document"
+        )
+        return [
+            EmbeddingResult(embedding=embedding, model=config.VOYAGE_MODEL, dimensions=len(embedding))
+            for embedding in result.embeddings
+        ]
+
+    def _embed_cohere(self, texts: List[str]) -> List[EmbeddingResult]:
+        response = self._bedrock_client.invoke_model(
+            modelId=config.COHERE_MODEL,
+            body=json.dumps({
+                "texts": texts,
+                "input_type": "search_document",
+                "truncate": "END"
+            })
+        )
+        result = json.loads(response['body'].read())
+        return [
+            EmbeddingResult(embedding=embedding, model=config.COHERE_MODEL, dimensions=len(embedding))
+            for embedding in result['embeddings']
+        ]
+
     async def _get_voyage_embedding(self, text: str) -> EmbeddingResult:
         """Generate embedding using Voyage finance-2 model."""
         try:
@@ -10,9 +10,15 @@ import logging
 from typing import Dict, List
 
 from temporalio.client import Client
+from temporalio.common import WorkflowIDReusePolicy
+from temporalio.exceptions import WorkflowAlreadyStartedError
+from temporalio.service import RPCError, RPCStatusCode
 from api.models import (
     TransactionRequest,
     TransactionResponse,
+    BatchTransactionRequest,
+    BatchTransactionResponse,
+    BatchProgressResponse,
     DecisionResponse,
     MetricsResponse
 )
@@ -20,8 +26,8 @@ from database.connection import connect_to_mongo, close_mongo_connection, db
 from database.schemas import Transaction, TransactionStatus
 from database.repositories import TransactionRepository, DecisionRepository
 from utils.decimal_utils import to_decimal128, decimal_to_float
-from temporal.workflows import TransactionProcessingWorkflow
-from temporal.shared import TransactionDetails, TRANSACTION_PROCESSING_TASK_QUEUE
+from temporal.workflows import TransactionProcessingWorkflow, BatchIngestionWorkflow
+from temporal.shared import TransactionDetails, BatchIngestionRequest, TRANSACTION_PROCESSING_TASK_QUEUE
 from utils.config import config
 from ai.embedding_client import embedding_client
 
@@ -122,6 +128,99 @@ async def process_transaction(transaction_req: TransactionRequest):
         logger.error(f"Error processing transaction: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/transactions/batch", response_model=BatchTransactionResponse)
+async def process_transaction_batch(batch_req: BatchTransactionRequest):
+    """Submit many transactions, processed in shards by one batch workflow."""
+    if len(batch_req.transactions) > config.BATCH_MAX_TRANSACTIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch has {len(batch_req.transactions)} transactions; the limit is {config.BATCH_MAX_TRANSACTIONS}"
+        )
+    try:
+        batch_id = batch_req.batch_id or f"BATCH_{datetime.now(timezone.utc).strftime('%Y%m%d')}_{uuid.uuid4().hex[:8].upper()}"
+        workflow_id = f"batch-ingestion-{batch_id}"
+        
+        # A batch ID is used once; check before inserting anything
+        try:
+            await temporal_client.get_workflow_handle(workflow_id).describe()
+            raise HTTPException(status_code=409, detail=f"Batch {batch_id} already exists")
+        except RPCError as e:
+            if e.status != RPCStatusCode.NOT_FOUND:
+                raise
+        
+        transactions = [
+            Transaction(
+                transaction_type=txn.transaction_type,
+                amount=to_decimal128(txn.amount),
+                currency=txn.currency,
+                sender=txn.sender,
+                recipient=txn.recipient,
+                reference_number=txn.reference_number or f"REF-{uuid.uuid4().hex[:8].upper()}",
+                description=txn.description,
+                status=TransactionStatus.PENDING,
+                metadata=txn.metadata or {},
+                batch_id=batch_id
+            )
+            for txn in batch_req.transactions
+        ]
+        
+        # One insert for the whole batch; the workflow input is just the IDs
+        transaction_ids = await TransactionRepository.create_transactions_bulk(transactions)
+        
+        request = BatchIngestionRequest(
+            batch_id=batch_id,
+            transaction_ids=transaction_ids,
+            shard_size=batch_req.shard_size or config.BATCH_SHARD_SIZE,
+            max_concurrent_shards=batch_req.max_concurrent_shards or config.BATCH_MAX_CONCURRENT_SHARDS,
+            shard_concurrency=batch_req.shard_concurrency or config.BATCH_SHARD_CONCURRENCY
+        )
+        try:
+            await temporal_client.start_workflow(
+                BatchIngestionWorkflow.run,
+                request,
+                id=workflow_id,
+                task_queue=TRANSACTION_PROCESSING_TASK_QUEUE,
+                id_reuse_policy=WorkflowIDReusePolicy.REJECT_DUPLICATE
+            )
+        except Exception as e:
+            # Nothing will process these; don't leave them PENDING
+            await TransactionRepository.delete_transactions_bulk(transactions)
+            if isinstance(e, WorkflowAlreadyStartedError):
+                raise HTTPException(status_code=409, detail=f"Batch {batch_id} already exists")
+            raise
+        
+        shard_count = -(-len(transaction_ids) // request.shard_size)
+        logger.info(f"Started workflow {workflow_id} for {len(transaction_ids)} transactions in {shard_count} shards")
+        
+        return BatchTransactionResponse(
+            batch_id=batch_id,
+            workflow_id=workflow_id,
+            transaction_count=len(transaction_ids),
+            shard_count=shard_count,
+            message="Batch submitted for AI analysis"
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing transaction batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/transactions/batch/{batch_id}", response_model=BatchProgressResponse)
+async def get_batch_progress(batch_id: str):
+    """Get live progress for a transaction batch."""
+    try:
+        handle = temporal_client.get_workflow_handle(f"batch-ingestion-{batch_id}")
+        progress = await handle.query(BatchIngestionWorkflow.get_progress)
+        return BatchProgressResponse(**progress)
+        
+    except RPCError as e:
+        logger.warning(f"Could not query batch {batch_id}: {e}")
+        raise HTTPException(status_code=404, detail="Batch not found")
+    except Exception as e:
+        logger.error(f"Error getting batch progress: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/transaction/{transaction_id}", response_model=DecisionResponse)
 async def get_transaction_decision(transaction_id: str):
     """Get the AI decision for a transaction."""
@@ -34,6 +34,31 @@ class TransactionRequest(BaseModel):
         except:
             raise ValueError('Amount must be a valid decimal number')
 
+class BatchTransactionRequest(BaseModel):
+    transactions: List[TransactionRequest] = Field(..., min_length=1)
+    batch_id: Optional[str] = None  # Generated if omitted; reusing one returns 409
+    shard_size: Optional[int] = Field(default=None, ge=1)
+    max_concurrent_shards: Optional[int] = Field(default=None, ge=1)
+    shard_concurrency: Optional[int] = Field(default=None, ge=1)
+
+class BatchTransactionResponse(BaseModel):
+    batch_id: str
+    workflow_id: str
+    transaction_count: int
+    shard_count: int
+    message: str
+
+class BatchProgressResponse(BaseModel):
+    batch_id: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    awaiting_approval: int = 0
+    pending: int
+    decisions: Dict[str, int]
+    shards: Dict[str, int]
+
 class TransactionResponse(BaseModel):
     transaction_id: str
     status: TransactionStatus
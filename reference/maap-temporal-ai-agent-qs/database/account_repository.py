@@ -11,6 +11,7 @@ from database.connection import db, get_sync_db
 from utils.config import config
 from utils.logger import transaction_logger, logger
 from utils.decimal_utils import to_decimal128, from_decimal128, add_money, subtract_money
+import threading
 import uuid
 
 class InsufficientFundsError(Exception):
@@ -21,6 +22,46 @@ class AccountNotFoundError(Exception):
     """Raised when account is not found."""
     pass
 
+class TransferStats:
+    """
+    In-process transfer commit counters per mode ("direct", "netting").
+
+    Every callback run inside with_transaction beyond the first is a retry
+    after a write conflict or other transient error, so retries / attempts
+    is the conflict rate.
+    """
+
+    _lock = threading.Lock()
+    _counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def record(cls, mode: str, transfers: int, attempts: int, committed: bool = True) -> None:
+        with cls._lock:
+            counters = cls._counters.setdefault(
+                mode, {"commits": 0, "failures": 0, "transfers": 0, "attempts": 0, "retries": 0}
+            )
+            counters["commits" if committed else "failures"] += 1
+            counters["transfers"] += transfers
+            counters["attempts"] += attempts
+            counters["retries"] += max(0, attempts - 1)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict[str, float]]:
+        """Counters per mode, with conflict_rate and mean transfers per commit."""
+        with cls._lock:
+            result = {}
+            for mode, counters in cls._counters.items():
+                stats = dict(counters)
+                stats["conflict_rate"] = round(counters["retries"] / counters["attempts"], 4) if counters["attempts"] else 0.0
+                stats["transfers_per_commit"] = round(counters["transfers"] / counters["commits"], 2) if counters["commits"] else 0.0
+                result[mode] = stats
+            return result
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._counters.clear()
+
 class AccountRepository:
     """Repository for account operations with ACID support."""
     
@@ -105,14 +146,24 @@ class AccountRepository:
             }
         )
         
+        attempts = 0
+        
         # Start a client session for ACID transaction
         with client.start_session() as session:
             try:
                 # Define the transaction
                 def callback(session):
+                    nonlocal attempts
+                    attempts += 1
                     accounts_collection = db_sync[config.ACCOUNTS_COLLECTION]
                     journal_collection = db_sync[config.JOURNAL_COLLECTION]
                     balance_updates_collection = db_sync[config.BALANCE_UPDATES_COLLECTION]
+                    applied_collection = db_sync[config.APPLIED_TRANSFERS_COLLECTION]
+                    
+                    # 0. Exactly once per transaction_id, whichever path applied it
+                    if applied_collection.find_one({"_id": transaction_id}, session=session):
+                        logger.info(f"Transfer {transaction_id} already applied, skipping")
+                        return True
                     
                     # 1. Get sender account with lock
                     sender = accounts_collection.find_one(
@@ -233,6 +284,10 @@ class AccountRepository:
                         journal_entry.model_dump(),
                         session=session
                     )
+                    applied_collection.insert_one(
+                        {"_id": transaction_id, "mode": "direct", "session_id": session_id, "applied_at": datetime.now(timezone.utc)},
+                        session=session
+                    )
                     
                     # Log balance updates
                     transaction_logger.log_balance_update(
@@ -262,6 +317,7 @@ class AccountRepository:
                     write_concern=None,
                     max_commit_time_ms=10000
                 )
+                TransferStats.record("direct", 1, attempts)
                 
                 transaction_logger.log_acid_transaction(
                     session_id=session_id,
@@ -276,6 +332,7 @@ class AccountRepository:
                 return result
                 
             except InsufficientFundsError as e:
+                TransferStats.record("direct", 1, attempts, committed=False)
                 transaction_logger.log_acid_transaction(
                     session_id=session_id,
                     operation="TRANSFER_FAILED",
@@ -288,6 +345,7 @@ class AccountRepository:
                 raise
                 
             except Exception as e:
+                TransferStats.record("direct", 1, attempts, committed=False)
                 transaction_logger.log_acid_transaction(
                     session_id=session_id,
                     operation="TRANSFER_FAILED",
@@ -308,79 +366,98 @@ class AccountRepository:
         reason: str = "Transaction processing",
         duration_hours: int = 24
     ) -> str:
-        """Place a hold on account funds."""
+        """
+        Place a hold on account funds.
+
+        The balance check, the debit of available_balance and the hold entry
+        are one conditional update, so concurrent holds on the same account
+        cannot overdraw it. The entry in the account's holds array is the
+        hold of record; release_hold_sync writes it to the holds collection.
+        """
         db_sync = get_sync_db()
         
-        # Check available balance
-        account = db_sync[config.ACCOUNTS_COLLECTION].find_one({"account_number": account_number})
-        if not account:
-            raise AccountNotFoundError(f"Account {account_number} not found")
-        
-        # Convert to Decimal for comparison
-        available_decimal = from_decimal128(account["available_balance"])
-        amount_decimal = from_decimal128(amount)
-        if available_decimal < amount_decimal:
-            raise InsufficientFundsError(f"Insufficient available balance for hold")
-        
         # Create hold with Decimal128 amount
+        amount_decimal128 = to_decimal128(from_decimal128(amount))
         hold = BalanceHold(
             account_number=account_number,
             transaction_id=transaction_id,
-            amount=to_decimal128(amount),
+            amount=amount_decimal128,
             reason=reason,
             expires_at=datetime.now(timezone.utc) + timedelta(hours=duration_hours)
         )
         
-        # Update available balance
-        db_sync[config.ACCOUNTS_COLLECTION].update_one(
-            {"account_number": account_number},
-            {
-                "$inc": {"available_balance": -float(amount_decimal)},  # MongoDB $inc needs float
-                "$push": {"holds": hold.model_dump()}
-            }
+        # Pipeline update keeps the arithmetic in Decimal128
+        account = db_sync[config.ACCOUNTS_COLLECTION].find_one_and_update(
+            {"account_number": account_number, "available_balance": {"$gte": amount_decimal128}},
+            [{
+                "$set": {
+                    "available_balance": {"$subtract": [{"$toDecimal": "$available_balance"}, amount_decimal128]},
+                    "holds": {"$concatArrays": [{"$ifNull": ["$holds", []]}, [{"$literal": hold.model_dump()}]]},
+                    "updated_at": "$$NOW"
+                }
+            }],
+            projection={"_id": 1}
         )
         
-        # Store hold record
-        db_sync[config.HOLDS_COLLECTION].insert_one(hold.model_dump())
+        if account is None:
+            # Only the failure path pays for a second read, to pick the error
+            if db_sync[config.ACCOUNTS_COLLECTION].count_documents({"account_number": account_number}, limit=1) == 0:
+                raise AccountNotFoundError(f"Account {account_number} not found")
+            raise InsufficientFundsError(f"Insufficient available balance for hold")
         
-        logger.info(f"Placed hold {hold.hold_id} for ${float(amount_decimal):.2f} on account {account_number}")
+        logger.info(f"Placed hold {hold.hold_id} for ${float(from_decimal128(amount_decimal128)):.2f} on account {account_number}")
         
         return hold.hold_id
     
     @staticmethod
     def release_hold_sync(hold_id: str) -> bool:
-        """Release a hold on account funds."""
+        """
+        Release a hold on account funds.
+
+        Removing the hold entry and crediting its amount back is one
+        conditional update, so releasing the same hold twice credits once.
+        """
         db_sync = get_sync_db()
+        hold_id_literal = {"$literal": hold_id}
         
-        # Find the hold
-        hold = db_sync[config.HOLDS_COLLECTION].find_one({"hold_id": hold_id})
-        if not hold or hold.get("released"):
+        # Return the pre-update hold entry to record it below
+        account = db_sync[config.ACCOUNTS_COLLECTION].find_one_and_update(
+            {"holds.hold_id": hold_id},
+            [{
+                "$set": {
+                    "available_balance": {"$add": [
+                        {"$toDecimal": "$available_balance"},
+                        {"$reduce": {
+                            "input": {"$filter": {"input": "$holds", "cond": {"$eq": ["$$this.hold_id", hold_id_literal]}}},
+                            "initialValue": Decimal128("0"),
+                            "in": {"$add": ["$$value", {"$toDecimal": "$$this.amount"}]}
+                        }}
+                    ]},
+                    "holds": {"$filter": {"input": "$holds", "cond": {"$ne": ["$$this.hold_id", hold_id_literal]}}},
+                    "updated_at": "$$NOW"
+                }
+            }],
+            projection={"account_number": 1, "holds": {"$elemMatch": {"hold_id": hold_id}}}
+        )
+        if not account or not account.get("holds"):
             return False
         
-        # Release the hold
+        hold = account["holds"][0]
+        released_at = datetime.now(timezone.utc)
+        
+        # Holds placed before the atomic path already have a record; newer ones get one here
+        hold_record = {key: value for key, value in hold.items() if key not in ("hold_id", "released", "released_at")}
         db_sync[config.HOLDS_COLLECTION].update_one(
             {"hold_id": hold_id},
             {
-                "$set": {
-                    "released": True,
-                    "released_at": datetime.now(timezone.utc)
-                }
-            }
+                "$set": {"released": True, "released_at": released_at},
+                "$setOnInsert": hold_record
+            },
+            upsert=True
         )
         
-        # Update account available balance
-        # Convert Decimal128 to float for MongoDB $inc operation and formatting
-        from utils.decimal_utils import from_decimal128
         amount_float = float(from_decimal128(hold["amount"]))
-
-        db_sync[config.ACCOUNTS_COLLECTION].update_one(
-            {"account_number": hold["account_number"]},
-            {
-                "$inc": {"available_balance": amount_float},
-                "$pull": {"holds": {"hold_id": hold_id}}
-            }
-        )
-        logger.info(f"Released hold {hold_id} for ${amount_float:.2f} on account {hold['account_number']}")
+        logger.info(f"Released hold {hold_id} for ${amount_float:.2f} on account {account['account_number']}")
         
         return True
     
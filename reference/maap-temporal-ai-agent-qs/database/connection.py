@@ -1,9 +1,15 @@
 """MongoDB connection management."""
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 from utils.config import config
+import asyncio
+import contextvars
+import functools
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +55,11 @@ async def create_indexes():
     await db.database[config.AUDIT_EVENTS_COLLECTION].create_index([("transaction_id", 1)])
     await db.database[config.AUDIT_EVENTS_COLLECTION].create_index([("event_type", 1)])
     
+    # Velocity bucket indexes; upserts rely on the unique key
+    await db.database[config.VELOCITY_BUCKETS_COLLECTION].create_index(
+        [("key", 1), ("bucket_start", 1)], unique=True
+    )
+    
     # Metrics indexes with TTL
     # await db.database[config.SYSTEM_METRICS_COLLECTION].create_index(
     #     [("timestamp", 1)], 
@@ -57,10 +68,42 @@ async def create_indexes():
 
 # Global sync client for Temporal activities
 _sync_client = None
+# run_sync pool threads can race to create it; only one client may be built
+_sync_client_lock = threading.Lock()
 
 def get_sync_db():
     """Get synchronous MongoDB client for Temporal activities."""
     global _sync_client
     if _sync_client is None:
-        _sync_client = MongoClient(config.MONGODB_URI)
+        with _sync_client_lock:
+            if _sync_client is None:
+                _sync_client = MongoClient(config.MONGODB_URI)
     return _sync_client[config.MONGODB_DB_NAME]
+
+# Thread pool for sync PyMongo calls made from async code (Temporal activities)
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_threads: Optional[int] = None
+
+def configure_db_executor(max_workers: int) -> None:
+    """Resize the pool used by run_sync; 0 runs sync calls inline on the event loop."""
+    global _db_executor, _db_executor_threads
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=False)
+    _db_executor = None
+    _db_executor_threads = max_workers
+
+async def run_sync(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking repository call without stalling the event loop.
+
+    The call runs on a DB_EXECUTOR_THREADS-sized pool with the caller's
+    context variables, so activity.logger and activity.info() keep working.
+    """
+    global _db_executor
+    threads = config.DB_EXECUTOR_THREADS if _db_executor_threads is None else _db_executor_threads
+    if threads <= 0:
+        return func(*args, **kwargs)
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="mongodb")
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_db_executor, call)
@@ -3,8 +3,10 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta, timezone
 from bson import ObjectId, Decimal128
+from pymongo import UpdateOne
 from decimal import Decimal
-from database.connection import get_sync_db, db
+from database.connection import get_sync_db, db, run_sync
+from database.velocity_repository import VelocityRepository, velocity_key
 from utils.decimal_utils import to_decimal128, from_decimal128, decimal_to_float
 from database.schemas import (
     Transaction, TransactionDecision, AuditEvent, SystemMetric,
@@ -139,6 +141,35 @@ class CustomerRepository:
         
         return await CustomerRepository.create_customer(customer)
     
+    @staticmethod
+    async def get_or_create_customers(customers_data: List[Dict]) -> Dict[Optional[str], str]:
+        """Get or create customers for many senders, keyed by name; one find and one insert."""
+        names = list(dict.fromkeys(customer_data.get("name") for customer_data in customers_data))
+        customer_ids = {}
+        async for existing in db.database[config.CUSTOMERS_COLLECTION].find(
+            {"legal_name": {"$in": names}}, {"legal_name": 1, "customer_id": 1}
+        ):
+            customer_ids.setdefault(existing.get("legal_name"), existing["customer_id"])
+        
+        # Create the missing ones, from the first sender seen with each name
+        new_customers = {}
+        for customer_data in customers_data:
+            name = customer_data.get("name")
+            if name in customer_ids or name in new_customers:
+                continue
+            new_customers[name] = Customer(
+                legal_name=customer_data.get("name", "Unknown"),
+                display_name=customer_data.get("name", "Unknown"),
+                customer_type="business" if "Corp" in customer_data.get("name", "") else "individual",
+                country=customer_data.get("country", "US")
+            )
+        if new_customers:
+            await db.database[config.CUSTOMERS_COLLECTION].insert_many(
+                [customer.model_dump() for customer in new_customers.values()], ordered=False
+            )
+            customer_ids.update((name, customer.customer_id) for name, customer in new_customers.items())
+        return customer_ids
+    
     @staticmethod
     def get_or_create_customer_sync(customer_data: Dict) -> str:
         """Get existing customer or create new one (synchronous)."""
@@ -177,8 +208,76 @@ class TransactionRepository:
         result = await db.database[config.TRANSACTIONS_COLLECTION].insert_one(
             transaction.model_dump()
         )
+        
+        # Velocity counters are best effort; the transaction is already stored
+        try:
+            await VelocityRepository.record(
+                velocity_key(transaction.sender.get("customer_id"), transaction.sender.get("account_number")),
+                transaction.amount,
+                transaction.created_at
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record velocity for {transaction.transaction_id}: {e}")
         return transaction.transaction_id
     
+    @staticmethod
+    async def create_transactions_bulk(transactions: List[Transaction]) -> List[str]:
+        """Create many transactions with one insert and one velocity write."""
+        unresolved = [t for t in transactions if "customer_id" not in t.sender]
+        if unresolved:
+            customer_ids = await CustomerRepository.get_or_create_customers([t.sender for t in unresolved])
+            for transaction in unresolved:
+                transaction.sender["customer_id"] = customer_ids[transaction.sender.get("name")]
+        
+        await db.database[config.TRANSACTIONS_COLLECTION].insert_many(
+            [transaction.model_dump() for transaction in transactions], ordered=False
+        )
+        
+        try:
+            await VelocityRepository.record_many([
+                (
+                    velocity_key(t.sender.get("customer_id"), t.sender.get("account_number")),
+                    t.amount,
+                    t.created_at
+                )
+                for t in transactions
+            ])
+        except Exception as e:
+            logger.warning(f"Failed to record velocity for {len(transactions)} transactions: {e}")
+        return [transaction.transaction_id for transaction in transactions]
+    
+    @staticmethod
+    async def delete_transactions_bulk(transactions: List[Transaction]) -> int:
+        """Undo create_transactions_bulk: delete the transactions and their velocity counts."""
+        result = await db.database[config.TRANSACTIONS_COLLECTION].delete_many(
+            {"transaction_id": {"$in": [t.transaction_id for t in transactions]}}
+        )
+        try:
+            await VelocityRepository.record_many([
+                (
+                    velocity_key(t.sender.get("customer_id"), t.sender.get("account_number")),
+                    t.amount,
+                    t.created_at
+                )
+                for t in transactions
+            ], sign=-1)
+        except Exception as e:
+            logger.warning(f"Failed to remove velocity for {len(transactions)} transactions: {e}")
+        return result.deleted_count
+    
+    @staticmethod
+    def get_transactions_sync(transaction_ids: List[str]) -> List[Dict]:
+        """Get transactions by ID in the given order, skipping missing ones (synchronous)."""
+        db_sync = get_sync_db()
+        docs = {
+            doc["transaction_id"]: doc
+            for doc in db_sync[config.TRANSACTIONS_COLLECTION].find(
+                {"transaction_id": {"$in": transaction_ids}},
+                {"embedding": 0}
+            )
+        }
+        return [docs[transaction_id] for transaction_id in transaction_ids if transaction_id in docs]
+    
     @staticmethod
     async def get_transaction(transaction_id: str) -> Optional[Dict]:
         """Get transaction by ID."""
@@ -261,6 +360,31 @@ class TransactionRepository:
             }
         )
     
+    @staticmethod
+    def store_embeddings_sync(embeddings: Dict[str, Any]):
+        """Store vector embeddings, an EmbeddingResult per transaction ID, in one bulk write (synchronous)."""
+        if not embeddings:
+            return
+        db_sync = get_sync_db()
+        now = datetime.now(timezone.utc)
+        db_sync[config.TRANSACTIONS_COLLECTION].bulk_write([
+            UpdateOne(
+                {"transaction_id": transaction_id},
+                {"$set": {"embedding": result.embedding, "embedding_model": result.model, "updated_at": now}}
+            )
+            for transaction_id, result in embeddings.items()
+        ], ordered=False)
+    
+    @staticmethod
+    def get_embedding_sync(transaction_id: str) -> Optional[List[float]]:
+        """Get a transaction's stored embedding, if any (synchronous)."""
+        db_sync = get_sync_db()
+        doc = db_sync[config.TRANSACTIONS_COLLECTION].find_one(
+            {"transaction_id": transaction_id},
+            {"embedding": 1}
+        )
+        return doc.get("embedding") if doc else None
+    
     @staticmethod
     def get_customer_history_sync(customer_id: str) -> Dict:
         """Get customer transaction history (synchronous for Temporal)."""
@@ -529,10 +653,10 @@ class DecisionRepository:
         ])
 
         try:
-            # Use sync connection for this method since it's called from sync context
+            # Sync driver, run on the DB thread pool so the event loop stays free
             db_sync = get_sync_db()
-            cursor = db_sync[config.TRANSACTIONS_COLLECTION].aggregate(pipeline, allowDiskUse=True)
-            results = list(cursor)
+            collection = db_sync[config.TRANSACTIONS_COLLECTION]
+            results = await run_sync(lambda: list(collection.aggregate(pipeline, allowDiskUse=True)))
             return [serialize_doc(doc) for doc in results]
         except Exception as e:
             logger.error(f"Hybrid search error: {e}")
@@ -594,10 +718,10 @@ class DecisionRepository:
         ]
 
         try:
-            # Use sync connection for this method since it's often called from sync context
+            # Sync driver, run on the DB thread pool so the event loop stays free
             db_sync = get_sync_db()
-            cursor = db_sync[config.TRANSACTIONS_COLLECTION].aggregate(pipeline)
-            results = list(cursor)
+            collection = db_sync[config.TRANSACTIONS_COLLECTION]
+            results = await run_sync(lambda: list(collection.aggregate(pipeline)))
             return [serialize_doc(doc) for doc in results]
         except Exception as e:
             logger.error(f"Vector search error: {e}")
@@ -725,13 +849,13 @@ class DecisionRepository:
         ]
 
         try:
-            # Use sync connection for this method since it's called from sync context
+            # Sync driver, run on the DB thread pool so the event loop stays free
             db_sync = get_sync_db()
-            cursor = db_sync[config.TRANSACTIONS_COLLECTION].aggregate(
+            collection = db_sync[config.TRANSACTIONS_COLLECTION]
+            results = await run_sync(lambda: list(collection.aggregate(
                 pipeline,
                 allowDiskUse=True
-            )
-            results = list(cursor)
+            )))
 
             if results:
                 result = results[0]
@@ -800,6 +924,30 @@ class RuleRepository:
         
         return [serialize_doc(r) for r in rules]
     
+    @staticmethod
+    def get_rules_version_sync() -> str:
+        """
+        Get a version stamp for the rules collection (synchronous).
+
+        Changes when a rule is added, removed, activated/deactivated or has
+        its updated_at bumped. Metric increments do not change it, so rule
+        edits must set updated_at.
+        """
+        db_sync = get_sync_db()
+        stats = list(db_sync[config.RULES_COLLECTION].aggregate([
+            {"$group": {
+                "_id": None,
+                "count": {"$sum": 1},
+                "active": {"$sum": {"$cond": [{"$eq": ["$status", RuleStatus.ACTIVE.value]}, 1, 0]}},
+                "updated_at": {"$max": "$updated_at"},
+            }}
+        ]))
+        if not stats:
+            return "empty"
+        updated_at = stats[0]["updated_at"]
+        updated = updated_at.isoformat() if isinstance(updated_at, datetime) else str(updated_at)
+        return f"{stats[0]['count']}:{stats[0]['active']}:{updated}"
+    
     @staticmethod
     async def update_rule_metrics(rule_id: str, triggered: bool, correct: bool):
         """Update rule effectiveness metrics."""
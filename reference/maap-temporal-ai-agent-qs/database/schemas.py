@@ -146,6 +146,10 @@ class Transaction(BaseModel):
     
     # Rules Applied
     rules_applied: List[str] = Field(default_factory=list)
+    
+    # Request metadata and bulk ingestion batch, if any
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    batch_id: Optional[str] = None
 
 # Rule Engine Schema
 class Rule(BaseModel):
@@ -0,0 +1,335 @@
+"""Micro-batched transfers for hot accounts."""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple, Union
+import threading
+import uuid
+
+from bson import Decimal128
+
+from database.account_repository import (
+    AccountNotFoundError,
+    AccountRepository,
+    InsufficientFundsError,
+    TransferStats,
+)
+from database.account_schemas import BalanceUpdate, TransactionJournal
+from database.connection import get_sync_db
+from database.repositories import MetricsRepository
+from database.schemas import SystemMetric
+from utils.config import config
+from utils.decimal_utils import from_decimal128, to_decimal128
+from utils.logger import transaction_logger, logger
+
+
+class _PendingTransfer:
+    """One queued transfer and, once its batch commits, its outcome."""
+
+    __slots__ = ("transaction_id", "sender", "recipient", "amount", "description",
+                 "wake", "finished", "result", "error")
+
+    def __init__(self, transaction_id: str, sender: str, recipient: str, amount: Decimal, description: str):
+        self.transaction_id = transaction_id
+        self.sender = sender
+        self.recipient = recipient
+        self.amount = amount
+        self.description = description
+        # Set when the transfer is finished or this thread becomes the leader
+        self.wake = threading.Event()
+        self.finished = False
+        self.result: Optional[bool] = None
+        self.error: Optional[Exception] = None
+
+    def finish(self, result: Optional[bool] = None, error: Optional[Exception] = None) -> None:
+        self.result = result
+        self.error = error
+        self.finished = True
+        self.wake.set()
+
+
+class _AccountQueue:
+    """Transfers waiting on one hot account."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filled = threading.Condition(self.lock)
+        self.pending: List[_PendingTransfer] = []
+        # True while some thread owns committing the queue
+        self.leading = False
+
+
+class TransferNetting:
+    """
+    Transfers to or from a hot account, committed in micro-batches.
+
+    Every transfer touching an account in TRANSFER_NETTING_ACCOUNTS joins that
+    account's queue. The first caller to find the queue idle becomes its
+    leader: it waits up to TRANSFER_NETTING_MAX_WAIT_MS for the batch to fill,
+    then commits up to TRANSFER_NETTING_MAX_BATCH transfers in one MongoDB
+    transaction that writes every journal entry and balance update but only
+    one net ``$inc`` per account. It then hands the queue to the oldest
+    waiting caller and returns. Callers block until their batch commits, so
+    this runs on the DB thread pool (DB_EXECUTOR_THREADS > 0).
+
+    Transfers are applied in queue order against running balances; one that
+    would overdraw its sender or names a missing account fails on its own
+    without aborting the batch. A transaction_id already present in
+    APPLIED_TRANSFERS_COLLECTION, by either path, is reported as applied and
+    not applied again.
+    """
+
+    _queues: Dict[str, _AccountQueue] = {}
+    _queues_lock = threading.Lock()
+
+    @staticmethod
+    def queue_key(sender_account: str, recipient_account: str) -> Optional[str]:
+        """Hot account whose queue a transfer joins, or None for the direct path."""
+        if not config.TRANSFER_NETTING_ENABLED:
+            return None
+        hot = config.TRANSFER_NETTING_ACCOUNTS
+        # Merchant accounts mostly receive, so the recipient wins when both are hot
+        if recipient_account in hot:
+            return recipient_account
+        if sender_account in hot:
+            return sender_account
+        return None
+
+    @classmethod
+    def execute(
+        cls,
+        sender_account: str,
+        recipient_account: str,
+        amount: Union[float, Decimal, Decimal128, str],
+        transaction_id: str,
+        description: str = ""
+    ) -> bool:
+        """Transfer funds, netted with concurrent transfers on a hot account."""
+        key = cls.queue_key(sender_account, recipient_account)
+        if key is None:
+            return AccountRepository.execute_transfer_with_acid(
+                sender_account=sender_account,
+                recipient_account=recipient_account,
+                amount=amount,
+                transaction_id=transaction_id,
+                description=description
+            )
+
+        item = _PendingTransfer(transaction_id, sender_account, recipient_account, from_decimal128(amount), description)
+        queue = cls._queue_for(key)
+        with queue.lock:
+            queue.pending.append(item)
+            if queue.leading:
+                queue.filled.notify()
+            else:
+                queue.leading = True
+                item.wake.set()
+
+        item.wake.wait()
+        if not item.finished:
+            cls._lead(key, queue)
+
+        if item.error is not None:
+            raise item.error
+        return bool(item.result)
+
+    @classmethod
+    def _queue_for(cls, key: str) -> _AccountQueue:
+        with cls._queues_lock:
+            queue = cls._queues.get(key)
+            if queue is None:
+                queue = cls._queues[key] = _AccountQueue()
+            return queue
+
+    @classmethod
+    def _lead(cls, key: str, queue: _AccountQueue) -> None:
+        """Commit the batch at the head of the queue, then hand the queue on."""
+        max_batch = max(1, config.TRANSFER_NETTING_MAX_BATCH)
+        with queue.lock:
+            queue.filled.wait_for(
+                lambda: len(queue.pending) >= max_batch,
+                timeout=config.TRANSFER_NETTING_MAX_WAIT_MS / 1000
+            )
+            batch = queue.pending[:max_batch]
+            del queue.pending[:max_batch]
+
+        try:
+            cls._commit_batch(key, batch)
+        except Exception as e:
+            for item in batch:
+                if not item.finished:
+                    item.finish(error=e)
+        finally:
+            with queue.lock:
+                if queue.pending:
+                    queue.pending[0].wake.set()
+                else:
+                    queue.leading = False
+
+    @classmethod
+    def _commit_batch(cls, key: str, batch: List[_PendingTransfer]) -> None:
+        db_sync = get_sync_db()
+        session_id = f"BATCH_{uuid.uuid4().hex[:8].upper()}"
+        attempts = 0
+
+        def callback(session) -> Dict[str, Tuple[Optional[bool], Optional[Exception]]]:
+            nonlocal attempts
+            attempts += 1
+            accounts_collection = db_sync[config.ACCOUNTS_COLLECTION]
+            applied_collection = db_sync[config.APPLIED_TRANSFERS_COLLECTION]
+            now = datetime.now(timezone.utc)
+
+            # 1. Transfers a previous batch or the direct path already applied
+            applied = {
+                doc["_id"] for doc in applied_collection.find(
+                    {"_id": {"$in": [item.transaction_id for item in batch]}}, {"_id": 1}, session=session
+                )
+            }
+
+            # 2. Every account in the batch in one read
+            account_numbers = {item.sender for item in batch} | {item.recipient for item in batch}
+            balances = {
+                doc["account_number"]: {
+                    "balance": from_decimal128(doc["balance"]),
+                    "available_balance": from_decimal128(doc["available_balance"]),
+                }
+                for doc in accounts_collection.find(
+                    {"account_number": {"$in": list(account_numbers)}},
+                    {"account_number": 1, "balance": 1, "available_balance": 1},
+                    session=session
+                )
+            }
+
+            # 3. Apply in queue order against running balances
+            net: Dict[str, Decimal] = defaultdict(Decimal)
+            deposits: Dict[str, Decimal] = defaultdict(Decimal)
+            withdrawals: Dict[str, Decimal] = defaultdict(Decimal)
+            counts: Dict[str, int] = defaultdict(int)
+            balance_updates, journal_entries, markers = [], [], []
+            outcomes: Dict[str, Tuple[Optional[bool], Optional[Exception]]] = {}
+
+            for item in batch:
+                if item.transaction_id in applied or item.transaction_id in outcomes:
+                    outcomes.setdefault(item.transaction_id, (True, None))
+                    continue
+                if item.sender not in balances:
+                    outcomes[item.transaction_id] = (None, AccountNotFoundError(f"Sender account {item.sender} not found"))
+                    continue
+                if item.recipient not in balances:
+                    outcomes[item.transaction_id] = (None, AccountNotFoundError(f"Recipient account {item.recipient} not found"))
+                    continue
+                sender = balances[item.sender]
+                if sender["available_balance"] < item.amount:
+                    outcomes[item.transaction_id] = (None, InsufficientFundsError(
+                        f"Insufficient funds: Available ${float(sender['available_balance']):.2f}, "
+                        f"Requested ${float(item.amount):.2f}"
+                    ))
+                    continue
+
+                for account_number, operation, delta in (
+                    (item.sender, "debit", -item.amount),
+                    (item.recipient, "credit", item.amount),
+                ):
+                    current = balances[account_number]
+                    previous_balance = current["balance"]
+                    current["balance"] += delta
+                    current["available_balance"] += delta
+                    net[account_number] += delta
+                    counts[account_number] += 1
+                    balance_updates.append(BalanceUpdate(
+                        account_number=account_number,
+                        transaction_id=item.transaction_id,
+                        operation=operation,
+                        amount=to_decimal128(item.amount),
+                        previous_balance=to_decimal128(previous_balance),
+                        new_balance=to_decimal128(current["balance"]),
+                        session_id=session_id
+                    ).model_dump())
+                withdrawals[item.sender] += item.amount
+                deposits[item.recipient] += item.amount
+
+                journal_entries.append(TransactionJournal(
+                    transaction_id=item.transaction_id,
+                    debit_account=item.sender,
+                    debit_amount=to_decimal128(item.amount),
+                    credit_account=item.recipient,
+                    credit_amount=to_decimal128(item.amount),
+                    description=item.description,
+                    status="completed",
+                    session_id=session_id,
+                    committed=True
+                ).model_dump())
+                markers.append({"_id": item.transaction_id, "mode": "netting", "session_id": session_id, "applied_at": now})
+                outcomes[item.transaction_id] = (True, None)
+
+            # 4. One net update per account; Decimal128 $inc keeps exact cents
+            for account_number, delta in net.items():
+                accounts_collection.update_one(
+                    {"account_number": account_number},
+                    {
+                        "$inc": {
+                            "balance": to_decimal128(delta),
+                            "available_balance": to_decimal128(delta),
+                            "transaction_count": counts[account_number],
+                            "total_deposits": float(deposits[account_number]),  # MongoDB $inc needs float
+                            "total_withdrawals": float(withdrawals[account_number])
+                        },
+                        "$set": {"last_transaction_at": now, "updated_at": now}
+                    },
+                    session=session
+                )
+            if journal_entries:
+                db_sync[config.BALANCE_UPDATES_COLLECTION].insert_many(balance_updates, session=session)
+                db_sync[config.JOURNAL_COLLECTION].insert_many(journal_entries, session=session)
+                applied_collection.insert_many(markers, session=session)
+            return outcomes
+
+        with db_sync.client.start_session() as session:
+            try:
+                outcomes = session.with_transaction(callback, max_commit_time_ms=10000)
+            except Exception as e:
+                TransferStats.record("netting", len(batch), attempts, committed=False)
+                transaction_logger.log_acid_transaction(
+                    session_id=session_id,
+                    operation="TRANSFER_BATCH_FAILED",
+                    status="ERROR",
+                    details={"account": key, "transfers": len(batch), "attempts": attempts, "error": str(e)}
+                )
+                logger.error(f"Netted transfer batch on {key} failed: {e}")
+                raise
+
+        TransferStats.record("netting", len(batch), attempts)
+        applied = sum(1 for result, error in outcomes.values() if error is None)
+        transaction_logger.log_acid_transaction(
+            session_id=session_id,
+            operation="TRANSFER_BATCH_COMPLETE",
+            status="SUCCESS",
+            details={"account": key, "transfers": len(batch), "applied": applied, "attempts": attempts}
+        )
+        for item in batch:
+            result, error = outcomes[item.transaction_id]
+            item.finish(result=result, error=error)
+
+        try:
+            MetricsRepository.record_metric_sync(SystemMetric(
+                metric_type="performance",
+                metric_name="transfer_netting_batch",
+                value=len(batch),
+                unit="transfers",
+                dimensions={
+                    "account": key,
+                    "applied": applied,
+                    "failed": len(outcomes) - applied,
+                    "attempts": attempts,
+                    "conflicts": attempts - 1,
+                },
+            ))
+        except Exception as metric_error:
+            logger.warning(f"Failed to record netting metric: {metric_error}")
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget idle queues (for tests and benchmarks)."""
+        with cls._queues_lock:
+            cls._queues = {key: queue for key, queue in cls._queues.items() if queue.leading}
@@ -0,0 +1,165 @@
+"""Per-sender velocity counters in fixed time buckets."""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from bson import Decimal128
+from pymongo import UpdateOne
+from decimal import Decimal
+from database.connection import db, get_sync_db
+from utils.config import config
+from utils.decimal_utils import decimal_to_float
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Buckets outlive the longest velocity window (24h) by a safe margin
+VELOCITY_RETENTION_SECONDS = 48 * 3600
+
+
+def velocity_key(customer_id: Optional[str], account_number: Optional[str] = None) -> Optional[str]:
+    """Counter key for a sender: the customer ID, or the account number without one."""
+    if customer_id:
+        return f"customer:{customer_id}"
+    if account_number:
+        return f"account:{account_number}"
+    return None
+
+
+def bucket_start(timestamp: datetime, bucket_seconds: Optional[int] = None) -> datetime:
+    """Start of the bucket containing a timestamp (naive timestamps are UTC)."""
+    size = bucket_seconds or config.VELOCITY_BUCKET_SECONDS
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    seconds = int(timestamp.timestamp())
+    return datetime.fromtimestamp(seconds - seconds % size, timezone.utc)
+
+
+class VelocityRepository:
+    """
+    Transaction counts and amount sums per sender and time bucket.
+
+    Each document is one sender key and one bucket:
+    ``{key, bucket_start, count, amount, last_at}``. Writes are single
+    ``$inc`` upserts; a window read is a range scan over at most
+    window / VELOCITY_BUCKET_SECONDS documents.
+    """
+
+    @staticmethod
+    def _bucket_update(amount: Union[float, Decimal, Decimal128, str, None], created_at: datetime) -> Dict:
+        return {
+            "$inc": {"count": 1, "amount": decimal_to_float(amount) if amount is not None else 0.0},
+            "$max": {"last_at": created_at},
+        }
+
+    @staticmethod
+    async def record(key: Optional[str], amount: Any, created_at: datetime):
+        """Count one transaction in its sender's bucket."""
+        if not key:
+            return
+        await db.database[config.VELOCITY_BUCKETS_COLLECTION].update_one(
+            {"key": key, "bucket_start": bucket_start(created_at)},
+            VelocityRepository._bucket_update(amount, created_at),
+            upsert=True
+        )
+
+    @staticmethod
+    def record_sync(key: Optional[str], amount: Any, created_at: datetime):
+        """Count one transaction in its sender's bucket (synchronous)."""
+        if not key:
+            return
+        db_sync = get_sync_db()
+        db_sync[config.VELOCITY_BUCKETS_COLLECTION].update_one(
+            {"key": key, "bucket_start": bucket_start(created_at)},
+            VelocityRepository._bucket_update(amount, created_at),
+            upsert=True
+        )
+
+    @staticmethod
+    async def record_many(entries: List[Tuple[Optional[str], Any, datetime]], sign: int = 1):
+        """
+        Count many (key, amount, created_at) transactions in one bulk write.
+
+        ``sign=-1`` takes previously recorded transactions back out of their
+        buckets (``last_at`` is left as is).
+        """
+        updates: Dict[Tuple[str, datetime], Dict] = {}
+        for key, amount, created_at in entries:
+            if not key:
+                continue
+            bucket = (key, bucket_start(created_at))
+            update = updates.setdefault(bucket, {"count": 0, "amount": 0.0, "last_at": created_at})
+            update["count"] += sign
+            update["amount"] += sign * (decimal_to_float(amount) if amount is not None else 0.0)
+            update["last_at"] = max(update["last_at"], created_at)
+        if not updates:
+            return
+        await db.database[config.VELOCITY_BUCKETS_COLLECTION].bulk_write([
+            UpdateOne(
+                {"key": key, "bucket_start": start},
+                {"$inc": {"count": u["count"], "amount": u["amount"]}, "$max": {"last_at": u["last_at"]}},
+                upsert=True
+            )
+            for (key, start), u in updates.items()
+        ], ordered=False)
+
+    @staticmethod
+    def get_buckets_sync(key: str, since: datetime) -> List[Dict]:
+        """Buckets for a sender starting at or after ``since``, oldest first."""
+        db_sync = get_sync_db()
+        return list(db_sync[config.VELOCITY_BUCKETS_COLLECTION].find(
+            {"key": key, "bucket_start": {"$gte": since}},
+            {"_id": 0, "bucket_start": 1, "count": 1, "amount": 1, "last_at": 1}
+        ).sort("bucket_start", 1))
+
+    @staticmethod
+    def rebuild_pipeline(since: datetime, bucket_seconds: Optional[int] = None) -> List[Dict]:
+        """
+        Aggregation over the transactions collection that recomputes buckets.
+
+        Buckets from ``since`` onwards are replaced with counts derived from
+        the stored transactions; used to backfill after bulk imports.
+        """
+        size_ms = (bucket_seconds or config.VELOCITY_BUCKET_SECONDS) * 1000
+        return [
+            {"$match": {"created_at": {"$gte": bucket_start(since, bucket_seconds)}}},
+            {"$project": {
+                "key": {"$cond": [
+                    {"$ifNull": ["$sender.customer_id", False]},
+                    {"$concat": ["customer:", "$sender.customer_id"]},
+                    {"$concat": ["account:", "$sender.account_number"]}
+                ]},
+                # A date minus milliseconds is a date
+                "bucket_start": {"$subtract": ["$created_at", {"$mod": [{"$toLong": "$created_at"}, size_ms]}]},
+                "amount": {"$toDouble": {"$ifNull": ["$amount", 0]}},
+                "created_at": 1
+            }},
+            {"$match": {"key": {"$ne": None}}},
+            {"$group": {
+                "_id": {"key": "$key", "bucket_start": "$bucket_start"},
+                "count": {"$sum": 1},
+                "amount": {"$sum": "$amount"},
+                "last_at": {"$max": "$created_at"}
+            }},
+            {"$project": {
+                "_id": 0,
+                "key": "$_id.key",
+                "bucket_start": "$_id.bucket_start",
+                "count": 1,
+                "amount": 1,
+                "last_at": 1
+            }},
+            {"$merge": {
+                "into": config.VELOCITY_BUCKETS_COLLECTION,
+                "on": ["key", "bucket_start"],
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }}
+        ]
+
+    @staticmethod
+    def rebuild_sync(hours: int = 24):
+        """Recompute the last ``hours`` of buckets from the transactions collection."""
+        db_sync = get_sync_db()
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        list(db_sync[config.TRANSACTIONS_COLLECTION].aggregate(VelocityRepository.rebuild_pipeline(since)))
+        logger.info(f"Rebuilt velocity buckets for the last {hours}h")
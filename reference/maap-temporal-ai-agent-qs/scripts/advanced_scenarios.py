@@ -295,6 +295,40 @@ class AdvancedScenarios:
         results["end_time"] = datetime.now(timezone.utc).isoformat()
         return results
     
+    async def run_bulk(self, count: int, poll_seconds: float = 5.0) -> Dict:
+        """Submit ``count`` scenario transactions as one batch and follow its progress."""
+        templates = [txn for scenario in self.generate_scenarios() for txn in scenario["transactions"]]
+        transactions = []
+        for i in range(count):
+            txn = dict(templates[i % len(templates)])
+            txn.pop("transaction_id", None)
+            txn["reference_number"] = f"REF{uuid.uuid4().hex[:12].upper()}"
+            transactions.append(txn)
+        
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            response = await client.post(
+                f"{self.api_url}/transactions/batch",
+                json={"transactions": transactions}
+            )
+            response.raise_for_status()
+            batch = response.json()
+            print(f"   ✅ Batch {batch['batch_id']}: {batch['transaction_count']} transactions in {batch['shard_count']} shards")
+            
+            start = datetime.now(timezone.utc)
+            while True:
+                await asyncio.sleep(poll_seconds)
+                progress = (await client.get(f"{self.api_url}/transactions/batch/{batch['batch_id']}")).json()
+                elapsed = (datetime.now(timezone.utc) - start).total_seconds()
+                done = progress["completed"] + progress["failed"] + progress["awaiting_approval"]
+                print(
+                    f"   ⏳ {done}/{progress['total']} done ({done / elapsed:.1f}/s), "
+                    f"{progress['failed']} failed, {progress['awaiting_approval']} awaiting approval, "
+                    f"shards running {progress['shards']['running']}, "
+                    f"decisions {progress['decisions']}"
+                )
+                if progress["status"] == "completed":
+                    return progress
+    
     async def check_results(self, workflow_ids: List[str]) -> List[Dict]:
         """Check the results of submitted transactions."""
         results = []
@@ -326,8 +360,15 @@ class AdvancedScenarios:
         return results
 
 
-async def main():
+async def main(bulk: int = 0):
     """Run all advanced scenarios."""
+    if bulk:
+        print(f"\n🚀 Submitting {bulk} scenario transactions as one batch")
+        progress = await AdvancedScenarios().run_bulk(bulk)
+        print(f"\n✨ Batch complete: {progress['completed']} processed, {progress['failed']} failed, "
+              f"{progress['awaiting_approval']} awaiting approval, decisions {progress['decisions']}")
+        return
+    
     print("\n" + "="*80)
     print("🚀 ADVANCED TRANSACTION PROCESSING SCENARIOS")
     print("="*80)
@@ -393,4 +434,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Run advanced transaction scenarios")
+    parser.add_argument("--bulk", type=int, default=0,
+                        help="Submit this many scenario transactions through the batch API instead")
+    args = parser.parse_args()
+    asyncio.run(main(args.bulk))
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Benchmark: fund holds on one hot account, read-check-write vs atomic.
+
+Two phases per mode, both on a single account hammered by N threads:
+
+1. Overdraw check: the balance covers exactly --holds holds; every thread
+   keeps placing holds until it is refused. The atomic path must grant
+   exactly --holds and end at a zero available balance; the legacy
+   find_one / update_one / insert_one path can grant more.
+2. Throughput: each thread places and releases holds in a loop for
+   --seconds; reports place+release pairs per second and place latency.
+
+"legacy" is the previous AccountRepository implementation, kept here only
+for comparison. Needs MongoDB 4.2+; the bench account and its holds are
+deleted afterwards:
+
+    python -m scripts.bench_account_holds [--threads 16] [--holds 200] [--seconds 5]
+"""
+
+import argparse
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from database.account_repository import AccountRepository, InsufficientFundsError
+from database.account_schemas import Account, BalanceHold
+from database.connection import get_sync_db
+from utils.config import config
+from utils.decimal_utils import from_decimal128, to_decimal128
+
+ACCOUNT = "ACC_BENCH_HOT"
+TXN_PREFIX = "TXN_HOLD_BENCH_"
+HOLD_AMOUNT = Decimal("10.01")
+
+
+def legacy_place_hold(account_number: str, amount: Decimal, transaction_id: str) -> str:
+    """The previous three-round-trip hold: read, compare in Python, then write."""
+    db_sync = get_sync_db()
+    account = db_sync[config.ACCOUNTS_COLLECTION].find_one({"account_number": account_number})
+    if from_decimal128(account["available_balance"]) < amount:
+        raise InsufficientFundsError("Insufficient available balance for hold")
+    hold = BalanceHold(
+        account_number=account_number,
+        transaction_id=transaction_id,
+        amount=to_decimal128(amount),
+        reason="benchmark",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+    )
+    db_sync[config.ACCOUNTS_COLLECTION].update_one(
+        {"account_number": account_number},
+        {"$inc": {"available_balance": -float(amount)}, "$push": {"holds": hold.model_dump()}}
+    )
+    db_sync[config.HOLDS_COLLECTION].insert_one(hold.model_dump())
+    return hold.hold_id
+
+
+def legacy_release_hold(hold_id: str) -> bool:
+    db_sync = get_sync_db()
+    hold = db_sync[config.HOLDS_COLLECTION].find_one({"hold_id": hold_id})
+    if not hold or hold.get("released"):
+        return False
+    db_sync[config.HOLDS_COLLECTION].update_one(
+        {"hold_id": hold_id}, {"$set": {"released": True, "released_at": datetime.now(timezone.utc)}}
+    )
+    db_sync[config.ACCOUNTS_COLLECTION].update_one(
+        {"account_number": hold["account_number"]},
+        {"$inc": {"available_balance": float(from_decimal128(hold["amount"]))}, "$pull": {"holds": {"hold_id": hold_id}}}
+    )
+    return True
+
+
+def atomic_place_hold(account_number: str, amount: Decimal, transaction_id: str) -> str:
+    return AccountRepository.place_hold_sync(account_number, amount, transaction_id, reason="benchmark", duration_hours=1)
+
+
+MODES: Dict[str, Dict[str, Callable]] = {
+    "legacy": {"place": legacy_place_hold, "release": legacy_release_hold},
+    "atomic": {"place": atomic_place_hold, "release": AccountRepository.release_hold_sync},
+}
+
+
+def reset_account(balance: Decimal) -> None:
+    db_sync = get_sync_db()
+    cleanup()
+    account = Account(
+        account_number=ACCOUNT,
+        customer_id="CUST_BENCH_HOT",
+        customer_name="Hold Benchmark",
+        balance=to_decimal128(balance),
+        available_balance=to_decimal128(balance),
+    )
+    db_sync[config.ACCOUNTS_COLLECTION].insert_one(account.model_dump())
+
+
+def available_balance() -> Decimal:
+    account = get_sync_db()[config.ACCOUNTS_COLLECTION].find_one({"account_number": ACCOUNT})
+    return from_decimal128(account["available_balance"])
+
+
+def cleanup() -> None:
+    db_sync = get_sync_db()
+    db_sync[config.ACCOUNTS_COLLECTION].delete_many({"account_number": ACCOUNT})
+    db_sync[config.HOLDS_COLLECTION].delete_many({"account_number": ACCOUNT})
+
+
+def run_threads(threads: int, target: Callable[[int], None]) -> float:
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def overdraw_check(mode: str, threads: int, holds: int) -> Dict:
+    place = MODES[mode]["place"]
+    reset_account(HOLD_AMOUNT * holds)
+    granted = [0] * threads
+
+    def worker(t: int) -> None:
+        n = 0
+        while True:
+            try:
+                place(ACCOUNT, HOLD_AMOUNT, f"{TXN_PREFIX}{t}_{n}")
+            except InsufficientFundsError:
+                return
+            granted[t] += 1
+            n += 1
+
+    run_threads(threads, worker)
+    return {"granted": sum(granted), "expected": holds, "available": available_balance()}
+
+
+def throughput(mode: str, threads: int, seconds: float) -> Dict:
+    place, release = MODES[mode]["place"], MODES[mode]["release"]
+    reset_account(HOLD_AMOUNT * threads * 10)
+    latencies: List[List[float]] = [[] for _ in range(threads)]
+    deadline = time.monotonic() + seconds
+
+    def worker(t: int) -> None:
+        n = 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            hold_id = place(ACCOUNT, HOLD_AMOUNT, f"{TXN_PREFIX}{t}_{n}")
+            latencies[t].append((time.perf_counter() - start) * 1000)
+            release(hold_id)
+            n += 1
+
+    elapsed = run_threads(threads, worker)
+    ordered = sorted(l for per_thread in latencies for l in per_thread)
+    return {
+        "pairs_per_s": len(ordered) / elapsed,
+        "p50_ms": ordered[len(ordered) // 2] if ordered else 0.0,
+        "p99_ms": ordered[int(len(ordered) * 0.99)] if ordered else 0.0,
+        "final_available": available_balance(),
+        "expected_available": HOLD_AMOUNT * threads * 10,
+    }
+
+
+def main(threads: int, holds: int, seconds: float) -> None:
+    print(f"{threads} threads on one account, database {config.MONGODB_DB_NAME}")
+    try:
+        for mode in MODES:
+            check = overdraw_check(mode, threads, holds)
+            bench = throughput(mode, threads, seconds)
+            overdrawn = "OVERDRAWN" if check["granted"] > check["expected"] else "ok"
+            drift = bench["final_available"] - bench["expected_available"]
+            print(
+                f"{mode:>7}: granted {check['granted']}/{check['expected']} holds ({overdrawn}, "
+                f"available {check['available']}), {bench['pairs_per_s']:,.0f} hold+release/s, "
+                f"place p50 {bench['p50_ms']:.1f} ms p99 {bench['p99_ms']:.1f} ms, balance drift {drift}"
+            )
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--holds", type=int, default=200, help="Holds the overdraw check's balance covers")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    main(args.threads, args.holds, args.seconds)
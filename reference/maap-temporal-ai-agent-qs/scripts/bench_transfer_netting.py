@@ -0,0 +1,164 @@
+"""Benchmark: transfers into one hot account, one transaction each vs netted.
+
+N threads each own a sender account and transfer into a single merchant
+account for --seconds. "direct" is AccountRepository.execute_transfer_with_acid;
+"netting" routes through TransferNetting with the merchant as the hot account.
+Reports transfers/s, latency, and the conflict rate from TransferStats
+(transaction attempts beyond the first per commit).
+
+Afterwards every transfer is submitted again with the same transaction_id
+to check exactly-once, and the merchant balance is compared with the
+journal. Needs a MongoDB replica set (transactions); bench accounts and
+their records are deleted afterwards:
+
+    python -m scripts.bench_transfer_netting [--threads 32] [--seconds 5] [--max-batch 50]
+"""
+
+import argparse
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from database.account_repository import AccountRepository, TransferStats
+from database.account_schemas import Account
+from database.connection import get_sync_db
+from database.transfer_netting import TransferNetting
+from utils.config import config
+from utils.decimal_utils import from_decimal128, to_decimal128
+
+MERCHANT = "ACC_BENCH_MERCHANT"
+SENDER_PREFIX = "ACC_BENCH_SENDER_"
+TXN_PREFIX = "TXN_NET_BENCH_"
+AMOUNT = Decimal("1.25")
+
+
+def direct_transfer(sender: str, transaction_id: str) -> bool:
+    return AccountRepository.execute_transfer_with_acid(sender, MERCHANT, AMOUNT, transaction_id, "benchmark")
+
+
+def netted_transfer(sender: str, transaction_id: str) -> bool:
+    return TransferNetting.execute(sender, MERCHANT, AMOUNT, transaction_id, "benchmark")
+
+
+MODES: Dict[str, Callable[[str, str], bool]] = {
+    "direct": direct_transfer,
+    "netting": netted_transfer,
+}
+
+
+def reset_accounts(threads: int) -> None:
+    cleanup()
+    accounts = [Account(
+        account_number=MERCHANT,
+        customer_id="CUST_BENCH_MERCHANT",
+        customer_name="Netting Benchmark Merchant",
+        balance=to_decimal128(0),
+        available_balance=to_decimal128(0),
+    )]
+    for t in range(threads):
+        accounts.append(Account(
+            account_number=f"{SENDER_PREFIX}{t}",
+            customer_id=f"CUST_BENCH_SENDER_{t}",
+            customer_name="Netting Benchmark Sender",
+            balance=to_decimal128(1_000_000),
+            available_balance=to_decimal128(1_000_000),
+        ))
+    get_sync_db()[config.ACCOUNTS_COLLECTION].insert_many([a.model_dump() for a in accounts])
+
+
+def cleanup() -> None:
+    db_sync = get_sync_db()
+    txn_query = {"transaction_id": {"$regex": f"^{TXN_PREFIX}"}}
+    db_sync[config.ACCOUNTS_COLLECTION].delete_many({"account_number": {"$regex": "^ACC_BENCH_(MERCHANT|SENDER_)"}})
+    db_sync[config.JOURNAL_COLLECTION].delete_many(txn_query)
+    db_sync[config.BALANCE_UPDATES_COLLECTION].delete_many(txn_query)
+    db_sync[config.APPLIED_TRANSFERS_COLLECTION].delete_many({"_id": {"$regex": f"^{TXN_PREFIX}"}})
+
+
+def run_threads(threads: int, target: Callable[[int], None]) -> float:
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def run_mode(mode: str, threads: int, seconds: float) -> Dict:
+    transfer = MODES[mode]
+    reset_accounts(threads)
+    TransferStats.reset()
+    latencies: List[List[float]] = [[] for _ in range(threads)]
+    submitted: List[List[str]] = [[] for _ in range(threads)]
+    deadline = time.monotonic() + seconds
+
+    def worker(t: int) -> None:
+        n = 0
+        while time.monotonic() < deadline:
+            transaction_id = f"{TXN_PREFIX}{mode}_{t}_{n}"
+            start = time.perf_counter()
+            transfer(f"{SENDER_PREFIX}{t}", transaction_id)
+            latencies[t].append((time.perf_counter() - start) * 1000)
+            submitted[t].append(transaction_id)
+            n += 1
+
+    elapsed = run_threads(threads, worker)
+    stats = TransferStats.snapshot().get(mode, {})
+
+    # Exactly-once: replaying every transaction_id must not move money again
+    def replay(t: int) -> None:
+        for transaction_id in submitted[t]:
+            transfer(f"{SENDER_PREFIX}{t}", transaction_id)
+
+    run_threads(threads, replay)
+
+    db_sync = get_sync_db()
+    merchant = db_sync[config.ACCOUNTS_COLLECTION].find_one({"account_number": MERCHANT})
+    journaled = db_sync[config.JOURNAL_COLLECTION].count_documents(
+        {"credit_account": MERCHANT, "transaction_id": {"$regex": f"^{TXN_PREFIX}{mode}_"}}
+    )
+    ordered = sorted(l for per_thread in latencies for l in per_thread)
+    return {
+        "transfers_per_s": len(ordered) / elapsed,
+        "p50_ms": ordered[len(ordered) // 2] if ordered else 0.0,
+        "p99_ms": ordered[int(len(ordered) * 0.99)] if ordered else 0.0,
+        "conflict_rate": stats.get("conflict_rate", 0.0),
+        "transfers_per_commit": stats.get("transfers_per_commit", 0.0),
+        "submitted": len(ordered),
+        "journaled": journaled,
+        "balance": from_decimal128(merchant["balance"]),
+        "expected_balance": AMOUNT * len(ordered),
+    }
+
+
+def main(threads: int, seconds: float, max_batch: int, max_wait_ms: float) -> None:
+    config.TRANSFER_NETTING_ENABLED = True
+    config.TRANSFER_NETTING_ACCOUNTS = [MERCHANT]
+    config.TRANSFER_NETTING_MAX_BATCH = max_batch
+    config.TRANSFER_NETTING_MAX_WAIT_MS = max_wait_ms
+    print(f"{threads} threads into one account, {seconds:.0f}s per mode, database {config.MONGODB_DB_NAME}")
+    try:
+        for mode in MODES:
+            r = run_mode(mode, threads, seconds)
+            exact = "ok" if r["journaled"] == r["submitted"] and r["balance"] == r["expected_balance"] else "MISMATCH"
+            print(
+                f"{mode:>8}: {r['transfers_per_s']:,.0f} transfers/s, p50 {r['p50_ms']:.1f} ms p99 {r['p99_ms']:.1f} ms, "
+                f"conflict rate {r['conflict_rate']:.1%}, {r['transfers_per_commit']:.1f} transfers/commit, "
+                f"exactly-once {exact} ({r['journaled']}/{r['submitted']} journaled, balance {r['balance']})"
+            )
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=config.TRANSFER_NETTING_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=config.TRANSFER_NETTING_MAX_WAIT_MS)
+    args = parser.parse_args()
+    main(args.threads, args.seconds, args.max_batch, args.max_wait_ms)
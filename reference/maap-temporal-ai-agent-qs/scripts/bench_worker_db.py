@@ -0,0 +1,128 @@
+"""Benchmark: activity throughput with DB calls inline vs on the DB thread pool.
+
+Runs the DB-bound activities (enrich_transaction_data, then store_decision)
+the way a worker does: many concurrent activity tasks on one event loop,
+through temporalio's ActivityEnvironment. Each mode is a DB_EXECUTOR_THREADS
+value; 0 is the old behaviour where every PyMongo call blocks the loop.
+
+Besides activities/s it reports event-loop lag (how late a 10 ms timer
+fires), which is what LLM- and embedding-bound activities sharing the
+worker experience while DB calls hold the loop.
+
+Needs a MongoDB with the rules seeded (scripts/setup_mongodb.py). Decisions
+and audit events it writes use TXN_BENCH_ IDs and are deleted afterwards;
+point MONGODB_DB_NAME at a scratch database to be safe:
+
+    python -m scripts.bench_worker_db [--threads 0,8,32] [--concurrency 32] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+from temporalio.testing import ActivityEnvironment
+
+from database.connection import configure_db_executor, get_sync_db
+from temporal.activities import TransactionActivities
+from temporal.shared import TransactionDetails
+from utils.config import config
+
+BENCH_PREFIX = "TXN_BENCH_"
+
+
+def build_details(i: int) -> TransactionDetails:
+    return TransactionDetails(
+        transaction_id=f"{BENCH_PREFIX}{uuid.uuid4().hex[:12].upper()}",
+        transaction_type="wire_transfer",
+        amount=str(1000 + i % 5000),
+        currency="USD",
+        sender={"customer_id": f"CUST_BENCH_{i % 50}", "account_number": f"ACC_BENCH_{i % 50}", "name": "Bench Sender"},
+        recipient={"account_number": f"ACC_BENCH_R{i % 20}", "name": "Bench Recipient", "country": "US"},
+        reference_number=f"REF-BENCH-{i}",
+        risk_flags=[],
+        metadata={},
+    )
+
+
+async def _activity_slot(activities: TransactionActivities, deadline: float, done: List[int]) -> None:
+    env = ActivityEnvironment()
+    i = 0
+    while time.monotonic() < deadline:
+        details = build_details(i)
+        await env.run(activities.enrich_transaction_data, details)
+        ai_result = {"decision": "approve", "confidence": 90, "reasoning": "benchmark", "rules_triggered": []}
+        await env.run(activities.store_decision, details.transaction_id, ai_result, "bench-workflow", "bench-run")
+        done[0] += 2
+        i += 1
+
+
+async def _loop_lag(deadline: float, lags: List[float]) -> None:
+    interval = 0.01
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def run_mode(threads: int, concurrency: int, seconds: float) -> Dict[str, float]:
+    configure_db_executor(threads)
+    activities = TransactionActivities()
+    done = [0]
+    lags: List[float] = []
+
+    start = time.monotonic()
+    deadline = start + seconds
+    await asyncio.gather(
+        _loop_lag(deadline, lags),
+        *(_activity_slot(activities, deadline, done) for _ in range(concurrency)),
+    )
+    elapsed = time.monotonic() - start
+
+    lags.sort()
+    return {
+        "threads": threads,
+        "activities_per_s": done[0] / elapsed,
+        "lag_p50_ms": statistics.median(lags) if lags else 0.0,
+        "lag_p99_ms": lags[int(len(lags) * 0.99)] if lags else 0.0,
+    }
+
+
+def cleanup() -> None:
+    db_sync = get_sync_db()
+    query = {"transaction_id": {"$regex": f"^{BENCH_PREFIX}"}}
+    for collection in (config.DECISIONS_COLLECTION, config.AUDIT_EVENTS_COLLECTION):
+        db_sync[collection].delete_many(query)
+
+
+async def main(modes: List[int], concurrency: int, seconds: float) -> None:
+    results = []
+    try:
+        for threads in modes:
+            results.append(await run_mode(threads, concurrency, seconds))
+    finally:
+        cleanup()
+
+    baseline = results[0]["activities_per_s"]
+    print(f"{concurrency} concurrent activities, {seconds:.0f}s per mode, database {config.MONGODB_DB_NAME}")
+    print(f"{'threads':>8} {'activities/s':>14} {'speedup':>8} {'loop lag p50':>13} {'p99':>9}")
+    for r in results:
+        label = "inline" if r["threads"] == 0 else str(r["threads"])
+        print(
+            f"{label:>8} {r['activities_per_s']:>14,.1f} {r['activities_per_s'] / baseline:>7.1f}x "
+            f"{r['lag_p50_ms']:>10.1f} ms {r['lag_p99_ms']:>6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    # Activity logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", default="0,8,32", help="Comma-separated DB_EXECUTOR_THREADS values; 0 = inline")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent activity tasks")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main([int(t) for t in args.threads.split(",")], args.concurrency, args.seconds))
@@ -17,6 +17,7 @@ from database.schemas import (
     TransactionType, TransactionStatus, DecisionType, RiskLevel
 )
 from services.rule_engine import RuleEngine
+from database.velocity_repository import VelocityRepository, VELOCITY_RETENTION_SECONDS
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
@@ -45,7 +46,10 @@ async def setup_collections():
             config.ACCOUNTS_COLLECTION,
             config.JOURNAL_COLLECTION,
             config.BALANCE_UPDATES_COLLECTION,
-            config.HOLDS_COLLECTION
+            config.HOLDS_COLLECTION,
+            config.VELOCITY_BUCKETS_COLLECTION,
+            # Written inside transfer transactions, so it must exist beforehand
+            config.APPLIED_TRANSFERS_COLLECTION
         ]
         
         existing_collections = await db.list_collection_names()
@@ -102,6 +106,7 @@ async def create_indexes(db):
     # Indexes for graph traversal
     await db[config.TRANSACTIONS_COLLECTION].create_index([("sender.account_number", 1)])
     await db[config.TRANSACTIONS_COLLECTION].create_index([("recipient.account_number", 1)])
+    await db[config.TRANSACTIONS_COLLECTION].create_index([("batch_id", 1)], sparse=True)
     await db[config.TRANSACTIONS_COLLECTION].create_index([
         ("sender.account_number", 1),
         ("timestamp", -1)
@@ -167,6 +172,12 @@ async def create_indexes(db):
     await db[config.HOLDS_COLLECTION].create_index([("transaction_id", 1)])
     await db[config.HOLDS_COLLECTION].create_index([("expires_at", 1)])
 
+    # Velocity bucket indexes
+    await db[config.VELOCITY_BUCKETS_COLLECTION].create_index([("key", 1), ("bucket_start", 1)], unique=True)
+    await db[config.VELOCITY_BUCKETS_COLLECTION].create_index(
+        [("bucket_start", 1)], expireAfterSeconds=VELOCITY_RETENTION_SECONDS
+    )
+
     logger.info("All indexes created successfully")
 
 async def create_vector_search_index(db):
@@ -303,6 +314,13 @@ async def insert_sample_data(db):
         await db[config.TRANSACTIONS_COLLECTION].insert_many(test_transactions)
         logger.info(f"Inserted {len(test_transactions)} test transactions")
 
+        # Seed velocity counters for the recent test transactions
+        since = datetime.now(timezone.utc) - timedelta(hours=24)
+        await db[config.TRANSACTIONS_COLLECTION].aggregate(
+            VelocityRepository.rebuild_pipeline(since)
+        ).to_list(None)
+        logger.info("Rebuilt velocity buckets")
+
     if test_decisions:
         await db[config.DECISIONS_COLLECTION].insert_many(test_decisions)
         logger.info(f"Inserted {len(test_decisions)} test decisions")
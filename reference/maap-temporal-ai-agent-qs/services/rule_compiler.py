@@ -0,0 +1,373 @@
+"""Compiler that turns rule documents into Python closures.
+
+The interpreter in ``RuleEngine.evaluate_condition`` re-parses every
+condition for every transaction: it splits dot-paths, converts both sides
+of a comparison to ``Decimal`` and recompiles regexes. Compiling a rule
+does that work once:
+
+- field paths become pre-split accessors
+- comparison thresholds are converted to float up front
+- regexes are compiled, ``in`` lists become frozensets
+- conditions are ordered so the cheapest, most decisive checks run first
+
+Compiled rules return exactly what the interpreter returns for the same
+rule and transaction, including ``False`` for malformed conditions.
+"""
+
+import logging
+import operator
+import re
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from utils.decimal_utils import from_decimal128
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[Dict], bool]
+
+# Returned by accessors when the path crosses a non-dict value
+UNRESOLVED = object()
+
+COMPARISONS = {
+    "greater_than": operator.gt,
+    "less_than": operator.lt,
+    "greater_or_equal": operator.ge,
+    "less_or_equal": operator.le,
+}
+
+# (relative cost, estimated probability that the condition holds) per operator,
+# used to order conditions within a rule
+OPERATOR_PROFILE = {
+    "equals": (1.0, 0.1),
+    "not_equals": (1.0, 0.9),
+    "exists": (1.0, 0.5),
+    "not_exists": (1.0, 0.5),
+    "in": (1.0, 0.2),
+    "not_in": (1.0, 0.8),
+    "greater_than": (2.0, 0.5),
+    "less_than": (2.0, 0.5),
+    "greater_or_equal": (2.0, 0.5),
+    "less_or_equal": (2.0, 0.5),
+    "contains": (3.0, 0.3),
+    "regex": (5.0, 0.3),
+}
+
+
+def _never(transaction: Dict) -> bool:
+    return False
+
+
+def field_accessor(field: str) -> Callable[[Dict], Any]:
+    """Build a getter for a dot-separated field path."""
+    parts = tuple(field.split("."))
+
+    if len(parts) == 1:
+        key = parts[0]
+
+        def get_one(transaction):
+            return transaction.get(key) if isinstance(transaction, dict) else UNRESOLVED
+        return get_one
+
+    def get_path(transaction):
+        value = transaction
+        for part in parts:
+            if not isinstance(value, dict):
+                return UNRESOLVED
+            value = value.get(part)
+        return value
+    return get_path
+
+
+def as_float(value: Any) -> float:
+    """Numeric value of a rule operand, as the interpreter computes it."""
+    kind = type(value)
+    if kind is float:
+        return value
+    if kind is int:
+        try:
+            return float(value)
+        except OverflowError:
+            pass  # Decimal conversion yields +/-inf instead of raising
+    return float(from_decimal128(value))
+
+
+def _guarded(test: Callable[[Any], bool], get: Callable[[Dict], Any], description: str) -> Predicate:
+    """Wrap a value test with path resolution and the interpreter's error handling."""
+    def predicate(transaction):
+        try:
+            actual = get(transaction)
+            if actual is UNRESOLVED:
+                return False
+            return test(actual)
+        except Exception as e:
+            logger.error(f"Error evaluating condition {description}: {e}")
+            return False
+    return predicate
+
+
+def membership_test(value: Any) -> Callable[[Any], bool]:
+    """Build ``actual in value``, using a frozenset when the values allow it."""
+    members: Optional[FrozenSet] = None
+    if isinstance(value, (list, tuple, set, frozenset)):
+        try:
+            members = frozenset(value)
+        except TypeError:
+            members = None
+
+    if members is None:
+        return lambda actual: actual in value
+
+    def contains(actual):
+        try:
+            return actual in members
+        except TypeError:
+            # Unhashable actual value: fall back to list semantics
+            return actual in value
+    return contains
+
+
+def value_test(condition: Dict) -> Optional[Tuple[str, str, Callable[[Any], bool], Any]]:
+    """
+    Parse one condition into (field, operator, test, operand).
+
+    ``test`` checks a resolved field value; ``operand`` is the condition
+    value, converted to float for comparisons. Returns None for a
+    condition the interpreter can never satisfy.
+    """
+    try:
+        op = condition.get("operator", "equals")
+        field = condition.get("field")
+        value = condition.get("value")
+    except AttributeError:
+        return None
+
+    # Nested groups carry no field; the interpreter treats them as unmatched
+    if not field or not isinstance(field, str) or op not in OPERATOR_PROFILE:
+        return None
+
+    if op == "equals":
+        test = lambda actual: actual == value
+    elif op == "not_equals":
+        test = lambda actual: actual != value
+    elif op in COMPARISONS:
+        if value is None:
+            return None
+        try:
+            value = as_float(value)
+        except Exception:
+            logger.error(f"Rule condition {field} {op} has a non-numeric value {value!r}")
+            return None
+        compare = COMPARISONS[op]
+        threshold = value
+        test = lambda actual: actual is not None and compare(as_float(actual), threshold)
+    elif op == "in":
+        test = membership_test(value)
+    elif op == "not_in":
+        member = membership_test(value)
+        test = lambda actual: not member(actual)
+    elif op == "contains":
+        test = lambda actual: value in str(actual)
+    elif op == "regex":
+        try:
+            match = re.compile(value).match
+        except Exception as e:
+            logger.error(f"Rule condition {field} {op} has an invalid pattern: {e}")
+            return None
+        test = lambda actual: match(str(actual)) is not None
+    elif op == "exists":
+        test = lambda actual: actual is not None
+    else:  # not_exists
+        test = lambda actual: actual is None
+
+    return field, op, test, value
+
+
+def compile_condition(condition: Dict) -> Tuple[Predicate, Optional[str], float, float]:
+    """
+    Compile one condition.
+
+    Returns (predicate, field, cost, probability). A condition the
+    interpreter can never satisfy compiles to a predicate that is always
+    False with field None.
+    """
+    parsed = value_test(condition)
+    if parsed is None:
+        return _never, None, 0.0, 0.0
+
+    field, op, test, _ = parsed
+    cost, probability = OPERATOR_PROFILE[op]
+    return _guarded(test, field_accessor(field), f"{field} {op}"), field, cost, probability
+
+
+def _all_of(predicates: Tuple[Predicate, ...]) -> Predicate:
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda transaction: first(transaction) and second(transaction)
+
+    def all_match(transaction):
+        for predicate in predicates:
+            if not predicate(transaction):
+                return False
+        return True
+    return all_match
+
+
+def _any_of(predicates: Tuple[Predicate, ...]) -> Predicate:
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda transaction: first(transaction) or second(transaction)
+
+    def any_match(transaction):
+        for predicate in predicates:
+            if predicate(transaction):
+                return True
+        return False
+    return any_match
+
+
+class CompiledRule:
+    """A rule whose conditions are compiled into a single predicate."""
+
+    __slots__ = ("rule_id", "name", "category", "action", "priority", "fields", "matches")
+
+    def __init__(self, rule: Dict):
+        self.rule_id = rule["rule_id"]
+        self.name = rule.get("name")
+        self.category = rule.get("category")
+        self.action = rule.get("action")
+        self.priority = rule.get("priority", 0)
+        self.fields: FrozenSet[str] = frozenset()
+        self.matches: Predicate = _never
+
+        try:
+            conditions = rule.get("conditions", {})
+            logic_operator = conditions.get("operator", "AND")
+            compiled = [compile_condition(cond) for cond in conditions.get("conditions", [])]
+        except Exception as e:
+            logger.error(f"Error compiling rule {self.rule_id}: {e}")
+            return
+
+        if not compiled or logic_operator not in ("AND", "OR"):
+            return
+
+        self.fields = frozenset(field for _, field, _, _ in compiled if field)
+
+        if logic_operator == "AND":
+            if any(predicate is _never for predicate, _, _, _ in compiled):
+                return
+            # Fail fast: cheap conditions that are likely to be false first
+            compiled.sort(key=lambda c: c[2] / max(1.0 - c[3], 0.01))
+        else:
+            compiled = [c for c in compiled if c[0] is not _never]
+            if not compiled:
+                return
+            # Succeed fast: cheap conditions that are likely to be true first
+            compiled.sort(key=lambda c: c[2] / max(c[3], 0.01))
+
+        predicates = tuple(predicate for predicate, _, _, _ in compiled)
+        self.matches = _all_of(predicates) if logic_operator == "AND" else _any_of(predicates)
+
+
+def _depends_on(field: str, changed: str) -> bool:
+    """Whether a rule reading ``field`` can see a write to ``changed``."""
+    return (
+        field == changed
+        or field.startswith(changed + ".")
+        or changed.startswith(field + ".")
+    )
+
+
+class CompiledRuleset:
+    """Active rules compiled for one version of the rules collection."""
+
+    def __init__(self, rules: List[Dict], version: Any = None):
+        self.version = version
+        self.rules: Tuple[CompiledRule, ...] = tuple(CompiledRule(rule) for rule in rules)
+        self._dependents: Dict[FrozenSet[str], Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, transaction: Dict) -> Dict[str, Any]:
+        """Apply every rule; same result shape as ``RuleEngine.apply_rules``."""
+        return self.summarize([rule for rule in self.rules if rule.matches(transaction)], transaction)
+
+    def start(self, transaction: Dict) -> "RuleEvaluation":
+        """Evaluate every rule and keep per-rule hits for incremental updates."""
+        return RuleEvaluation(self, [rule.matches(transaction) for rule in self.rules])
+
+    def dependents(self, changed_fields: Iterable[str]) -> Tuple[int, ...]:
+        """Indexes of the rules that read any of the changed field paths."""
+        changed = frozenset(changed_fields)
+        indexes = self._dependents.get(changed)
+        if indexes is None:
+            indexes = tuple(
+                i for i, rule in enumerate(self.rules)
+                if any(_depends_on(field, path) for field in rule.fields for path in changed)
+            )
+            self._dependents[changed] = indexes
+        return indexes
+
+    @staticmethod
+    def summarize(triggered: List[CompiledRule], transaction: Dict) -> Dict[str, Any]:
+        """Build the rule result for a list of triggered rules in ruleset order."""
+        triggered_rules = []
+        risk_flags = []
+        final_action = None
+        best_priority = None
+
+        for rule in triggered:
+            triggered_rules.append(rule.rule_id)
+
+            if rule.category:
+                risk_flags.append(f"rule_{rule.category}")
+
+            # Highest priority wins; ties go to the earliest rule
+            if rule.action and (best_priority is None or rule.priority > best_priority):
+                final_action = rule.action
+                best_priority = rule.priority
+
+            logger.info(f"Rule triggered: {rule.name} for transaction {transaction.get('transaction_id')}")
+
+        return {
+            "triggered_rules": triggered_rules,
+            "risk_flags": risk_flags,
+            "recommended_action": final_action,
+            "rule_count": len(triggered_rules)
+        }
+
+
+class RuleEvaluation:
+    """
+    Per-rule hits for one transaction, updatable as the transaction gains fields.
+
+    Pins the ruleset it started with, so every pass over a transaction
+    uses the same rule version.
+    """
+
+    __slots__ = ("ruleset", "hits")
+
+    def __init__(self, ruleset: CompiledRuleset, hits: List[bool]):
+        self.ruleset = ruleset
+        self.hits = hits
+
+    def results(self, transaction: Dict) -> Dict[str, Any]:
+        """Rule result for the current hits."""
+        rules = self.ruleset.rules
+        return CompiledRuleset.summarize([rules[i] for i, hit in enumerate(self.hits) if hit], transaction)
+
+    def update(self, transaction: Dict, changed_fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        Re-evaluate only the rules that read a changed field and return the merged result.
+
+        ``changed_fields`` are dot paths written since the last pass; writing
+        a parent (``metadata``) covers every field below it.
+        """
+        rules = self.ruleset.rules
+        for i in self.ruleset.dependents(changed_fields):
+            self.hits[i] = rules[i].matches(transaction)
+        return self.results(transaction)
@@ -4,13 +4,64 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 from database.repositories import RuleRepository
 from database.schemas import Rule, RuleStatus
+from services.rule_compiler import CompiledRuleset, RuleEvaluation
+from utils.config import config
 import logging
 import re
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 class RuleEngine:
-    """Engine for evaluating transaction rules."""
+    """
+    Engine for evaluating transaction rules.
+
+    apply_rules evaluates a compiled, cached copy of the active ruleset
+    (services/rule_compiler.py). evaluate_condition and evaluate_rule are
+    the reference interpreter the compiler must agree with.
+    """
+
+    _ruleset: Optional[CompiledRuleset] = None
+    _checked_at: float = 0.0
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_ruleset(cls) -> CompiledRuleset:
+        """
+        Get the compiled active ruleset.
+
+        The rules collection's version stamp is checked at most once per
+        RULES_CACHE_TTL_SECONDS; rules are only reloaded and recompiled
+        when it has changed.
+        """
+        ruleset = cls._ruleset
+        if ruleset is not None and time.monotonic() - cls._checked_at < config.RULES_CACHE_TTL_SECONDS:
+            return ruleset
+
+        with cls._lock:
+            ruleset = cls._ruleset
+            if ruleset is not None and time.monotonic() - cls._checked_at < config.RULES_CACHE_TTL_SECONDS:
+                return ruleset
+
+            try:
+                version = RuleRepository.get_rules_version_sync()
+                if ruleset is None or ruleset.version != version:
+                    ruleset = CompiledRuleset(RuleRepository.get_active_rules_sync(), version)
+                    cls._ruleset = ruleset
+                    logger.info(f"Compiled {len(ruleset)} active rules (version {version})")
+            except Exception as e:
+                if ruleset is None:
+                    raise
+                logger.warning(f"Could not refresh rules, using cached version {ruleset.version}: {e}")
+
+            cls._checked_at = time.monotonic()
+            return ruleset
+    
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Force the next evaluation to re-check the rules collection."""
+        cls._checked_at = 0.0
     
     @staticmethod
     def evaluate_condition(condition: Dict, transaction: Dict) -> bool:
@@ -118,53 +169,53 @@ class RuleEngine:
     def apply_rules(transaction: Dict) -> Dict[str, Any]:
         """Apply all active rules to a transaction."""
         try:
-            # Get active rules
-            rules = RuleRepository.get_active_rules_sync()
-            
-            triggered_rules = []
-            risk_flags = []
-            actions = []
-            
-            for rule in rules:
-                if RuleEngine.evaluate_rule(rule, transaction):
-                    triggered_rules.append(rule["rule_id"])
-                    
-                    # Add risk flag
-                    if rule.get("category"):
-                        risk_flags.append(f"rule_{rule['category']}")
-                    
-                    # Collect actions
-                    action = rule.get("action")
-                    if action:
-                        actions.append({
-                            "rule_id": rule["rule_id"],
-                            "action": action,
-                            "priority": rule.get("priority", 0)
-                        })
-                    
-                    logger.info(f"Rule triggered: {rule['name']} for transaction {transaction.get('transaction_id')}")
-            
-            # Determine final action based on highest priority
-            final_action = None
-            if actions:
-                actions.sort(key=lambda x: x["priority"], reverse=True)
-                final_action = actions[0]["action"]
+            return RuleEngine.get_ruleset().evaluate(transaction)
             
+        except Exception as e:
+            logger.error(f"Error applying rules: {e}")
             return {
-                "triggered_rules": triggered_rules,
-                "risk_flags": risk_flags,
-                "recommended_action": final_action,
-                "rule_count": len(triggered_rules)
+                "triggered_rules": [],
+                "risk_flags": [],
+                "recommended_action": None,
+                "rule_count": 0
             }
-            
+    
+    @staticmethod
+    def start_evaluation(transaction: Dict) -> Optional[RuleEvaluation]:
+        """
+        Apply all active rules, keeping per-rule hits for incremental re-evaluation.
+
+        Returns None if the rules could not be loaded; apply_rules_incremental
+        then falls back to the empty result.
+        """
+        try:
+            return RuleEngine.get_ruleset().start(transaction)
         except Exception as e:
             logger.error(f"Error applying rules: {e}")
+            return None
+    
+    @staticmethod
+    def apply_rules_incremental(
+        evaluation: Optional[RuleEvaluation],
+        transaction: Dict,
+        changed_fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the rule result for an evaluation started with start_evaluation.
+
+        With changed_fields, only rules reading those dot paths are
+        re-evaluated; the rest keep their earlier outcome.
+        """
+        if evaluation is None:
             return {
                 "triggered_rules": [],
                 "risk_flags": [],
                 "recommended_action": None,
                 "rule_count": 0
             }
+        if changed_fields:
+            return evaluation.update(transaction, changed_fields)
+        return evaluation.results(transaction)
     
     @staticmethod
     def get_default_rules() -> List[Rule]:
@@ -0,0 +1,128 @@
+"""Sliding-window transaction velocity from bucketed counters."""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+import threading
+
+from database.velocity_repository import VelocityRepository, bucket_start, velocity_key
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+# (count, amount, last transaction time) for one bucket
+Bucket = Tuple[int, float, Optional[datetime]]
+
+SHORT_WINDOW = timedelta(hours=1)
+LONG_WINDOW = timedelta(hours=24)
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class _SenderWindow:
+    """Settled buckets for one sender, cached between lookups."""
+
+    __slots__ = ("buckets", "settled_until")
+
+    def __init__(self, buckets: Dict[datetime, Bucket], settled_until: datetime):
+        self.buckets = buckets
+        # Buckets starting before this no longer receive writes
+        self.settled_until = settled_until
+
+
+class VelocityTracker:
+    """
+    Transaction counts and amounts per sender over the last 1h and 24h.
+
+    Reads the sender's buckets from VelocityRepository and sums whole
+    buckets, so a window covers up to one bucket more than its nominal
+    length. Buckets older than the previous one are settled: they are
+    cached in an LRU of VELOCITY_CACHE_SIZE senders, and a hot sender's
+    lookup only re-reads the last two buckets.
+    """
+
+    _cache: "OrderedDict[str, _SenderWindow]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_metrics(
+        cls,
+        customer_id: Optional[str],
+        sender_account: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Velocity metrics in the shape the enrichment metadata expects."""
+        now = now or datetime.now(timezone.utc)
+        key = velocity_key(customer_id, sender_account)
+        buckets = cls._load(key, now) if key else {}
+
+        short_since = bucket_start(now - SHORT_WINDOW)
+        long_since = bucket_start(now - LONG_WINDOW)
+        count_1h, amount_1h, last_1h = cls._sum(v for start, v in buckets.items() if start >= short_since)
+        count_24h, amount_24h, _ = cls._sum(v for start, v in buckets.items() if start >= long_since)
+
+        time_since_last = None
+        if last_1h is not None:
+            time_since_last = (now - last_1h).total_seconds()
+
+        return {
+            "velocity_1h": count_1h,
+            "velocity_24h": count_24h,
+            "total_amount_1h": amount_1h,
+            "total_amount_24h": amount_24h,
+            "time_since_last_seconds": time_since_last,
+            "velocity_calculated_at": now.isoformat(),
+        }
+
+    @classmethod
+    def _load(cls, key: str, now: datetime) -> Dict[datetime, Bucket]:
+        """All of a sender's buckets within the long window."""
+        oldest = bucket_start(now - LONG_WINDOW)
+        current = bucket_start(now)
+        settled_until = current - timedelta(seconds=config.VELOCITY_BUCKET_SECONDS)
+
+        with cls._lock:
+            cached = cls._cache.get(key)
+            if cached is not None:
+                cls._cache.move_to_end(key)
+
+        buckets: Dict[datetime, Bucket] = {}
+        since = oldest
+        if cached is not None and cached.settled_until > oldest:
+            buckets = {start: v for start, v in cached.buckets.items() if start >= oldest}
+            since = cached.settled_until
+
+        for doc in VelocityRepository.get_buckets_sync(key, since):
+            start = _utc(doc["bucket_start"])
+            buckets[start] = (doc.get("count", 0), doc.get("amount", 0.0), _utc(doc.get("last_at")))
+
+        # The previous bucket can still receive writes from in-flight requests
+        settled = {start: v for start, v in buckets.items() if start < settled_until}
+        with cls._lock:
+            cls._cache[key] = _SenderWindow(settled, settled_until)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > config.VELOCITY_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+
+        return buckets
+
+    @staticmethod
+    def _sum(buckets: Iterable[Bucket]) -> Bucket:
+        count, amount, last_at = 0, 0.0, None
+        for bucket_count, bucket_amount, bucket_last in buckets:
+            count += bucket_count
+            amount += bucket_amount
+            if bucket_last is not None and (last_at is None or bucket_last > last_at):
+                last_at = bucket_last
+        return count, amount, last_at
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached buckets, e.g. after a rebuild."""
+        with cls._lock:
+            cls._cache.clear()
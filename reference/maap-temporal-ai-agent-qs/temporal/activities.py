@@ -17,11 +17,13 @@ from database.repositories import (
     HumanReviewRepository,
     NotificationRepository,
 )
+from database.connection import run_sync
 from database.account_repository import (
     AccountRepository,
     InsufficientFundsError,
     AccountNotFoundError,
 )
+from database.transfer_netting import TransferNetting
 from database.schemas import (
     TransactionDecision,
     AuditEvent,
@@ -37,11 +39,13 @@ from ai.groq_client import groq_client
 from ai.embedding_client import embedding_client
 from ai.prompts import create_transaction_analysis_prompt, create_risk_assessment_prompt
 from services.risk_engine import RiskEngine
+from services.rule_batch import BatchRuleEvaluator, TransactionBatch
 from services.rule_engine import RuleEngine
+from services.velocity import VelocityTracker
 from temporal.shared import TransactionDetails, RiskAssessment, InsufficientDataError
 from utils.logger import transaction_logger, logger
 from utils.config import config
-from utils.decimal_utils import to_decimal128, from_decimal128, decimal_to_float
+from utils.decimal_utils import to_decimal128, from_decimal128
 from utils.temporal_serialization import prepare_activity_result
 from decimal import Decimal
 
@@ -65,13 +69,15 @@ class TransactionActivities:
                 f"Amount: {transaction_details.amount}, Decimal: {amount_decimal}, Initial balance: {initial_balance}"
             )
 
-            sender_account = AccountRepository.get_or_create_account_sync(
+            sender_account = await run_sync(
+                AccountRepository.get_or_create_account_sync,
                 account_number=transaction_details.sender.get("account_number"),
                 customer_name=transaction_details.sender.get("name"),
                 initial_balance=initial_balance,  # Dynamic demo balance
             )
 
-            recipient_account = AccountRepository.get_or_create_account_sync(
+            recipient_account = await run_sync(
+                AccountRepository.get_or_create_account_sync,
                 account_number=transaction_details.recipient.get("account_number"),
                 customer_name=transaction_details.recipient.get("name"),
                 initial_balance=50000.0,  # Demo initial balance
@@ -79,7 +85,8 @@ class TransactionActivities:
 
             # Check sufficient funds
             has_funds, available_balance = (
-                AccountRepository.check_sufficient_funds_sync(
+                await run_sync(
+                    AccountRepository.check_sufficient_funds_sync,
                     sender_account.account_number, amount_decimal
                 )
             )
@@ -97,7 +104,8 @@ class TransactionActivities:
                 )
 
             # Place hold on funds
-            hold_id = AccountRepository.place_hold_sync(
+            hold_id = await run_sync(
+                AccountRepository.place_hold_sync,
                 account_number=sender_account.account_number,
                 amount=amount_decimal,
                 transaction_id=transaction_details.transaction_id,
@@ -146,81 +154,48 @@ class TransactionActivities:
             # Get customer data
             customer_id = transaction_details.sender.get("customer_id")
             if customer_id:
-                customer_history = TransactionRepository.get_customer_history_sync(
+                customer_history = await run_sync(
+                    TransactionRepository.get_customer_history_sync,
                     customer_id
                 )
             else:
                 # Try to find/create customer
-                customer_id = CustomerRepository.get_or_create_customer_sync(
+                customer_id = await run_sync(
+                    CustomerRepository.get_or_create_customer_sync,
                     transaction_details.sender
                 )
                 transaction_details.sender["customer_id"] = customer_id
-                customer_history = TransactionRepository.get_customer_history_sync(
+                customer_history = await run_sync(
+                    TransactionRepository.get_customer_history_sync,
                     customer_id
                 )
 
             # Build transaction dict for rule evaluation
-            # Convert amount string to float for rule evaluation
-            amount_value = float(Decimal(str(transaction_details.amount)))
-            transaction_dict = {
-                "transaction_id": transaction_details.transaction_id,
-                "transaction_type": transaction_details.transaction_type,
-                "amount": amount_value,
-                "currency": transaction_details.currency,
-                "sender": transaction_details.sender,
-                "recipient": transaction_details.recipient,
-                "reference_number": transaction_details.reference_number,
-                "metadata": transaction_details.metadata,
-            }
-
-            # Apply rules
-            rule_results = RuleEngine.apply_rules(transaction_dict)
-
-            # Combine risk flags
-            risk_flags = (
-                transaction_details.risk_flags.copy()
-                if transaction_details.risk_flags
-                else []
-            )
-            risk_flags.extend(rule_results["risk_flags"])
-
-            # Additional risk flag checks
-            if amount_value > 50000:
-                risk_flags.append("high_amount")
-
-            # Check for structuring pattern (amounts just under $5000 threshold)
-            if 4900 <= amount_value < 5000:
-                risk_flags.append("structuring_pattern")
-                risk_flags.append("suspicious_amount")
-                activity.logger.warning(
-                    f"Potential structuring detected: Amount ${amount_value} "
-                    f"just under $5000 reporting threshold"
-                )
+            transaction_dict = self._rule_transaction(transaction_details)
+            amount_value = transaction_dict["amount"]
+
+            precomputed = transaction_details.precomputed or {}
+            batch_rule_results = precomputed.get("rule_results")
+            if batch_rule_results is not None:
+                # Both rule passes were evaluated with the rest of the shard
+                rule_evaluation = None
+                rule_flags = precomputed.get("rule_flags", [])
+            else:
+                # Apply rules; velocity-dependent rules are re-evaluated below
+                rule_evaluation = await run_sync(RuleEngine.start_evaluation, transaction_dict)
+                rule_flags = RuleEngine.apply_rules_incremental(rule_evaluation, transaction_dict)["risk_flags"]
+            changed_fields = []
 
             # Check time-based risks
             current_hour = datetime.now(timezone.utc).hour
-            if current_hour < 6 or current_hour > 22:
-                risk_flags.append("unusual_time")
+            unusual_time = current_hour < 6 or current_hour > 22
+            if unusual_time:
                 transaction_dict["metadata"]["unusual_time"] = True
-
-            # Check for international transactions
-            if transaction_details.transaction_type == "international":
-                risk_flags.append("cross_border")
-
-                recipient_country = transaction_details.recipient.get("country", "")
-                if recipient_country in config.HIGH_RISK_COUNTRIES:
-                    risk_flags.append("high_risk_country")
-
-            # Check for new recipient
-            if customer_history.get("common_recipients"):
-                if (
-                    transaction_details.recipient.get("name")
-                    not in customer_history["common_recipients"]
-                ):
-                    risk_flags.append("new_recipient")
+                changed_fields.append("metadata.unusual_time")
 
             # Calculate velocity metrics
-            velocity_data = self._calculate_velocity_metrics(
+            velocity_data = await run_sync(
+                self._calculate_velocity_metrics,
                 customer_id=customer_id,
                 sender_account=transaction_details.sender.get("account_number"),
             )
@@ -228,35 +203,46 @@ class TransactionActivities:
             # Add velocity data to metadata for rule evaluation
             if not transaction_dict["metadata"]:
                 transaction_dict["metadata"] = {}
+                changed_fields.append("metadata")
             transaction_dict["metadata"].update(velocity_data)
+            changed_fields.extend(f"metadata.{key}" for key in velocity_data)
 
-            # Check velocity thresholds
-            if velocity_data.get("velocity_1h", 0) > 3:
-                risk_flags.append("high_velocity_1h")
+            # Combine risk flags
+            risk_flags = self._enrichment_risk_flags(
+                transaction_details, amount_value, rule_flags,
+                customer_history, velocity_data, unusual_time
+            )
+            if "structuring_pattern" in risk_flags:
+                activity.logger.warning(
+                    f"Potential structuring detected: Amount ${amount_value} "
+                    f"just under $5000 reporting threshold"
+                )
+            if "high_velocity_1h" in risk_flags:
                 activity.logger.warning(
                     f"High velocity detected for customer {customer_id}: "
                     f"{velocity_data['velocity_1h']} transactions in last hour"
                 )
 
-            if velocity_data.get("velocity_24h", 0) > 10:
-                risk_flags.append("high_velocity_24h")
-
-            if velocity_data.get("total_amount_1h", 0) > 100000:
-                risk_flags.append("high_amount_velocity")
-
-            # Re-apply rules with updated metadata including velocity
-            rule_results = RuleEngine.apply_rules(transaction_dict)
+            # Re-evaluate only the rules that read fields written since the first pass
+            if batch_rule_results is not None:
+                rule_results = batch_rule_results
+            else:
+                rule_results = RuleEngine.apply_rules_incremental(
+                    rule_evaluation, transaction_dict, changed_fields
+                )
 
             # Create enriched data
             enriched_data = {
                 "transaction": transaction_dict,
                 "customer_history": customer_history,
                 "rule_results": rule_results,
-                "risk_flags": list(set(risk_flags)),  # Deduplicate
+                "risk_flags": risk_flags,
                 "enrichment_time_ms": int(
                     (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
                 ),
             }
+            if precomputed.get("embedding_model"):
+                enriched_data["embedding_model"] = precomputed["embedding_model"]
 
             # Update customer behavior profile
             # Note: This is commented out to avoid the async call issue
@@ -274,89 +260,80 @@ class TransactionActivities:
             activity.logger.error(f"Error enriching transaction: {e}")
             raise InsufficientDataError(f"Failed to enrich transaction data: {str(e)}")
 
+    @staticmethod
+    def _rule_transaction(transaction_details: TransactionDetails) -> Dict[str, Any]:
+        """Transaction dict the rules are evaluated against, before velocity."""
+        return {
+            "transaction_id": transaction_details.transaction_id,
+            "transaction_type": transaction_details.transaction_type,
+            # Convert amount string to float for rule evaluation
+            "amount": float(Decimal(str(transaction_details.amount))),
+            "currency": transaction_details.currency,
+            "sender": transaction_details.sender,
+            "recipient": transaction_details.recipient,
+            "reference_number": transaction_details.reference_number,
+            "metadata": transaction_details.metadata,
+        }
+
+    @staticmethod
+    def _enrichment_risk_flags(
+        transaction_details: TransactionDetails,
+        amount_value: float,
+        rule_flags: List[str],
+        customer_history: Dict[str, Any],
+        velocity_data: Dict[str, Any],
+        unusual_time: bool,
+    ) -> List[str]:
+        """Risk flags enrichment attaches to a transaction, deduplicated in order."""
+        risk_flags = list(transaction_details.risk_flags or [])
+        # Flags from the first rule pass, before time and velocity metadata
+        risk_flags.extend(rule_flags)
+
+        if amount_value > 50000:
+            risk_flags.append("high_amount")
+
+        # Check for structuring pattern (amounts just under $5000 threshold)
+        if 4900 <= amount_value < 5000:
+            risk_flags.append("structuring_pattern")
+            risk_flags.append("suspicious_amount")
+
+        if unusual_time:
+            risk_flags.append("unusual_time")
+
+        # Check for international transactions
+        if transaction_details.transaction_type == "international":
+            risk_flags.append("cross_border")
+
+            recipient_country = transaction_details.recipient.get("country", "")
+            if recipient_country in config.HIGH_RISK_COUNTRIES:
+                risk_flags.append("high_risk_country")
+
+        # Check for new recipient
+        if customer_history.get("common_recipients"):
+            if (
+                transaction_details.recipient.get("name")
+                not in customer_history["common_recipients"]
+            ):
+                risk_flags.append("new_recipient")
+
+        # Check velocity thresholds
+        if velocity_data.get("velocity_1h", 0) > 3:
+            risk_flags.append("high_velocity_1h")
+
+        if velocity_data.get("velocity_24h", 0) > 10:
+            risk_flags.append("high_velocity_24h")
+
+        if velocity_data.get("total_amount_1h", 0) > 100000:
+            risk_flags.append("high_amount_velocity")
+
+        return list(dict.fromkeys(risk_flags))
+
     def _calculate_velocity_metrics(
         self, customer_id: str, sender_account: str
     ) -> Dict[str, Any]:
         """Calculate transaction velocity metrics for a customer/account."""
         try:
-            from database.connection import get_sync_db
-
-            db_sync = get_sync_db()
-
-            now = datetime.now(timezone.utc)
-            one_hour_ago = now - timedelta(hours=1)
-            twenty_four_hours_ago = now - timedelta(hours=24)
-
-            # Query transactions in last hour
-            transactions_1h = list(
-                db_sync[config.TRANSACTIONS_COLLECTION].find(
-                    {
-                        "$or": [
-                            {"sender.customer_id": customer_id},
-                            {"sender.account_number": sender_account},
-                        ],
-                        "created_at": {"$gte": one_hour_ago},
-                    }
-                )
-            )
-
-            # Query transactions in last 24 hours
-            transactions_24h = list(
-                db_sync[config.TRANSACTIONS_COLLECTION].find(
-                    {
-                        "$or": [
-                            {"sender.customer_id": customer_id},
-                            {"sender.account_number": sender_account},
-                        ],
-                        "created_at": {"$gte": twenty_four_hours_ago},
-                    }
-                )
-            )
-
-            # Calculate metrics
-            velocity_1h = len(transactions_1h)
-            velocity_24h = len(transactions_24h)
-            # Convert Decimal128 to float for sum operations
-            # Handle missing or None amounts by providing 0 as default
-            total_amount_1h = sum(
-                (
-                    decimal_to_float(t.get("amount"))
-                    if t.get("amount") is not None
-                    else 0.0
-                )
-                for t in transactions_1h
-            )
-            total_amount_24h = sum(
-                (
-                    decimal_to_float(t.get("amount"))
-                    if t.get("amount") is not None
-                    else 0.0
-                )
-                for t in transactions_24h
-            )
-
-            # Calculate time since last transaction
-            time_since_last = None
-            if transactions_1h:
-                last_transaction_time = max(
-                    t.get("created_at") for t in transactions_1h if t.get("created_at")
-                )
-                if last_transaction_time:
-                    # Ensure both datetimes are timezone-aware
-                    if last_transaction_time.tzinfo is None:
-                        last_transaction_time = last_transaction_time.replace(
-                            tzinfo=timezone.utc
-                        )
-                    time_since_last = (now - last_transaction_time).total_seconds()
-
-            return {
-                "velocity_1h": velocity_1h,
-                "velocity_24h": velocity_24h,
-                "total_amount_1h": total_amount_1h,
-                "total_amount_24h": total_amount_24h,
-                "time_since_last_seconds": time_since_last,
-                "velocity_calculated_at": now.isoformat(),
-            }
+            return VelocityTracker.get_metrics(customer_id, sender_account)
         except Exception as e:
             activity.logger.warning(f"Failed to calculate velocity metrics: {e}")
             # Return default values if calculation fails
@@ -369,6 +346,123 @@ class TransactionActivities:
                 "velocity_calculated_at": datetime.now(timezone.utc).isoformat(),
             }
 
+    @activity.defn
+    async def prepare_transaction_batch(
+        self, transaction_ids: List[str]
+    ) -> List[TransactionDetails]:
+        """
+        Load a shard of stored transactions and do its per-shard work in bulk.
+
+        Both rule passes of enrich_transaction_data run over the whole shard
+        in vectorized form, and embeddings of the same text the workflow
+        would embed are generated BATCH_EMBEDDING_SIZE per API call and
+        stored in one bulk write. Each TransactionDetails carries its rule
+        flags, rule result and embedding model in ``precomputed``, so the
+        transaction workflow skips those steps; anything that fails here is
+        simply left for the workflow to compute.
+        """
+        documents = await run_sync(TransactionRepository.get_transactions_sync, transaction_ids)
+        details = [self._details_from_document(doc) for doc in documents]
+        if len(details) < len(transaction_ids):
+            activity.logger.warning(
+                f"{len(transaction_ids) - len(details)} of {len(transaction_ids)} batch transactions not found"
+            )
+        if not details:
+            return []
+
+        # Same records enrich_transaction_data evaluates: the first pass as
+        # built, the final pass with time and velocity metadata filled in
+        first_pass = [self._rule_transaction(d) for d in details]
+        records = [dict(record) for record in first_pass]
+        current_hour = datetime.now(timezone.utc).hour
+        unusual_time = current_hour < 6 or current_hour > 22
+        velocities = await run_sync(lambda: [
+            self._calculate_velocity_metrics(
+                customer_id=d.sender.get("customer_id"),
+                sender_account=d.sender.get("account_number"),
+            )
+            for d in details
+        ])
+        for record, velocity in zip(records, velocities):
+            record["metadata"] = dict(record["metadata"] or {})
+            if unusual_time:
+                record["metadata"]["unusual_time"] = True
+            record["metadata"].update(velocity)
+
+        rule_flags: List[Optional[List[str]]] = [None] * len(details)
+        rule_results: List[Optional[Dict[str, Any]]] = [None] * len(details)
+        try:
+            evaluator = BatchRuleEvaluator(await run_sync(RuleRepository.get_active_rules_sync))
+            first_result = evaluator.evaluate(TransactionBatch.from_records(first_pass))
+            batch_result = evaluator.evaluate(TransactionBatch.from_records(records))
+            rule_flags = [first_result.result(i)["risk_flags"] for i in range(len(details))]
+            rule_results = [prepare_activity_result(batch_result.result(i)) for i in range(len(details))]
+        except Exception as e:
+            activity.logger.warning(f"Batch rule evaluation failed, transactions will evaluate rules individually: {e}")
+
+        # Embed with the risk flags enrichment will attach, so the stored
+        # embedding matches what find_similar_transactions would generate
+        embedding_models: List[Optional[str]] = [None] * len(details)
+        embeddable = [
+            i for i, d in enumerate(details)
+            if rule_flags[i] is not None and d.sender.get("customer_id")
+        ]
+        try:
+            if embeddable:
+                customer_ids = {details[i].sender["customer_id"] for i in embeddable}
+                histories = await run_sync(lambda: {
+                    customer_id: TransactionRepository.get_customer_history_sync(customer_id)
+                    for customer_id in customer_ids
+                })
+                texts = []
+                for i in embeddable:
+                    d = details[i]
+                    risk_flags = self._enrichment_risk_flags(
+                        d, records[i]["amount"], rule_flags[i],
+                        histories[d.sender["customer_id"]], velocities[i], unusual_time
+                    )
+                    texts.append(embedding_client.prepare_transaction_text(records[i], {"risk_flags": risk_flags}))
+                embeddings = await embedding_client.get_embeddings(texts)
+                await run_sync(
+                    TransactionRepository.store_embeddings_sync,
+                    {details[i].transaction_id: e for i, e in zip(embeddable, embeddings)}
+                )
+                for i, e in zip(embeddable, embeddings):
+                    embedding_models[i] = e.model
+        except Exception as e:
+            activity.logger.warning(f"Batch embedding failed, transactions will embed individually: {e}")
+
+        for d, flags, result, model in zip(details, rule_flags, rule_results, embedding_models):
+            precomputed = {}
+            if result is not None:
+                precomputed["rule_flags"] = flags
+                precomputed["rule_results"] = result
+            if model:
+                precomputed["embedding_model"] = model
+            d.precomputed = precomputed or None
+
+        activity.logger.info(
+            f"Prepared {len(details)} batch transactions: "
+            f"{sum(r is not None for r in rule_results)} rule results, {sum(m is not None for m in embedding_models)} embeddings"
+        )
+        return details
+
+    @staticmethod
+    def _details_from_document(doc: Dict[str, Any]) -> TransactionDetails:
+        """TransactionDetails for a stored transaction, as the API builds them."""
+        transaction_type = doc.get("transaction_type")
+        return TransactionDetails(
+            transaction_id=doc["transaction_id"],
+            transaction_type=transaction_type.value if hasattr(transaction_type, "value") else str(transaction_type),
+            amount=str(from_decimal128(doc["amount"])),
+            currency=doc.get("currency", "USD"),
+            sender=doc.get("sender", {}),
+            recipient=doc.get("recipient", {}),
+            reference_number=doc.get("reference_number") or "",
+            risk_flags=list(doc.get("risk_flags") or []),
+            metadata=dict(doc.get("metadata") or {}),
+        )
+
     @activity.defn
     async def perform_risk_assessment(
         self, enriched_data: Dict[str, Any]
@@ -453,7 +547,7 @@ class TransactionActivities:
                         "rules_triggered": len(rule_results.get("triggered_rules", [])),
                     },
                 )
-                MetricsRepository.record_metric_sync(metric)
+                await run_sync(MetricsRepository.record_metric_sync, metric)
             except Exception as metric_error:
                 activity.logger.warning(f"Failed to record metric: {metric_error}")
 
@@ -495,24 +589,33 @@ class TransactionActivities:
             embedding = None
             embedding_model = None
             try:
-                # Prepare transaction text for embedding
-                embedding_text = embedding_client.prepare_transaction_text(
-                    transaction, enriched_data
-                )
+                # Batch ingestion already embedded and stored this transaction
+                if enriched_data.get("embedding_model"):
+                    embedding = await run_sync(
+                        TransactionRepository.get_embedding_sync, transaction["transaction_id"]
+                    )
+                    embedding_model = enriched_data["embedding_model"]
 
-                # Get embedding using dual provider strategy
-                embedding_result = await embedding_client.get_embedding(embedding_text)
-                embedding = embedding_result.embedding
-                embedding_model = embedding_result.model
+                if embedding is None:
+                    # Prepare transaction text for embedding
+                    embedding_text = embedding_client.prepare_transaction_text(
+                        transaction, enriched_data
+                    )
 
-                # Store embedding for this transaction
-                TransactionRepository.store_embedding_sync(
-                    transaction["transaction_id"], embedding, embedding_model
-                )
+                    # Get embedding using dual provider strategy
+                    embedding_result = await embedding_client.get_embedding(embedding_text)
+                    embedding = embedding_result.embedding
+                    embedding_model = embedding_result.model
 
-                activity.logger.info(
-                    f"Generated {embedding_result.dimensions}D embedding using {embedding_model}"
-                )
+                    # Store embedding for this transaction
+                    await run_sync(
+                        TransactionRepository.store_embedding_sync,
+                        transaction["transaction_id"], embedding, embedding_model
+                    )
+
+                    activity.logger.info(
+                        f"Generated {embedding_result.dimensions}D embedding using {embedding_model}"
+                    )
 
             except Exception as embed_error:
                 activity.logger.warning(f"Could not generate embedding: {embed_error}")
@@ -693,7 +796,7 @@ class TransactionActivities:
                         "transaction_type": transaction["transaction_type"],
                     },
                 )
-                MetricsRepository.record_metric_sync(metric)
+                await run_sync(MetricsRepository.record_metric_sync, metric)
             except Exception as metric_error:
                 activity.logger.warning(f"Failed to record metric: {metric_error}")
 
@@ -756,7 +859,7 @@ class TransactionActivities:
             )
 
             # Store decision
-            decision_id = DecisionRepository.create_decision_sync(decision)
+            decision_id = await run_sync(DecisionRepository.create_decision_sync, decision)
 
             # Create comprehensive audit event
             try:
@@ -777,7 +880,7 @@ class TransactionActivities:
                         ),
                     },
                 )
-                AuditRepository.create_audit_event_sync(audit_event)
+                await run_sync(AuditRepository.create_audit_event_sync, audit_event)
             except Exception as audit_error:
                 activity.logger.warning(f"Failed to create audit event: {audit_error}")
 
@@ -789,7 +892,8 @@ class TransactionActivities:
             }
 
             try:
-                TransactionRepository.update_status_sync(
+                await run_sync(
+                    TransactionRepository.update_status_sync,
                     transaction_id, status_map.get(ai_result["decision"], "processing")
                 )
             except Exception as status_error:
@@ -801,7 +905,7 @@ class TransactionActivities:
             for rule_id in ai_result.get("rules_triggered", []):
                 try:
                     # Mark rule as triggered and assume correct for now
-                    RuleRepository.update_rule_metrics_sync(rule_id, True, True)
+                    await run_sync(RuleRepository.update_rule_metrics_sync, rule_id, True, True)
                 except Exception as rule_error:
                     activity.logger.warning(
                         f"Failed to update rule metrics: {rule_error}"
@@ -851,7 +955,7 @@ class TransactionActivities:
             )
 
             # Store in database
-            review_id = HumanReviewRepository.create_review_sync_obj(review)
+            review_id = await run_sync(HumanReviewRepository.create_review_sync_obj, review)
 
             activity.logger.info(
                 f"Queued transaction {transaction_id} for human review "
@@ -875,7 +979,7 @@ class TransactionActivities:
                         "review_id": review_id,
                     },
                 )
-                AuditRepository.create_audit_event_sync(audit_event)
+                await run_sync(AuditRepository.create_audit_event_sync, audit_event)
             except Exception as audit_error:
                 activity.logger.warning(f"Failed to create audit event: {audit_error}")
 
@@ -910,11 +1014,12 @@ class TransactionActivities:
             )
 
             # Store notification
-            notification_id = NotificationRepository.create_notification_sync_obj(
+            notification_id = await run_sync(
+                NotificationRepository.create_notification_sync_obj,
                 notification
             )
 
-            NotificationRepository.mark_as_sent_sync(notification_id)
+            await run_sync(NotificationRepository.mark_as_sent_sync, notification_id)
 
             activity.logger.info(
                 f"Notification {notification_id} created and sent for "
@@ -941,10 +1046,11 @@ class TransactionActivities:
             # Convert amount to float if it's a string
             amount_value = float(amount) if isinstance(amount, str) else amount
             # Release the hold first
-            AccountRepository.release_hold_sync(hold_id)
+            await run_sync(AccountRepository.release_hold_sync, hold_id)
 
-            # Execute ACID transfer
-            result = AccountRepository.execute_transfer_with_acid(
+            # Execute ACID transfer, netted in micro-batches for hot accounts
+            result = await run_sync(
+                TransferNetting.execute,
                 sender_account=sender_account,
                 recipient_account=recipient_account,
                 amount=amount_value,
@@ -970,7 +1076,7 @@ class TransactionActivities:
             activity.logger.error(f"Fund transfer failed: {e}")
             # Release hold if transfer fails
             try:
-                AccountRepository.release_hold_sync(hold_id)
+                await run_sync(AccountRepository.release_hold_sync, hold_id)
             except:
                 pass
             return False
@@ -980,7 +1086,7 @@ class TransactionActivities:
         """Cleanup/release a hold if it exists."""
         try:
             if hold_id:
-                AccountRepository.release_hold_sync(hold_id)
+                await run_sync(AccountRepository.release_hold_sync, hold_id)
                 activity.logger.info(f"Cleaned up hold {hold_id}")
                 return True
         except Exception as e:
@@ -1,48 +1,113 @@
-"""Worker that hosts workflow and activity implementations."""
+"""Worker that hosts workflow and activity implementations.
 
+Runs the worker profiles in WORKER_PROFILES (see temporal/worker_profiles.py).
+Each "<profile>=<n>" entry gets n worker processes, so throughput scales
+across cores; a single entry with one process runs in this process.
+
+    python -m temporal.run_worker                                  # everything, one process
+    python -m temporal.run_worker --profiles workflows,llm=2,db=4,transfer
+"""
+
+import argparse
 import asyncio
 import logging
+import multiprocessing
+import signal
+import sys
+from typing import List
 from temporalio.client import Client
 from temporalio.worker import Worker
 
 from temporal.activities import TransactionActivities
-from temporal.workflows import TransactionProcessingWorkflow
-from temporal.shared import TRANSACTION_PROCESSING_TASK_QUEUE
+from temporal.workflows import WORKFLOWS
+from temporal.worker_profiles import build_profiles, parse_profile_spec
 from utils.config import config
 
-async def main() -> None:
-    """Start the worker to process workflows and activities."""
+logger = logging.getLogger(__name__)
+
+async def run_workers(profile_names: List[str]) -> None:
+    """Run one Worker per profile in this process until shutdown."""
     logging.basicConfig(level=logging.INFO)
-    
+
     # Connect to Temporal
     client = await Client.connect(config.TEMPORAL_HOST, namespace=config.TEMPORAL_NAMESPACE)
-    
+
     # Create activities instance
     activities = TransactionActivities()
-    
-    # Create worker
-    worker = Worker(
-        client,
-        task_queue=TRANSACTION_PROCESSING_TASK_QUEUE,
-        workflows=[TransactionProcessingWorkflow],
-        activities=[
-            activities.validate_and_hold_funds,
-            activities.enrich_transaction_data,
-            activities.perform_risk_assessment,
-            activities.find_similar_transactions,
-            activities.analyze_fraud_network,
-            activities.ai_decision_analysis,
-            activities.store_decision,
-            activities.queue_for_human_review,
-            activities.send_notification,
-            activities.execute_fund_transfer,
-            activities.cleanup_hold
-        ],
-    )
-    
-    print(f"Starting worker on task queue: {TRANSACTION_PROCESSING_TASK_QUEUE}")
+    profiles = build_profiles()
+
+    workers = []
+    for name in profile_names:
+        profile = profiles[name]
+        workers.append(Worker(
+            client,
+            task_queue=profile.task_queue,
+            workflows=WORKFLOWS if profile.run_workflows else [],
+            activities=[getattr(activities, activity_name) for activity_name in profile.activity_names],
+            **profile.worker_options(),
+        ))
+        print(f"Starting {name} worker on task queue: {profile.task_queue} {profile.worker_options()}")
     print(f"Connected to Temporal at: {config.TEMPORAL_HOST}")
-    await worker.run()
+
+    # Drain in-flight tasks on SIGTERM/SIGINT instead of dropping them
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, lambda: [asyncio.ensure_future(w.shutdown()) for w in workers])
+
+    await asyncio.gather(*(worker.run() for worker in workers))
+
+def _worker_process(profile_names: List[str]) -> None:
+    asyncio.run(run_workers(profile_names))
+
+def launch(spec: str) -> int:
+    """Start the processes described by a profile spec and supervise them."""
+    entries = parse_profile_spec(spec)
+    if len(entries) == 1 and entries[0][1] == 1:
+        _worker_process(entries[0][0])
+        return 0
+
+    # Spawn so each process builds its own Temporal client and MongoDB pools
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for profile_names, count in entries:
+        for i in range(count):
+            process = context.Process(
+                target=_worker_process,
+                args=(profile_names,),
+                name=f"worker-{'+'.join(profile_names)}-{i}",
+            )
+            process.start()
+            processes.append(process)
+    logger.info(f"Started {len(processes)} worker processes for '{spec}'")
+
+    def stop(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # Exit as soon as any worker dies so the supervisor (Docker, systemd) restarts the set
+    exit_code = 0
+    while processes:
+        for process in list(processes):
+            process.join(timeout=1)
+            if process.exitcode is None:
+                continue
+            processes.remove(process)
+            if process.exitcode != 0 and exit_code == 0:
+                logger.error(f"{process.name} exited with code {process.exitcode}, stopping the others")
+                exit_code = 1
+                stop(None, None)
+    return exit_code
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run Temporal workers")
+    parser.add_argument("--profiles", default=config.WORKER_PROFILES,
+                        help="Profiles to run, e.g. 'all' or 'workflows,llm=2,db=2,transfer'")
+    args = parser.parse_args()
+    return launch(args.profiles)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(main())
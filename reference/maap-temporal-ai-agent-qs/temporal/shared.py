@@ -1,6 +1,6 @@
 """Shared constants and data models for Temporal workflows."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 from decimal import Decimal
@@ -8,6 +8,27 @@ from decimal import Decimal
 # Task Queue name
 TRANSACTION_PROCESSING_TASK_QUEUE = "transaction-processing-queue"
 
+# Activity task queues, one per resource the activities wait on
+LLM_ACTIVITIES_TASK_QUEUE = "transaction-llm-activities"
+DB_ACTIVITIES_TASK_QUEUE = "transaction-db-activities"
+TRANSFER_ACTIVITIES_TASK_QUEUE = "transaction-transfer-activities"
+
+# Task queue per activity name when ACTIVITY_QUEUE_ROUTING is on
+ACTIVITY_TASK_QUEUES = {
+    "perform_risk_assessment": LLM_ACTIVITIES_TASK_QUEUE,
+    "ai_decision_analysis": LLM_ACTIVITIES_TASK_QUEUE,
+    "find_similar_transactions": LLM_ACTIVITIES_TASK_QUEUE,  # embedding API call
+    "prepare_transaction_batch": LLM_ACTIVITIES_TASK_QUEUE,  # batched embedding calls
+    "enrich_transaction_data": DB_ACTIVITIES_TASK_QUEUE,
+    "analyze_fraud_network": DB_ACTIVITIES_TASK_QUEUE,
+    "store_decision": DB_ACTIVITIES_TASK_QUEUE,
+    "queue_for_human_review": DB_ACTIVITIES_TASK_QUEUE,
+    "send_notification": DB_ACTIVITIES_TASK_QUEUE,
+    "validate_and_hold_funds": TRANSFER_ACTIVITIES_TASK_QUEUE,
+    "execute_fund_transfer": TRANSFER_ACTIVITIES_TASK_QUEUE,
+    "cleanup_hold": TRANSFER_ACTIVITIES_TASK_QUEUE,
+}
+
 @dataclass
 class TransactionDetails:
     """Extended transaction details for processing."""
@@ -20,6 +41,8 @@ class TransactionDetails:
     reference_number: str
     risk_flags: List[str]
     metadata: Dict[str, Any]
+    # Results computed for a whole shard by prepare_transaction_batch
+    precomputed: Optional[Dict[str, Any]] = None
 
 @dataclass
 class ProcessingResult:
@@ -42,6 +65,35 @@ class RiskAssessment:
     requires_enhanced_diligence: bool
     compliance_checks: Dict[str, bool]
 
+@dataclass
+class BatchIngestionRequest:
+    """Stored transactions to process as one batch."""
+    batch_id: str
+    transaction_ids: List[str]
+    shard_size: int = 100
+    max_concurrent_shards: int = 10
+    shard_concurrency: int = 20
+
+@dataclass
+class BatchShard:
+    """One child workflow's slice of a batch."""
+    batch_id: str
+    shard_index: int
+    transaction_ids: List[str]
+    concurrency: int = 20
+    parent_workflow_id: Optional[str] = None
+
+@dataclass
+class ShardResult:
+    """Outcome counts for one shard."""
+    shard_index: int
+    total: int
+    completed: int = 0
+    failed: int = 0
+    # Left running, abandoned, while they wait on manager approval
+    awaiting_approval: int = 0
+    decisions: Dict[str, int] = field(default_factory=dict)
+
 # Exceptions
 class InsufficientDataError(Exception):
     """Raised when insufficient data for decision."""
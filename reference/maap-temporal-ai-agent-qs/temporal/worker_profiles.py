@@ -0,0 +1,119 @@
+"""Worker profiles: which task queue a worker polls and how it is sized.
+
+LLM calls take seconds and mostly wait on the network, DB activities take
+milliseconds, and fund transfers contend on account documents. With
+ACTIVITY_QUEUE_ROUTING on, the workflow schedules each kind on its own
+task queue (temporal/shared.py), so a worker profile can give each its own
+slot count and pollers and be scaled as a separate process.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from temporal.shared import (
+    ACTIVITY_TASK_QUEUES,
+    DB_ACTIVITIES_TASK_QUEUE,
+    LLM_ACTIVITIES_TASK_QUEUE,
+    TRANSACTION_PROCESSING_TASK_QUEUE,
+    TRANSFER_ACTIVITIES_TASK_QUEUE,
+)
+from utils.config import config
+
+
+@dataclass
+class WorkerProfile:
+    """Settings for one Temporal Worker."""
+    name: str
+    task_queue: str
+    activity_names: List[str]
+    run_workflows: bool = False
+    max_concurrent_activities: Optional[int] = None
+    max_concurrent_activity_task_polls: Optional[int] = None
+    max_concurrent_workflow_tasks: Optional[int] = None
+    max_concurrent_workflow_task_polls: Optional[int] = None
+    max_cached_workflows: Optional[int] = None
+
+    def worker_options(self) -> Dict:
+        """Keyword arguments for temporalio.worker.Worker, without unset values."""
+        options = {
+            "max_concurrent_activities": self.max_concurrent_activities,
+            "max_concurrent_activity_task_polls": self.max_concurrent_activity_task_polls,
+            "max_concurrent_workflow_tasks": self.max_concurrent_workflow_tasks,
+            "max_concurrent_workflow_task_polls": self.max_concurrent_workflow_task_polls,
+            "max_cached_workflows": self.max_cached_workflows,
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
+
+def _activities_on(task_queue: str) -> List[str]:
+    return [name for name, queue in ACTIVITY_TASK_QUEUES.items() if queue == task_queue]
+
+
+def build_profiles() -> Dict[str, WorkerProfile]:
+    """Profiles sized from the current configuration."""
+    return {
+        # Also serves every activity on the workflow queue: used when routing
+        # is off, and by activities scheduled before it was turned on
+        "workflows": WorkerProfile(
+            name="workflows",
+            task_queue=TRANSACTION_PROCESSING_TASK_QUEUE,
+            activity_names=list(ACTIVITY_TASK_QUEUES),
+            run_workflows=True,
+            max_concurrent_workflow_tasks=config.WORKER_WORKFLOW_TASK_SLOTS,
+            max_concurrent_workflow_task_polls=config.WORKER_WORKFLOW_POLLERS,
+            max_cached_workflows=config.WORKER_MAX_CACHED_WORKFLOWS,
+        ),
+        "llm": WorkerProfile(
+            name="llm",
+            task_queue=LLM_ACTIVITIES_TASK_QUEUE,
+            activity_names=_activities_on(LLM_ACTIVITIES_TASK_QUEUE),
+            max_concurrent_activities=config.WORKER_LLM_SLOTS,
+            max_concurrent_activity_task_polls=config.WORKER_LLM_POLLERS,
+        ),
+        "db": WorkerProfile(
+            name="db",
+            task_queue=DB_ACTIVITIES_TASK_QUEUE,
+            activity_names=_activities_on(DB_ACTIVITIES_TASK_QUEUE),
+            max_concurrent_activities=config.WORKER_DB_SLOTS,
+            max_concurrent_activity_task_polls=config.WORKER_DB_POLLERS,
+        ),
+        "transfer": WorkerProfile(
+            name="transfer",
+            task_queue=TRANSFER_ACTIVITIES_TASK_QUEUE,
+            activity_names=_activities_on(TRANSFER_ACTIVITIES_TASK_QUEUE),
+            max_concurrent_activities=config.WORKER_TRANSFER_SLOTS,
+            max_concurrent_activity_task_polls=config.WORKER_TRANSFER_POLLERS,
+        ),
+    }
+
+
+# "all" runs every profile in one process
+PROFILE_GROUPS = {"all": ["workflows", "llm", "db", "transfer"]}
+
+
+def parse_profile_spec(spec: str) -> List[Tuple[List[str], int]]:
+    """
+    Parse WORKER_PROFILES into (profile names, process count) entries.
+
+    "workflows,llm=2,db=2" gives one process for workflows, two for llm
+    and two for db. Group names such as "all" expand in place.
+    """
+    known = build_profiles()
+    entries = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, count = item.partition("=")
+        name = name.strip()
+        names = PROFILE_GROUPS.get(name, [name])
+        unknown = [n for n in names if n not in known]
+        if unknown:
+            raise ValueError(f"Unknown worker profile '{name}'; expected one of {sorted(known) + sorted(PROFILE_GROUPS)}")
+        processes = int(count) if count else 1
+        if processes < 1:
+            raise ValueError(f"Worker profile '{name}' needs at least one process")
+        entries.append((names, processes))
+    if not entries:
+        raise ValueError("No worker profiles configured")
+    return entries
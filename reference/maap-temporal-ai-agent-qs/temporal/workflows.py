@@ -1,20 +1,52 @@
 """Transaction processing workflow definition."""
 
+import asyncio
 from datetime import timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from temporalio import workflow
 from temporalio.common import RetryPolicy
-from temporalio.exceptions import ActivityError, ApplicationError
+from temporalio.exceptions import ActivityError, ApplicationError, ChildWorkflowError, WorkflowAlreadyStartedError
 
 # Use unsafe imports for non-deterministic code
 with workflow.unsafe.imports_passed_through():
     from temporal.shared import (
+        ACTIVITY_TASK_QUEUES,
+        BatchIngestionRequest,
+        BatchShard,
+        ShardResult,
         TransactionDetails,
-        ProcessingResult
+        ProcessingResult,
+        RiskAssessment
     )
     from temporal.activities import TransactionActivities
     from utils.config import config
 
+# Patch ID guarding the concurrent analysis fan-out. Histories recorded
+# before it keep replaying the sequential path.
+PARALLEL_ANALYSIS_PATCH = "parallel-analysis-fanout"
+
+# Per-branch budgets for the fan-out: start_to_close bounds one attempt,
+# schedule_to_close bounds the branch including retries so a slow branch
+# degrades instead of holding up the decision.
+ANALYSIS_BRANCH_TIMEOUTS = {
+    "risk_assessment": (timedelta(seconds=120), timedelta(seconds=180)),
+    "similar_transactions": (timedelta(seconds=20), timedelta(seconds=45)),
+    "network_analysis": (timedelta(seconds=120), timedelta(seconds=180)),
+}
+
+# Shards report progress to the batch workflow every this many transactions
+SHARD_PROGRESS_INTERVAL = 25
+
+# Patch ID guarding the signal a batch transaction sends its shard when it
+# starts waiting on manager approval
+APPROVAL_WAIT_SIGNAL_PATCH = "batch-approval-wait-signal"
+
+def activity_task_queue(activity_name: str) -> Optional[str]:
+    """Task queue for an activity; None keeps it on the workflow's own queue."""
+    if not config.ACTIVITY_QUEUE_ROUTING:
+        return None
+    return ACTIVITY_TASK_QUEUES.get(activity_name)
+
 @workflow.defn
 class TransactionProcessingWorkflow:
     """Workflow for AI-powered transaction processing."""
@@ -55,6 +87,7 @@ class TransactionProcessingWorkflow:
             funds_validation = await workflow.execute_activity(
                 activities.validate_and_hold_funds,
                 transaction_details,
+                task_queue=activity_task_queue("validate_and_hold_funds"),
                 start_to_close_timeout=timedelta(seconds=60),
                 retry_policy=retry_policy
             )
@@ -65,33 +98,43 @@ class TransactionProcessingWorkflow:
             enriched_data = await workflow.execute_activity(
                 activities.enrich_transaction_data,
                 transaction_details,
+                task_queue=activity_task_queue("enrich_transaction_data"),
                 start_to_close_timeout=timedelta(seconds=120),
                 retry_policy=retry_policy
             )
             
-            # Step 2: Perform risk assessment
-            risk_assessment = await workflow.execute_activity(
-                activities.perform_risk_assessment,
-                enriched_data,
-                start_to_close_timeout=timedelta(seconds=120),
-                retry_policy=retry_policy
-            )
+            if workflow.patched(PARALLEL_ANALYSIS_PATCH):
+                # Steps 2-3.5 run concurrently; each needs only the enriched data
+                risk_assessment, similar_cases, network_analysis = await self._run_analysis_branches(
+                    activities, enriched_data, retry_policy
+                )
+            else:
+                # Step 2: Perform risk assessment
+                risk_assessment = await workflow.execute_activity(
+                    activities.perform_risk_assessment,
+                    enriched_data,
+                    task_queue=activity_task_queue("perform_risk_assessment"),
+                    start_to_close_timeout=timedelta(seconds=120),
+                    retry_policy=retry_policy
+                )
             
-            # Step 3: Find similar historical transactions
-            similar_cases = await workflow.execute_activity(
-                activities.find_similar_transactions,
-                enriched_data,
-                start_to_close_timeout=timedelta(seconds=20),
-                retry_policy=retry_policy
-            )
+                # Step 3: Find similar historical transactions
+                similar_cases = await workflow.execute_activity(
+                    activities.find_similar_transactions,
+                    enriched_data,
+                    task_queue=activity_task_queue("find_similar_transactions"),
+                    start_to_close_timeout=timedelta(seconds=20),
+                    retry_policy=retry_policy
+                )
 
-            # Step 3.5: Analyze fraud network patterns
-            network_analysis = await workflow.execute_activity(
-                activities.analyze_fraud_network,
-                enriched_data,
-                start_to_close_timeout=timedelta(seconds=120),
-                retry_policy=retry_policy
-            )
+                # Step 3.5: Analyze fraud network patterns
+                network_analysis = await workflow.execute_activity(
+                    activities.analyze_fraud_network,
+                    enriched_data,
+                    task_queue=activity_task_queue("analyze_fraud_network"),
+                    start_to_close_timeout=timedelta(seconds=120),
+                    retry_policy=retry_policy
+                )
 
             # Incorporate network analysis into risk assessment
             if network_analysis.get("network_analysis_performed"):
@@ -105,6 +148,7 @@ class TransactionProcessingWorkflow:
             ai_result = await workflow.execute_activity(
                 activities.ai_decision_analysis,
                 args=[enriched_data, risk_assessment, similar_cases],
+                task_queue=activity_task_queue("ai_decision_analysis"),
                 start_to_close_timeout=timedelta(seconds=120),
                 retry_policy=retry_policy
             )
@@ -122,6 +166,7 @@ class TransactionProcessingWorkflow:
                 ai_result["decision"] == "approve"):
                 self.awaiting_approval = True
                 workflow.logger.info(f"Transaction {self.transaction_id} requires manager approval")
+                await self._notify_shard_awaiting_approval()
                 
                 # Wait for approval (with timeout)
                 try:
@@ -157,6 +202,7 @@ class TransactionProcessingWorkflow:
                     workflow.info().workflow_id,
                     workflow.info().run_id
                 ],
+                task_queue=activity_task_queue("store_decision"),
                 start_to_close_timeout=timedelta(seconds=60),
                 retry_policy=retry_policy
             )
@@ -167,6 +213,7 @@ class TransactionProcessingWorkflow:
                 review_id = await workflow.execute_activity(
                     activities.queue_for_human_review,
                     args=[transaction_details.transaction_id, ai_result],
+                    task_queue=activity_task_queue("queue_for_human_review"),
                     start_to_close_timeout=timedelta(seconds=60),
                     retry_policy=retry_policy
                 )
@@ -195,6 +242,7 @@ class TransactionProcessingWorkflow:
                             transaction_details.amount,
                             hold_id
                         ],
+                        task_queue=activity_task_queue("execute_fund_transfer"),
                         start_to_close_timeout=timedelta(seconds=120),
                         retry_policy=retry_policy
                     )
@@ -208,6 +256,7 @@ class TransactionProcessingWorkflow:
                         await workflow.execute_activity(
                             activities.cleanup_hold,
                             hold_id,
+                            task_queue=activity_task_queue("cleanup_hold"),
                             start_to_close_timeout=timedelta(seconds=60),
                             retry_policy=retry_policy
                         )
@@ -233,6 +282,7 @@ class TransactionProcessingWorkflow:
                     result.decision,
                     result.message
                 ],
+                task_queue=activity_task_queue("send_notification"),
                 start_to_close_timeout=timedelta(seconds=60),
                 retry_policy=RetryPolicy(maximum_attempts=3)
             )
@@ -267,6 +317,7 @@ class TransactionProcessingWorkflow:
                         workflow.info().workflow_id,
                         workflow.info().run_id
                     ],
+                    task_queue=activity_task_queue("store_decision"),
                     start_to_close_timeout=timedelta(seconds=60),
                     retry_policy=retry_policy
                 )
@@ -285,6 +336,7 @@ class TransactionProcessingWorkflow:
                     await workflow.execute_activity(
                         activities.cleanup_hold,
                         hold_id,
+                        task_queue=activity_task_queue("cleanup_hold"),
                         start_to_close_timeout=timedelta(seconds=5),
                         retry_policy=RetryPolicy(maximum_attempts=3)
                     )
@@ -304,6 +356,7 @@ class TransactionProcessingWorkflow:
                     await workflow.execute_activity(
                         activities.cleanup_hold,
                         hold_id,
+                        task_queue=activity_task_queue("cleanup_hold"),
                         start_to_close_timeout=timedelta(seconds=5),
                         retry_policy=RetryPolicy(maximum_attempts=3)
                     )
@@ -314,7 +367,87 @@ class TransactionProcessingWorkflow:
                 f"System error during transaction processing: {str(e)}",
                 non_retryable=True
             )
+
+    async def _run_analysis_branches(
+        self,
+        activities: TransactionActivities,
+        enriched_data: Dict[str, Any],
+        retry_policy: RetryPolicy
+    ) -> Tuple[RiskAssessment, List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Run risk assessment, similar-case search and fraud network analysis concurrently.
+
+        The three branches depend only on the enriched data and join before
+        the AI decision. A branch that fails or exceeds its budget is replaced
+        by a conservative default and listed in enriched_data["degraded_analysis"],
+        so the decision still runs on partial results.
+        """
+        branches = {
+            "risk_assessment": activities.perform_risk_assessment,
+            "similar_transactions": activities.find_similar_transactions,
+            "network_analysis": activities.analyze_fraud_network,
+        }
+        handles = []
+        for name, activity_fn in branches.items():
+            start_to_close, schedule_to_close = ANALYSIS_BRANCH_TIMEOUTS[name]
+            handles.append(workflow.start_activity(
+                activity_fn,
+                enriched_data,
+                task_queue=activity_task_queue(activity_fn.__name__),
+                start_to_close_timeout=start_to_close,
+                schedule_to_close_timeout=schedule_to_close,
+                retry_policy=retry_policy
+            ))
+
+        results = await asyncio.gather(*handles, return_exceptions=True)
+
+        degraded = []
+        outcomes = {}
+        for name, result in zip(branches, results):
+            if isinstance(result, ActivityError):
+                workflow.logger.warning(
+                    f"Analysis branch {name} failed for {self.transaction_id}, continuing without it: {result}"
+                )
+                degraded.append(name)
+                outcomes[name] = None
+            elif isinstance(result, BaseException):
+                # Cancellation and workflow errors are not degradable
+                raise result
+            else:
+                outcomes[name] = result
+
+        risk_assessment = outcomes["risk_assessment"]
+        if risk_assessment is None:
+            # Same conservative default the activity returns on internal errors
+            risk_assessment = RiskAssessment(
+                risk_score=75.0,
+                risk_level="high",
+                risk_factors=["assessment_unavailable"],
+                requires_enhanced_diligence=True,
+                compliance_checks={"error": False}
+            )
+        similar_cases = outcomes["similar_transactions"] or []
+        network_analysis = outcomes["network_analysis"]
+        if network_analysis is None:
+            network_analysis = {"network_analysis_performed": False, "error": "branch_failed"}
+
+        if degraded:
+            enriched_data["degraded_analysis"] = degraded
+
+        return risk_assessment, similar_cases, network_analysis
     
+    async def _notify_shard_awaiting_approval(self) -> None:
+        """Let a batch shard free this transaction's slot during the approval wait."""
+        parent = workflow.info().parent
+        if parent is None or not workflow.patched(APPROVAL_WAIT_SIGNAL_PATCH):
+            return
+        try:
+            await workflow.get_external_workflow_handle(parent.workflow_id).signal(
+                TransactionBatchShardWorkflow.transaction_awaiting_approval, self.transaction_id
+            )
+        except Exception as e:
+            workflow.logger.warning(f"Could not notify shard {parent.workflow_id}: {e}")
+
     @workflow.signal
     def approve(self, manager_name: str) -> None:
         """Approve a transaction awaiting manager approval."""
@@ -358,4 +491,223 @@ class TransactionProcessingWorkflow:
             except:
                 status_dict["decision"] = str(self.decision)
         
-        return status_dict
\ No newline at end of file
+        return status_dict
+
+
+@workflow.defn
+class BatchIngestionWorkflow:
+    """
+    Process thousands of stored transactions as one batch.
+
+    The transaction IDs are split into shards of ``shard_size``; each shard
+    is a TransactionBatchShardWorkflow child and at most
+    ``max_concurrent_shards`` run at once. Shards signal their progress
+    back, so get_progress reports live counts for the whole batch.
+    """
+
+    def __init__(self):
+        self.batch_id = None
+        self.total = 0
+        self.shard_count = 0
+        self.shards_running = 0
+        self.shards_completed = 0
+        self.shards_failed = 0
+        # Latest counts per shard index, from progress signals and results
+        self.shard_progress: Dict[int, Dict[str, Any]] = {}
+        self.finished = False
+
+    @workflow.run
+    async def run(self, request: BatchIngestionRequest) -> Dict[str, Any]:
+        self.batch_id = request.batch_id
+        self.total = len(request.transaction_ids)
+        shard_size = max(1, request.shard_size)
+        shards = [
+            request.transaction_ids[start:start + shard_size]
+            for start in range(0, self.total, shard_size)
+        ]
+        self.shard_count = len(shards)
+        slots = asyncio.Semaphore(max(1, request.max_concurrent_shards))
+
+        async def run_shard(index: int, transaction_ids: List[str]) -> None:
+            async with slots:
+                self.shards_running += 1
+                shard = BatchShard(
+                    batch_id=request.batch_id,
+                    shard_index=index,
+                    transaction_ids=transaction_ids,
+                    concurrency=request.shard_concurrency,
+                    parent_workflow_id=workflow.info().workflow_id
+                )
+                try:
+                    result = await workflow.execute_child_workflow(
+                        TransactionBatchShardWorkflow.run,
+                        shard,
+                        id=f"{workflow.info().workflow_id}-shard-{index}"
+                    )
+                    self.shard_progress[index] = self._counts(result)
+                    self.shards_completed += 1
+                except (ChildWorkflowError, WorkflowAlreadyStartedError) as e:
+                    workflow.logger.error(f"Batch {self.batch_id} shard {index} failed: {e}")
+                    progress = self.shard_progress.setdefault(
+                        index, {"completed": 0, "failed": 0, "awaiting_approval": 0, "decisions": {}}
+                    )
+                    # Everything the shard had not finished or handed to an approver counts as failed
+                    progress["failed"] = len(transaction_ids) - progress["completed"] - progress["awaiting_approval"]
+                    self.shards_failed += 1
+                finally:
+                    self.shards_running -= 1
+
+        await asyncio.gather(*(run_shard(i, ids) for i, ids in enumerate(shards)))
+        self.finished = True
+        return self.get_progress()
+
+    @staticmethod
+    def _counts(result: ShardResult) -> Dict[str, Any]:
+        return {
+            "completed": result.completed,
+            "failed": result.failed,
+            "awaiting_approval": result.awaiting_approval,
+            "decisions": dict(result.decisions),
+        }
+
+    @workflow.signal
+    def shard_progress_update(self, result: ShardResult) -> None:
+        """Progress report from a running shard."""
+        self.shard_progress[result.shard_index] = self._counts(result)
+
+    @workflow.query
+    def get_progress(self) -> Dict[str, Any]:
+        """Counts for the batch so far."""
+        decisions: Dict[str, int] = {}
+        completed = failed = awaiting_approval = 0
+        for progress in self.shard_progress.values():
+            completed += progress["completed"]
+            failed += progress["failed"]
+            awaiting_approval += progress["awaiting_approval"]
+            for decision, count in progress["decisions"].items():
+                decisions[decision] = decisions.get(decision, 0) + count
+        return {
+            "batch_id": self.batch_id,
+            "status": "completed" if self.finished else "running",
+            "total": self.total,
+            "completed": completed,
+            "failed": failed,
+            "awaiting_approval": awaiting_approval,
+            "pending": self.total - completed - failed - awaiting_approval,
+            "decisions": decisions,
+            "shards": {
+                "total": self.shard_count,
+                "completed": self.shards_completed,
+                "failed": self.shards_failed,
+                "running": self.shards_running,
+            },
+        }
+
+
+@workflow.defn
+class TransactionBatchShardWorkflow:
+    """
+    One shard of a batch: bulk preparation, then a workflow per transaction.
+
+    prepare_transaction_batch evaluates the shard's rules in one vectorized
+    pass and embeds it in a few API calls; the results ride along in each
+    TransactionDetails. Transactions then run as TransactionProcessingWorkflow
+    children, ``concurrency`` at a time, with the same workflow IDs as
+    transactions submitted one by one.
+
+    A child holds its slot until it finishes or signals that it is waiting
+    on manager approval, which can take 24 hours. Children are started with
+    ParentClosePolicy.ABANDON, so the shard returns once every transaction
+    has finished or is waiting; those waiting are counted as
+    ``awaiting_approval`` and complete on their own.
+    """
+
+    def __init__(self):
+        self.result = None
+        # Children that signalled they are waiting on manager approval
+        self.waiting_for_approval = set()
+
+    @workflow.run
+    async def run(self, shard: BatchShard) -> ShardResult:
+        self.result = ShardResult(shard_index=shard.shard_index, total=len(shard.transaction_ids))
+        activities = TransactionActivities()
+
+        transactions = await workflow.execute_activity(
+            activities.prepare_transaction_batch,
+            shard.transaction_ids,
+            task_queue=activity_task_queue("prepare_transaction_batch"),
+            start_to_close_timeout=timedelta(minutes=5),
+            retry_policy=RetryPolicy(
+                maximum_attempts=3,
+                initial_interval=timedelta(seconds=2),
+                backoff_coefficient=2
+            )
+        )
+        # Transactions that could not be loaded will never run
+        self.result.failed = len(shard.transaction_ids) - len(transactions)
+
+        parent = (
+            workflow.get_external_workflow_handle(shard.parent_workflow_id)
+            if shard.parent_workflow_id else None
+        )
+        slots = asyncio.Semaphore(max(1, shard.concurrency))
+        reported = 0
+
+        async def report(force: bool = False) -> None:
+            nonlocal reported
+            done = self.result.completed + self.result.failed + self.result.awaiting_approval
+            if parent and (force or done - reported >= SHARD_PROGRESS_INTERVAL):
+                reported = done
+                await parent.signal(BatchIngestionWorkflow.shard_progress_update, self.result)
+
+        async def process(details: TransactionDetails) -> None:
+            transaction_id = details.transaction_id
+            try:
+                async with slots:
+                    child = await workflow.start_child_workflow(
+                        TransactionProcessingWorkflow.run,
+                        details,
+                        id=f"txn-processing-{transaction_id}",
+                        parent_close_policy=workflow.ParentClosePolicy.ABANDON
+                    )
+                    await workflow.wait_condition(
+                        lambda: child.done() or transaction_id in self.waiting_for_approval
+                    )
+                if child.done():
+                    outcome = await child
+                    self.result.completed += 1
+                    self.result.decisions[outcome.decision] = self.result.decisions.get(outcome.decision, 0) + 1
+                else:
+                    self.result.awaiting_approval += 1
+            except (ChildWorkflowError, WorkflowAlreadyStartedError) as e:
+                # Already started: the transaction was submitted on its own too
+                workflow.logger.warning(f"Batch transaction {transaction_id} failed: {e}")
+                self.result.failed += 1
+            await report()
+
+        await asyncio.gather(*(process(details) for details in transactions))
+        await report(force=True)
+        return self.result
+
+    @workflow.query
+    def get_progress(self) -> Dict[str, Any]:
+        """Counts for this shard so far."""
+        if self.result is None:
+            return {}
+        return {
+            "shard_index": self.result.shard_index,
+            "total": self.result.total,
+            "completed": self.result.completed,
+            "failed": self.result.failed,
+            "awaiting_approval": self.result.awaiting_approval,
+            "decisions": dict(self.result.decisions),
+        }
+
+    @workflow.signal
+    def transaction_awaiting_approval(self, transaction_id: str) -> None:
+        """A child transaction is waiting on manager approval and can give up its slot."""
+        self.waiting_for_approval.add(transaction_id)
+
+
+# Workflow classes a workflow worker registers
+WORKFLOWS = [TransactionProcessingWorkflow, BatchIngestionWorkflow, TransactionBatchShardWorkflow]
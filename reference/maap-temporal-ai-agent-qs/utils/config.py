@@ -10,12 +10,29 @@ class Config:
     # MongoDB
     MONGODB_URI = os.getenv("MONGODB_URI")
     MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "transaction_ai_poc")
+    # Threads for sync PyMongo calls made from activities; 0 blocks the event loop
+    DB_EXECUTOR_THREADS = int(os.getenv("DB_EXECUTOR_THREADS", 32))
     
     # Temporal
     TEMPORAL_HOST = os.getenv("TEMPORAL_HOST", "temporal:7233")
     TEMPORAL_NAMESPACE = os.getenv("TEMPORAL_NAMESPACE", "default")
     TEMPORAL_TASK_QUEUE = os.getenv("TEMPORAL_TASK_QUEUE", "transaction-processing-queue")
     
+    # Temporal Workers
+    # Send LLM-, DB- and transfer-bound activities to their own task queues
+    ACTIVITY_QUEUE_ROUTING = os.getenv("ACTIVITY_QUEUE_ROUTING", "true").lower() == "true"
+    # Comma-separated profiles to run, each optionally "=<processes>" (e.g. "workflows,llm=2,db=2,transfer")
+    WORKER_PROFILES = os.getenv("WORKER_PROFILES", "all")
+    WORKER_MAX_CACHED_WORKFLOWS = int(os.getenv("WORKER_MAX_CACHED_WORKFLOWS", 1000))
+    WORKER_WORKFLOW_TASK_SLOTS = int(os.getenv("WORKER_WORKFLOW_TASK_SLOTS", 100))
+    WORKER_WORKFLOW_POLLERS = int(os.getenv("WORKER_WORKFLOW_POLLERS", 5))
+    WORKER_LLM_SLOTS = int(os.getenv("WORKER_LLM_SLOTS", 64))
+    WORKER_LLM_POLLERS = int(os.getenv("WORKER_LLM_POLLERS", 4))
+    WORKER_DB_SLOTS = int(os.getenv("WORKER_DB_SLOTS", 32))
+    WORKER_DB_POLLERS = int(os.getenv("WORKER_DB_POLLERS", 4))
+    WORKER_TRANSFER_SLOTS = int(os.getenv("WORKER_TRANSFER_SLOTS", 8))
+    WORKER_TRANSFER_POLLERS = int(os.getenv("WORKER_TRANSFER_POLLERS", 2))
+    
     # AWS
     AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
@@ -49,12 +66,41 @@ class Config:
     JOURNAL_COLLECTION = "transaction_journal"
     BALANCE_UPDATES_COLLECTION = "balance_updates"
     HOLDS_COLLECTION = "balance_holds"
+    VELOCITY_BUCKETS_COLLECTION = "velocity_buckets"
+    APPLIED_TRANSFERS_COLLECTION = "applied_transfers"
     
     # AI Settings
     CONFIDENCE_THRESHOLD_APPROVE = float(os.getenv("CONFIDENCE_THRESHOLD_APPROVE", 85))
     CONFIDENCE_THRESHOLD_ESCALATE = float(os.getenv("CONFIDENCE_THRESHOLD_ESCALATE", 70))
     AUTO_APPROVAL_LIMIT = float(os.getenv("AUTO_APPROVAL_LIMIT", 50000))
     
+    # Rule Engine
+    # Seconds a compiled ruleset is trusted before its version stamp is re-checked
+    RULES_CACHE_TTL_SECONDS = float(os.getenv("RULES_CACHE_TTL_SECONDS", 30))
+    
+    # Velocity Counters
+    # Width of a velocity bucket; windows are summed from whole buckets
+    VELOCITY_BUCKET_SECONDS = int(os.getenv("VELOCITY_BUCKET_SECONDS", 300))
+    # Senders whose settled buckets are kept in memory per worker
+    VELOCITY_CACHE_SIZE = int(os.getenv("VELOCITY_CACHE_SIZE", 10000))
+    
+    # Transfer Netting
+    # Transfers touching these accounts are queued and committed in micro-batches
+    TRANSFER_NETTING_ENABLED = os.getenv("TRANSFER_NETTING_ENABLED", "false").lower() == "true"
+    TRANSFER_NETTING_ACCOUNTS: List[str] = [a.strip() for a in os.getenv("TRANSFER_NETTING_ACCOUNTS", "").split(",") if a.strip()]
+    TRANSFER_NETTING_MAX_BATCH = int(os.getenv("TRANSFER_NETTING_MAX_BATCH", 50))
+    TRANSFER_NETTING_MAX_WAIT_MS = float(os.getenv("TRANSFER_NETTING_MAX_WAIT_MS", 20))
+    
+    # Batch Ingestion
+    BATCH_MAX_TRANSACTIONS = int(os.getenv("BATCH_MAX_TRANSACTIONS", 10000))
+    # Transactions per child shard workflow, and shards running at once
+    BATCH_SHARD_SIZE = int(os.getenv("BATCH_SHARD_SIZE", 100))
+    BATCH_MAX_CONCURRENT_SHARDS = int(os.getenv("BATCH_MAX_CONCURRENT_SHARDS", 10))
+    # Transaction workflows each shard runs at once
+    BATCH_SHARD_CONCURRENCY = int(os.getenv("BATCH_SHARD_CONCURRENCY", 20))
+    # Texts per embedding API call (Cohere on Bedrock accepts at most 96)
+    BATCH_EMBEDDING_SIZE = int(os.getenv("BATCH_EMBEDDING_SIZE", 96))
+    
     # High Risk Countries
     HIGH_RISK_COUNTRIES: List[str] = ["RU","IR", "KP", "SY", "AF", "YE"]
     
@@ -6,6 +6,7 @@ Environment variables are loaded from .env file and can be overridden.
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -23,6 +24,68 @@ class Settings(BaseSettings):
         description="Database name for admin dashboard"
     )
 
+    # MongoDB Connection Pool Configuration
+    mongo_pool_profile: str = Field(
+        default="default",
+        alias="MONGO_POOL_PROFILE",
+        description="Connection pool profile: small, default or large"
+    )
+    mongo_max_pool_size: Optional[int] = Field(
+        default=None,
+        alias="MONGO_MAX_POOL_SIZE",
+        description="Override the profile's maxPoolSize"
+    )
+    mongo_min_pool_size: Optional[int] = Field(
+        default=None,
+        alias="MONGO_MIN_POOL_SIZE",
+        description="Override the profile's minPoolSize"
+    )
+    mongo_max_idle_time_ms: Optional[int] = Field(
+        default=None,
+        alias="MONGO_MAX_IDLE_TIME_MS",
+        description="Override the profile's maxIdleTimeMS"
+    )
+    mongo_wait_queue_timeout_ms: Optional[int] = Field(
+        default=None,
+        alias="MONGO_WAIT_QUEUE_TIMEOUT_MS",
+        description="Override the profile's waitQueueTimeoutMS"
+    )
+    mongo_max_connecting: Optional[int] = Field(
+        default=None,
+        alias="MONGO_MAX_CONNECTING",
+        description="Override the profile's maxConnecting"
+    )
+    mongo_compressors: str = Field(
+        default="zstd,snappy,zlib",
+        alias="MONGO_COMPRESSORS",
+        description="Wire compressors in preference order (empty to disable)"
+    )
+    mongo_analytics_read_preference: str = Field(
+        default="secondaryPreferred",
+        alias="MONGO_ANALYTICS_READ_PREFERENCE",
+        description="Read preference for analytics repositories (dashboards, aggregations)"
+    )
+    mongo_monitoring_enabled: bool = Field(
+        default=True,
+        alias="MONGO_MONITORING_ENABLED",
+        description="Register CMAP and command-monitoring listeners"
+    )
+    index_advisor_sample_rate: float = Field(
+        default=0.25,
+        alias="INDEX_ADVISOR_SAMPLE_RATE",
+        description="Fraction of read commands sampled for query shape analysis (0 disables)"
+    )
+    index_advisor_min_queries: int = Field(
+        default=20,
+        alias="INDEX_ADVISOR_MIN_QUERIES",
+        description="Sampled executions before a query shape is considered for an index"
+    )
+    index_advisor_unused_min_hours: float = Field(
+        default=24.0,
+        alias="INDEX_ADVISOR_UNUSED_MIN_HOURS",
+        description="Hours of $indexStats history required before an unused index is suggested for removal"
+    )
+
     # JWT Configuration
     jwt_secret: str = Field(
         default="change-this-secret-in-production-min-32-chars",
@@ -79,6 +142,129 @@ class Settings(BaseSettings):
         description="Debug mode"
     )
 
+    # Metrics Configuration
+    metrics_enabled: bool = Field(
+        default=True,
+        alias="METRICS_ENABLED",
+        description="Expose Prometheus metrics at /metrics"
+    )
+    event_loop_lag_interval: float = Field(
+        default=0.5,
+        alias="EVENT_LOOP_LAG_INTERVAL",
+        description="Seconds between event loop lag samples"
+    )
+    loop_watchdog_enabled: bool = Field(
+        default=True,
+        alias="LOOP_WATCHDOG_ENABLED",
+        description="Capture stack traces when a callback blocks the event loop"
+    )
+    loop_watchdog_threshold_ms: float = Field(
+        default=100.0,
+        alias="LOOP_WATCHDOG_THRESHOLD_MS",
+        description="Blocking time in milliseconds that counts as an event loop stall"
+    )
+    loop_watchdog_interval_ms: float = Field(
+        default=50.0,
+        alias="LOOP_WATCHDOG_INTERVAL_MS",
+        description="Milliseconds between watchdog heartbeats on the event loop"
+    )
+
+    # Outbound HTTP Client Configuration
+    http_client_http2: bool = Field(
+        default=True,
+        alias="HTTP_CLIENT_HTTP2",
+        description="Negotiate HTTP/2 for outbound requests (requires the h2 package)"
+    )
+    http_client_max_connections: int = Field(
+        default=100,
+        alias="HTTP_CLIENT_MAX_CONNECTIONS",
+        description="Maximum open outbound connections across all hosts"
+    )
+    http_client_max_keepalive: int = Field(
+        default=20,
+        alias="HTTP_CLIENT_MAX_KEEPALIVE",
+        description="Maximum idle keep-alive connections kept in the pool"
+    )
+    http_client_keepalive_expiry: float = Field(
+        default=30.0,
+        alias="HTTP_CLIENT_KEEPALIVE_EXPIRY",
+        description="Seconds an idle keep-alive connection is kept open"
+    )
+    http_client_max_per_host: int = Field(
+        default=10,
+        alias="HTTP_CLIENT_MAX_PER_HOST",
+        description="Maximum concurrent outbound requests to a single host"
+    )
+    http_client_timeout: float = Field(
+        default=10.0,
+        alias="HTTP_CLIENT_TIMEOUT",
+        description="Outbound request timeout in seconds"
+    )
+    config_test_concurrency: int = Field(
+        default=8,
+        alias="CONFIG_TEST_CONCURRENCY",
+        description="Maximum API key connection tests run in parallel"
+    )
+
+    # Rate Limiting Configuration
+    rate_limit_enabled: bool = Field(
+        default=True,
+        alias="RATE_LIMIT_ENABLED",
+        description="Enable rate limiting on public and auth endpoints"
+    )
+    rate_limit_backend: str = Field(
+        default="memory",
+        alias="RATE_LIMIT_BACKEND",
+        description="Rate limiter store: memory (per process) or mongodb (shared across replicas)"
+    )
+    rate_limit_shards: int = Field(
+        default=16,
+        alias="RATE_LIMIT_SHARDS",
+        description="Number of shards in the in-process bucket store"
+    )
+    rate_limit_max_keys: int = Field(
+        default=100000,
+        alias="RATE_LIMIT_MAX_KEYS",
+        description="Maximum tracked buckets before least recently used keys are evicted"
+    )
+    rate_limit_login_ip: str = Field(
+        default="20/60",
+        alias="RATE_LIMIT_LOGIN_IP",
+        description="Login attempts per client IP as 'requests/seconds'"
+    )
+    rate_limit_login_username: str = Field(
+        default="10/300",
+        alias="RATE_LIMIT_LOGIN_USERNAME",
+        description="Login attempts per username as 'requests/seconds'"
+    )
+    rate_limit_usage_enquiry_ip: str = Field(
+        default="10/60",
+        alias="RATE_LIMIT_USAGE_ENQUIRY_IP",
+        description="Usage enquiries per client IP as 'requests/seconds'"
+    )
+
+    # Usage Enquiry Intake Configuration
+    usage_enquiry_batch_size: int = Field(
+        default=100,
+        alias="USAGE_ENQUIRY_BATCH_SIZE",
+        description="Buffered usage enquiries written per insert batch"
+    )
+    usage_enquiry_flush_interval: float = Field(
+        default=1.0,
+        alias="USAGE_ENQUIRY_FLUSH_INTERVAL",
+        description="Maximum seconds a usage enquiry waits in the buffer before being written"
+    )
+    usage_enquiry_max_buffer: int = Field(
+        default=5000,
+        alias="USAGE_ENQUIRY_MAX_BUFFER",
+        description="Buffered enquiries above which submissions wait for a flush"
+    )
+    usage_enquiry_dedupe_window: int = Field(
+        default=3600,
+        alias="USAGE_ENQUIRY_DEDUPE_WINDOW",
+        description="Seconds within which repeat enquiries for the same solution are dropped"
+    )
+
     # SMTP Email Configuration
     smtp_host: str = Field(
         default="smtp.mailersend.net",
@@ -110,6 +296,75 @@ class Settings(BaseSettings):
         alias="SMTP_FROM_NAME",
         description="From name for sent emails"
     )
+    smtp_starttls: bool = Field(
+        default=True,
+        alias="SMTP_STARTTLS",
+        description="Upgrade the SMTP connection with STARTTLS"
+    )
+    smtp_auth_required: bool = Field(
+        default=True,
+        alias="SMTP_AUTH_REQUIRED",
+        description="Require SMTP credentials before sending (disable for local debugging servers)"
+    )
+    smtp_timeout: int = Field(
+        default=30,
+        alias="SMTP_TIMEOUT",
+        description="SMTP socket timeout in seconds"
+    )
+
+    # Email Outbox Configuration
+    email_outbox_batch_size: int = Field(
+        default=50,
+        alias="EMAIL_OUTBOX_BATCH_SIZE",
+        description="Maximum number of queued emails claimed per worker cycle"
+    )
+    email_outbox_poll_interval: float = Field(
+        default=5.0,
+        alias="EMAIL_OUTBOX_POLL_INTERVAL",
+        description="Seconds between outbox polls when no wake-up signal is received"
+    )
+    email_outbox_max_attempts: int = Field(
+        default=5,
+        alias="EMAIL_OUTBOX_MAX_ATTEMPTS",
+        description="Delivery attempts before a queued email is marked failed"
+    )
+    email_outbox_backoff_base: float = Field(
+        default=30.0,
+        alias="EMAIL_OUTBOX_BACKOFF_BASE",
+        description="Base retry delay in seconds (doubled on each attempt)"
+    )
+    email_outbox_backoff_max: float = Field(
+        default=3600.0,
+        alias="EMAIL_OUTBOX_BACKOFF_MAX",
+        description="Maximum retry delay in seconds"
+    )
+    email_outbox_lease_seconds: int = Field(
+        default=300,
+        alias="EMAIL_OUTBOX_LEASE_SECONDS",
+        description="Seconds a claimed email stays locked before another worker may retry it"
+    )
+    email_outbox_idle_timeout: float = Field(
+        default=60.0,
+        alias="EMAIL_OUTBOX_IDLE_TIMEOUT",
+        description="Seconds an idle pooled SMTP connection is kept open"
+    )
+    email_outbox_retention_days: int = Field(
+        default=7,
+        alias="EMAIL_OUTBOX_RETENTION_DAYS",
+        description="Days to retain delivered or failed outbox entries"
+    )
+
+    # Housekeeping Configuration
+    db_stats_cache_ttl: int = Field(
+        default=30,
+        alias="DB_STATS_CACHE_TTL",
+        description="Seconds database statistics are cached for the housekeeping page"
+    )
+    db_stats_concurrency: int = Field(
+        default=8,
+        alias="DB_STATS_CONCURRENCY",
+        description="Maximum collections queried in parallel for database statistics"
+    )
 
     # Password Reset Configuration
     password_reset_expiry: int = Field(
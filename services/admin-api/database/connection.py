@@ -4,19 +4,80 @@ Follows patterns from reference/maap-temporal-ai-agent-qs/database/connection.py
 """
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
+from typing import Any, Dict, Optional
 import logging
 
 from config import settings
+from database.monitoring import MongoMonitor
 
 logger = logging.getLogger(__name__)
 
+# Connection pool profiles (PyMongo client options).
+# Individual MONGO_* settings override the selected profile.
+POOL_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Single small instance / local development
+    "small": {
+        "maxPoolSize": 20,
+        "minPoolSize": 0,
+        "maxIdleTimeMS": 60000,
+        "waitQueueTimeoutMS": 5000,
+        "maxConnecting": 2,
+    },
+    # Typical API replica
+    "default": {
+        "maxPoolSize": 100,
+        "minPoolSize": 5,
+        "maxIdleTimeMS": 300000,
+        "waitQueueTimeoutMS": 10000,
+        "maxConnecting": 4,
+    },
+    # High-concurrency replicas (SSE viewers, exports, load tests)
+    "large": {
+        "maxPoolSize": 300,
+        "minPoolSize": 20,
+        "maxIdleTimeMS": 600000,
+        "waitQueueTimeoutMS": 15000,
+        "maxConnecting": 8,
+    },
+}
+
+
+def build_client_options() -> Dict[str, Any]:
+    """Build AsyncIOMotorClient keyword options from the configured pool profile."""
+    profile = POOL_PROFILES.get(settings.mongo_pool_profile)
+    if profile is None:
+        logger.warning(
+            f"Unknown MONGO_POOL_PROFILE '{settings.mongo_pool_profile}' - using 'default'"
+        )
+        profile = POOL_PROFILES["default"]
+
+    options: Dict[str, Any] = dict(profile)
+    overrides = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "maxConnecting": settings.mongo_max_connecting,
+    }
+    options.update({k: v for k, v in overrides.items() if v is not None})
+
+    compressors = [c.strip() for c in settings.mongo_compressors.split(",") if c.strip()]
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+
+    options["serverSelectionTimeoutMS"] = 5000
+    options["connectTimeoutMS"] = 10000
+    return options
+
 
 class MongoDB:
     """MongoDB connection manager with async support."""
 
     client: Optional[AsyncIOMotorClient] = None
     database: Optional[AsyncIOMotorDatabase] = None
+    analytics_database: Optional[AsyncIOMotorDatabase] = None
+    client_options: Dict[str, Any] = {}
 
     @classmethod
     async def connect(cls) -> None:
@@ -30,13 +91,23 @@ class MongoDB:
 
         try:
             logger.info(f"Connecting to MongoDB database: {settings.admin_db_name}")
+            cls.client_options = build_client_options()
+            event_listeners = MongoMonitor.listeners() if settings.mongo_monitoring_enabled else []
+
             cls.client = AsyncIOMotorClient(
                 settings.mongodb_uri,
-                serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=10000,
+                event_listeners=event_listeners,
+                **cls.client_options,
             )
             cls.database = cls.client[settings.admin_db_name]
 
+            # Analytics reads tolerate replication lag, so route them away from the primary
+            analytics_mode = read_pref_mode_from_name(settings.mongo_analytics_read_preference)
+            cls.analytics_database = cls.client.get_database(
+                settings.admin_db_name,
+                read_preference=make_read_preference(analytics_mode, None),
+            )
+
             # Verify connection
             await cls.client.admin.command("ping")
             logger.info("Successfully connected to MongoDB")
@@ -45,6 +116,7 @@ class MongoDB:
             logger.error(f"Failed to connect to MongoDB: {e}")
             cls.client = None
             cls.database = None
+            cls.analytics_database = None
             raise
 
     @classmethod
@@ -58,6 +130,7 @@ class MongoDB:
             cls.client.close()
             cls.client = None
             cls.database = None
+            cls.analytics_database = None
             logger.info("MongoDB connection closed")
 
     @classmethod
@@ -70,6 +143,36 @@ class MongoDB:
             raise RuntimeError("MongoDB not connected. Call connect() first.")
         return cls.database
 
+    @classmethod
+    def get_analytics_database(cls) -> AsyncIOMotorDatabase:
+        """
+        Get the database handle used for analytics reads.
+
+        Uses MONGO_ANALYTICS_READ_PREFERENCE (secondaryPreferred by default).
+        Raises RuntimeError if not connected.
+        """
+        if cls.analytics_database is None:
+            return cls.get_database()
+        return cls.analytics_database
+
+    @classmethod
+    def get_analytics_collection(cls, collection_name: str):
+        """Get a collection bound to the analytics read preference."""
+        return cls.get_analytics_database()[collection_name]
+
+    @classmethod
+    def supports_transactions(cls) -> bool:
+        """
+        Check whether the deployment supports multi-document transactions.
+
+        Transactions require a replica set or sharded cluster; standalone
+        servers (typical for local development) reject them.
+        """
+        if cls.client is None:
+            return False
+        topology_type = cls.client.topology_description.topology_type_name
+        return topology_type in ("ReplicaSetWithPrimary", "Sharded", "LoadBalanced")
+
     @classmethod
     def get_collection(cls, collection_name: str):
         """
@@ -97,6 +200,10 @@ class Collections:
     API_KEYS = "api_keys"
     HOUSEKEEPING_TASKS = "housekeeping_tasks"
     USAGE_ENQUIRIES = "usage_enquiries"
+    USAGE_ENQUIRY_COUNTERS = "usage_enquiry_counters"
+    EMAIL_OUTBOX = "email_outbox"
+    APP_METADATA = "app_metadata"
+    RATE_LIMITS = "rate_limits"
 
 
 # Convenience functions
@@ -105,6 +212,11 @@ def get_database() -> AsyncIOMotorDatabase:
     return MongoDB.get_database()
 
 
+def get_analytics_collection(collection_name: str):
+    """Get a collection bound to the analytics read preference."""
+    return MongoDB.get_analytics_collection(collection_name)
+
+
 def get_admins_collection():
     """Get the admins collection."""
     return MongoDB.get_collection(Collections.ADMINS)
@@ -168,3 +280,18 @@ def get_housekeeping_tasks_collection():
 def get_usage_enquiries_collection():
     """Get the usage_enquiries collection."""
     return MongoDB.get_collection(Collections.USAGE_ENQUIRIES)
+
+
+def get_usage_enquiry_counters_collection():
+    """Get the usage_enquiry_counters collection (per-solution running counts)."""
+    return MongoDB.get_collection(Collections.USAGE_ENQUIRY_COUNTERS)
+
+
+def get_email_outbox_collection():
+    """Get the email_outbox collection."""
+    return MongoDB.get_collection(Collections.EMAIL_OUTBOX)
+
+
+def get_rate_limits_collection():
+    """Get the rate_limits collection (shared rate limiter buckets)."""
+    return MongoDB.get_collection(Collections.RATE_LIMITS)
@@ -0,0 +1,353 @@
+"""
+Index advisor combining sampled query shapes with $indexStats and explain.
+
+Query shapes come from the QueryShapeSampler command listener. For each
+hot shape the advisor derives an equality-sort-range (ESR) compound index
+and checks whether an existing index already serves it, falling back to
+``explain`` when no index obviously matches. Drop candidates are indexes
+that are a strict prefix of another index, or that have recorded no
+accesses for ``index_advisor_unused_min_hours``.
+
+Recommendations are advisory: manifest-managed indexes (database/indexes.py)
+that are dropped come back the next time the manifest changes, so
+permanent removals belong in the manifest itself.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pymongo.errors import OperationFailure
+
+from config import settings
+from database.connection import MongoDB
+from database.indexes import get_index_manifest
+from database.monitoring import MongoMonitor
+
+logger = logging.getLogger(__name__)
+
+# Plan stages that signal a query is not served by an index
+_COLLSCAN_STAGES = frozenset({"COLLSCAN"})
+_BLOCKING_SORT_STAGES = frozenset({"SORT"})
+
+
+def _index_name(keys: Sequence[Tuple[str, int]]) -> str:
+    """Default MongoDB index name for a key pattern."""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Flatten the stage names of an explain winning plan."""
+    stages: List[str] = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key in ("inputStage", "queryPlan"):
+            stages.extend(_plan_stages(plan.get(key)))
+        for child in plan.get("inputStages", []):
+            stages.extend(_plan_stages(child))
+    return stages
+
+
+def _esr_keys(shape: dict) -> List[Tuple[str, int]]:
+    """Build an equality-sort-range key pattern for a query shape."""
+    keys: List[Tuple[str, int]] = [(field, 1) for field in shape["equality"]]
+    seen = {field for field, _ in keys}
+    for field, direction in shape["sort"]:
+        if field not in seen:
+            keys.append((field, direction))
+            seen.add(field)
+    for field in shape["range"]:
+        if field not in seen:
+            keys.append((field, 1))
+            seen.add(field)
+    return keys
+
+
+def _serves(index_keys: List[Tuple[str, int]], shape: dict) -> bool:
+    """
+    Check whether an index's key pattern serves a shape's equality and sort.
+
+    Equality fields must form the index prefix (in any order), followed by
+    the sort fields in order with matching (or uniformly reversed) directions.
+    """
+    equality = set(shape["equality"])
+    prefix = [field for field, _ in index_keys[: len(equality)]]
+    if set(prefix) != equality:
+        return False
+
+    sort = [(field, direction) for field, direction in shape["sort"] if field not in equality]
+    if not sort:
+        return bool(equality) or any(field == index_keys[0][0] for field in shape["range"])
+
+    following = index_keys[len(equality): len(equality) + len(sort)]
+    if [field for field, _ in following] != [field for field, _ in sort]:
+        return False
+    same = all(d1 == d2 for (_, d1), (_, d2) in zip(following, sort))
+    reversed_ = all(d1 == -d2 for (_, d1), (_, d2) in zip(following, sort))
+    return same or reversed_
+
+
+class IndexAdvisor:
+    """Builds and applies index recommendations for the admin database."""
+
+    @classmethod
+    async def analyze(cls) -> Dict[str, Any]:
+        """Analyze sampled query shapes and index usage across all collections."""
+        db = MongoDB.get_database()
+        sampled = MongoMonitor.shapes.snapshot(db.name)
+        manifest = get_index_manifest()
+
+        collection_names = set(manifest) | {shape["collection"] for shape in sampled["shapes"]}
+        existing = await db.list_collection_names(filter={"type": "collection"})
+        collection_names &= set(existing)
+
+        index_info = dict(zip(
+            sorted(collection_names),
+            await asyncio.gather(*(cls._collection_indexes(db, name) for name in sorted(collection_names))),
+        ))
+
+        elapsed_min = max((time.time() - sampled["collecting_since"]) / 60, 1 / 60)
+        recommendations: List[dict] = []
+
+        for shape in sampled["shapes"]:
+            if shape["count"] < settings.index_advisor_min_queries:
+                continue
+            indexes = index_info.get(shape["collection"])
+            if indexes is None:
+                continue
+            recommendation = await cls._recommend_add(db, shape, indexes)
+            if recommendation is not None and not any(
+                r["id"] == recommendation["id"] for r in recommendations
+            ):
+                recommendations.append(recommendation)
+
+        for collection_name, indexes in index_info.items():
+            managed = {model.document["name"] for model in manifest.get(collection_name, [])}
+            writes_per_min = sampled["writes"].get(collection_name, 0) / elapsed_min
+            recommendations.extend(
+                cls._recommend_drops(collection_name, indexes, managed, writes_per_min)
+            )
+
+        for shape in sampled["shapes"]:
+            shape.pop("sample", None)
+
+        return {
+            "database_name": db.name,
+            "sample_rate": settings.index_advisor_sample_rate,
+            "collecting_since": datetime.utcfromtimestamp(sampled["collecting_since"]),
+            "shapes": sampled["shapes"],
+            "writes_per_min": {
+                name: round(count / elapsed_min, 2) for name, count in sampled["writes"].items()
+            },
+            "recommendations": recommendations,
+            "generated_at": datetime.utcnow(),
+        }
+
+    @classmethod
+    async def apply(cls, recommendation_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Apply selected recommendations from a fresh analysis.
+
+        Returns one result per requested ID; unknown IDs are reported, not raised.
+        """
+        report = await cls.analyze()
+        by_id = {r["id"]: r for r in report["recommendations"]}
+        db = MongoDB.get_database()
+        results = []
+
+        for recommendation_id in recommendation_ids:
+            recommendation = by_id.get(recommendation_id)
+            if recommendation is None:
+                results.append({
+                    "id": recommendation_id,
+                    "success": False,
+                    "message": "Recommendation no longer applies",
+                })
+                continue
+
+            collection = db[recommendation["collection"]]
+            try:
+                if recommendation["action"] == "add":
+                    await collection.create_index(
+                        [tuple(key) for key in recommendation["keys"]],
+                        name=recommendation["index_name"],
+                    )
+                    message = f"Created index {recommendation['index_name']}"
+                else:
+                    await collection.drop_index(recommendation["index_name"])
+                    message = f"Dropped index {recommendation['index_name']}"
+                    if recommendation["managed"]:
+                        message += " (managed in database/indexes.py - remove it there to make this permanent)"
+                logger.info(f"Index advisor: {message} on {recommendation['collection']}")
+                results.append({"id": recommendation_id, "success": True, "message": message})
+            except OperationFailure as e:
+                logger.error(f"Index advisor failed to apply {recommendation_id}: {e}")
+                results.append({"id": recommendation_id, "success": False, "message": str(e)})
+
+        return results
+
+    @staticmethod
+    async def _collection_indexes(db, collection_name: str) -> List[dict]:
+        """Get index definitions joined with $indexStats accesses and sizes."""
+        collection = db[collection_name]
+        definitions, usage, coll_stats = await asyncio.gather(
+            collection.list_indexes().to_list(length=None),
+            collection.aggregate([{"$indexStats": {}}]).to_list(length=None),
+            collection.aggregate([{"$collStats": {"storageStats": {}}}]).to_list(length=None),
+        )
+
+        accesses: Dict[str, int] = {}
+        since: Dict[str, datetime] = {}
+        for doc in usage:
+            name = doc["name"]
+            accesses[name] = accesses.get(name, 0) + int(doc.get("accesses", {}).get("ops", 0))
+            started = doc.get("accesses", {}).get("since")
+            if started is not None and (name not in since or started > since[name]):
+                since[name] = started
+
+        sizes: Dict[str, int] = {}
+        for doc in coll_stats:
+            for name, size in doc.get("storageStats", {}).get("indexSizes", {}).items():
+                sizes[name] = sizes.get(name, 0) + size
+
+        return [
+            {
+                "name": definition["name"],
+                "keys": [(field, int(direction)) if isinstance(direction, (int, float)) else (field, direction)
+                         for field, direction in definition["key"].items()],
+                "unique": bool(definition.get("unique")),
+                "ttl": "expireAfterSeconds" in definition,
+                "special": bool(definition.get("sparse") or definition.get("partialFilterExpression")),
+                "accesses": accesses.get(definition["name"], 0),
+                "accesses_since": since.get(definition["name"]),
+                "size_bytes": sizes.get(definition["name"], 0),
+            }
+            for definition in definitions
+        ]
+
+    @classmethod
+    async def _recommend_add(cls, db, shape: dict, indexes: List[dict]) -> Optional[dict]:
+        """Recommend an ESR index for a hot shape that no index serves."""
+        keys = _esr_keys(shape)
+        if not keys:
+            # Regex-only or $or-only shapes: nothing an ordinary index can bound
+            return None
+
+        plain_indexes = [index for index in indexes if not index["special"]]
+        if any(_serves(index["keys"], shape) for index in plain_indexes):
+            return None
+
+        stages = await cls._explain_stages(db, shape)
+        if stages and not (set(stages) & (_COLLSCAN_STAGES | _BLOCKING_SORT_STAGES)):
+            # The planner found an index that works well enough
+            return None
+
+        reasons = []
+        if set(stages) & _COLLSCAN_STAGES:
+            reasons.append("collection scan")
+        if set(stages) & _BLOCKING_SORT_STAGES:
+            reasons.append("in-memory sort")
+        if not stages:
+            reasons.append("no index matches the equality/sort prefix")
+        note = ""
+        if shape["regex"]:
+            note = (
+                f" Regex filters on {', '.join(shape['regex'])} cannot use index bounds; "
+                "they are applied while scanning this index."
+            )
+
+        index_name = _index_name(keys)
+        return {
+            "id": f"add:{shape['collection']}:{index_name}",
+            "action": "add",
+            "collection": shape["collection"],
+            "index_name": index_name,
+            "keys": [list(key) for key in keys],
+            "managed": False,
+            "reason": f"{shape['count']} sampled queries ({shape['avg_ms']}ms avg) use "
+                      f"{' and '.join(reasons)}.{note}",
+            "plan_stages": stages,
+            "query_count": shape["count"],
+            "avg_query_ms": shape["avg_ms"],
+            "size_mb": None,
+            "index_writes_saved_per_min": None,
+            "estimated_write_savings_pct": None,
+        }
+
+    @staticmethod
+    async def _explain_stages(db, shape: dict) -> List[str]:
+        """Explain the shape's sample query and return the winning plan stages."""
+        sample = shape.get("sample") or {}
+        command = {"find": shape["collection"], "filter": sample.get("filter") or {}}
+        if sample.get("sort"):
+            command["sort"] = sample["sort"]
+        try:
+            explain = await db.command("explain", command, verbosity="queryPlanner")
+        except OperationFailure as e:
+            logger.debug(f"Explain failed for {shape['collection']}: {e}")
+            return []
+
+        planner = explain.get("queryPlanner", {})
+        winning = planner.get("winningPlan", {})
+        # Sharded clusters nest per-shard plans
+        if "shards" in winning:
+            return [stage for shard in winning["shards"] for stage in _plan_stages(shard.get("winningPlan"))]
+        return _plan_stages(winning)
+
+    @staticmethod
+    def _recommend_drops(
+        collection_name: str,
+        indexes: List[dict],
+        managed: set,
+        writes_per_min: float,
+    ) -> List[dict]:
+        """
+        Recommend dropping redundant-prefix and long-unused indexes.
+
+        Each secondary index adds one index-key write per document insert,
+        delete or indexed-field update, so dropping one of N indexes saves
+        roughly 1/(N+1) of the per-write work (the +1 being the document itself).
+        """
+        now = datetime.utcnow()
+        recommendations = []
+
+        for index in indexes:
+            if index["name"] == "_id_" or index["unique"] or index["ttl"] or index["special"]:
+                continue
+
+            reason = None
+            for other in indexes:
+                if other is index or other["special"]:
+                    continue
+                if len(other["keys"]) > len(index["keys"]) and other["keys"][: len(index["keys"])] == index["keys"]:
+                    reason = f"Redundant: prefix of {other['name']}, which serves the same queries."
+                    break
+
+            if reason is None and index["accesses"] == 0 and index["accesses_since"] is not None:
+                observed_hours = (now - index["accesses_since"]).total_seconds() / 3600
+                if observed_hours >= settings.index_advisor_unused_min_hours:
+                    reason = f"Unused: no accesses in {observed_hours:.0f}h of $indexStats history."
+
+            if reason is None:
+                continue
+
+            recommendations.append({
+                "id": f"drop:{collection_name}:{index['name']}",
+                "action": "drop",
+                "collection": collection_name,
+                "index_name": index["name"],
+                "keys": [list(key) for key in index["keys"]],
+                "managed": index["name"] in managed,
+                "reason": reason,
+                "plan_stages": [],
+                "query_count": index["accesses"],
+                "avg_query_ms": None,
+                "size_mb": round(index["size_bytes"] / (1024 * 1024), 2),
+                "index_writes_saved_per_min": round(writes_per_min, 2),
+                "estimated_write_savings_pct": round(100 / (len(indexes) + 1), 1),
+            })
+
+        return recommendations
@@ -1,10 +1,20 @@
 """
 MongoDB index creation for admin dashboard collections.
-Indexes are created on application startup.
+
+Indexes are declared as a manifest (collection -> IndexModel list). On
+startup the manifest is fingerprinted and compared with the fingerprint
+stored in the ``app_metadata`` collection; index builds only run when the
+manifest changed, so rolling deploys skip dozens of ``createIndexes``
+round trips.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from datetime import timedelta
+from datetime import datetime
+from typing import Dict, List
+
 from pymongo import IndexModel, ASCENDING, DESCENDING
 
 from config import settings
@@ -12,40 +22,109 @@ from database.connection import MongoDB, Collections
 
 logger = logging.getLogger(__name__)
 
+# app_metadata document holding the last applied manifest fingerprint
+INDEX_MANIFEST_DOC_ID = "index_manifest"
+
+
+def get_index_manifest() -> Dict[str, List[IndexModel]]:
+    """Get the full index manifest keyed by collection name."""
+    return {
+        # Phase 1 collections
+        Collections.ADMINS: _admins_indexes(),
+        Collections.ADMIN_SESSIONS: _sessions_indexes(),
+        Collections.AUTH_AUDIT: _audit_indexes(),
+        Collections.SOLUTION_OVERRIDES: _solution_overrides_indexes(),
+        # Solutions collection
+        "solutions": _solutions_indexes(),
+        # Phase 2-5 collections
+        Collections.APP_CONFIG: _app_config_indexes(),
+        Collections.CONFIG_AUDIT: _config_audit_indexes(),
+        Collections.PASSWORD_RESET_TOKENS: _password_reset_tokens_indexes(),
+        Collections.LOGS: _logs_indexes(),
+        Collections.TELEMETRY: _telemetry_indexes(),
+        Collections.API_KEYS: _api_keys_indexes(),
+        Collections.HOUSEKEEPING_TASKS: _housekeeping_tasks_indexes(),
+        Collections.USAGE_ENQUIRIES: _usage_enquiries_indexes(),
+        Collections.EMAIL_OUTBOX: _email_outbox_indexes(),
+        Collections.RATE_LIMITS: _rate_limits_indexes(),
+    }
+
+
+def compute_manifest_fingerprint(manifest: Dict[str, List[IndexModel]]) -> str:
+    """
+    Compute a stable SHA256 fingerprint of an index manifest.
 
-async def create_indexes() -> None:
+    Covers key patterns, names and options (unique, TTL, sparse...), so any
+    change to an index definition produces a new fingerprint.
+    """
+    canonical = {
+        collection: [
+            {k: (list(v.items()) if k == "key" else v) for k, v in sorted(model.document.items())}
+            for model in models
+        ]
+        for collection, models in sorted(manifest.items())
+    }
+    payload = json.dumps(canonical, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def create_indexes(force: bool = False) -> bool:
     """
     Create all required indexes for admin dashboard collections.
     Should be called during application startup after MongoDB connection.
-    """
-    db = MongoDB.get_database()
 
-    # Phase 1 collections
-    await _create_admins_indexes(db)
-    await _create_sessions_indexes(db)
-    await _create_audit_indexes(db)
-    await _create_solution_overrides_indexes(db)
-
-    # Solutions collection
-    await _create_solutions_indexes(db)
-
-    # Phase 2-5 collections
-    await _create_app_config_indexes(db)
-    await _create_config_audit_indexes(db)
-    await _create_password_reset_tokens_indexes(db)
-    await _create_logs_indexes(db)
-    await _create_telemetry_indexes(db)
-    await _create_api_keys_indexes(db)
-    await _create_housekeeping_tasks_indexes(db)
-
-    logger.info("All indexes created successfully")
+    Args:
+        force: Build indexes even if the stored fingerprint matches
 
+    Returns:
+        True if index builds ran, False if skipped via fingerprint match
+    """
+    db = MongoDB.get_database()
+    metadata = db[Collections.APP_METADATA]
+
+    manifest = get_index_manifest()
+    fingerprint = compute_manifest_fingerprint(manifest)
+
+    if not force:
+        stored = await metadata.find_one({"_id": INDEX_MANIFEST_DOC_ID})
+        if stored and stored.get("fingerprint") == fingerprint:
+            logger.info(f"Index manifest unchanged ({fingerprint[:12]}) - skipping index creation")
+            return False
+
+    # Collections are independent, so build them concurrently
+    await asyncio.gather(
+        *(_create_collection_indexes(db, name, models) for name, models in manifest.items())
+    )
+
+    await metadata.update_one(
+        {"_id": INDEX_MANIFEST_DOC_ID},
+        {
+            "$set": {
+                "fingerprint": fingerprint,
+                "collections": sorted(manifest.keys()),
+                "applied_at": datetime.utcnow(),
+            }
+        },
+        upsert=True,
+    )
+
+    logger.info(f"All indexes created successfully (manifest {fingerprint[:12]})")
+    return True
+
+
+async def _create_collection_indexes(db, collection_name: str, indexes: List[IndexModel]) -> None:
+    """Create the manifest indexes for a single collection."""
+    try:
+        await db[collection_name].create_indexes(indexes)
+        logger.info(f"Created indexes for {collection_name}")
+    except Exception as e:
+        logger.error(f"Error creating indexes for {collection_name}: {e}")
+        raise
 
-async def _create_admins_indexes(db) -> None:
-    """Create indexes for the admins collection."""
-    collection = db[Collections.ADMINS]
 
-    indexes = [
+def _admins_indexes() -> List[IndexModel]:
+    """Indexes for the admins collection."""
+    return [
         IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
         IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
         IndexModel([("admin_id", ASCENDING)], unique=True, name="admin_id_unique"),
@@ -56,19 +135,10 @@ async def _create_admins_indexes(db) -> None:
         IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.ADMINS}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.ADMINS}: {e}")
-        raise
-
 
-async def _create_sessions_indexes(db) -> None:
-    """Create indexes for the admin_sessions collection with TTL."""
-    collection = db[Collections.ADMIN_SESSIONS]
-
-    indexes = [
+def _sessions_indexes() -> List[IndexModel]:
+    """Indexes for the admin_sessions collection with TTL."""
+    return [
         IndexModel([("session_id", ASCENDING)], unique=True, name="session_id_unique"),
         IndexModel(
             [("admin_id", ASCENDING), ("is_active", ASCENDING)],
@@ -84,22 +154,13 @@ async def _create_sessions_indexes(db) -> None:
         ),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.ADMIN_SESSIONS}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.ADMIN_SESSIONS}: {e}")
-        raise
-
-
-async def _create_audit_indexes(db) -> None:
-    """Create indexes for the auth_audit collection with TTL."""
-    collection = db[Collections.AUTH_AUDIT]
 
+def _audit_indexes() -> List[IndexModel]:
+    """Indexes for the auth_audit collection with TTL."""
     # Calculate TTL in seconds
     audit_ttl_seconds = settings.audit_log_retention_days * 24 * 60 * 60
 
-    indexes = [
+    return [
         IndexModel([("event_id", ASCENDING)], unique=True, name="event_id_unique"),
         IndexModel(
             [("admin_id", ASCENDING), ("timestamp", DESCENDING)],
@@ -122,36 +183,18 @@ async def _create_audit_indexes(db) -> None:
         ),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.AUTH_AUDIT}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.AUTH_AUDIT}: {e}")
-        raise
 
-
-async def _create_solution_overrides_indexes(db) -> None:
-    """Create indexes for the solution_overrides collection."""
-    collection = db["solution_overrides"]
-
-    indexes = [
+def _solution_overrides_indexes() -> List[IndexModel]:
+    """Indexes for the solution_overrides collection."""
+    return [
         IndexModel([("solution_id", ASCENDING)], unique=True, name="solution_id_unique"),
         IndexModel([("updated_at", DESCENDING)], name="updated_at_desc"),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info("Created indexes for solution_overrides")
-    except Exception as e:
-        logger.error(f"Error creating indexes for solution_overrides: {e}")
-        raise
-
 
-async def _create_solutions_indexes(db) -> None:
-    """Create indexes for the solutions collection."""
-    collection = db["solutions"]
-
-    indexes = [
+def _solutions_indexes() -> List[IndexModel]:
+    """Indexes for the solutions collection."""
+    return [
         IndexModel([("solution_id", ASCENDING)], unique=True, name="solution_id_unique"),
         IndexModel([("category", ASCENDING)], name="category_idx"),
         IndexModel([("partner.name", ASCENDING)], name="partner_name_idx"),
@@ -160,42 +203,24 @@ async def _create_solutions_indexes(db) -> None:
         IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info("Created indexes for solutions")
-    except Exception as e:
-        logger.error(f"Error creating indexes for solutions: {e}")
-        raise
-
 
 # ============================================
-# Phase 2-5 Index Creation Functions
+# Phase 2-5 Index Definitions
 # ============================================
 
-async def _create_app_config_indexes(db) -> None:
-    """Create indexes for the app_config collection."""
-    collection = db[Collections.APP_CONFIG]
-
-    indexes = [
+def _app_config_indexes() -> List[IndexModel]:
+    """Indexes for the app_config collection."""
+    return [
         IndexModel([("config_id", ASCENDING)], unique=True, name="config_id_unique"),
         IndexModel([("key", ASCENDING)], unique=True, name="key_unique"),
         IndexModel([("category", ASCENDING)], name="category_idx"),
         IndexModel([("updated_at", DESCENDING)], name="updated_at_desc"),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.APP_CONFIG}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.APP_CONFIG}: {e}")
-        raise
 
-
-async def _create_config_audit_indexes(db) -> None:
-    """Create indexes for the config_audit collection with TTL (365 days)."""
-    collection = db[Collections.CONFIG_AUDIT]
-
-    indexes = [
+def _config_audit_indexes() -> List[IndexModel]:
+    """Indexes for the config_audit collection with TTL (365 days)."""
+    return [
         IndexModel([("audit_id", ASCENDING)], unique=True, name="audit_id_unique"),
         IndexModel(
             [("config_id", ASCENDING), ("timestamp", DESCENDING)],
@@ -210,19 +235,10 @@ async def _create_config_audit_indexes(db) -> None:
         ),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.CONFIG_AUDIT}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.CONFIG_AUDIT}: {e}")
-        raise
 
-
-async def _create_password_reset_tokens_indexes(db) -> None:
-    """Create indexes for the password_reset_tokens collection with TTL (1 hour)."""
-    collection = db[Collections.PASSWORD_RESET_TOKENS]
-
-    indexes = [
+def _password_reset_tokens_indexes() -> List[IndexModel]:
+    """Indexes for the password_reset_tokens collection with TTL (1 hour)."""
+    return [
         IndexModel([("token_id", ASCENDING)], unique=True, name="token_id_unique"),
         IndexModel([("token_hash", ASCENDING)], name="token_hash_idx"),
         IndexModel([("admin_id", ASCENDING)], name="admin_id_idx"),
@@ -234,19 +250,10 @@ async def _create_password_reset_tokens_indexes(db) -> None:
         ),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.PASSWORD_RESET_TOKENS}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.PASSWORD_RESET_TOKENS}: {e}")
-        raise
-
 
-async def _create_logs_indexes(db) -> None:
-    """Create indexes for the logs collection with TTL (30 days default)."""
-    collection = db[Collections.LOGS]
-
-    indexes = [
+def _logs_indexes() -> List[IndexModel]:
+    """Indexes for the logs collection with TTL (30 days default)."""
+    return [
         IndexModel([("log_id", ASCENDING)], unique=True, name="log_id_unique"),
         IndexModel([("timestamp", DESCENDING)], name="timestamp_desc"),
         IndexModel(
@@ -274,19 +281,10 @@ async def _create_logs_indexes(db) -> None:
         ),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.LOGS}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.LOGS}: {e}")
-        raise
-
-
-async def _create_telemetry_indexes(db) -> None:
-    """Create indexes for the telemetry collection with TTL (90 days default)."""
-    collection = db[Collections.TELEMETRY]
 
-    indexes = [
+def _telemetry_indexes() -> List[IndexModel]:
+    """Indexes for the telemetry collection with TTL (90 days default)."""
+    return [
         IndexModel([("event_id", ASCENDING)], unique=True, name="event_id_unique"),
         IndexModel([("timestamp", DESCENDING)], name="timestamp_desc"),
         IndexModel(
@@ -307,19 +305,10 @@ async def _create_telemetry_indexes(db) -> None:
         ),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.TELEMETRY}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.TELEMETRY}: {e}")
-        raise
 
-
-async def _create_api_keys_indexes(db) -> None:
-    """Create indexes for the api_keys collection."""
-    collection = db[Collections.API_KEYS]
-
-    indexes = [
+def _api_keys_indexes() -> List[IndexModel]:
+    """Indexes for the api_keys collection."""
+    return [
         IndexModel([("key_id", ASCENDING)], unique=True, name="key_id_unique"),
         IndexModel([("key_hash", ASCENDING)], unique=True, name="key_hash_unique"),
         IndexModel([("key_prefix", ASCENDING)], name="key_prefix_idx"),
@@ -328,27 +317,59 @@ async def _create_api_keys_indexes(db) -> None:
         IndexModel([("expires_at", ASCENDING)], name="expires_at_idx"),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.API_KEYS}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.API_KEYS}: {e}")
-        raise
-
 
-async def _create_housekeeping_tasks_indexes(db) -> None:
-    """Create indexes for the housekeeping_tasks collection."""
-    collection = db[Collections.HOUSEKEEPING_TASKS]
-
-    indexes = [
+def _housekeeping_tasks_indexes() -> List[IndexModel]:
+    """Indexes for the housekeeping_tasks collection."""
+    return [
         IndexModel([("task_id", ASCENDING)], unique=True, name="task_id_unique"),
         IndexModel([("is_enabled", ASCENDING)], name="enabled_tasks"),
         IndexModel([("next_run", ASCENDING)], name="next_run_idx"),
     ]
 
-    try:
-        await collection.create_indexes(indexes)
-        logger.info(f"Created indexes for {Collections.HOUSEKEEPING_TASKS}")
-    except Exception as e:
-        logger.error(f"Error creating indexes for {Collections.HOUSEKEEPING_TASKS}: {e}")
-        raise
+
+def _usage_enquiries_indexes() -> List[IndexModel]:
+    """Indexes for the usage_enquiries collection."""
+    return [
+        IndexModel([("enquiry_id", ASCENDING)], unique=True, name="enquiry_id_unique"),
+        # Repeat submissions within the dedupe window share a key; sparse so
+        # enquiries recorded before deduplication existed are left alone
+        IndexModel([("dedupe_key", ASCENDING)], unique=True, sparse=True, name="dedupe_key_unique"),
+        # Keyset pagination for the admin list views. Enquiry IDs start with
+        # the creation timestamp, so ID order is newest-first order.
+        IndexModel(
+            [("solution_id", ASCENDING), ("enquiry_id", DESCENDING)],
+            name="solution_enquiry_id_desc"
+        ),
+    ]
+
+
+def _email_outbox_indexes() -> List[IndexModel]:
+    """Indexes for the email_outbox collection with TTL."""
+    return [
+        IndexModel([("email_id", ASCENDING)], unique=True, name="email_id_unique"),
+        # Worker claim query: due pending messages in FIFO order
+        IndexModel(
+            [("status", ASCENDING), ("next_attempt_at", ASCENDING)],
+            name="status_next_attempt"
+        ),
+        IndexModel([("claim_id", ASCENDING)], sparse=True, name="claim_id_sparse"),
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+        # TTL index - only set once a message is delivered or dead-lettered
+        IndexModel(
+            [("expires_at", ASCENDING)],
+            expireAfterSeconds=0,
+            name="email_outbox_ttl"
+        ),
+    ]
+
+
+def _rate_limits_indexes() -> List[IndexModel]:
+    """Indexes for the rate_limits collection with TTL (one window)."""
+    return [
+        # Buckets are addressed by _id; TTL removes them once their window has passed
+        IndexModel(
+            [("expires_at", ASCENDING)],
+            expireAfterSeconds=0,
+            name="rate_limits_ttl"
+        ),
+    ]
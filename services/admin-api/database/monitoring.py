@@ -0,0 +1,484 @@
+"""
+PyMongo CMAP and command-monitoring listeners.
+
+Listeners are registered on the Motor client and run on the driver's
+executor threads, so all state is kept in small lock-protected counters
+and fixed-bucket histograms. Snapshots feed the diagnostics endpoints
+and the index advisor.
+"""
+
+import bisect
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson.regex import Regex
+from pymongo import monitoring
+
+from config import settings
+
+from services.metrics import (
+    REGISTRY,
+    MONGO_COMMAND_DURATION,
+    MONGO_COMMAND_FAILURES,
+    MONGO_POOL_CHECKOUT_WAIT,
+    MONGO_CONNECTIONS_IN_USE,
+)
+
+# Upper bounds in milliseconds; the last bucket is +Inf
+LATENCY_BUCKETS_MS: Sequence[float] = (
+    0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum_ms", "max_ms")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Record a single observation."""
+        self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        """Get a JSON-serializable view of the histogram."""
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": [
+                {"le": bound, "count": count}
+                for bound, count in zip(list(self.bounds) + ["+Inf"], self.counts)
+            ],
+        }
+
+
+class _PoolState:
+    """Per-server pool counters."""
+
+    __slots__ = (
+        "checked_out", "max_checked_out", "connections_open", "connections_created",
+        "connections_closed", "checkout_failures", "pool_clears", "checkout_wait",
+    )
+
+    def __init__(self):
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.connections_open = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkout_failures = 0
+        self.pool_clears = 0
+        self.checkout_wait = LatencyHistogram()
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """CMAP listener tracking checkout wait times and in-use connections."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _PoolState] = defaultdict(_PoolState)
+
+    @staticmethod
+    def _key(address) -> str:
+        host, port = address
+        return f"{host}:{port}"
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)]
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)].pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            pool = self._pools[self._key(event.address)]
+            pool.connections_created += 1
+            pool.connections_open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pools[self._key(event.address)]
+            pool.connections_closed += 1
+            pool.connections_open = max(0, pool.connections_open - 1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            pool = self._pools[self._key(event.address)]
+            pool.checkout_failures += 1
+            pool.checkout_wait.observe(getattr(event, "duration", 0.0) * 1000)
+        MONGO_POOL_CHECKOUT_WAIT.observe(getattr(event, "duration", 0.0))
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            pool = self._pools[self._key(event.address)]
+            pool.checked_out += 1
+            if pool.checked_out > pool.max_checked_out:
+                pool.max_checked_out = pool.checked_out
+            # ``duration`` (seconds) covers the whole wait, including connection setup
+            pool.checkout_wait.observe(getattr(event, "duration", 0.0) * 1000)
+        MONGO_POOL_CHECKOUT_WAIT.observe(getattr(event, "duration", 0.0))
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pools[self._key(event.address)]
+            pool.checked_out = max(0, pool.checked_out - 1)
+
+    def reset(self) -> None:
+        """Reset cumulative counters and histograms, keeping live gauges."""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.max_checked_out = pool.checked_out
+                pool.connections_created = 0
+                pool.connections_closed = 0
+                pool.checkout_failures = 0
+                pool.pool_clears = 0
+                pool.checkout_wait = LatencyHistogram()
+
+    def in_use(self) -> int:
+        """Total connections currently checked out across all servers."""
+        with self._lock:
+            return sum(pool.checked_out for pool in self._pools.values())
+
+    def snapshot(self) -> List[dict]:
+        """Get per-server pool statistics."""
+        with self._lock:
+            return [
+                {
+                    "address": address,
+                    "in_use": pool.checked_out,
+                    "max_in_use": pool.max_checked_out,
+                    "open_connections": pool.connections_open,
+                    "connections_created": pool.connections_created,
+                    "connections_closed": pool.connections_closed,
+                    "checkout_failures": pool.checkout_failures,
+                    "pool_clears": pool.pool_clears,
+                    "checkout_wait": pool.checkout_wait.snapshot(),
+                }
+                for address, pool in sorted(self._pools.items())
+            ]
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Command listener recording per-command latency histograms."""
+
+    # Handshake and monitoring chatter that would drown out real traffic
+    IGNORED_COMMANDS = frozenset({
+        "hello", "ismaster", "isMaster", "saslStart", "saslContinue", "ping",
+        "buildinfo", "buildInfo", "endSessions",
+    })
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._failures: Dict[str, int] = defaultdict(int)
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        with self._lock:
+            self._latency[event.command_name].observe(event.duration_micros / 1000)
+        MONGO_COMMAND_DURATION.labels(event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        with self._lock:
+            self._latency[event.command_name].observe(event.duration_micros / 1000)
+            self._failures[event.command_name] += 1
+        MONGO_COMMAND_DURATION.labels(event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(event.command_name).inc()
+
+    def reset(self) -> None:
+        """Reset all command statistics."""
+        with self._lock:
+            self._latency.clear()
+            self._failures.clear()
+
+    def snapshot(self) -> List[dict]:
+        """Get per-command latency statistics."""
+        with self._lock:
+            return [
+                {
+                    "command": name,
+                    "failures": self._failures.get(name, 0),
+                    "latency": histogram.snapshot(),
+                }
+                for name, histogram in sorted(self._latency.items())
+            ]
+
+
+# (namespace, equality fields, sort spec, range fields, regex fields, other operators)
+QueryShapeKey = Tuple[str, Tuple[str, ...], Tuple[Tuple[str, int], ...], Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+_RANGE_OPERATORS = frozenset({"$gt", "$gte", "$lt", "$lte"})
+_EQUALITY_OPERATORS = frozenset({"$eq", "$in"})
+
+
+def _classify_filter(query: dict, shape: Dict[str, set], prefix: str = "") -> None:
+    """Sort a query's fields into equality / range / regex / other buckets."""
+    for field, condition in query.items():
+        if field == "$and":
+            for clause in condition:
+                _classify_filter(clause, shape, prefix)
+        elif field in ("$or", "$nor"):
+            fields = sorted({name for clause in condition for name in clause})
+            shape["other"].add(f"{field}({','.join(fields)})")
+        elif field.startswith("$"):
+            shape["other"].add(field)
+        elif isinstance(condition, (Regex, re.Pattern)):
+            shape["regex"].add(field)
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            operators = set(condition)
+            if "$regex" in operators:
+                shape["regex"].add(field)
+            elif operators & _RANGE_OPERATORS:
+                shape["range"].add(field)
+            elif operators <= _EQUALITY_OPERATORS:
+                shape["equality"].add(field)
+            else:
+                shape["other"].add(f"{field}:{','.join(sorted(operators))}")
+        else:
+            shape["equality"].add(field)
+
+
+def extract_query_shape(command_name: str, command: dict) -> Optional[Tuple[str, dict, dict]]:
+    """
+    Get (collection, filter, sort) for a read command, or None if it has no filter.
+
+    Aggregations contribute their leading ``$match`` and the ``$sort`` that follows it.
+    """
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        return None
+
+    if command_name == "find":
+        return collection, command.get("filter") or {}, command.get("sort") or {}
+    if command_name in ("count", "distinct"):
+        return collection, command.get("query") or {}, {}
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        query: dict = {}
+        sort: dict = {}
+        for stage in pipeline[:2]:
+            if "$match" in stage and not query:
+                query = stage["$match"]
+            elif "$sort" in stage:
+                sort = stage["$sort"]
+            else:
+                break
+        if not query and not sort:
+            return None
+        return collection, query, sort
+    return None
+
+
+class QueryShapeSampler(monitoring.CommandListener):
+    """
+    Command listener sampling read query shapes and write volume per collection.
+
+    Only field names and operator classes are aggregated; one sample filter
+    per shape is kept (in memory only) so the advisor can run ``explain``.
+    """
+
+    READ_COMMANDS = frozenset({"find", "aggregate", "count", "distinct"})
+    WRITE_COMMANDS = {"insert": "documents", "update": "updates", "delete": "deletes"}
+    MAX_SHAPES = 500
+    MAX_PENDING = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, QueryShapeKey] = {}
+        self._shapes: Dict[QueryShapeKey, dict] = {}
+        self._writes: Dict[str, int] = defaultdict(int)
+        self.started_at = time.time()
+
+    def started(self, event):
+        command_name = event.command_name
+        if command_name in self.WRITE_COMMANDS:
+            collection = event.command.get(command_name)
+            ops = len(event.command.get(self.WRITE_COMMANDS[command_name]) or ()) or 1
+            with self._lock:
+                self._writes[f"{event.database_name}.{collection}"] += ops
+            return
+
+        if command_name not in self.READ_COMMANDS:
+            return
+        if random.random() >= settings.index_advisor_sample_rate:
+            return
+
+        extracted = extract_query_shape(command_name, event.command)
+        if extracted is None:
+            return
+        collection, query, sort = extracted
+
+        buckets: Dict[str, set] = {"equality": set(), "range": set(), "regex": set(), "other": set()}
+        _classify_filter(query, buckets)
+        key: QueryShapeKey = (
+            f"{event.database_name}.{collection}",
+            tuple(sorted(buckets["equality"])),
+            tuple((field, int(direction)) for field, direction in dict(sort).items()
+                  if isinstance(direction, (int, float))),
+            tuple(sorted(buckets["range"] - buckets["equality"])),
+            tuple(sorted(buckets["regex"])),
+            tuple(sorted(buckets["other"])),
+        )
+
+        with self._lock:
+            if key not in self._shapes:
+                if len(self._shapes) >= self.MAX_SHAPES:
+                    return
+                self._shapes[key] = {
+                    "count": 0,
+                    "failures": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "sample": {"filter": query, "sort": sort},
+                }
+            if len(self._pending) < self.MAX_PENDING:
+                self._pending[event.request_id] = key
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool) -> None:
+        if event.command_name not in self.READ_COMMANDS:
+            return
+        with self._lock:
+            key = self._pending.pop(event.request_id, None)
+            if key is None:
+                return
+            stats = self._shapes[key]
+            duration_ms = event.duration_micros / 1000
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            if duration_ms > stats["max_ms"]:
+                stats["max_ms"] = duration_ms
+            if failed:
+                stats["failures"] += 1
+
+    def reset(self) -> None:
+        """Drop all sampled shapes and write counters."""
+        with self._lock:
+            self._pending.clear()
+            self._shapes.clear()
+            self._writes.clear()
+            self.started_at = time.time()
+
+    def snapshot(self, database_name: str) -> Dict[str, Any]:
+        """Get sampled shapes and write counts for one database."""
+        prefix = f"{database_name}."
+        with self._lock:
+            shapes = [
+                {
+                    "collection": key[0][len(prefix):],
+                    "equality": list(key[1]),
+                    "sort": [list(item) for item in key[2]],
+                    "range": list(key[3]),
+                    "regex": list(key[4]),
+                    "other": list(key[5]),
+                    "count": stats["count"],
+                    "failures": stats["failures"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 3) if stats["count"] else 0.0,
+                    "max_ms": round(stats["max_ms"], 3),
+                    "total_ms": round(stats["total_ms"], 3),
+                    "sample": stats["sample"],
+                }
+                for key, stats in self._shapes.items()
+                if key[0].startswith(prefix) and stats["count"]
+            ]
+            writes = {
+                namespace[len(prefix):]: count
+                for namespace, count in self._writes.items()
+                if namespace.startswith(prefix)
+            }
+        shapes.sort(key=lambda shape: shape["total_ms"], reverse=True)
+        return {"collecting_since": self.started_at, "shapes": shapes, "writes": writes}
+
+
+class MongoMonitor:
+    """Process-wide listener instances shared by the Motor client."""
+
+    pool = PoolMonitor()
+    commands = CommandMonitor()
+    shapes = QueryShapeSampler()
+    started_at: float = time.time()
+
+    @classmethod
+    def listeners(cls) -> list:
+        """Listeners to pass to the client's ``event_listeners`` option."""
+        return [cls.pool, cls.commands, cls.shapes]
+
+    @classmethod
+    def reset(cls) -> None:
+        """Reset collected statistics (listeners stay registered on the client)."""
+        cls.pool.reset()
+        cls.commands.reset()
+        cls.shapes.reset()
+        cls.started_at = time.time()
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """Get pool and command statistics since start or the last reset."""
+        return {
+            "collecting_since": cls.started_at,
+            "pools": cls.pool.snapshot(),
+            "commands": cls.commands.snapshot(),
+        }
+
+
+def _collect_pool_metrics() -> None:
+    MONGO_CONNECTIONS_IN_USE.set(MongoMonitor.pool.in_use())
+
+
+REGISTRY.register_collector(_collect_pool_metrics)
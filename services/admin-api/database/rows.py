@@ -0,0 +1,41 @@
+"""
+Projection-based row reads for list and export endpoints.
+
+Documents in the logs and telemetry collections are written by their
+repositories from validated models, so re-validating every document into
+a Pydantic model on the way out only to serialize it again is wasted
+work. The helpers here fetch just the fields a response needs and hand
+back plain dicts with every field present (missing ones set to None), so
+the response shape matches the Pydantic response model exactly. Rows go
+straight to ``services.json_response`` for encoding.
+
+RawBSONDocument was considered. The JSON encoder has to visit every field
+anyway, so lazily decoded BSON saves nothing over the C dict decoder once
+the projection has cut the payload down.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+
+def projection(fields: Sequence[str]) -> Dict[str, int]:
+    """Build a find() projection returning only ``fields`` (no _id)."""
+    spec = {field: 1 for field in fields}
+    spec["_id"] = 0
+    return spec
+
+
+def to_row(doc: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Normalize a projected document into a row with every field present."""
+    return {field: doc.get(field) for field in fields}
+
+
+async def fetch_rows(cursor, fields: Sequence[str], length: int) -> List[Dict[str, Any]]:
+    """Read a projected cursor into a list of rows."""
+    docs = await cursor.to_list(length=length)
+    return [to_row(doc, fields) for doc in docs]
+
+
+async def iter_rows(cursor, fields: Sequence[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Stream rows from a projected cursor, batch by batch."""
+    async for doc in cursor:
+        yield to_row(doc, fields)
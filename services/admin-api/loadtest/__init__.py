@@ -0,0 +1,21 @@
+"""
+Load-test and benchmark suite for the admin API.
+
+    python -m loadtest --backend mongomock --duration 30
+    python -m loadtest --backend mongod --mongodb-uri mongodb://localhost:27017 --scale medium
+    python -m loadtest --url http://localhost:8000 --thresholds loadtest/thresholds.json
+
+By default the runner starts the API in a subprocess (``loadtest.serve``)
+seeded with synthetic data, drives the weighted workloads in
+``loadtest.workloads`` from an async load generator and reports
+throughput, latency percentiles and MongoDB commands per request. With
+``--thresholds`` it exits non-zero when a budget is exceeded, so it can
+gate CI.
+
+The mongomock backend (needs ``mongomock-motor``) keeps everything in
+memory for profiling without a database. It evaluates queries in Python
+and emits no driver command events, so its latencies are not comparable
+to production and DB ops per request are only reported against a real
+mongod. The budgets in ``thresholds.json`` are for a local mongod at the
+medium scale.
+"""
@@ -0,0 +1,320 @@
+"""
+Load generator and benchmark runner. See ``loadtest/__init__.py`` for usage.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest.options import (
+    LOADTEST_PASSWORD,
+    LOADTEST_USERNAME,
+    add_backend_arguments,
+    add_scale_arguments,
+    scale_argv,
+)
+from loadtest.workloads import LOG_STREAM_PATH, WORKLOADS, RequestSpec, WorkloadMix
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prometheus sample summed to count MongoDB commands
+DB_OPS_SAMPLE = "mongodb_command_duration_seconds_count"
+
+
+@dataclass
+class EndpointStats:
+    """Latencies and errors recorded for one request name."""
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, elapsed_ms: float, ok: bool) -> None:
+        self.latencies_ms.append(elapsed_ms)
+        if not ok:
+            self.errors += 1
+
+    def summary(self, duration: float) -> dict:
+        ordered = sorted(self.latencies_ms)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "rps": round(count / duration, 1) if duration else 0.0,
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+        }
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return round(ordered[rank - 1], 1)
+
+
+class LoadRun:
+    """One timed run of virtual users and SSE viewers against a base URL."""
+
+    def __init__(self, client: httpx.AsyncClient, token: str, mix: WorkloadMix):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.mix = mix
+        self.stats: Dict[str, EndpointStats] = {}
+        self.sse_events = 0
+        self.sse_errors = 0
+        self.recording = False
+        self.db_ops: Optional[float] = None
+
+    async def _issue(self, spec: RequestSpec) -> None:
+        headers = self.headers if spec.authenticated else None
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(spec.method, spec.path, params=spec.params, headers=headers)
+            # Exports stream; read the whole body so latency covers the transfer
+            await response.aread()
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if self.recording:
+            self.stats.setdefault(spec.name, EndpointStats()).record(elapsed_ms, ok)
+
+    async def _virtual_user(self, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            await self._issue(self.mix.next_request())
+
+    async def _sse_viewer(self, deadline: float) -> None:
+        timeout = httpx.Timeout(10.0, read=max(5.0, deadline - time.monotonic() + 5))
+        try:
+            async with self.client.stream("GET", LOG_STREAM_PATH, headers=self.headers, timeout=timeout) as response:
+                if response.status_code != 200:
+                    self.sse_errors += 1
+                    return
+                async for line in response.aiter_lines():
+                    if line.startswith("event: log") and self.recording:
+                        self.sse_events += 1
+                    if time.monotonic() >= deadline:
+                        return
+        except httpx.HTTPError:
+            self.sse_errors += 1
+
+    async def run(self, concurrency: int, sse_viewers: int, warmup: float, duration: float) -> float:
+        """Run users for warmup + duration seconds; return the measured duration."""
+        deadline = time.monotonic() + warmup + duration
+        tasks = [asyncio.create_task(self._virtual_user(deadline)) for _ in range(concurrency)]
+        tasks += [asyncio.create_task(self._sse_viewer(deadline)) for _ in range(sse_viewers)]
+
+        await asyncio.sleep(warmup)
+        ops_before = await _scrape_db_ops(self.client)
+        self.recording = True
+        started = time.monotonic()
+        await asyncio.gather(*tasks)
+        self.recording = False
+        elapsed = time.monotonic() - started
+        ops_after = await _scrape_db_ops(self.client)
+
+        if ops_before is not None and ops_after is not None and ops_after > ops_before:
+            self.db_ops = ops_after - ops_before
+        return elapsed
+
+
+async def _scrape_db_ops(client: httpx.AsyncClient) -> Optional[float]:
+    """Sum MongoDB command counts from /metrics; None if metrics are unavailable."""
+    try:
+        response = await client.get("/metrics")
+    except httpx.HTTPError:
+        return None
+    if response.status_code != 200:
+        return None
+
+    total = 0.0
+    for line in response.text.splitlines():
+        if line.startswith(DB_OPS_SAMPLE):
+            total += float(line.rsplit(" ", 1)[1])
+    return total
+
+
+async def _wait_ready(client: httpx.AsyncClient, server: Optional[subprocess.Popen], timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Load-test server exited with code {server.returncode}")
+        try:
+            response = await client.get("/api/admin/health/ready")
+            if response.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server not ready after {timeout:.0f}s")
+
+
+async def _login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/api/admin/auth/login", json={"username": username, "password": password})
+    if response.status_code != 200:
+        raise RuntimeError(f"Login failed ({response.status_code}): {response.text}")
+    return response.json()["access_token"]
+
+
+def _start_server(args: argparse.Namespace) -> subprocess.Popen:
+    command = [sys.executable, "-m", "loadtest.serve", "--port", str(args.port), *scale_argv(args)]
+    return subprocess.Popen(command, cwd=SERVICE_ROOT)
+
+
+def check_thresholds(results: dict, thresholds: dict) -> List[str]:
+    """Compare results against budgets; return one message per violation."""
+    violations = []
+    overall = results["overall"]
+
+    max_error_rate = thresholds.get("max_error_rate")
+    if max_error_rate is not None and overall["error_rate"] > max_error_rate:
+        violations.append(f"error rate {overall['error_rate']:.2%} > {max_error_rate:.2%}")
+
+    min_rps = thresholds.get("min_throughput_rps")
+    if min_rps is not None and overall["rps"] < min_rps:
+        violations.append(f"throughput {overall['rps']} rps < {min_rps} rps")
+
+    max_db_ops = thresholds.get("max_db_ops_per_request")
+    db_ops = results.get("db_ops_per_request")
+    if max_db_ops is not None and db_ops is not None and db_ops > max_db_ops:
+        violations.append(f"DB ops per request {db_ops} > {max_db_ops}")
+
+    for name, budget in thresholds.get("endpoints", {}).items():
+        endpoint = results["endpoints"].get(name)
+        if endpoint is None:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = budget.get(key)
+            if limit is not None and endpoint[key] > limit:
+                violations.append(f"{name} {key} {endpoint[key]} > {limit}")
+        max_errors = budget.get("max_error_rate")
+        if max_errors is not None and endpoint["error_rate"] > max_errors:
+            violations.append(f"{name} error rate {endpoint['error_rate']:.2%} > {max_errors:.2%}")
+
+    return violations
+
+
+def _print_report(results: dict) -> None:
+    header = f"{'endpoint':<26} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print()
+    print(header)
+    print("-" * len(header))
+    rows = sorted(results["endpoints"].items()) + [("TOTAL", results["overall"])]
+    for name, s in rows:
+        print(
+            f"{name:<26} {s['requests']:>7} {s['errors']:>5} {s['rps']:>8.1f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}"
+        )
+    print()
+    db_ops = results["db_ops_per_request"]
+    print(f"DB ops per request: {db_ops if db_ops is not None else 'n/a (no driver command metrics)'}")
+    print(f"SSE viewers: {results['sse']['viewers']}, events {results['sse']['events']}, errors {results['sse']['errors']}")
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    server = None if args.url else _start_server(args)
+    limits = httpx.Limits(max_connections=args.concurrency + args.sse_viewers + 4)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+            await _wait_ready(client, server, args.startup_timeout)
+            token = await _login(client, args.username, args.password)
+
+            mix = WorkloadMix(args.workloads.split(","), random.Random(args.random_seed))
+            run = LoadRun(client, token, mix)
+
+            duration = await run.run(args.concurrency, args.sse_viewers, args.warmup, args.duration)
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    endpoints = {name: s.summary(duration) for name, s in run.stats.items()}
+    overall = EndpointStats()
+    for s in run.stats.values():
+        overall.latencies_ms.extend(s.latencies_ms)
+        overall.errors += s.errors
+    overall_summary = overall.summary(duration)
+
+    db_ops_per_request = None
+    if run.db_ops is not None:
+        # Includes the writes behind each request (request logs, telemetry, sessions)
+        db_ops_per_request = round(run.db_ops / max(1, overall_summary["requests"]), 2)
+
+    return {
+        "config": {
+            "url": base_url,
+            "backend": None if args.url else args.backend,
+            "scale": None if args.url else args.scale,
+            "workloads": args.workloads,
+            "concurrency": args.concurrency,
+            "duration_s": round(duration, 2),
+        },
+        "overall": overall_summary,
+        "endpoints": endpoints,
+        "db_ops_per_request": db_ops_per_request,
+        "sse": {"viewers": args.sse_viewers, "events": run.sse_events, "errors": run.sse_errors},
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Admin API load test")
+    parser.add_argument("--url", help="Target a running server instead of starting one (must be seeded)")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the spawned server")
+    add_backend_arguments(parser)
+    add_scale_arguments(parser)
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="Comma-separated workloads to mix")
+    parser.add_argument("--concurrency", type=int, default=32, help="Virtual users")
+    parser.add_argument("--sse-viewers", type=int, default=4, help="Concurrent log stream viewers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before recording")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--username", default=LOADTEST_USERNAME)
+    parser.add_argument("--password", default=LOADTEST_PASSWORD)
+    parser.add_argument("--json-out", help="Write results to this file")
+    parser.add_argument("--thresholds", help="JSON budgets; exit 1 when any is exceeded")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    results = asyncio.run(_run(args))
+    _print_report(results)
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            violations = check_thresholds(results, json.load(f))
+        if violations:
+            print("\nThreshold violations:")
+            for violation in violations:
+                print(f"  - {violation}")
+            return 1
+        print("\nAll thresholds met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Command-line options shared by the load-test entry points.
+
+Kept free of application imports: ``loadtest.serve`` parses its arguments
+and sets environment overrides before ``config.settings`` is loaded.
+"""
+
+import argparse
+from typing import Dict
+
+# Credentials of the admin the seeder creates and the runner logs in with
+LOADTEST_USERNAME = "loadtest"
+LOADTEST_PASSWORD = "LoadTest#2025"
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"solutions": 20, "logs": 5_000, "telemetry": 5_000},
+    "medium": {"solutions": 100, "logs": 100_000, "telemetry": 100_000},
+    "large": {"solutions": 500, "logs": 1_000_000, "telemetry": 1_000_000},
+}
+
+
+def parse_scale(name: str, overrides: argparse.Namespace) -> Dict[str, int]:
+    """Resolve a named scale with optional per-collection overrides."""
+    scale = dict(SCALES[name])
+    for key in scale:
+        value = getattr(overrides, key, None)
+        if value is not None:
+            scale[key] = value
+    return scale
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add --scale and per-collection count overrides to a parser."""
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Synthetic data size")
+    parser.add_argument("--solutions", type=int, help="Override the number of solutions")
+    parser.add_argument("--logs", type=int, help="Override the number of log entries")
+    parser.add_argument("--telemetry", type=int, help="Override the number of telemetry events")
+
+
+def add_backend_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the database backend options."""
+    parser.add_argument("--backend", choices=["mongomock", "mongod"], default="mongomock")
+    parser.add_argument("--mongodb-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="admin_loadtest", help="Never point this at a real database")
+    parser.add_argument("--random-seed", type=int, default=42)
+
+
+def scale_argv(args: argparse.Namespace) -> list:
+    """Re-serialize backend and scale options for a child process."""
+    argv = [
+        "--backend", args.backend,
+        "--mongodb-uri", args.mongodb_uri,
+        "--db-name", args.db_name,
+        "--random-seed", str(args.random_seed),
+        "--scale", args.scale,
+    ]
+    for key in SCALES[args.scale]:
+        value = getattr(args, key, None)
+        if value is not None:
+            argv += [f"--{key}", str(value)]
+    return argv
@@ -0,0 +1,189 @@
+"""
+Synthetic data for load tests.
+
+Seeds a load-test super admin plus solutions, logs and telemetry events
+shaped like the documents the repositories write. Generation is
+deterministic (seeded RNG) so runs are comparable.
+
+    python -m loadtest.seed --mongodb-uri mongodb://localhost:27017 --scale medium
+
+Only documents carrying the load-test markers are replaced.
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import bcrypt
+
+from database.connection import Collections
+from loadtest.options import LOADTEST_PASSWORD, LOADTEST_USERNAME, add_scale_arguments, parse_scale
+from models.admin import AdminPermissions, AdminRole, AdminStatus
+
+INSERT_BATCH_SIZE = 5_000
+
+CATEGORIES = ["AI Agents", "Search", "Analytics", "Streaming", "Inference", "RAG"]
+ENDPOINTS = [
+    ("GET", "/api/admin/solutions"),
+    ("GET", "/api/admin/dashboard/stats"),
+    ("GET", "/api/admin/logs"),
+    ("GET", "/api/admin/telemetry/stats"),
+    ("POST", "/api/admin/auth/login"),
+    ("GET", "/api/admin/public/solutions/status"),
+]
+EVENT_TYPES = ["api_call", "demo_interaction", "page_view"]
+
+
+def _admin_doc() -> dict:
+    """Build the load-test super admin as AdminRepository.create stores it."""
+    now = datetime.utcnow()
+    return {
+        "admin_id": f"ADM_{now.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}",
+        "username": LOADTEST_USERNAME,
+        "email": "loadtest@example.com",
+        # Minimum bcrypt cost: the runner logs in once, hashing speed is not under test
+        "password_hash": bcrypt.hashpw(LOADTEST_PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode(),
+        "role": AdminRole.SUPER_ADMIN.value,
+        "status": AdminStatus.ACTIVE.value,
+        "created_at": now,
+        "updated_at": now,
+        "created_by": None,
+        "last_login": None,
+        "failed_login_attempts": 0,
+        "locked_until": None,
+        "profile": {"display_name": "Load Test", "avatar_url": None},
+        "permissions": AdminPermissions.for_role(AdminRole.SUPER_ADMIN).model_dump(),
+    }
+
+
+def _solution_docs(count: int, rng: random.Random) -> List[dict]:
+    now = datetime.utcnow()
+    return [
+        {
+            "solution_id": f"loadtest-solution-{i:04d}",
+            "name": f"Load Test Solution {i}",
+            "partner": {"name": f"Partner {i % 40}", "logo": "/logos/placeholder.svg", "website": ""},
+            "description": "Synthetic solution for load testing " * 3,
+            "long_description": None,
+            "value_proposition": ["Fast", "Scalable"],
+            "technologies": rng.sample(["Atlas", "Vector Search", "Kafka", "LangChain", "Python"], 3),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "demo_url": "",
+            "source_url": "",
+            "documentation": None,
+            "ports": {"api": 8000 + i, "ui": 3000 + i},
+            "status": "active" if i % 10 else "coming-soon",
+            "featured": i % 7 == 0,
+            "created_at": now,
+            "updated_at": now,
+            "created_by": None,
+            "updated_by": None,
+            "is_from_file": False,
+        }
+        for i in range(count)
+    ]
+
+
+def _log_doc(i: int, now: datetime, rng: random.Random) -> dict:
+    method, endpoint = ENDPOINTS[i % len(ENDPOINTS)]
+    is_error = rng.random() < 0.05
+    timestamp = now - timedelta(seconds=i * 2)
+    return {
+        "log_id": f"LOG_{timestamp.strftime('%Y%m%d%H%M%S')}_{i:08x}",
+        "timestamp": timestamp,
+        "level": "error" if is_error else ("warning" if rng.random() < 0.1 else "info"),
+        "message": f"{method} {endpoint} - {500 if is_error else 200}",
+        "service": "admin-api",
+        "request_id": uuid.uuid4().hex[:16],
+        "endpoint": endpoint,
+        "method": method,
+        "status_code": 500 if is_error else 200,
+        "duration_ms": round(rng.lognormvariate(3, 0.6), 2),
+        "ip_address": f"10.0.{i % 256}.{rng.randrange(256)}",
+        "user_agent": "loadtest",
+        "admin_id": None,
+        "error_type": "RuntimeError" if is_error else None,
+        "error_message": "synthetic failure" if is_error else None,
+        "stack_trace": None,
+        "extra": None,
+        "expires_at": timestamp + timedelta(days=30),
+    }
+
+
+def _telemetry_doc(i: int, now: datetime, solutions: int, rng: random.Random) -> dict:
+    method, endpoint = ENDPOINTS[i % len(ENDPOINTS)]
+    timestamp = now - timedelta(seconds=i * 2)
+    return {
+        "event_id": f"EVT_{timestamp.strftime('%Y%m%d%H%M%S')}_{i:08x}",
+        "timestamp": timestamp,
+        "event_type": EVENT_TYPES[i % len(EVENT_TYPES)],
+        "partner_demo": f"loadtest-partner-{i % 40}",
+        "solution_id": f"loadtest-solution-{rng.randrange(max(1, solutions)):04d}",
+        "session_id": f"session-{i // 20}",
+        "endpoint": endpoint,
+        "method": method,
+        "status_code": 500 if rng.random() < 0.03 else 200,
+        "duration_ms": round(rng.lognormvariate(4, 0.7), 2),
+        "tokens_used": rng.randrange(0, 4000) if i % 3 == 0 else None,
+        "model_used": "synthetic-model" if i % 3 == 0 else None,
+        "ip_address": f"10.1.{i % 256}.{rng.randrange(256)}",
+        "expires_at": timestamp + timedelta(days=90),
+    }
+
+
+async def _insert_generated(collection, count: int, factory) -> None:
+    for start in range(0, count, INSERT_BATCH_SIZE):
+        batch = [factory(i) for i in range(start, min(count, start + INSERT_BATCH_SIZE))]
+        await collection.insert_many(batch, ordered=False)
+
+
+async def seed(db, scale: Dict[str, int], random_seed: int = 42) -> Dict[str, int]:
+    """
+    Replace load-test data in ``db`` with a fresh synthetic data set.
+
+    Returns the number of documents written per collection.
+    """
+    rng = random.Random(random_seed)
+    now = datetime.utcnow()
+
+    await db[Collections.ADMINS].delete_many({"username": LOADTEST_USERNAME})
+    await db[Collections.ADMINS].insert_one(_admin_doc())
+
+    await db["solutions"].delete_many({"solution_id": {"$regex": "^loadtest-solution-"}})
+    if scale["solutions"]:
+        await db["solutions"].insert_many(_solution_docs(scale["solutions"], rng))
+
+    await db[Collections.LOGS].delete_many({"user_agent": "loadtest"})
+    await _insert_generated(db[Collections.LOGS], scale["logs"], lambda i: _log_doc(i, now, rng))
+
+    await db[Collections.TELEMETRY].delete_many({"partner_demo": {"$regex": "^loadtest-"}})
+    await _insert_generated(
+        db[Collections.TELEMETRY],
+        scale["telemetry"],
+        lambda i: _telemetry_doc(i, now, scale["solutions"], rng),
+    )
+
+    return {"admins": 1, **scale}
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(args.mongodb_uri)
+    try:
+        counts = await seed(client[args.db_name], parse_scale(args.scale, args), args.random_seed)
+        print(f"Seeded {args.db_name}: {counts}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic admin-api data for load tests")
+    parser.add_argument("--mongodb-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="admin_loadtest")
+    parser.add_argument("--random-seed", type=int, default=42)
+    add_scale_arguments(parser)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""
+Run the admin API against a seeded load-test database.
+
+    python -m loadtest.serve --backend mongomock --port 8765 --scale small
+    python -m loadtest.serve --backend mongod --mongodb-uri mongodb://localhost:27017
+
+The mongomock backend needs ``mongomock-motor`` (a development dependency,
+not in requirements.txt). The mongod backend writes to ``--db-name``, which
+defaults to ``admin_loadtest`` so a developer database is never touched.
+"""
+
+import argparse
+import asyncio
+import os
+
+from loadtest.options import add_backend_arguments, add_scale_arguments, parse_scale
+
+
+def _configure_environment(args: argparse.Namespace) -> None:
+    """Set settings overrides before config.settings is first imported."""
+    os.environ["MONGODB_URI"] = args.mongodb_uri
+    os.environ["ADMIN_DB_NAME"] = args.db_name
+    os.environ["METRICS_ENABLED"] = "true"
+    # The runner logs in once and hammers a single admin; limits would skew results
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("DEBUG", "false")
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    from database.connection import MongoDB
+    from loadtest.seed import seed
+
+    scale = parse_scale(args.scale, args)
+
+    if args.backend == "mongomock":
+        from mongomock_motor import AsyncMongoMockClient
+
+        # Pre-populating the client makes MongoDB.connect() a no-op
+        MongoDB.client = AsyncMongoMockClient()
+        MongoDB.database = MongoDB.client[args.db_name]
+        MongoDB.analytics_database = MongoDB.database
+        counts = await seed(MongoDB.database, scale, args.random_seed)
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(args.mongodb_uri)
+        try:
+            counts = await seed(client[args.db_name], scale, args.random_seed)
+        finally:
+            client.close()
+
+    print(f"Seeded {args.backend}/{args.db_name}: {counts}", flush=True)
+
+    from main import app
+
+    config = uvicorn.Config(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+    await uvicorn.Server(config).serve()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve the admin API on seeded load-test data")
+    add_backend_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_scale_arguments(parser)
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = build_parser().parse_args()
+    _configure_environment(arguments)
+    asyncio.run(_serve(arguments))
@@ -0,0 +1,83 @@
+"""
+Weighted request mixes for the load generator.
+
+Each workload is a named group of requests with a relative weight. A
+virtual user picks a workload by weight, then issues one of its requests
+at random. Endpoint names in results and thresholds are the ``name`` of
+each request, so keep them stable.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    """A single request a virtual user can issue."""
+    name: str
+    method: str
+    path: str
+    authenticated: bool = True
+    params: Optional[Dict[str, str]] = None
+
+
+@dataclass(frozen=True)
+class Workload:
+    """A weighted group of requests."""
+    name: str
+    weight: int
+    requests: Tuple[RequestSpec, ...] = field(default_factory=tuple)
+
+
+PUBLIC_CATALOG = Workload(
+    name="public_catalog",
+    weight=50,
+    requests=(
+        RequestSpec("public_solutions_status", "GET", "/api/admin/public/solutions/status", authenticated=False),
+        RequestSpec("public_maintenance", "GET", "/api/admin/public/maintenance", authenticated=False),
+    ),
+)
+
+DASHBOARD = Workload(
+    name="dashboard",
+    weight=40,
+    requests=(
+        RequestSpec("dashboard_stats", "GET", "/api/admin/dashboard/stats"),
+        RequestSpec("solutions_list", "GET", "/api/admin/solutions"),
+        RequestSpec("logs_page", "GET", "/api/admin/logs", params={"page": "1", "page_size": "50"}),
+        RequestSpec("logs_errors", "GET", "/api/admin/logs", params={"level": "error", "page_size": "50"}),
+        RequestSpec("telemetry_stats", "GET", "/api/admin/telemetry/stats"),
+        RequestSpec("telemetry_events", "GET", "/api/admin/telemetry", params={"page_size": "50"}),
+    ),
+)
+
+EXPORTS = Workload(
+    name="exports",
+    weight=2,
+    requests=(
+        RequestSpec("logs_export", "GET", "/api/admin/logs/export/json", params={"max_records": "5000"}),
+        RequestSpec("telemetry_export", "GET", "/api/admin/telemetry/export/json", params={"max_records": "5000"}),
+    ),
+)
+
+WORKLOADS: Dict[str, Workload] = {w.name: w for w in (PUBLIC_CATALOG, DASHBOARD, EXPORTS)}
+
+# Held open by SSE viewers rather than picked by virtual users
+LOG_STREAM_PATH = "/api/admin/logs/stream"
+
+
+class WorkloadMix:
+    """Weighted random choice over a set of workloads."""
+
+    def __init__(self, names: List[str], rng: random.Random):
+        unknown = [n for n in names if n not in WORKLOADS]
+        if unknown:
+            raise ValueError(f"Unknown workloads: {', '.join(unknown)} (choose from {', '.join(WORKLOADS)})")
+        self._workloads = [WORKLOADS[n] for n in names]
+        self._weights = [w.weight for w in self._workloads]
+        self._rng = rng
+
+    def next_request(self) -> RequestSpec:
+        workload = self._rng.choices(self._workloads, weights=self._weights)[0]
+        return self._rng.choice(workload.requests)
@@ -14,6 +14,11 @@ from config import settings
 from database.connection import MongoDB
 from database.indexes import create_indexes
 from repositories.solutions_repository import SolutionsRepository
+from services.email_outbox_worker import EmailOutboxWorker
+from services.http_client import HttpClientPool
+from services.startup_service import StartupService
+from services.usage_enquiry_intake import UsageEnquiryIntake
+from repositories.usage_enquiry_repository import UsageEnquiryRepository
 from routes.auth import router as auth_router
 from routes.dashboard import router as dashboard_router
 from routes.health import router as health_router
@@ -25,7 +30,13 @@ from routes.config import router as config_router
 from routes.logs import router as logs_router
 from routes.telemetry import router as telemetry_router
 from routes.housekeeping import router as housekeeping_router
+from routes.diagnostics import router as diagnostics_router
+from routes.usage_enquiries import router as usage_enquiries_router
+from routes.metrics import router as metrics_router
 from middleware.logging_middleware import RequestLoggingMiddleware
+from middleware.metrics_middleware import PrometheusMiddleware
+from services.metrics import EventLoopLagProbe
+from services.loop_watchdog import LoopWatchdog
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +46,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def _seed_solutions() -> str:
+    """Seed solutions from files if needed."""
+    seeded = await SolutionsRepository.seed_from_files()
+    if seeded > 0:
+        logger.info(f"Seeded {seeded} solutions from files")
+    return f"seeded={seeded}"
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -44,25 +63,46 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting Admin Dashboard API...")
+    StartupService.begin()
 
     try:
         # Connect to MongoDB
-        await MongoDB.connect()
+        async with StartupService.phase("mongodb_connect"):
+            await MongoDB.connect()
         logger.info("MongoDB connected")
 
-        # Create indexes
-        await create_indexes()
-        logger.info("Database indexes created")
+        # Create indexes (skipped when the manifest fingerprint is unchanged)
+        async with StartupService.phase("create_indexes") as phase:
+            created = await create_indexes()
+            phase["detail"] = "created" if created else "unchanged"
+
+        # Start event loop lag sampling
+        if settings.metrics_enabled:
+            EventLoopLagProbe.start(settings.event_loop_lag_interval)
+
+        # Blocking-call detection
+        if settings.loop_watchdog_enabled:
+            LoopWatchdog.start()
+
+        # Shared outbound HTTP connection pool
+        HttpClientPool.start()
 
-        # Seed solutions from files if needed
-        seeded = await SolutionsRepository.seed_from_files()
-        if seeded > 0:
-            logger.info(f"Seeded {seeded} solutions from files")
+        # Start background email delivery
+        async with StartupService.phase("email_outbox_worker"):
+            EmailOutboxWorker.start()
+
+        # Buffered usage enquiry writes
+        UsageEnquiryIntake.start()
 
     except Exception as e:
         logger.error(f"Startup failed: {e}")
         raise
 
+    # Seed solutions from files in the background; /health/ready gates on it
+    StartupService.run_in_background("seed_solutions", _seed_solutions)
+    StartupService.run_in_background("usage_enquiry_counters", UsageEnquiryRepository.ensure_counters)
+
+    StartupService.mark_serving()
     logger.info("Admin Dashboard API started successfully")
 
     yield  # Application is running
@@ -71,6 +111,12 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Admin Dashboard API...")
 
     try:
+        await StartupService.cancel_pending()
+        await UsageEnquiryIntake.stop()
+        await EmailOutboxWorker.stop()
+        await HttpClientPool.stop()
+        await EventLoopLagProbe.stop()
+        await LoopWatchdog.stop()
         await MongoDB.disconnect()
         logger.info("MongoDB disconnected")
     except Exception as e:
@@ -109,6 +155,10 @@ app.add_middleware(
 # Request logging middleware (logs ALL HTTP requests)
 app.add_middleware(RequestLoggingMiddleware)
 
+# Prometheus request metrics (outermost, so it times the full middleware stack)
+if settings.metrics_enabled:
+    app.add_middleware(PrometheusMiddleware)
+
 
 # Include routers
 app.include_router(auth_router, prefix="/api/admin")
@@ -122,6 +172,12 @@ app.include_router(config_router, prefix="/api/admin")
 app.include_router(logs_router, prefix="/api/admin")
 app.include_router(telemetry_router, prefix="/api/admin")
 app.include_router(housekeeping_router, prefix="/api/admin")
+app.include_router(diagnostics_router, prefix="/api/admin")
+app.include_router(usage_enquiries_router, prefix="/api/admin")
+
+# Prometheus scrape endpoint (internal only - not routed by the gateway)
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -3,5 +3,6 @@ Middleware package for admin-api.
 """
 
 from .logging_middleware import RequestLoggingMiddleware
+from .metrics_middleware import PrometheusMiddleware
 
-__all__ = ["RequestLoggingMiddleware"]
+__all__ = ["RequestLoggingMiddleware", "PrometheusMiddleware"]
@@ -115,32 +115,35 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 message += f"?{query_string}"
             message += f" - {status_code}"
 
-            # Create log entry (fire and forget, don't block request)
-            try:
-                log_data = LogCreate(
-                    level=level,
-                    message=message,
-                    service="admin-api",
-                    request_id=request_id,
-                    endpoint=endpoint,
-                    method=method,
-                    status_code=status_code,
-                    duration_ms=round(duration_ms, 2),
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    admin_id=admin_id,
-                    error_type=error_type,
-                    error_message=error_message,
-                    stack_trace=stack_trace if error_type else None,
-                    extra={"query_params": query_string} if query_string else None,
-                )
-
-                # Log asynchronously
-                await LogRepository.create(log_data)
-
-            except Exception as log_error:
-                # Don't fail the request if logging fails
-                logger.error(f"Failed to create log entry: {log_error}")
+            # Create log entry (fire and forget, don't block request).
+            # Rate-limited requests are skipped: they are counted by the limiter,
+            # and persisting them would hand a flood the write load it was denied.
+            if status_code != 429:
+                try:
+                    log_data = LogCreate(
+                        level=level,
+                        message=message,
+                        service="admin-api",
+                        request_id=request_id,
+                        endpoint=endpoint,
+                        method=method,
+                        status_code=status_code,
+                        duration_ms=round(duration_ms, 2),
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                        admin_id=admin_id,
+                        error_type=error_type,
+                        error_message=error_message,
+                        stack_trace=stack_trace if error_type else None,
+                        extra={"query_params": query_string} if query_string else None,
+                    )
+
+                    # Log asynchronously
+                    await LogRepository.create(log_data)
+
+                except Exception as log_error:
+                    # Don't fail the request if logging fails
+                    logger.error(f"Failed to create log entry: {log_error}")
 
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP from request headers or connection."""
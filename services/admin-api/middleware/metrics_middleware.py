@@ -0,0 +1,64 @@
+"""
+Prometheus request metrics middleware.
+
+Implemented as a plain ASGI middleware (rather than BaseHTTPMiddleware)
+so it adds no extra task or body buffering per request.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+
+class PrometheusMiddleware:
+    """
+    Middleware that records request latency by route template.
+
+    Labels use the matched route's path template (``/api/admin/logs/{log_id}``)
+    instead of the raw URL to keep label cardinality bounded.
+    """
+
+    # Paths to exclude from metrics (scrapes and probes)
+    EXCLUDED_PATHS = {
+        "/metrics",
+        "/api/admin/health",
+        "/api/admin/health/ready",
+    }
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _route_template(scope: Scope) -> str:
+        """Full path template of the matched route; one fixed label otherwise."""
+        # FastAPI releases that resolve included routers lazily leave
+        # scope["route"] as declared on its APIRouter and record the
+        # prefixed template on the effective route context instead
+        effective = (scope.get("fastapi") or {}).get("effective_route_context")
+        template = getattr(effective, "path", None) or getattr(scope.get("route"), "path", None)
+        return template or "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], self._route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - start_time)
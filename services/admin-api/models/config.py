@@ -156,6 +156,29 @@ class ConfigImportRequest(BaseModel):
         default=False,
         description="Whether to overwrite existing configs with same key"
     )
+    dry_run: bool = Field(
+        default=False,
+        description="Compute the diff without writing anything"
+    )
+    transactional: bool = Field(
+        default=True,
+        description="Apply all writes in one transaction (when the deployment supports it)"
+    )
+
+
+class ConfigImportAction(str, Enum):
+    """Planned action for a single imported key."""
+    CREATE = "create"
+    UPDATE = "update"
+    UNCHANGED = "unchanged"
+    SKIP = "skip"
+
+
+class ConfigImportChange(BaseModel):
+    """Diff entry describing what an import does to one key."""
+    key: str
+    action: ConfigImportAction
+    changed_fields: List[str] = Field(default_factory=list)
 
 
 class ConfigImportResponse(BaseModel):
@@ -164,6 +187,9 @@ class ConfigImportResponse(BaseModel):
     updated: int
     skipped: int
     errors: List[str]
+    dry_run: bool = False
+    transactional: bool = False
+    changes: List[ConfigImportChange] = Field(default_factory=list)
 
 
 class ConfigTestRequest(BaseModel):
@@ -174,9 +200,47 @@ class ConfigTestRequest(BaseModel):
     )
 
 
+class ConfigTestTimings(BaseModel):
+    """Latency breakdown for a connection test (milliseconds)."""
+    connect_ms: Optional[float] = None  # Includes DNS; None when a pooled connection was reused
+    tls_ms: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    total_ms: float
+    connection_reused: bool = False
+    http_version: Optional[str] = None
+
+
 class ConfigTestResponse(BaseModel):
     """Response model for API key connection test."""
     success: bool
     message: str
     response_time_ms: Optional[float] = None
     status_code: Optional[int] = None
+    timings: Optional[ConfigTestTimings] = None
+
+
+class ConfigBatchTestRequest(BaseModel):
+    """Request model for testing every API key connection."""
+    concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        le=32,
+        description="Maximum tests run in parallel (defaults to CONFIG_TEST_CONCURRENCY)"
+    )
+
+
+class ConfigBatchTestResult(ConfigTestResponse):
+    """Connection test result for a single API key."""
+    config_id: str
+    key: str
+    test_endpoint: Optional[str] = None
+
+
+class ConfigBatchTestResponse(BaseModel):
+    """Response model for a batch API key connection test."""
+    results: List[ConfigBatchTestResult]
+    total: int
+    succeeded: int
+    failed: int
+    skipped: int  # No test endpoint configured
+    duration_ms: float
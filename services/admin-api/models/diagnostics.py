@@ -0,0 +1,162 @@
+"""
+Diagnostics models for runtime introspection endpoints.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel
+
+
+class HistogramBucket(BaseModel):
+    """Histogram bucket: observations above the previous bound and <= le."""
+    le: Union[float, str]
+    count: int
+
+
+class LatencyHistogramSnapshot(BaseModel):
+    """Latency histogram summary in milliseconds."""
+    count: int
+    sum_ms: float
+    avg_ms: float
+    max_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    buckets: List[HistogramBucket]
+
+
+class ConnectionPoolStats(BaseModel):
+    """Connection pool statistics for a single server."""
+    address: str
+    in_use: int
+    max_in_use: int
+    open_connections: int
+    connections_created: int
+    connections_closed: int
+    checkout_failures: int
+    pool_clears: int
+    checkout_wait: LatencyHistogramSnapshot
+
+
+class CommandLatencyStats(BaseModel):
+    """Latency statistics for a single MongoDB command."""
+    command: str
+    failures: int
+    latency: LatencyHistogramSnapshot
+
+
+class MongoPoolStatsResponse(BaseModel):
+    """Response model for MongoDB pool and command latency introspection."""
+    monitoring_enabled: bool
+    pool_profile: str
+    client_options: Dict[str, Any]
+    analytics_read_preference: str
+    collecting_since: datetime
+    total_in_use: int
+    pools: List[ConnectionPoolStats]
+    commands: List[CommandLatencyStats]
+    generated_at: datetime
+    message: Optional[str] = None
+
+
+class QueryShapeStats(BaseModel):
+    """Aggregated statistics for one sampled query shape (field names only)."""
+    collection: str
+    equality: List[str]
+    sort: List[List[Union[str, int]]]
+    range: List[str]
+    regex: List[str]
+    other: List[str]
+    count: int
+    failures: int
+    avg_ms: float
+    max_ms: float
+    total_ms: float
+
+
+class IndexRecommendation(BaseModel):
+    """Suggested index addition or removal."""
+    id: str
+    action: str  # "add" or "drop"
+    collection: str
+    index_name: str
+    keys: List[List[Union[str, int]]]
+    managed: bool  # Defined in database/indexes.py
+    reason: str
+    plan_stages: List[str] = []
+    query_count: Optional[int] = None
+    avg_query_ms: Optional[float] = None
+    size_mb: Optional[float] = None
+    index_writes_saved_per_min: Optional[float] = None
+    estimated_write_savings_pct: Optional[float] = None
+
+
+class IndexAdvisorReport(BaseModel):
+    """Response model for the index advisor."""
+    database_name: str
+    sample_rate: float
+    collecting_since: datetime
+    shapes: List[QueryShapeStats]
+    writes_per_min: Dict[str, float]
+    recommendations: List[IndexRecommendation]
+    generated_at: datetime
+
+
+class IndexAdvisorApplyRequest(BaseModel):
+    """Request model for applying index recommendations."""
+    recommendation_ids: List[str]
+
+
+class IndexAdvisorApplyResult(BaseModel):
+    """Outcome of applying a single recommendation."""
+    id: str
+    success: bool
+    message: str
+
+
+class IndexAdvisorApplyResponse(BaseModel):
+    """Response model for applying index recommendations."""
+    results: List[IndexAdvisorApplyResult]
+
+
+class LoopStallOffender(BaseModel):
+    """Event loop stalls attributed to one coroutine and code location."""
+    coroutine: str
+    location: str
+    blocking_call: str
+    count: int
+    total_ms: float
+    max_ms: float
+    avg_ms: float
+    last_seen: datetime
+    stack: List[str]
+
+
+class LoopWatchdogResponse(BaseModel):
+    """Response model for event loop watchdog introspection."""
+    enabled: bool
+    running: bool
+    threshold_ms: float
+    collecting_since: datetime
+    stalls: int
+    lag_last_ms: float
+    offenders: List[LoopStallOffender]
+
+
+class RateLimitPolicyStats(BaseModel):
+    """Configuration and decision counts for one rate limit policy."""
+    name: str
+    limit: int
+    period_seconds: float
+    allowed: int
+    rejected: int
+
+
+class RateLimiterStatsResponse(BaseModel):
+    """Response model for rate limiter introspection."""
+    enabled: bool
+    backend: str
+    shards: int
+    tracked_keys: int
+    max_keys: int
+    policies: List[RateLimitPolicyStats]
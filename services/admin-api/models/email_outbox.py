@@ -0,0 +1,53 @@
+"""
+Email outbox models for queued SMTP delivery.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class EmailStatus(str, Enum):
+    """Delivery status of a queued email."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutboxCreate(BaseModel):
+    """Model for enqueueing an email."""
+    to_email: str = Field(..., description="Recipient email address")
+    subject: str = Field(..., description="Email subject")
+    html_content: str = Field(..., description="HTML body content")
+    text_content: Optional[str] = Field(default=None, description="Plain text fallback")
+    digest_key: Optional[str] = Field(
+        default=None,
+        description="Messages to the same recipient sharing this key are merged into one digest",
+    )
+
+
+class EmailOutboxInDB(EmailOutboxCreate):
+    """Queued email stored in database."""
+    email_id: str = Field(..., description="Unique outbox entry identifier")
+    status: EmailStatus = Field(default=EmailStatus.PENDING)
+    attempts: int = Field(default=0, description="Delivery attempts made so far")
+    last_error: Optional[str] = Field(default=None, description="Error from the last failed attempt")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    locked_until: Optional[datetime] = Field(default=None, description="Claim lease expiry")
+    sent_at: Optional[datetime] = Field(default=None)
+    expires_at: Optional[datetime] = Field(default=None, description="TTL, set once delivery is final")
+
+
+class EmailOutboxStats(BaseModel):
+    """Outbox queue depth and worker state."""
+    pending: int = 0
+    sending: int = 0
+    sent: int = 0
+    failed: int = 0
+    worker_running: bool = False
+    smtp_connected: bool = False
+    messages_sent: int = 0
+    connections_opened: int = 0
@@ -99,6 +99,15 @@ class TaskListResponse(BaseModel):
     tasks: List[TaskResponse]
 
 
+class IndexUsageStats(BaseModel):
+    """Size and usage of a single index (usage from $indexStats)."""
+    name: str
+    size_mb: float
+    accesses: int = 0
+    accesses_since: Optional[datetime] = None  # Counters reset on server restart
+    unused: bool = False  # No accesses over a full observation window
+
+
 class DatabaseStats(BaseModel):
     """Database statistics."""
     collection_name: str
@@ -107,6 +116,7 @@ class DatabaseStats(BaseModel):
     avg_document_size_bytes: float
     index_count: int
     index_size_mb: float
+    indexes: List[IndexUsageStats] = Field(default_factory=list)
 
 
 class DatabaseStatsResponse(BaseModel):
@@ -115,5 +125,14 @@ class DatabaseStatsResponse(BaseModel):
     total_collections: int
     total_documents: int
     total_storage_mb: float
+    total_index_size_mb: float = 0.0
     collections: List[DatabaseStats]
+    unused_indexes: List[str] = Field(
+        default_factory=list,
+        description=(
+            "collection.index names with no accesses in at least INDEX_ADVISOR_UNUSED_MIN_HOURS "
+            "(excluding _id_, unique, TTL, sparse and partial indexes)"
+        )
+    )
     generated_at: datetime
+    cached: bool = False
@@ -104,6 +104,7 @@ class SolutionInDB(BaseModel):
     created_by: Optional[str] = None
     updated_by: Optional[str] = None
     is_from_file: bool = False  # True if migrated from solution.json
+    source_hash: Optional[str] = None  # SHA256 of the seeded solution.json
 
 
 class SolutionListItem(BaseModel):
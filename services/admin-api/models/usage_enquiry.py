@@ -3,7 +3,7 @@ Usage enquiry models for tracking demo usage requests.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 
 
@@ -37,3 +37,25 @@ class UsageEnquiryResponse(BaseModel):
     """Response model for a usage enquiry."""
     enquiry_id: str
     message: str
+
+
+class UsageEnquirySolutionCount(BaseModel):
+    """Running enquiry count for one solution."""
+    solution_id: str
+    solution_name: str = ""
+    count: int
+    last_enquiry_at: Optional[datetime] = None
+
+
+class UsageEnquiryListResponse(BaseModel):
+    """Keyset-paginated usage enquiries with counter-backed totals."""
+    enquiries: List[UsageEnquiryInDB]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+class UsageEnquiryCountsResponse(BaseModel):
+    """Per-solution enquiry counters."""
+    total: int
+    solutions: List[UsageEnquirySolutionCount]
+    pending: int = 0
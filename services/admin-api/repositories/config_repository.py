@@ -2,12 +2,17 @@
 Repository for configuration management with caching and encryption.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from enum import Enum
+from typing import Optional, Dict, List, Any, Set
 import uuid
 
-from database.connection import get_app_config_collection, get_config_audit_collection
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from database.connection import MongoDB, get_app_config_collection, get_config_audit_collection
 from models.config import (
     ConfigCreate,
     ConfigUpdate,
@@ -15,8 +20,11 @@ from models.config import (
     ConfigCategory,
     ConfigAuditInDB,
     ConfigAuditAction,
+    ConfigImportAction,
+    ConfigImportChange,
 )
 from services.encryption import EncryptionService
+from services.metrics import record_cache
 
 logger = logging.getLogger(__name__)
 
@@ -98,27 +106,19 @@ class ConfigRepository:
             updated_by=doc["updated_by"],
         )
 
-    @classmethod
-    async def create(cls, config_data: ConfigCreate, admin_id: str) -> ConfigInDB:
-        """Create a new configuration entry."""
-        collection = get_app_config_collection()
-        now = datetime.utcnow()
-
-        # Encrypt value if sensitive
-        value = config_data.value
-        is_encrypted = False
-        if config_data.is_sensitive:
-            value = EncryptionService.encrypt(config_data.value)
-            is_encrypted = True
-
-        doc = {
+    @staticmethod
+    def _build_new_doc(
+        config_data: ConfigCreate, value: str, admin_id: str, now: datetime
+    ) -> dict:
+        """Build the document for a new configuration (``value`` already encrypted if sensitive)."""
+        return {
             "config_id": _generate_config_id(),
             "key": config_data.key,
             "value": value,
             "category": config_data.category.value,
             "description": config_data.description,
             "is_sensitive": config_data.is_sensitive,
-            "is_encrypted": is_encrypted,
+            "is_encrypted": config_data.is_sensitive,
             "validation_type": config_data.validation_type.value,
             "default_value": config_data.default_value,
             "metadata": config_data.metadata,
@@ -128,6 +128,19 @@ class ConfigRepository:
             "updated_by": admin_id,
         }
 
+    @classmethod
+    async def create(cls, config_data: ConfigCreate, admin_id: str) -> ConfigInDB:
+        """Create a new configuration entry."""
+        collection = get_app_config_collection()
+        now = datetime.utcnow()
+
+        # Encrypt value if sensitive
+        value = config_data.value
+        if config_data.is_sensitive:
+            value = EncryptionService.encrypt(config_data.value)
+
+        doc = cls._build_new_doc(config_data, value, admin_id, now)
+
         await collection.insert_one(doc)
 
         # Log audit
@@ -163,7 +176,9 @@ class ConfigRepository:
         """Get a configuration by key."""
         # Check cache first
         if cls._is_cache_valid() and key in cls._cache:
+            record_cache("app_config", hit=True)
             return cls._cache[key]
+        record_cache("app_config", hit=False)
 
         collection = get_app_config_collection()
         doc = await collection.find_one({"key": key})
@@ -175,7 +190,9 @@ class ConfigRepository:
     async def get_all(cls, category: Optional[ConfigCategory] = None) -> List[ConfigInDB]:
         """Get all configurations, optionally filtered by category."""
         # Refresh cache if needed
-        if not cls._is_cache_valid():
+        cache_valid = cls._is_cache_valid()
+        record_cache("app_config", hit=cache_valid)
+        if not cache_valid:
             await cls._load_cache()
 
         configs = list(cls._cache.values())
@@ -318,35 +335,106 @@ class ConfigRepository:
         cls,
         configs: List[Dict[str, Any]],
         admin_id: str,
-        overwrite: bool = False
-    ) -> Dict[str, int]:
-        """Import configurations from a list of dictionaries."""
-        results = {"created": 0, "updated": 0, "skipped": 0, "errors": []}
+        overwrite: bool = False,
+        dry_run: bool = False,
+        transactional: bool = True,
+        ip_address: str = "",
+        user_agent: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Import configurations from a list of dictionaries.
+
+        Existing keys are fetched with a single ``$in`` query, sensitive values
+        are encrypted in one batch off the event loop, and all writes go through
+        one ``bulk_write`` followed by one audit ``insert_many``. When
+        ``transactional`` is set and the deployment supports it, config writes
+        and audit records commit or roll back together.
+
+        With ``dry_run`` nothing is written; ``changes`` describes what the
+        import would do to each key.
+        """
+        results: Dict[str, Any] = {
+            "created": 0,
+            "updated": 0,
+            "skipped": 0,
+            "errors": [],
+            "dry_run": dry_run,
+            "transactional": False,
+            "changes": [],
+        }
 
+        entries: Dict[str, Dict[str, Any]] = {}
         for config_dict in configs:
+            key = config_dict.get("key")
+            if not key:
+                results["errors"].append("Missing key in config")
+            elif key in entries:
+                results["errors"].append(f"Duplicate key in import: {key}")
+            else:
+                entries[key] = config_dict
+
+        if not entries:
+            return results
+
+        collection = get_app_config_collection()
+        existing_docs: Dict[str, dict] = {}
+        async for doc in collection.find({"key": {"$in": list(entries)}}):
+            existing_docs[doc["key"]] = doc
+
+        # Only decrypt existing values when they may be overwritten
+        existing: Dict[str, ConfigInDB] = {}
+        if overwrite and existing_docs:
+            existing = await asyncio.to_thread(
+                lambda: {key: cls._doc_to_model(doc) for key, doc in existing_docs.items()}
+            )
+
+        now = datetime.utcnow()
+        # Each planned write: (key, action, new doc or $set, plaintext value, existing)
+        planned: List[tuple] = []
+        skipped = 0
+
+        for key, config_dict in entries.items():
             try:
-                key = config_dict.get("key")
-                if not key:
-                    results["errors"].append("Missing key in config")
-                    continue
-
-                existing = await cls.get_by_key(key)
-
-                if existing:
-                    if overwrite:
-                        # Update existing
-                        update_data = ConfigUpdate(
-                            value=config_dict.get("value"),
-                            description=config_dict.get("description"),
-                            is_sensitive=config_dict.get("is_sensitive"),
-                            metadata=config_dict.get("metadata"),
+                if key in existing_docs:
+                    if not overwrite:
+                        results["changes"].append(
+                            ConfigImportChange(key=key, action=ConfigImportAction.SKIP)
+                        )
+                        skipped += 1
+                        continue
+
+                    current = existing[key]
+                    update_data = ConfigUpdate(
+                        value=config_dict.get("value"),
+                        description=config_dict.get("description"),
+                        is_sensitive=config_dict.get("is_sensitive"),
+                        validation_type=config_dict.get("validation_type"),
+                        default_value=config_dict.get("default_value"),
+                        metadata=config_dict.get("metadata"),
+                    )
+                    changed_fields = [
+                        field
+                        for field in update_data.model_dump(exclude_none=True)
+                        if getattr(update_data, field) != getattr(current, field)
+                    ]
+                    if not changed_fields:
+                        results["changes"].append(
+                            ConfigImportChange(key=key, action=ConfigImportAction.UNCHANGED)
                         )
-                        await cls.update(existing.config_id, update_data, admin_id)
-                        results["updated"] += 1
-                    else:
-                        results["skipped"] += 1
+                        skipped += 1
+                        continue
+
+                    results["changes"].append(ConfigImportChange(
+                        key=key, action=ConfigImportAction.UPDATE, changed_fields=changed_fields
+                    ))
+                    planned.append((
+                        key,
+                        ConfigImportAction.UPDATE,
+                        cls._build_update_doc(current, update_data, changed_fields, admin_id, now),
+                        update_data.value,
+                        current,
+                    ))
                 else:
-                    # Create new
                     create_data = ConfigCreate(
                         key=key,
                         value=config_dict.get("value", ""),
@@ -357,21 +445,176 @@ class ConfigRepository:
                         default_value=config_dict.get("default_value"),
                         metadata=config_dict.get("metadata"),
                     )
-                    await cls.create(create_data, admin_id)
-                    results["created"] += 1
+                    results["changes"].append(
+                        ConfigImportChange(key=key, action=ConfigImportAction.CREATE)
+                    )
+                    planned.append((
+                        key,
+                        ConfigImportAction.CREATE,
+                        cls._build_new_doc(create_data, create_data.value, admin_id, now),
+                        create_data.value,
+                        None,
+                    ))
 
             except Exception as e:
-                results["errors"].append(f"Error importing {config_dict.get('key', 'unknown')}: {str(e)}")
+                results["errors"].append(f"Error importing {key}: {str(e)}")
+
+        if dry_run or not planned:
+            results["created"] = sum(1 for p in planned if p[1] == ConfigImportAction.CREATE)
+            results["updated"] = sum(1 for p in planned if p[1] == ConfigImportAction.UPDATE)
+            results["skipped"] = skipped
+            return results
+
+        # Encrypt every sensitive value in one pass off the event loop
+        to_encrypt = [
+            (doc, doc["value"]) for _, _, doc, _, _ in planned if "value" in doc and doc.get("is_encrypted")
+        ]
+        if to_encrypt:
+            ciphertexts = await asyncio.to_thread(
+                EncryptionService.encrypt_many, [value for _, value in to_encrypt]
+            )
+            for (doc, _), ciphertext in zip(to_encrypt, ciphertexts):
+                doc["value"] = ciphertext
+
+        operations = []
+        for key, action, doc, _, current in planned:
+            if action == ConfigImportAction.CREATE:
+                # Upsert on key so a concurrent create turns into a skip, not a duplicate key error
+                operations.append(UpdateOne({"key": key}, {"$setOnInsert": doc}, upsert=True))
+            else:
+                operations.append(UpdateOne({"config_id": current.config_id}, {"$set": doc}))
+
+        use_transaction = transactional and MongoDB.supports_transactions()
+        results["transactional"] = use_transaction
+
+        try:
+            if use_transaction:
+                async with await MongoDB.client.start_session() as session:
+                    async with session.start_transaction():
+                        result = await collection.bulk_write(operations, ordered=True, session=session)
+                        upserted, failed = set(result.upserted_ids), {}
+                        applied = cls._applied_operations(planned, upserted, failed)
+                        await ConfigAuditRepository.log_changes(
+                            cls._build_import_audits(applied, admin_id, ip_address, user_agent),
+                            session=session,
+                        )
+            else:
+                try:
+                    result = await collection.bulk_write(operations, ordered=False)
+                    upserted, failed = set(result.upserted_ids), {}
+                except BulkWriteError as e:
+                    upserted = {doc["index"] for doc in e.details.get("upserted", [])}
+                    failed = {err["index"]: err["errmsg"] for err in e.details.get("writeErrors", [])}
+                    for index, message in failed.items():
+                        results["errors"].append(f"Error importing {planned[index][0]}: {message}")
+
+                applied = cls._applied_operations(planned, upserted, failed)
+                await ConfigAuditRepository.log_changes(
+                    cls._build_import_audits(applied, admin_id, ip_address, user_agent)
+                )
+
+        except Exception as e:
+            logger.error(f"Config import failed: {e}")
+            if use_transaction:
+                results["errors"].append(f"Import rolled back, no changes applied: {str(e)}")
+            else:
+                results["errors"].append(f"Import failed: {str(e)}")
+            results["skipped"] = skipped
+            return results
 
+        cls.invalidate_cache()
+
+        lost_creates = sum(
+            1 for index, (_, action, _, _, _) in enumerate(planned)
+            if action == ConfigImportAction.CREATE and index not in upserted and index not in failed
+        )
+        results["created"] = sum(1 for p in applied if p[1] == ConfigImportAction.CREATE)
+        results["updated"] = sum(1 for p in applied if p[1] == ConfigImportAction.UPDATE)
+        # Creates lost to a concurrent writer count as skipped
+        results["skipped"] = skipped + lost_creates
+
+        logger.info(
+            f"Config import by {admin_id}: {results['created']} created, "
+            f"{results['updated']} updated, {results['skipped']} skipped"
+        )
         return results
 
+    @staticmethod
+    def _build_update_doc(
+        current: ConfigInDB,
+        update_data: ConfigUpdate,
+        changed_fields: List[str],
+        admin_id: str,
+        now: datetime,
+    ) -> dict:
+        """Build the ``$set`` document for an imported update (value left in plaintext)."""
+        update_doc: Dict[str, Any] = {"updated_at": now, "updated_by": admin_id}
+
+        for field in changed_fields:
+            if field == "value":
+                continue
+            value = getattr(update_data, field)
+            update_doc[field] = value.value if isinstance(value, Enum) else value
+
+        if update_data.value is not None and (
+            "value" in changed_fields or "is_sensitive" in changed_fields
+        ):
+            is_sensitive = (
+                update_data.is_sensitive if update_data.is_sensitive is not None else current.is_sensitive
+            )
+            update_doc["value"] = update_data.value
+            update_doc["is_encrypted"] = is_sensitive
+
+        return update_doc
+
+    @staticmethod
+    def _applied_operations(
+        planned: List[tuple], upserted: Set[int], failed: Dict[int, str]
+    ) -> List[tuple]:
+        """Filter planned writes down to those the bulk write actually applied."""
+        return [
+            entry for index, entry in enumerate(planned)
+            if index not in failed
+            and (entry[1] != ConfigImportAction.CREATE or index in upserted)
+        ]
+
+    @staticmethod
+    def _build_import_audits(
+        applied: List[tuple], admin_id: str, ip_address: str, user_agent: str
+    ) -> List[dict]:
+        """Build audit documents for applied import writes."""
+        audits = []
+        for key, action, doc, value, current in applied:
+            if action == ConfigImportAction.CREATE:
+                audits.append(ConfigAuditRepository.build_audit_doc(
+                    config_id=doc["config_id"],
+                    config_key=key,
+                    action=ConfigAuditAction.CREATE,
+                    previous_value=None,
+                    new_value=value,
+                    admin_id=admin_id,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                ))
+            else:
+                audits.append(ConfigAuditRepository.build_audit_doc(
+                    config_id=current.config_id,
+                    config_key=key,
+                    action=ConfigAuditAction.UPDATE,
+                    previous_value=current.value,
+                    new_value=value if value is not None else current.value,
+                    admin_id=admin_id,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                ))
+        return audits
+
 
 class ConfigAuditRepository:
     """Repository for configuration audit logging."""
 
-    @classmethod
-    async def log_change(
-        cls,
+    @staticmethod
+    def build_audit_doc(
         config_id: str,
         config_key: str,
         action: ConfigAuditAction,
@@ -380,12 +623,10 @@ class ConfigAuditRepository:
         admin_id: str,
         ip_address: str,
         user_agent: str,
-    ) -> None:
-        """Log a configuration change."""
-        collection = get_config_audit_collection()
+    ) -> dict:
+        """Build an audit document (values are stored as hashes only)."""
         now = datetime.utcnow()
-
-        doc = {
+        return {
             "audit_id": _generate_audit_id(),
             "config_id": config_id,
             "config_key": config_key,
@@ -399,11 +640,49 @@ class ConfigAuditRepository:
             "expires_at": now + timedelta(days=365),  # TTL: 365 days
         }
 
+    @classmethod
+    async def log_change(
+        cls,
+        config_id: str,
+        config_key: str,
+        action: ConfigAuditAction,
+        previous_value: Optional[str],
+        new_value: Optional[str],
+        admin_id: str,
+        ip_address: str,
+        user_agent: str,
+    ) -> None:
+        """Log a configuration change."""
+        collection = get_config_audit_collection()
+        doc = cls.build_audit_doc(
+            config_id, config_key, action, previous_value, new_value,
+            admin_id, ip_address, user_agent,
+        )
+
         try:
             await collection.insert_one(doc)
         except Exception as e:
             logger.error(f"Failed to log config audit: {e}")
 
+    @classmethod
+    async def log_changes(cls, docs: List[dict], session=None) -> None:
+        """
+        Insert a batch of audit documents built with ``build_audit_doc``.
+
+        Inside a transaction (``session`` given) failures propagate so the
+        whole import rolls back; otherwise they are logged like ``log_change``.
+        """
+        if not docs:
+            return
+
+        collection = get_config_audit_collection()
+        try:
+            await collection.insert_many(docs, ordered=False, session=session)
+        except Exception as e:
+            if session is not None:
+                raise
+            logger.error(f"Failed to log {len(docs)} config audits: {e}")
+
     @classmethod
     async def get_history(
         cls, config_id: str, limit: int = 50
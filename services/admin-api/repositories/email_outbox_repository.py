@@ -0,0 +1,200 @@
+"""
+Repository for the MongoDB-backed email outbox.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from pymongo import ReturnDocument
+
+from config import settings
+from database.connection import get_email_outbox_collection
+from models.email_outbox import (
+    EmailStatus,
+    EmailOutboxCreate,
+    EmailOutboxInDB,
+    EmailOutboxStats,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_email_id() -> str:
+    """Generate a unique outbox entry ID."""
+    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    unique_part = uuid.uuid4().hex[:8]
+    return f"EMAIL_{timestamp}_{unique_part}"
+
+
+def _due_filter(now: datetime) -> dict:
+    """Filter for messages ready to be (re)claimed by a worker."""
+    return {
+        "$or": [
+            {"status": EmailStatus.PENDING.value, "next_attempt_at": {"$lte": now}},
+            # Lease expired: the worker that claimed it died mid-send
+            {"status": EmailStatus.SENDING.value, "locked_until": {"$lt": now}},
+        ]
+    }
+
+
+class EmailOutboxRepository:
+    """Repository for email outbox operations."""
+
+    @classmethod
+    async def enqueue(cls, email: EmailOutboxCreate) -> EmailOutboxInDB:
+        """
+        Add an email to the outbox.
+
+        Args:
+            email: Email to enqueue
+
+        Returns:
+            The stored outbox entry
+        """
+        collection = get_email_outbox_collection()
+        now = datetime.utcnow()
+
+        entry = EmailOutboxInDB(
+            email_id=_generate_email_id(),
+            created_at=now,
+            next_attempt_at=now,
+            **email.model_dump(),
+        )
+        doc = entry.model_dump()
+        doc["status"] = entry.status.value
+
+        await collection.insert_one(doc)
+        logger.debug(f"Enqueued email {entry.email_id} to {entry.to_email}")
+
+        return entry
+
+    @classmethod
+    async def claim_batch(cls, limit: int) -> List[EmailOutboxInDB]:
+        """
+        Atomically claim up to ``limit`` due messages for delivery.
+
+        Uses a per-call claim ID so the batch is claimed in three round
+        trips regardless of size, and concurrent workers never share a message.
+        """
+        collection = get_email_outbox_collection()
+        now = datetime.utcnow()
+
+        cursor = (
+            collection.find(_due_filter(now), {"email_id": 1})
+            .sort("next_attempt_at", 1)
+            .limit(limit)
+        )
+        candidate_ids = [doc["email_id"] async for doc in cursor]
+        if not candidate_ids:
+            return []
+
+        claim_id = uuid.uuid4().hex
+        locked_until = now + timedelta(seconds=settings.email_outbox_lease_seconds)
+
+        await collection.update_many(
+            {"email_id": {"$in": candidate_ids}, **_due_filter(now)},
+            {
+                "$set": {
+                    "status": EmailStatus.SENDING.value,
+                    "locked_until": locked_until,
+                    "claim_id": claim_id,
+                },
+                "$inc": {"attempts": 1},
+            },
+        )
+
+        claimed = []
+        async for doc in collection.find({"claim_id": claim_id}).sort("next_attempt_at", 1):
+            doc.pop("_id", None)
+            doc.pop("claim_id", None)
+            claimed.append(EmailOutboxInDB(**doc))
+
+        return claimed
+
+    @classmethod
+    async def mark_sent(cls, email_ids: List[str]) -> int:
+        """Mark delivered messages as sent and schedule them for TTL expiry."""
+        if not email_ids:
+            return 0
+
+        collection = get_email_outbox_collection()
+        now = datetime.utcnow()
+
+        result = await collection.update_many(
+            {"email_id": {"$in": email_ids}},
+            {
+                "$set": {
+                    "status": EmailStatus.SENT.value,
+                    "sent_at": now,
+                    "locked_until": None,
+                    "last_error": None,
+                    "expires_at": now + timedelta(days=settings.email_outbox_retention_days),
+                },
+                "$unset": {"claim_id": ""},
+            },
+        )
+        return result.modified_count
+
+    @classmethod
+    async def mark_failed(cls, email: EmailOutboxInDB, error: str) -> EmailOutboxInDB:
+        """
+        Record a failed delivery attempt.
+
+        Reschedules with exponential backoff, or dead-letters the message
+        once ``email_outbox_max_attempts`` is reached.
+        """
+        collection = get_email_outbox_collection()
+        now = datetime.utcnow()
+
+        if email.attempts >= settings.email_outbox_max_attempts:
+            update = {
+                "status": EmailStatus.FAILED.value,
+                "locked_until": None,
+                "last_error": error,
+                "expires_at": now + timedelta(days=settings.email_outbox_retention_days),
+            }
+            logger.error(
+                f"Email {email.email_id} to {email.to_email} failed permanently "
+                f"after {email.attempts} attempts: {error}"
+            )
+        else:
+            delay = min(
+                settings.email_outbox_backoff_base * (2 ** (email.attempts - 1)),
+                settings.email_outbox_backoff_max,
+            )
+            update = {
+                "status": EmailStatus.PENDING.value,
+                "locked_until": None,
+                "last_error": error,
+                "next_attempt_at": now + timedelta(seconds=delay),
+            }
+            logger.warning(
+                f"Email {email.email_id} attempt {email.attempts} failed, "
+                f"retrying in {delay:.0f}s: {error}"
+            )
+
+        doc = await collection.find_one_and_update(
+            {"email_id": email.email_id},
+            {"$set": update, "$unset": {"claim_id": ""}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return email
+
+        doc.pop("_id", None)
+        return EmailOutboxInDB(**doc)
+
+    @classmethod
+    async def get_stats(cls) -> EmailOutboxStats:
+        """Get per-status outbox counts."""
+        collection = get_email_outbox_collection()
+
+        stats = EmailOutboxStats()
+        pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+        async for doc in collection.aggregate(pipeline):
+            if doc["_id"] in EmailOutboxStats.model_fields:
+                setattr(stats, doc["_id"], doc["count"])
+
+        return stats
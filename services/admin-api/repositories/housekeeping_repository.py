@@ -2,10 +2,13 @@
 Housekeeping repository for managing maintenance tasks.
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
+from config import settings
 from database.connection import MongoDB
 from models.housekeeping import (
     HousekeepingTask,
@@ -16,6 +19,7 @@ from models.housekeeping import (
     TaskRunResult,
     HousekeepingTaskConfig,
     DatabaseStats,
+    IndexUsageStats,
 )
 
 logger = logging.getLogger(__name__)
@@ -68,6 +72,11 @@ DEFAULT_TASKS = [
 class HousekeepingRepository:
     """Repository for housekeeping task operations."""
 
+    # Cached database statistics
+    _db_stats_cache: Optional[Dict[str, Any]] = None
+    _db_stats_cached_at: float = 0.0
+    _db_stats_lock: Optional[asyncio.Lock] = None
+
     @staticmethod
     def _get_collection():
         """Get the housekeeping_tasks collection."""
@@ -182,53 +191,163 @@ class HousekeepingRepository:
             },
         )
 
+    @classmethod
+    async def get_database_stats(cls, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get database statistics for all collections.
+
+        Results are cached for ``db_stats_cache_ttl`` seconds; concurrent
+        callers during a refresh share a single computation.
+        """
+        if not refresh and cls._db_stats_is_fresh():
+            return {**cls._db_stats_cache, "cached": True}
+
+        if cls._db_stats_lock is None:
+            cls._db_stats_lock = asyncio.Lock()
+
+        async with cls._db_stats_lock:
+            # Another request may have refreshed while we waited
+            if not refresh and cls._db_stats_is_fresh():
+                return {**cls._db_stats_cache, "cached": True}
+
+            stats = await cls._compute_database_stats()
+            cls._db_stats_cache = stats
+            cls._db_stats_cached_at = time.monotonic()
+            return {**stats, "cached": False}
+
+    @classmethod
+    def _db_stats_is_fresh(cls) -> bool:
+        """Check if the cached database statistics are still valid."""
+        return (
+            cls._db_stats_cache is not None
+            and time.monotonic() - cls._db_stats_cached_at < settings.db_stats_cache_ttl
+        )
+
     @staticmethod
-    async def get_database_stats() -> Dict[str, Any]:
-        """Get database statistics for all collections."""
+    async def _compute_database_stats() -> Dict[str, Any]:
+        """Collect $collStats and $indexStats for every collection concurrently."""
         db = MongoDB.get_database()
 
-        # Get list of collections
-        collection_names = await db.list_collection_names()
-
-        stats_list = []
-        total_docs = 0
-        total_storage = 0
-
-        for coll_name in collection_names:
-            try:
-                stats = await db.command("collStats", coll_name)
-
-                doc_count = stats.get("count", 0)
-                storage_size = stats.get("storageSize", 0)
-                avg_doc_size = stats.get("avgObjSize", 0)
-                index_count = stats.get("nindexes", 0)
-                index_size = stats.get("totalIndexSize", 0)
-
-                stats_list.append(
-                    DatabaseStats(
-                        collection_name=coll_name,
-                        document_count=doc_count,
-                        storage_size_mb=round(storage_size / (1024 * 1024), 2),
-                        avg_document_size_bytes=round(avg_doc_size, 2),
-                        index_count=index_count,
-                        index_size_mb=round(index_size / (1024 * 1024), 2),
-                    )
-                )
+        # Views have no storage of their own and reject $collStats
+        collection_names = await db.list_collection_names(filter={"type": "collection"})
+        semaphore = asyncio.Semaphore(settings.db_stats_concurrency)
 
-                total_docs += doc_count
-                total_storage += storage_size
+        async def collect(coll_name: str) -> Optional[Tuple[DatabaseStats, int, int]]:
+            async with semaphore:
+                try:
+                    return await HousekeepingRepository._get_collection_stats(db, coll_name)
+                except Exception as e:
+                    logger.warning(f"Could not get stats for collection {coll_name}: {e}")
+                    return None
 
-            except Exception as e:
-                logger.warning(f"Could not get stats for collection {coll_name}: {e}")
+        results = [r for r in await asyncio.gather(*(collect(name) for name in collection_names)) if r is not None]
+        stats_list = [stats for stats, _, _ in results]
+        # Totals from raw bytes, rounded once like the per-collection figures
+        total_storage = sum(storage_size for _, storage_size, _ in results)
+        total_index_size = sum(index_size for _, _, index_size in results)
 
         # Sort by document count descending
         stats_list.sort(key=lambda x: x.document_count, reverse=True)
 
+        unused_indexes = [
+            f"{stats.collection_name}.{index.name}"
+            for stats in stats_list
+            for index in stats.indexes
+            if index.unused
+        ]
+
         return {
             "database_name": db.name,
             "total_collections": len(collection_names),
-            "total_documents": total_docs,
+            "total_documents": sum(stats.document_count for stats in stats_list),
             "total_storage_mb": round(total_storage / (1024 * 1024), 2),
+            "total_index_size_mb": round(total_index_size / (1024 * 1024), 2),
             "collections": stats_list,
+            "unused_indexes": unused_indexes,
             "generated_at": datetime.utcnow(),
         }
+
+    @staticmethod
+    async def _get_collection_stats(db, coll_name: str) -> Tuple[DatabaseStats, int, int]:
+        """
+        Get storage and index usage for one collection.
+
+        ``$collStats`` and ``$indexStats`` return one document per shard on
+        sharded clusters, so figures are summed across documents. Returns
+        the stats with the storage and index sizes in bytes, for totals.
+        """
+        collection = db[coll_name]
+        coll_stats_docs, index_stats_docs = await asyncio.gather(
+            collection.aggregate(
+                [{"$collStats": {"storageStats": {"scale": 1}}}]
+            ).to_list(length=None),
+            collection.aggregate([{"$indexStats": {}}]).to_list(length=None),
+        )
+
+        doc_count = 0
+        storage_size = 0
+        data_size = 0
+        index_count = 0
+        index_size = 0
+        index_sizes: Dict[str, int] = {}
+        for doc in coll_stats_docs:
+            storage = doc.get("storageStats", {})
+            doc_count += storage.get("count", 0)
+            storage_size += storage.get("storageSize", 0)
+            data_size += storage.get("size", 0)
+            index_count = max(index_count, storage.get("nindexes", 0))
+            index_size += storage.get("totalIndexSize", 0)
+            for name, size in storage.get("indexSizes", {}).items():
+                index_sizes[name] = index_sizes.get(name, 0) + size
+
+        accesses: Dict[str, int] = {}
+        accesses_since: Dict[str, datetime] = {}
+        specs: Dict[str, Dict[str, Any]] = {}
+        for doc in index_stats_docs:
+            name = doc["name"]
+            access = doc.get("accesses", {})
+            accesses[name] = accesses.get(name, 0) + int(access.get("ops", 0))
+            # Latest reset across shards: every counter covers the time since
+            since = access.get("since")
+            if since is not None and (name not in accesses_since or since > accesses_since[name]):
+                accesses_since[name] = since
+            specs.setdefault(name, doc.get("spec", {}))
+
+        now = datetime.utcnow()
+        min_observed = timedelta(hours=settings.index_advisor_unused_min_hours)
+
+        def is_unused(name: str) -> bool:
+            # Unique, TTL, sparse and partial indexes do their work without
+            # $indexStats accesses; like the index advisor, never flag them
+            spec = specs.get(name)
+            if name == "_id_" or spec is None or accesses[name] != 0:
+                return False
+            if spec.get("unique") or "expireAfterSeconds" in spec:
+                return False
+            if spec.get("sparse") or spec.get("partialFilterExpression"):
+                return False
+            # Counters reset on restart; zero means little until they have run a while
+            since = accesses_since.get(name)
+            return since is not None and now - since >= min_observed
+
+        indexes = [
+            IndexUsageStats(
+                name=name,
+                size_mb=round(index_sizes.get(name, 0) / (1024 * 1024), 2),
+                accesses=accesses.get(name, 0),
+                accesses_since=accesses_since.get(name),
+                unused=is_unused(name),
+            )
+            for name in sorted(set(index_sizes) | set(accesses))
+        ]
+
+        stats = DatabaseStats(
+            collection_name=coll_name,
+            document_count=doc_count,
+            storage_size_mb=round(storage_size / (1024 * 1024), 2),
+            avg_document_size_bytes=round(data_size / doc_count, 2) if doc_count else 0,
+            index_count=index_count,
+            index_size_mb=round(index_size / (1024 * 1024), 2),
+            indexes=indexes,
+        )
+        return stats, storage_size, index_size
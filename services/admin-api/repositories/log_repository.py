@@ -4,15 +4,17 @@ Repository for HTTP request log management.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
+from typing import AsyncIterator, Optional, List, Tuple
 import uuid
 
-from database.connection import get_logs_collection
+from database.connection import Collections, get_logs_collection, get_analytics_collection
+from database.rows import fetch_rows, iter_rows, projection
 from models.log import (
     LogCreate,
     LogInDB,
     LogLevel,
     LogFilter,
+    LogResponse,
     ErrorAggregation,
 )
 
@@ -21,6 +23,17 @@ logger = logging.getLogger(__name__)
 # Default log retention in days
 DEFAULT_LOG_RETENTION_DAYS = 30
 
+# Fields read by the row-mode list and export queries
+LOG_LIST_FIELDS = tuple(LogResponse.model_fields)
+LOG_EXPORT_FIELDS = (
+    "log_id", "timestamp", "level", "message", "service", "request_id",
+    "endpoint", "method", "status_code", "duration_ms", "ip_address",
+    "user_agent", "admin_id", "error_type", "error_message",
+)
+
+# Documents per cursor batch when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
 
 def _generate_log_id() -> str:
     """Generate a unique log ID."""
@@ -139,22 +152,8 @@ class LogRepository:
         return None
 
     @classmethod
-    async def get_paginated(
-        cls,
-        filter_params: LogFilter,
-    ) -> Tuple[List[LogInDB], int]:
-        """
-        Get paginated log entries with filtering.
-
-        Args:
-            filter_params: Filter criteria
-
-        Returns:
-            Tuple of (list of logs, total count)
-        """
-        collection = get_logs_collection()
-
-        # Build query
+    def build_query(cls, filter_params: LogFilter) -> dict:
+        """Build the MongoDB filter for list and export reads."""
         query = {}
 
         if filter_params.level:
@@ -191,23 +190,7 @@ class LogRepository:
                 {"error_message": {"$regex": filter_params.search, "$options": "i"}},
             ]
 
-        # Calculate pagination
-        skip = (filter_params.page - 1) * filter_params.page_size
-
-        # Execute query
-        cursor = (
-            collection.find(query)
-            .sort("timestamp", -1)
-            .skip(skip)
-            .limit(filter_params.page_size)
-        )
-
-        docs = await cursor.to_list(length=filter_params.page_size)
-        total = await collection.count_documents(query)
-
-        logs = [cls._doc_to_model(doc) for doc in docs]
-
-        return logs, total
+        return query
 
     @classmethod
     async def get_recent(cls, limit: int = 100) -> List[LogInDB]:
@@ -235,7 +218,7 @@ class LogRepository:
         Returns:
             List of error aggregations
         """
-        collection = get_logs_collection()
+        collection = get_analytics_collection(Collections.LOGS)
         since = datetime.utcnow() - timedelta(hours=hours)
 
         pipeline = [
@@ -284,7 +267,7 @@ class LogRepository:
         Returns:
             Dictionary of level -> count
         """
-        collection = get_logs_collection()
+        collection = get_analytics_collection(Collections.LOGS)
         since = datetime.utcnow() - timedelta(hours=hours)
 
         pipeline = [
@@ -320,42 +303,43 @@ class LogRepository:
         return result.deleted_count
 
     @classmethod
-    async def export_logs(
+    async def get_paginated_rows(
         cls,
         filter_params: LogFilter,
-        max_records: int = 10000,
-    ) -> List[LogInDB]:
+    ) -> Tuple[List[dict], int]:
         """
-        Export logs for download.
+        Get a page of logs as plain rows shaped like LogResponse.
 
-        Args:
-            filter_params: Filter criteria
-            max_records: Maximum records to export
-
-        Returns:
-            List of log entries
+        Skips building a LogInDB per document; see database/rows.py.
         """
         collection = get_logs_collection()
+        query = cls.build_query(filter_params)
+        skip = (filter_params.page - 1) * filter_params.page_size
 
-        # Build query (same as get_paginated)
-        query = {}
+        cursor = (
+            collection.find(query, projection(LOG_LIST_FIELDS))
+            .sort("timestamp", -1)
+            .skip(skip)
+            .limit(filter_params.page_size)
+        )
 
-        if filter_params.level:
-            query["level"] = filter_params.level.value
-        if filter_params.endpoint:
-            query["endpoint"] = {"$regex": filter_params.endpoint, "$options": "i"}
-        if filter_params.method:
-            query["method"] = filter_params.method.upper()
-        if filter_params.status_code:
-            query["status_code"] = filter_params.status_code
-        if filter_params.start_time or filter_params.end_time:
-            query["timestamp"] = {}
-            if filter_params.start_time:
-                query["timestamp"]["$gte"] = filter_params.start_time
-            if filter_params.end_time:
-                query["timestamp"]["$lte"] = filter_params.end_time
+        rows = await fetch_rows(cursor, LOG_LIST_FIELDS, filter_params.page_size)
+        total = await collection.count_documents(query)
 
-        cursor = collection.find(query).sort("timestamp", -1).limit(max_records)
-        docs = await cursor.to_list(length=max_records)
+        return rows, total
 
-        return [cls._doc_to_model(doc) for doc in docs]
+    @classmethod
+    def iter_export_rows(
+        cls,
+        filter_params: LogFilter,
+        max_records: int = 10000,
+    ) -> AsyncIterator[dict]:
+        """Stream logs for download as plain rows, without loading them all."""
+        collection = get_logs_collection()
+        cursor = (
+            collection.find(cls.build_query(filter_params), projection(LOG_EXPORT_FIELDS))
+            .sort("timestamp", -1)
+            .limit(max_records)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
+        return iter_rows(cursor, LOG_EXPORT_FIELDS)
@@ -3,13 +3,17 @@ Solutions repository for MongoDB-based CRUD operations.
 Supports migration from file-based solutions and full CRUD.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from pymongo import UpdateOne
+
 from database.connection import MongoDB
 from models.solution import (
     Solution,
@@ -26,6 +30,9 @@ from models.solution_override import SolutionOverrideInDB
 
 logger = logging.getLogger(__name__)
 
+# Maximum solution.json files read/parsed at once during seeding
+SEED_PARSE_CONCURRENCY = 16
+
 
 class SolutionsRepository:
     """
@@ -43,79 +50,165 @@ class SolutionsRepository:
         return MongoDB.get_database()["solutions"]
 
     @staticmethod
-    async def seed_from_files(solutions_dir: str = "/app/solutions") -> int:
+    def _load_solution_file(solution_file: Path) -> Optional[Tuple[str, str, dict]]:
+        """
+        Read and parse a solution.json file (runs on a worker thread).
+
+        Returns (solution_id, content_hash, data), or None if the file has no ID.
+        """
+        raw = solution_file.read_bytes()
+        data = json.loads(raw)
+
+        solution_id = data.get("id")
+        if not solution_id:
+            return None
+
+        return solution_id, hashlib.sha256(raw).hexdigest(), data
+
+    @staticmethod
+    def _file_fields(data: dict) -> dict:
+        """Map solution.json fields to solution document fields."""
+        return {
+            "name": data.get("name", ""),
+            "partner": {
+                "name": data.get("partner", {}).get("name", ""),
+                "logo": data.get("partner", {}).get("logo", "/logos/placeholder.svg"),
+                "website": data.get("partner", {}).get("website", ""),
+            },
+            "description": data.get("description", ""),
+            "long_description": data.get("longDescription"),
+            "value_proposition": data.get("valueProposition", []),
+            "technologies": data.get("technologies", []),
+            "category": data.get("category", "Uncategorized"),
+            "demo_url": data.get("demoUrl", ""),
+            "source_url": data.get("sourceUrl", ""),
+            "documentation": data.get("documentation"),
+            "ports": data.get("ports"),
+            "status": data.get("status", "active"),
+            "featured": data.get("featured", False),
+        }
+
+    @staticmethod
+    async def seed_from_files(
+        solutions_dir: str = "/app/solutions",
+        max_concurrency: int = SEED_PARSE_CONCURRENCY,
+    ) -> int:
         """
         Seed solutions from solution.json files into MongoDB.
-        Only seeds solutions that don't already exist.
 
-        Returns the number of solutions seeded.
+        Files are read and hashed concurrently off the event loop. Existing
+        content hashes are fetched in one query and only new or changed
+        solutions are written, in a single unordered ``bulk_write``:
+
+        - new solution: inserted
+        - file changed and solution never edited through the admin API:
+          file-derived fields refreshed
+        - unchanged, or edited by an admin: left untouched
+
+        Returns the number of solutions inserted or updated.
         """
         collection = SolutionsRepository._get_collection()
         solutions_path = Path(solutions_dir)
-        seeded = 0
 
         if not solutions_path.exists():
             logger.warning(f"Solutions directory not found: {solutions_dir}")
             return 0
 
-        for solution_dir in solutions_path.iterdir():
-            if not solution_dir.is_dir():
-                continue
+        solution_files = await asyncio.to_thread(
+            lambda: [
+                d / "solution.json"
+                for d in solutions_path.iterdir()
+                if d.is_dir() and (d / "solution.json").exists()
+            ]
+        )
+        if not solution_files:
+            return 0
 
-            solution_file = solution_dir / "solution.json"
-            if not solution_file.exists():
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _load(solution_file: Path):
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(
+                        SolutionsRepository._load_solution_file, solution_file
+                    )
+                except Exception as e:
+                    logger.error(f"Error seeding solution from {solution_file}: {e}")
+                    return None
+
+        parsed: Dict[str, Tuple[str, dict]] = {}
+        for result in await asyncio.gather(*(_load(f) for f in solution_files)):
+            if result is None:
                 continue
+            solution_id, content_hash, data = result
+            parsed[solution_id] = (content_hash, data)
+
+        if not parsed:
+            return 0
 
-            try:
-                with open(solution_file, "r") as f:
-                    data = json.load(f)
+        # One round trip for all existing hashes
+        existing = {}
+        cursor = collection.find(
+            {"solution_id": {"$in": list(parsed.keys())}},
+            {"solution_id": 1, "source_hash": 1, "is_from_file": 1, "updated_by": 1},
+        )
+        async for doc in cursor:
+            existing[doc["solution_id"]] = doc
+
+        now = datetime.utcnow()
+        operations = []
+
+        for solution_id, (content_hash, data) in parsed.items():
+            fields = SolutionsRepository._file_fields(data)
+            current = existing.get(solution_id)
+
+            if current is None:
+                operations.append(UpdateOne(
+                    {"solution_id": solution_id},
+                    {"$setOnInsert": {
+                        "solution_id": solution_id,
+                        **fields,
+                        "source_hash": content_hash,
+                        "created_at": now,
+                        "updated_at": now,
+                        "created_by": None,
+                        "updated_by": None,
+                        "is_from_file": True,
+                    }},
+                    upsert=True,
+                ))
+                continue
 
-                solution_id = data.get("id")
-                if not solution_id:
-                    continue
+            if current.get("source_hash") == content_hash:
+                continue
 
-                # Check if already exists
-                existing = await collection.find_one({"solution_id": solution_id})
-                if existing:
-                    continue
+            # Never clobber solutions created or edited through the admin API
+            if not current.get("is_from_file") or current.get("updated_by") is not None:
+                continue
 
-                # Parse and create solution
-                now = datetime.utcnow()
-                solution_doc = {
+            operations.append(UpdateOne(
+                # Re-check in the filter so a concurrent admin edit wins
+                {
                     "solution_id": solution_id,
-                    "name": data.get("name", ""),
-                    "partner": {
-                        "name": data.get("partner", {}).get("name", ""),
-                        "logo": data.get("partner", {}).get("logo", "/logos/placeholder.svg"),
-                        "website": data.get("partner", {}).get("website", ""),
-                    },
-                    "description": data.get("description", ""),
-                    "long_description": data.get("longDescription"),
-                    "value_proposition": data.get("valueProposition", []),
-                    "technologies": data.get("technologies", []),
-                    "category": data.get("category", "Uncategorized"),
-                    "demo_url": data.get("demoUrl", ""),
-                    "source_url": data.get("sourceUrl", ""),
-                    "documentation": data.get("documentation"),
-                    "ports": data.get("ports"),
-                    "status": data.get("status", "active"),
-                    "featured": data.get("featured", False),
-                    "created_at": now,
-                    "updated_at": now,
-                    "created_by": None,
-                    "updated_by": None,
                     "is_from_file": True,
-                }
+                    "updated_by": None,
+                    "source_hash": current.get("source_hash"),
+                },
+                {"$set": {**fields, "source_hash": content_hash, "updated_at": now}},
+            ))
 
-                await collection.insert_one(solution_doc)
-                seeded += 1
-                logger.info(f"Seeded solution: {solution_id}")
+        if not operations:
+            logger.debug(f"Solution seed: {len(parsed)} files unchanged")
+            return 0
 
-            except Exception as e:
-                logger.error(f"Error seeding solution from {solution_file}: {e}")
-                continue
+        result = await collection.bulk_write(operations, ordered=False)
+        applied = result.upserted_count + result.modified_count
 
-        return seeded
+        logger.info(
+            f"Solution seed: {result.upserted_count} inserted, "
+            f"{result.modified_count} updated, {len(parsed) - len(operations)} unchanged"
+        )
+        return applied
 
     @staticmethod
     async def create(data: SolutionCreate, created_by: str) -> SolutionInDB:
@@ -5,9 +5,10 @@ Telemetry repository for usage tracking and analytics.
 import logging
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple, Dict, Any
+from typing import AsyncIterator, List, Optional, Tuple, Dict, Any
 
 from database.connection import MongoDB
+from database.rows import fetch_rows, iter_rows, projection
 from models.telemetry import (
     TelemetryCreate,
     TelemetryInDB,
@@ -17,6 +18,7 @@ from models.telemetry import (
     PercentileStats,
     TimeSeriesDataPoint,
     TopEndpointStats,
+    TelemetryResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,17 @@ logger = logging.getLogger(__name__)
 # Default retention period in days
 DEFAULT_RETENTION_DAYS = 90
 
+# Fields read by the row-mode list and export queries
+TELEMETRY_LIST_FIELDS = tuple(TelemetryResponse.model_fields)
+TELEMETRY_EXPORT_FIELDS = (
+    "event_id", "timestamp", "event_type", "partner_demo", "solution_id",
+    "session_id", "endpoint", "method", "status_code", "duration_ms",
+    "tokens_used", "ip_address",
+)
+
+# Documents per cursor batch when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
 
 class TelemetryRepository:
     """Repository for telemetry operations."""
@@ -33,6 +46,11 @@ class TelemetryRepository:
         """Get the telemetry collection."""
         return MongoDB.get_database()["telemetry"]
 
+    @staticmethod
+    def _get_analytics_collection():
+        """Get the telemetry collection with the analytics read preference."""
+        return MongoDB.get_analytics_collection("telemetry")
+
     @staticmethod
     def _generate_event_id() -> str:
         """Generate a unique event ID."""
@@ -80,13 +98,8 @@ class TelemetryRepository:
         return event
 
     @staticmethod
-    async def get_paginated(
-        filter_params: TelemetryFilter,
-    ) -> Tuple[List[TelemetryInDB], int]:
-        """Get paginated telemetry events with filtering."""
-        collection = TelemetryRepository._get_collection()
-
-        # Build query
+    def build_query(filter_params: TelemetryFilter) -> Dict[str, Any]:
+        """Build the MongoDB filter for list and export reads."""
         query: Dict[str, Any] = {}
 
         if filter_params.event_type:
@@ -112,24 +125,12 @@ class TelemetryRepository:
             if filter_params.end_time:
                 query["timestamp"]["$lte"] = filter_params.end_time
 
-        # Get total count
-        total = await collection.count_documents(query)
-
-        # Get paginated results
-        skip = (filter_params.page - 1) * filter_params.page_size
-        cursor = collection.find(query).sort("timestamp", -1).skip(skip).limit(filter_params.page_size)
-
-        events = []
-        async for doc in cursor:
-            doc.pop("_id", None)
-            events.append(TelemetryInDB(**doc))
-
-        return events, total
+        return query
 
     @staticmethod
     async def get_usage_stats(hours: int = 24) -> UsageStats:
         """Get overall usage statistics for the specified time range."""
-        collection = TelemetryRepository._get_collection()
+        collection = TelemetryRepository._get_analytics_collection()
 
         since = datetime.utcnow() - timedelta(hours=hours)
         query = {"timestamp": {"$gte": since}}
@@ -194,7 +195,7 @@ class TelemetryRepository:
     @staticmethod
     async def get_percentiles(hours: int = 24) -> PercentileStats:
         """Get response time percentile statistics."""
-        collection = TelemetryRepository._get_collection()
+        collection = TelemetryRepository._get_analytics_collection()
 
         since = datetime.utcnow() - timedelta(hours=hours)
         query = {
@@ -247,7 +248,7 @@ class TelemetryRepository:
         interval: str = "hour",
     ) -> List[TimeSeriesDataPoint]:
         """Get usage data aggregated over time intervals."""
-        collection = TelemetryRepository._get_collection()
+        collection = TelemetryRepository._get_analytics_collection()
 
         since = datetime.utcnow() - timedelta(hours=hours)
 
@@ -306,7 +307,7 @@ class TelemetryRepository:
         limit: int = 20,
     ) -> List[TopEndpointStats]:
         """Get top endpoints by request count."""
-        collection = TelemetryRepository._get_collection()
+        collection = TelemetryRepository._get_analytics_collection()
 
         since = datetime.utcnow() - timedelta(hours=hours)
 
@@ -355,7 +356,7 @@ class TelemetryRepository:
         hours: int = 24,
     ) -> Dict[str, int]:
         """Get event counts by solution."""
-        collection = TelemetryRepository._get_collection()
+        collection = TelemetryRepository._get_analytics_collection()
 
         since = datetime.utcnow() - timedelta(hours=hours)
 
@@ -384,37 +385,44 @@ class TelemetryRepository:
         return result
 
     @staticmethod
-    async def export_events(
+    async def get_paginated_rows(
         filter_params: TelemetryFilter,
-        max_records: int = 10000,
-    ) -> List[TelemetryInDB]:
-        """Export telemetry events for download."""
-        collection = TelemetryRepository._get_collection()
-
-        # Build query
-        query: Dict[str, Any] = {}
-
-        if filter_params.event_type:
-            query["event_type"] = filter_params.event_type.value
+    ) -> Tuple[List[dict], int]:
+        """
+        Get a page of telemetry events as plain rows shaped like TelemetryResponse.
 
-        if filter_params.solution_id:
-            query["solution_id"] = filter_params.solution_id
+        Skips building a TelemetryInDB per document; see database/rows.py.
+        """
+        collection = TelemetryRepository._get_collection()
+        query = TelemetryRepository.build_query(filter_params)
 
-        if filter_params.start_time or filter_params.end_time:
-            query["timestamp"] = {}
-            if filter_params.start_time:
-                query["timestamp"]["$gte"] = filter_params.start_time
-            if filter_params.end_time:
-                query["timestamp"]["$lte"] = filter_params.end_time
+        total = await collection.count_documents(query)
 
-        cursor = collection.find(query).sort("timestamp", -1).limit(max_records)
+        skip = (filter_params.page - 1) * filter_params.page_size
+        cursor = (
+            collection.find(query, projection(TELEMETRY_LIST_FIELDS))
+            .sort("timestamp", -1)
+            .skip(skip)
+            .limit(filter_params.page_size)
+        )
+        rows = await fetch_rows(cursor, TELEMETRY_LIST_FIELDS, filter_params.page_size)
 
-        events = []
-        async for doc in cursor:
-            doc.pop("_id", None)
-            events.append(TelemetryInDB(**doc))
+        return rows, total
 
-        return events
+    @staticmethod
+    def iter_export_rows(
+        filter_params: TelemetryFilter,
+        max_records: int = 10000,
+    ) -> AsyncIterator[dict]:
+        """Stream telemetry events for download as plain rows, without loading them all."""
+        collection = TelemetryRepository._get_collection()
+        cursor = (
+            collection.find(TelemetryRepository.build_query(filter_params), projection(TELEMETRY_EXPORT_FIELDS))
+            .sort("timestamp", -1)
+            .limit(max_records)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
+        return iter_rows(cursor, TELEMETRY_EXPORT_FIELDS)
 
     @staticmethod
     async def cleanup_old(retention_days: int = DEFAULT_RETENTION_DAYS) -> int:
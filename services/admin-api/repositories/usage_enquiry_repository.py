@@ -1,50 +1,97 @@
 """
 Usage enquiry repository for storing demo usage requests.
+
+Enquiries carry a ``dedupe_key`` (a hash of the submitter and solution
+within a time window) backed by a unique index, so a repeat submission
+is never stored twice and its original can be found by key. Totals are
+kept in the ``usage_enquiry_counters`` collection, one document per
+solution, incremented as enquiries are inserted; counts are read from
+there instead of scanning the enquiries collection.
 """
 
+import asyncio
+import hashlib
 import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
-from database.connection import MongoDB
-from models.usage_enquiry import UsageEnquiryCreate, UsageEnquiryInDB
+from config import settings
+from database.connection import (
+    get_usage_enquiries_collection,
+    get_usage_enquiry_counters_collection,
+)
+from models.usage_enquiry import (
+    UsageEnquiryCreate,
+    UsageEnquiryInDB,
+    UsageEnquirySolutionCount,
+)
 
 logger = logging.getLogger(__name__)
 
-# Collection name
-COLLECTION_NAME = "usage_enquiries"
+# MongoDB duplicate key error code
+DUPLICATE_KEY_ERROR = 11000
+
+# Tries for a counter bulk_write before the counters are flagged for rebuild
+COUNTER_WRITE_ATTEMPTS = 3
 
 
 class UsageEnquiryRepository:
     """Repository for usage enquiry operations."""
 
+    # Set when a counter update could not be applied; cleared by rebuild_counters
+    counters_stale: bool = False
+
     @staticmethod
     def _get_collection():
         """Get the usage_enquiries collection."""
-        return MongoDB.get_database()[COLLECTION_NAME]
+        return get_usage_enquiries_collection()
 
     @staticmethod
-    def _generate_enquiry_id() -> str:
+    def _get_counters_collection():
+        """Get the usage_enquiry_counters collection."""
+        return get_usage_enquiry_counters_collection()
+
+    @staticmethod
+    def _generate_enquiry_id(now: datetime) -> str:
         """Generate a unique enquiry ID."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        timestamp = now.strftime("%Y%m%d%H%M%S")
         unique_id = uuid.uuid4().hex[:8]
         return f"ENQ_{timestamp}_{unique_id}"
 
     @staticmethod
-    async def create(
+    def dedupe_key(
+        enquiry_data: UsageEnquiryCreate,
+        ip_address: Optional[str],
+        now: datetime,
+    ) -> str:
+        """
+        Compute the deduplication key for an enquiry.
+
+        Submissions for the same solution from the same email (or, for
+        skipped forms, the same client IP) within
+        USAGE_ENQUIRY_DEDUPE_WINDOW seconds share a key.
+        """
+        submitter = enquiry_data.email.strip().lower() or f"ip:{ip_address or 'unknown'}"
+        window = int(now.timestamp() // max(1, settings.usage_enquiry_dedupe_window))
+        raw = f"{submitter}|{enquiry_data.solution_id}|{window}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def build(
         enquiry_data: UsageEnquiryCreate,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-    ) -> UsageEnquiryInDB:
-        """Create a new usage enquiry."""
-        collection = UsageEnquiryRepository._get_collection()
-
+    ) -> Tuple[UsageEnquiryInDB, dict]:
+        """Build an enquiry model and its MongoDB document without writing it."""
         now = datetime.utcnow()
-        enquiry_id = UsageEnquiryRepository._generate_enquiry_id()
 
         enquiry = UsageEnquiryInDB(
-            enquiry_id=enquiry_id,
+            enquiry_id=UsageEnquiryRepository._generate_enquiry_id(now),
             name=enquiry_data.name,
             email=enquiry_data.email,
             company=enquiry_data.company,
@@ -62,47 +109,267 @@ class UsageEnquiryRepository:
             k: v for k, v in enquiry.model_dump().items()
             if v not in (None, "") and not (k == "skipped" and v is False)
         }
-        await collection.insert_one(doc)
-        logger.info(f"Created usage enquiry: {enquiry_id} for solution {enquiry_data.solution_id}")
+        doc["dedupe_key"] = UsageEnquiryRepository.dedupe_key(enquiry_data, ip_address, now)
+        return enquiry, doc
+
+    @staticmethod
+    async def create(
+        enquiry_data: UsageEnquiryCreate,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> UsageEnquiryInDB:
+        """
+        Create a new usage enquiry immediately.
+
+        Returns the stored enquiry when this is a repeat within the dedupe
+        window. The public endpoint goes through ``UsageEnquiryIntake``
+        instead, which buffers inserts; this is the unbuffered path.
+        """
+        enquiry, doc = UsageEnquiryRepository.build(enquiry_data, ip_address, user_agent)
+        inserted = await UsageEnquiryRepository.insert_batch([doc])
+        if inserted:
+            logger.info(f"Created usage enquiry: {enquiry.enquiry_id} for solution {enquiry.solution_id}")
+            return enquiry
 
-        return enquiry
+        # A repeat within the dedupe window: the stored enquiry is the record
+        existing = await UsageEnquiryRepository.get_by_dedupe_key(doc["dedupe_key"])
+        if existing is None:
+            raise RuntimeError(f"Failed to create usage enquiry for solution {enquiry.solution_id}")
+        return existing
 
     @staticmethod
-    async def get_all(limit: int = 100, skip: int = 0) -> List[UsageEnquiryInDB]:
-        """Get all usage enquiries with pagination."""
+    async def get_by_dedupe_key(dedupe_key: str) -> Optional[UsageEnquiryInDB]:
+        """Get the stored enquiry for a dedupe key, if any."""
         collection = UsageEnquiryRepository._get_collection()
+        doc = await collection.find_one({"dedupe_key": dedupe_key}, {"_id": 0, "dedupe_key": 0})
+        return UsageEnquiryInDB(**doc) if doc else None
 
-        cursor = collection.find().sort("created_at", -1).skip(skip).limit(limit)
+    @staticmethod
+    async def insert_batch(docs: List[dict]) -> List[dict]:
+        """
+        Insert a batch of enquiry documents and update the counters.
 
-        enquiries = []
-        async for doc in cursor:
-            doc.pop("_id", None)
-            enquiries.append(UsageEnquiryInDB(**doc))
+        Duplicates (same dedupe_key) are rejected by the unique index and
+        skipped. Returns the documents that were actually inserted.
+        """
+        if not docs:
+            return []
 
-        return enquiries
+        collection = UsageEnquiryRepository._get_collection()
+        failed = set()
+
+        try:
+            await collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed.add(error["index"])
+                if error.get("code") != DUPLICATE_KEY_ERROR:
+                    logger.error(f"Failed to insert usage enquiry: {error.get('errmsg')}")
+
+        inserted = [doc for i, doc in enumerate(docs) if i not in failed]
+        duplicates = len(docs) - len(inserted)
+        if duplicates:
+            logger.debug(f"Skipped {duplicates} duplicate usage enquiries")
+
+        # The documents are stored now: a counter failure must not reach the
+        # caller, which would retry the insert and see only duplicates
+        await UsageEnquiryRepository._increment_counters(inserted)
+        return inserted
 
     @staticmethod
-    async def get_by_solution(solution_id: str, limit: int = 100) -> List[UsageEnquiryInDB]:
-        """Get usage enquiries for a specific solution."""
+    async def _increment_counters(docs: List[dict]) -> None:
+        """
+        Apply one $inc per solution for a batch of inserted enquiries.
+
+        Operations that fail are retried a few times; after that the error
+        is logged and ``counters_stale`` is set so the next intake flush
+        rebuilds the counters. Never raises.
+        """
+        operations = UsageEnquiryRepository._counter_operations(docs)
+        counters = UsageEnquiryRepository._get_counters_collection()
+
+        for attempt in range(1, COUNTER_WRITE_ATTEMPTS + 1):
+            if not operations:
+                return
+            try:
+                await counters.bulk_write(operations, ordered=False)
+                return
+            except BulkWriteError as e:
+                # Unordered: only the failed operations were not applied
+                failed = {error["index"] for error in e.details.get("writeErrors", [])}
+                operations = [op for i, op in enumerate(operations) if i in failed]
+                error_message = str(e.details.get("writeErrors", [])[:1])
+            except Exception as e:
+                error_message = str(e)
+            if attempt < COUNTER_WRITE_ATTEMPTS:
+                await asyncio.sleep(0.1 * 2 ** (attempt - 1))
+
+        UsageEnquiryRepository.counters_stale = True
+        logger.error(
+            f"Failed to update usage enquiry counters for {len(operations)} solutions, "
+            f"flagged for rebuild: {error_message}"
+        )
+
+    @staticmethod
+    def _counter_operations(docs: List[dict]) -> List[UpdateOne]:
+        """One counter upsert per solution in a batch of inserted enquiries."""
+        if not docs:
+            return []
+
+        counts: Dict[str, int] = defaultdict(int)
+        latest: Dict[str, dict] = {}
+        for doc in docs:
+            solution_id = doc["solution_id"]
+            counts[solution_id] += 1
+            if solution_id not in latest or doc["created_at"] > latest[solution_id]["created_at"]:
+                latest[solution_id] = doc
+
+        return [
+            UpdateOne(
+                {"_id": solution_id},
+                {
+                    "$inc": {"count": count},
+                    "$set": {"solution_name": latest[solution_id]["solution_name"]},
+                    "$max": {"last_enquiry_at": latest[solution_id]["created_at"]},
+                },
+                upsert=True,
+            )
+            for solution_id, count in counts.items()
+        ]
+
+    @staticmethod
+    async def rebuild_counters() -> int:
+        """
+        Recompute the counters from the enquiries collection.
+
+        Only needed once for enquiries recorded before counters existed, or
+        to repair drift. Returns the number of solutions counted.
+        """
+        # Cleared first so a failure while rebuilding leaves it set
+        UsageEnquiryRepository.counters_stale = False
+        try:
+            return await UsageEnquiryRepository._rebuild_counters()
+        except Exception:
+            UsageEnquiryRepository.counters_stale = True
+            raise
+
+    @staticmethod
+    async def _rebuild_counters() -> int:
         collection = UsageEnquiryRepository._get_collection()
+        pipeline = [
+            {"$sort": {"enquiry_id": 1}},
+            {
+                "$group": {
+                    "_id": "$solution_id",
+                    "count": {"$sum": 1},
+                    "solution_name": {"$last": "$solution_name"},
+                    "last_enquiry_at": {"$max": "$created_at"},
+                }
+            },
+        ]
 
-        cursor = collection.find({"solution_id": solution_id}).sort("created_at", -1).limit(limit)
+        operations = []
+        solution_ids = []
+        async for row in collection.aggregate(pipeline, allowDiskUse=True):
+            solution_ids.append(row["_id"])
+            operations.append(
+                UpdateOne(
+                    {"_id": row["_id"]},
+                    {
+                        "$set": {
+                            "count": row["count"],
+                            "solution_name": row.get("solution_name") or "",
+                            "last_enquiry_at": row.get("last_enquiry_at"),
+                        }
+                    },
+                    upsert=True,
+                )
+            )
+
+        counters = UsageEnquiryRepository._get_counters_collection()
+        if operations:
+            await counters.bulk_write(operations, ordered=False)
+        await counters.delete_many({"_id": {"$nin": solution_ids}})
+        logger.info(f"Rebuilt usage enquiry counters for {len(operations)} solutions")
+        return len(operations)
+
+    @staticmethod
+    async def ensure_counters() -> str:
+        """Backfill the counters if enquiries exist but no counters do."""
+        counters = UsageEnquiryRepository._get_counters_collection()
+        if await counters.find_one({}, {"_id": 1}) is not None:
+            return "present"
+        if await UsageEnquiryRepository._get_collection().find_one({}, {"_id": 1}) is None:
+            return "empty"
+        solutions = await UsageEnquiryRepository.rebuild_counters()
+        return f"rebuilt={solutions}"
+
+    @staticmethod
+    async def get_all(limit: int = 100, before: Optional[str] = None) -> List[UsageEnquiryInDB]:
+        """
+        Get usage enquiries, newest first.
+
+        Args:
+            limit: Maximum enquiries to return
+            before: Keyset cursor - only enquiries with an older enquiry_id
+        """
+        return await UsageEnquiryRepository._find({}, limit, before)
+
+    @staticmethod
+    async def get_by_solution(
+        solution_id: str,
+        limit: int = 100,
+        before: Optional[str] = None,
+    ) -> List[UsageEnquiryInDB]:
+        """Get usage enquiries for a specific solution, newest first."""
+        return await UsageEnquiryRepository._find({"solution_id": solution_id}, limit, before)
+
+    @staticmethod
+    async def _find(query: dict, limit: int, before: Optional[str]) -> List[UsageEnquiryInDB]:
+        """Run a keyset-paginated enquiry query."""
+        collection = UsageEnquiryRepository._get_collection()
+
+        if before:
+            query = {**query, "enquiry_id": {"$lt": before}}
+
+        cursor = collection.find(query, {"_id": 0, "dedupe_key": 0}).sort("enquiry_id", -1).limit(limit)
 
         enquiries = []
         async for doc in cursor:
-            doc.pop("_id", None)
             enquiries.append(UsageEnquiryInDB(**doc))
 
         return enquiries
 
+    @staticmethod
+    async def get_counts() -> List[UsageEnquirySolutionCount]:
+        """Get the running enquiry count for every solution."""
+        counters = UsageEnquiryRepository._get_counters_collection()
+        cursor = counters.find({}).sort("count", -1)
+
+        results = []
+        async for doc in cursor:
+            results.append(
+                UsageEnquirySolutionCount(
+                    solution_id=doc["_id"],
+                    solution_name=doc.get("solution_name", ""),
+                    count=doc.get("count", 0),
+                    last_enquiry_at=doc.get("last_enquiry_at"),
+                )
+            )
+        return results
+
     @staticmethod
     async def count() -> int:
-        """Get total count of usage enquiries."""
-        collection = UsageEnquiryRepository._get_collection()
-        return await collection.count_documents({})
+        """Get total count of usage enquiries (sum of per-solution counters)."""
+        counters = UsageEnquiryRepository._get_counters_collection()
+        rows = await counters.aggregate(
+            [{"$group": {"_id": None, "total": {"$sum": "$count"}}}]
+        ).to_list(length=1)
+        return rows[0]["total"] if rows else 0
 
     @staticmethod
     async def count_by_solution(solution_id: str) -> int:
         """Get count of usage enquiries for a specific solution."""
-        collection = UsageEnquiryRepository._get_collection()
-        return await collection.count_documents({"solution_id": solution_id})
+        counters = UsageEnquiryRepository._get_counters_collection()
+        doc = await counters.find_one({"_id": solution_id}, {"count": 1})
+        return doc.get("count", 0) if doc else 0
@@ -34,6 +34,7 @@ from models.password_reset import (
     PasswordResetTokenResponse,
 )
 from services.email_service import EmailService
+from services.rate_limiter import RateLimiter
 from config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -92,6 +93,10 @@ async def login(
     ip_address = get_client_ip(request)
     user_agent = get_user_agent(request)
 
+    # Rate limit before any database work (lockout checks and audits write)
+    await RateLimiter.enforce("login_ip", ip_address)
+    await RateLimiter.enforce("login_username", body.username.lower())
+
     # Find admin by username
     admin = await AdminRepository.get_by_username(body.username)
 
@@ -411,8 +416,8 @@ async def forgot_password(
             email=admin.email,
         )
 
-        # Send email
-        email_sent = EmailService.send_password_reset_email(
+        # Queue email (delivered by the outbox worker)
+        email_sent = await EmailService.send_password_reset_email(
             to_email=admin.email,
             username=admin.username,
             reset_token=reset_token,
@@ -517,8 +522,8 @@ async def reset_password(
     # Invalidate all sessions for security
     await SessionRepository.deactivate_all_for_admin(admin.admin_id)
 
-    # Send confirmation email
-    EmailService.send_password_changed_email(
+    # Queue confirmation email
+    await EmailService.send_password_changed_email(
         to_email=admin.email,
         username=admin.username,
     )
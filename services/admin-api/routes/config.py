@@ -3,17 +3,20 @@ Configuration management routes.
 Only accessible by super_admin users.
 """
 
+import asyncio
 import logging
+import time
 import httpx
-from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 from auth.dependencies import require_super_admin
+from config import settings
 from models.admin import AdminInDB
 from models.config import (
     ConfigCreate,
     ConfigUpdate,
+    ConfigInDB,
     ConfigCategory,
     ConfigResponse,
     ConfigListResponse,
@@ -22,8 +25,13 @@ from models.config import (
     ConfigImportResponse,
     ConfigTestRequest,
     ConfigTestResponse,
+    ConfigTestTimings,
+    ConfigBatchTestRequest,
+    ConfigBatchTestResult,
+    ConfigBatchTestResponse,
 )
 from repositories.config_repository import ConfigRepository, ConfigAuditRepository
+from services.http_client import HttpClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -115,24 +123,85 @@ async def export_configs(
 @router.post("/import", response_model=ConfigImportResponse)
 async def import_configs(
     import_data: ConfigImportRequest,
+    request: Request,
     current_admin: AdminInDB = Depends(require_super_admin),
 ) -> ConfigImportResponse:
     """
     Import configurations from JSON.
 
     If overwrite is True, existing configs with the same key will be updated.
+    If dry_run is True, nothing is written and the response lists the
+    per-key changes the import would make.
     Only accessible by super_admin.
     """
     results = await ConfigRepository.import_configs(
         configs=import_data.configs,
         admin_id=current_admin.admin_id,
         overwrite=import_data.overwrite,
+        dry_run=import_data.dry_run,
+        transactional=import_data.transactional,
+        ip_address=_get_client_ip(request),
+        user_agent=_get_user_agent(request),
     )
     return ConfigImportResponse(
         created=results["created"],
         updated=results["updated"],
         skipped=results["skipped"],
         errors=results.get("errors", []),
+        dry_run=results["dry_run"],
+        transactional=results["transactional"],
+        changes=results["changes"],
+    )
+
+
+@router.post("/test-all", response_model=ConfigBatchTestResponse)
+async def test_all_connections(
+    test_data: Optional[ConfigBatchTestRequest] = None,
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> ConfigBatchTestResponse:
+    """
+    Test every API key configuration concurrently.
+
+    Keys without a metadata.test_endpoint are reported as skipped.
+    Parallelism is bounded by the request's concurrency (or
+    CONFIG_TEST_CONCURRENCY) and by the HTTP pool's per-host limit.
+    Only accessible by super_admin.
+    """
+    concurrency = (test_data.concurrency if test_data else None) or settings.config_test_concurrency
+    semaphore = asyncio.Semaphore(concurrency)
+    configs = await ConfigRepository.get_all(category=ConfigCategory.API_KEYS)
+
+    async def run_one(config: ConfigInDB) -> ConfigBatchTestResult:
+        test_endpoint = (config.metadata or {}).get("test_endpoint")
+        if not test_endpoint:
+            return ConfigBatchTestResult(
+                config_id=config.config_id,
+                key=config.key,
+                success=False,
+                message="No test endpoint configured",
+            )
+        async with semaphore:
+            result = await _run_connection_test(config, test_endpoint)
+        return ConfigBatchTestResult(
+            config_id=config.config_id,
+            key=config.key,
+            test_endpoint=test_endpoint,
+            **result.model_dump(),
+        )
+
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*(run_one(config) for config in configs))
+    duration_ms = (time.perf_counter() - start_time) * 1000
+
+    skipped = sum(1 for r in results if r.test_endpoint is None)
+    succeeded = sum(1 for r in results if r.success)
+    return ConfigBatchTestResponse(
+        results=results,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded - skipped,
+        skipped=skipped,
+        duration_ms=round(duration_ms, 2),
     )
 
 
@@ -258,53 +327,46 @@ async def test_config_connection(
             detail="No test endpoint configured. Set metadata.test_endpoint or provide test_endpoint in request."
         )
 
-    # Perform test request
-    start_time = datetime.utcnow()
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Try with common API key header patterns
-            headers = {
-                "Authorization": f"Bearer {config.value}",
-                "X-API-Key": config.value,
-            }
-            response = await client.get(test_endpoint, headers=headers)
+    return await _run_connection_test(config, test_endpoint)
+
 
-        duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+async def _run_connection_test(config: ConfigInDB, test_endpoint: str) -> ConfigTestResponse:
+    """Call a test endpoint with the API key through the shared HTTP client pool."""
+    try:
+        # Try with common API key header patterns
+        headers = {
+            "Authorization": f"Bearer {config.value}",
+            "X-API-Key": config.value,
+        }
+        response, timings = await HttpClientPool.timed_get(test_endpoint, headers=headers)
+        duration_ms = round(timings["total_ms"], 2)
+        test_timings = ConfigTestTimings(**{
+            name: round(value, 2) if isinstance(value, float) else value
+            for name, value in timings.items()
+        })
 
         if response.status_code in [200, 201, 204]:
-            return ConfigTestResponse(
-                success=True,
-                message="Connection successful",
-                response_time_ms=round(duration_ms, 2),
-                status_code=response.status_code,
-            )
+            message = "Connection successful"
         elif response.status_code == 401:
-            return ConfigTestResponse(
-                success=False,
-                message="Authentication failed - API key may be invalid",
-                response_time_ms=round(duration_ms, 2),
-                status_code=response.status_code,
-            )
+            message = "Authentication failed - API key may be invalid"
         elif response.status_code == 403:
-            return ConfigTestResponse(
-                success=False,
-                message="Access forbidden - API key may lack required permissions",
-                response_time_ms=round(duration_ms, 2),
-                status_code=response.status_code,
-            )
+            message = "Access forbidden - API key may lack required permissions"
         else:
-            return ConfigTestResponse(
-                success=False,
-                message=f"Unexpected response: {response.status_code}",
-                response_time_ms=round(duration_ms, 2),
-                status_code=response.status_code,
-            )
+            message = f"Unexpected response: {response.status_code}"
+
+        return ConfigTestResponse(
+            success=response.status_code in [200, 201, 204],
+            message=message,
+            response_time_ms=duration_ms,
+            status_code=response.status_code,
+            timings=test_timings,
+        )
 
     except httpx.TimeoutException:
         return ConfigTestResponse(
             success=False,
             message="Connection timed out",
-            response_time_ms=10000,
+            response_time_ms=settings.http_client_timeout * 1000,
             status_code=None,
         )
     except httpx.ConnectError as e:
@@ -0,0 +1,159 @@
+"""
+Diagnostics routes for runtime performance introspection.
+"""
+
+import logging
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+
+from auth.dependencies import require_super_admin
+from config import settings
+from database.connection import MongoDB
+from database.index_advisor import IndexAdvisor
+from database.monitoring import MongoMonitor
+from models.admin import AdminInDB
+from models.diagnostics import (
+    MongoPoolStatsResponse,
+    IndexAdvisorReport,
+    IndexAdvisorApplyRequest,
+    IndexAdvisorApplyResponse,
+    RateLimiterStatsResponse,
+    LoopWatchdogResponse,
+)
+from services.loop_watchdog import LoopWatchdog
+from services.metrics import EVENT_LOOP_LAG_LAST
+from services.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/mongo-pool", response_model=MongoPoolStatsResponse)
+async def get_mongo_pool_stats(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> MongoPoolStatsResponse:
+    """
+    Get MongoDB connection pool and command latency statistics.
+
+    Includes checkout wait times, in-use connections per server and
+    per-command latency histograms collected by the driver listeners.
+    Super admin only.
+    """
+    snapshot = MongoMonitor.snapshot()
+
+    return MongoPoolStatsResponse(
+        monitoring_enabled=settings.mongo_monitoring_enabled,
+        pool_profile=settings.mongo_pool_profile,
+        client_options=MongoDB.client_options,
+        analytics_read_preference=settings.mongo_analytics_read_preference,
+        collecting_since=datetime.utcfromtimestamp(snapshot["collecting_since"]),
+        total_in_use=MongoMonitor.pool.in_use(),
+        pools=snapshot["pools"],
+        commands=snapshot["commands"],
+        generated_at=datetime.utcnow(),
+        message=None if settings.mongo_monitoring_enabled else "Monitoring disabled (MONGO_MONITORING_ENABLED=false)",
+    )
+
+
+@router.post("/mongo-pool/reset", response_model=MongoPoolStatsResponse)
+async def reset_mongo_pool_stats(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> MongoPoolStatsResponse:
+    """
+    Reset collected pool and command statistics.
+
+    Super admin only.
+    """
+    MongoMonitor.reset()
+    logger.info(f"MongoDB pool statistics reset by {current_admin.admin_id}")
+
+    return await get_mongo_pool_stats(current_admin)
+
+
+@router.get("/index-advisor", response_model=IndexAdvisorReport)
+async def get_index_advice(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> IndexAdvisorReport:
+    """
+    Get index recommendations.
+
+    Joins sampled query shapes with $indexStats access counts and explain
+    plans to suggest missing indexes and redundant or unused ones.
+    Sampling restarts with POST /diagnostics/mongo-pool/reset.
+    Super admin only.
+    """
+    return IndexAdvisorReport(**await IndexAdvisor.analyze())
+
+
+@router.post("/index-advisor/apply", response_model=IndexAdvisorApplyResponse)
+async def apply_index_advice(
+    apply_data: IndexAdvisorApplyRequest,
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> IndexAdvisorApplyResponse:
+    """
+    Apply selected index recommendations by ID.
+
+    Recommendations are recomputed first, so stale IDs are rejected.
+    Super admin only.
+    """
+    logger.info(
+        f"Index advisor apply by {current_admin.admin_id}: {apply_data.recommendation_ids}"
+    )
+    results = await IndexAdvisor.apply(apply_data.recommendation_ids)
+    return IndexAdvisorApplyResponse(results=results)
+
+
+@router.get("/rate-limits", response_model=RateLimiterStatsResponse)
+async def get_rate_limit_stats(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> RateLimiterStatsResponse:
+    """
+    Get rate limiter policies, tracked buckets and allow/reject counts.
+
+    Super admin only.
+    """
+    return RateLimiterStatsResponse(**RateLimiter.get_stats())
+
+
+@router.get("/event-loop", response_model=LoopWatchdogResponse)
+async def get_event_loop_stalls(
+    limit: int = Query(default=20, ge=1, le=100),
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> LoopWatchdogResponse:
+    """
+    Get the code paths that blocked the event loop the longest.
+
+    Each offender groups stalls by the running coroutine and innermost
+    application frame, with the stack captured while the call was blocking.
+    Super admin only.
+    """
+    stats = LoopWatchdog.get_stats(limit)
+    for offender in stats["offenders"]:
+        offender["last_seen"] = datetime.utcfromtimestamp(offender["last_seen"])
+
+    return LoopWatchdogResponse(
+        enabled=stats["enabled"],
+        running=stats["running"],
+        threshold_ms=stats["threshold_ms"],
+        collecting_since=datetime.utcfromtimestamp(stats["collecting_since"]),
+        stalls=stats["stalls"],
+        lag_last_ms=round(EVENT_LOOP_LAG_LAST.get() * 1000, 2),
+        offenders=stats["offenders"],
+    )
+
+
+@router.post("/event-loop/reset", response_model=LoopWatchdogResponse)
+async def reset_event_loop_stalls(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> LoopWatchdogResponse:
+    """
+    Clear collected event loop stalls.
+
+    Super admin only.
+    """
+    LoopWatchdog.reset()
+    logger.info(f"Event loop watchdog reset by {current_admin.admin_id}")
+
+    return await get_event_loop_stalls(20, current_admin)
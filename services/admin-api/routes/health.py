@@ -3,10 +3,14 @@ Health check routes for admin dashboard.
 """
 
 from datetime import datetime
-from fastapi import APIRouter
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Response, status
 from pydantic import BaseModel
 
+from auth.dependencies import require_super_admin
 from database.connection import MongoDB
+from models.admin import AdminInDB
+from services.startup_service import StartupService
 
 router = APIRouter(tags=["Health"])
 
@@ -19,6 +23,33 @@ class HealthResponse(BaseModel):
     version: str = "1.0.0"
 
 
+class ReadinessResponse(BaseModel):
+    """Readiness probe response."""
+    ready: bool
+    pending: List[str]
+
+
+class StartupPhase(BaseModel):
+    """Timing for a single startup phase."""
+    name: str
+    background: bool
+    offset_ms: float
+    duration_ms: Optional[float] = None
+    status: str
+    detail: Optional[str] = None
+
+
+class StartupReportResponse(BaseModel):
+    """Startup timing breakdown."""
+    started_at: Optional[datetime] = None
+    ready: bool
+    serving_after_ms: Optional[float] = None
+    ready_after_ms: Optional[float] = None
+    pending: List[str]
+    errors: Dict[str, Any]
+    phases: List[StartupPhase]
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
     """
@@ -40,3 +71,30 @@ async def health_check() -> HealthResponse:
         timestamp=datetime.utcnow(),
         database=db_status,
     )
+
+
+@router.get("/health/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """
+    Readiness probe.
+
+    Returns 503 until background startup work (e.g. solution seeding)
+    has finished, so load balancers only route traffic to ready instances.
+    """
+    ready = StartupService.is_ready()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessResponse(ready=ready, pending=StartupService.pending())
+
+
+@router.get("/health/startup", response_model=StartupReportResponse)
+async def startup_report(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> StartupReportResponse:
+    """
+    Get the startup timing breakdown per phase.
+
+    Super admin only.
+    """
+    return StartupReportResponse(**StartupService.get_report())
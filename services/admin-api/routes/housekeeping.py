@@ -15,8 +15,10 @@ from models.housekeeping import (
     TaskRunResult,
     DatabaseStatsResponse,
 )
+from models.email_outbox import EmailOutboxStats
 from repositories.housekeeping_repository import HousekeepingRepository
 from services.housekeeping_service import HousekeepingService
+from services.email_outbox_worker import EmailOutboxWorker
 
 logger = logging.getLogger(__name__)
 
@@ -148,14 +150,29 @@ async def run_task(
 
 @router.get("/db-stats", response_model=DatabaseStatsResponse)
 async def get_database_stats(
+    refresh: bool = False,
     current_admin: AdminInDB = Depends(require_super_admin),
 ) -> DatabaseStatsResponse:
     """
     Get database statistics.
 
-    Returns storage and document counts for all collections.
+    Returns storage and document counts for all collections, plus index
+    sizes and usage so unused indexes can be spotted. Results are cached
+    briefly; pass refresh=true to bypass the cache.
     Super admin only.
     """
-    stats = await HousekeepingRepository.get_database_stats()
+    stats = await HousekeepingRepository.get_database_stats(refresh=refresh)
 
     return DatabaseStatsResponse(**stats)
+
+
+@router.get("/email-outbox", response_model=EmailOutboxStats)
+async def get_email_outbox_stats(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> EmailOutboxStats:
+    """
+    Get email outbox queue depth and worker status.
+
+    Super admin only.
+    """
+    return await EmailOutboxWorker.get_stats()
@@ -22,6 +22,7 @@ from models.log import (
     ErrorAggregationResponse,
 )
 from repositories.log_repository import LogRepository
+from services.json_response import FastJSONResponse, stream_json_export
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +44,7 @@ async def get_logs(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=1, le=100),
     current_admin: AdminInDB = Depends(require_any_admin),
-) -> LogsListResponse:
+) -> FastJSONResponse:
     """
     Get paginated system logs with filtering.
 
@@ -64,37 +65,18 @@ async def get_logs(
         page_size=page_size,
     )
 
-    logs, total = await LogRepository.get_paginated(filter_params)
+    logs, total = await LogRepository.get_paginated_rows(filter_params)
 
     total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
-    return LogsListResponse(
-        logs=[
-            LogResponse(
-                log_id=log.log_id,
-                timestamp=log.timestamp,
-                level=log.level.value,
-                message=log.message,
-                service=log.service,
-                request_id=log.request_id,
-                endpoint=log.endpoint,
-                method=log.method,
-                status_code=log.status_code,
-                duration_ms=log.duration_ms,
-                ip_address=log.ip_address,
-                user_agent=log.user_agent,
-                admin_id=log.admin_id,
-                error_type=log.error_type,
-                error_message=log.error_message,
-                extra=log.extra,
-            )
-            for log in logs
-        ],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-    )
+    # Rows already match LogResponse, so they go straight to the encoder
+    return FastJSONResponse({
+        "logs": logs,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+    })
 
 
 @router.get("/stream")
@@ -254,15 +236,10 @@ async def export_logs_json(
         status_code=status_code,
         start_time=start_time,
         end_time=end_time,
-        page=1,
-        page_size=max_records,
     )
 
-    logs = await LogRepository.export_logs(filter_params, max_records=max_records)
-
-    export_data = {
+    header = {
         "exported_at": datetime.utcnow().isoformat(),
-        "total_records": len(logs),
         "filters": {
             "level": level.value if level else None,
             "endpoint": endpoint,
@@ -271,32 +248,13 @@ async def export_logs_json(
             "start_time": start_time.isoformat() if start_time else None,
             "end_time": end_time.isoformat() if end_time else None,
         },
-        "logs": [
-            {
-                "log_id": log.log_id,
-                "timestamp": log.timestamp.isoformat(),
-                "level": log.level.value,
-                "message": log.message,
-                "service": log.service,
-                "request_id": log.request_id,
-                "endpoint": log.endpoint,
-                "method": log.method,
-                "status_code": log.status_code,
-                "duration_ms": log.duration_ms,
-                "ip_address": log.ip_address,
-                "user_agent": log.user_agent,
-                "admin_id": log.admin_id,
-                "error_type": log.error_type,
-                "error_message": log.error_message,
-            }
-            for log in logs
-        ],
     }
+    rows = LogRepository.iter_export_rows(filter_params, max_records=max_records)
 
     filename = f"logs_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
 
     return StreamingResponse(
-        iter([json.dumps(export_data, indent=2)]),
+        stream_json_export(header, "logs", rows),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
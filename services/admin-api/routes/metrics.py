@@ -0,0 +1,22 @@
+"""
+Prometheus metrics endpoint.
+
+Mounted at the application root (``/metrics``), outside the
+``/api/admin`` prefix routed by the public gateway, so it is only
+reachable from inside the service network.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services.metrics import REGISTRY, CONTENT_TYPE_LATEST
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Expose in-process metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
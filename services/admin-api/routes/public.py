@@ -10,8 +10,9 @@ from pydantic import BaseModel
 from repositories.solutions_repository import get_solutions_repository, SolutionsRepository
 from repositories.solution_overrides_repository import SolutionOverridesRepository
 from repositories.settings_repository import SettingsRepository
-from repositories.usage_enquiry_repository import UsageEnquiryRepository
 from models.usage_enquiry import UsageEnquiryCreate, UsageEnquiryResponse
+from services.rate_limiter import RateLimiter
+from services.usage_enquiry_intake import UsageEnquiryIntake
 
 router = APIRouter(prefix="/public", tags=["Public"])
 
@@ -102,13 +103,16 @@ async def submit_usage_enquiry(
     ip_address = _get_client_ip(request)
     user_agent = _get_user_agent(request)
 
-    enquiry = await UsageEnquiryRepository.create(
+    await RateLimiter.enforce("usage_enquiry_ip", ip_address)
+
+    # Buffered and deduplicated; written in batches by the intake task
+    enquiry_id = await UsageEnquiryIntake.submit(
         enquiry_data=body,
         ip_address=ip_address,
         user_agent=user_agent,
     )
 
     return UsageEnquiryResponse(
-        enquiry_id=enquiry.enquiry_id,
+        enquiry_id=enquiry_id,
         message="Thank you for your interest! The demo will now launch.",
     )
@@ -21,6 +21,7 @@ from models.solution import (
 from models.solution_override import SolutionOverrideUpdate, SolutionOverrideResponse
 from repositories.solutions_repository import SolutionsRepository
 from repositories.solution_overrides_repository import SolutionOverridesRepository
+from services.json_response import FastJSONResponse
 
 router = APIRouter(prefix="/solutions", tags=["Solutions"])
 
@@ -61,7 +62,7 @@ async def list_solutions(
     category: Optional[str] = Query(None, description="Filter by category"),
     search: Optional[str] = Query(None, description="Search query"),
     admin: AdminInDB = Depends(require_any_admin),
-) -> SolutionsListResponse:
+) -> FastJSONResponse:
     """
     List all solutions with optional filtering.
 
@@ -82,11 +83,11 @@ async def list_solutions(
     # Get categories for filter dropdown
     categories = await SolutionsRepository.get_categories()
 
-    return SolutionsListResponse(
+    return FastJSONResponse(SolutionsListResponse(
         solutions=solutions,
         total=len(solutions),
         categories=[c.name for c in categories],
-    )
+    ))
 
 
 @router.get("/categories", response_model=List[CategoryCount])
@@ -6,7 +6,6 @@ Provides access to usage statistics and analytics for admin users.
 import logging
 from datetime import datetime
 from typing import Optional
-import json
 
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
@@ -16,13 +15,13 @@ from models.admin import AdminInDB
 from models.telemetry import (
     TelemetryEventType,
     TelemetryFilter,
-    TelemetryResponse,
     UsageStats,
     PercentileStats,
     TimeSeriesResponse,
     TopEndpointsResponse,
 )
 from repositories.telemetry_repository import TelemetryRepository
+from services.json_response import FastJSONResponse, stream_json_export
 
 logger = logging.getLogger(__name__)
 
@@ -155,7 +154,7 @@ async def get_events(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=1, le=100),
     current_admin: AdminInDB = Depends(require_any_admin),
-) -> dict:
+) -> FastJSONResponse:
     """
     Get paginated telemetry events with filtering.
 
@@ -173,33 +172,18 @@ async def get_events(
         page_size=page_size,
     )
 
-    events, total = await TelemetryRepository.get_paginated(filter_params)
+    events, total = await TelemetryRepository.get_paginated_rows(filter_params)
 
     total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
-    return {
-        "events": [
-            TelemetryResponse(
-                event_id=e.event_id,
-                timestamp=e.timestamp,
-                event_type=e.event_type.value,
-                partner_demo=e.partner_demo,
-                solution_id=e.solution_id,
-                session_id=e.session_id,
-                endpoint=e.endpoint,
-                method=e.method,
-                status_code=e.status_code,
-                duration_ms=e.duration_ms,
-                tokens_used=e.tokens_used,
-                model_used=e.model_used,
-            ).model_dump()
-            for e in events
-        ],
+    # Rows already match TelemetryResponse, so they go straight to the encoder
+    return FastJSONResponse({
+        "events": events,
         "total": total,
         "page": page,
         "page_size": page_size,
         "total_pages": total_pages,
-    }
+    })
 
 
 @router.get("/export/json")
@@ -221,44 +205,23 @@ async def export_telemetry_json(
         solution_id=solution_id,
         start_time=start_time,
         end_time=end_time,
-        page=1,
-        page_size=max_records,
     )
 
-    events = await TelemetryRepository.export_events(filter_params, max_records=max_records)
-
-    export_data = {
+    header = {
         "exported_at": datetime.utcnow().isoformat(),
-        "total_records": len(events),
         "filters": {
             "event_type": event_type.value if event_type else None,
             "solution_id": solution_id,
             "start_time": start_time.isoformat() if start_time else None,
             "end_time": end_time.isoformat() if end_time else None,
         },
-        "events": [
-            {
-                "event_id": e.event_id,
-                "timestamp": e.timestamp.isoformat(),
-                "event_type": e.event_type.value,
-                "partner_demo": e.partner_demo,
-                "solution_id": e.solution_id,
-                "session_id": e.session_id,
-                "endpoint": e.endpoint,
-                "method": e.method,
-                "status_code": e.status_code,
-                "duration_ms": e.duration_ms,
-                "tokens_used": e.tokens_used,
-                "ip_address": e.ip_address,
-            }
-            for e in events
-        ],
     }
+    rows = TelemetryRepository.iter_export_rows(filter_params, max_records=max_records)
 
     filename = f"telemetry_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
 
     return StreamingResponse(
-        iter([json.dumps(export_data, indent=2)]),
+        stream_json_export(header, "events", rows),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
@@ -0,0 +1,80 @@
+"""
+Usage enquiry routes.
+Lists demo usage enquiries and their per-solution counts for admin users.
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from auth.dependencies import require_any_admin, require_super_admin
+from models.admin import AdminInDB
+from models.usage_enquiry import UsageEnquiryCountsResponse, UsageEnquiryListResponse
+from repositories.usage_enquiry_repository import UsageEnquiryRepository
+from services.json_response import FastJSONResponse
+from services.usage_enquiry_intake import UsageEnquiryIntake
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/usage-enquiries", tags=["Usage Enquiries"])
+
+
+@router.get("", response_model=UsageEnquiryListResponse)
+async def list_usage_enquiries(
+    solution_id: Optional[str] = None,
+    before: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=50, ge=1, le=200),
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> FastJSONResponse:
+    """
+    List usage enquiries, newest first.
+
+    Pages with a keyset cursor rather than skip/limit, and the total comes
+    from the per-solution counters. Super admin only (contains contact details).
+    """
+    if solution_id:
+        enquiries = await UsageEnquiryRepository.get_by_solution(solution_id, limit, before)
+        total = await UsageEnquiryRepository.count_by_solution(solution_id)
+    else:
+        enquiries = await UsageEnquiryRepository.get_all(limit, before)
+        total = await UsageEnquiryRepository.count()
+
+    return FastJSONResponse(UsageEnquiryListResponse(
+        enquiries=enquiries,
+        total=total,
+        next_cursor=enquiries[-1].enquiry_id if len(enquiries) == limit else None,
+    ))
+
+
+@router.get("/counts", response_model=UsageEnquiryCountsResponse)
+async def get_usage_enquiry_counts(
+    current_admin: AdminInDB = Depends(require_any_admin),
+) -> UsageEnquiryCountsResponse:
+    """
+    Get enquiry counts per solution.
+
+    Reads the incrementally maintained counters. ``pending`` is the number
+    of enquiries buffered in this process and not yet written.
+    """
+    solutions = await UsageEnquiryRepository.get_counts()
+    return UsageEnquiryCountsResponse(
+        total=sum(s.count for s in solutions),
+        solutions=solutions,
+        pending=UsageEnquiryIntake.pending(),
+    )
+
+
+@router.post("/counts/rebuild", response_model=UsageEnquiryCountsResponse)
+async def rebuild_usage_enquiry_counts(
+    current_admin: AdminInDB = Depends(require_super_admin),
+) -> UsageEnquiryCountsResponse:
+    """
+    Recompute the per-solution counters from the enquiries collection.
+
+    Flushes buffered enquiries first. Super admin only.
+    """
+    await UsageEnquiryIntake.flush()
+    await UsageEnquiryRepository.rebuild_counters()
+    logger.info(f"Usage enquiry counters rebuilt by {current_admin.username}")
+    return await get_usage_enquiry_counts(current_admin)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON response serialization for admin API list payloads.
+
+Compares, for LogsListResponse payloads of increasing size:
+
+    jsonable_encoder   FastAPI's generic path: jsonable_encoder + stdlib json
+    response_model     response_model path: validate, dump_python(mode="json"), stdlib json
+    fast (model)       FastJSONResponse(model): pydantic-core straight to bytes
+    fast (dicts)       FastJSONResponse(dict): orjson over model_dump() dicts
+                       (telemetry events / raw document endpoints)
+
+No database or server is needed.
+
+Usage:
+    python scripts/bench_json.py [--sizes 10,100,1000,5000] [--seconds 1.0]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from models.log import LogResponse, LogsListResponse
+from services.json_response import FastJSONResponse
+
+
+def build_payload(rows: int) -> LogsListResponse:
+    """Build a logs page with representative field values."""
+    start = datetime(2025, 1, 1)
+    logs = [
+        LogResponse(
+            log_id=f"LOG_20250101000000_{i:08x}",
+            timestamp=start + timedelta(seconds=i),
+            level="warning" if i % 7 == 0 else "info",
+            message=f"GET /api/admin/solutions?page={i % 20} - 200",
+            service="admin-api",
+            request_id=f"{i:016x}",
+            endpoint="/api/admin/solutions",
+            method="GET",
+            status_code=200,
+            duration_ms=12.5 + i % 40,
+            ip_address="10.0.0.1",
+            user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+            admin_id="ADM_20240101000000_abcd1234",
+            extra={"query_params": f"page={i % 20}"},
+        )
+        for i in range(rows)
+    ]
+    return LogsListResponse(logs=logs, total=rows, page=1, page_size=rows, total_pages=1)
+
+
+def stdlib_dumps(content) -> bytes:
+    """Encode exactly like starlette's JSONResponse.render."""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def measure(func: Callable[[], bytes], seconds: float) -> float:
+    """Return the mean time per call in milliseconds."""
+    func()  # warm up
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return elapsed / calls * 1000
+
+
+def main(sizes: List[int], seconds: float) -> None:
+    adapter = TypeAdapter(LogsListResponse)
+
+    print(f"{'rows':>6}  {'path':<18} {'ms/response':>12} {'speedup':>8} {'bytes':>10}")
+    for rows in sizes:
+        payload = build_payload(rows)
+        dict_payload = payload.model_dump()
+
+        paths = {
+            "jsonable_encoder": lambda: stdlib_dumps(jsonable_encoder(payload)),
+            "response_model": lambda: stdlib_dumps(
+                adapter.dump_python(adapter.validate_python(payload), mode="json", by_alias=True)
+            ),
+            "fast (model)": lambda: FastJSONResponse(payload).body,
+            "fast (dicts)": lambda: FastJSONResponse(dict_payload).body,
+        }
+
+        baseline = None
+        for name, func in paths.items():
+            ms = measure(func, seconds)
+            baseline = baseline or ms
+            print(f"{rows:>6}  {name:<18} {ms:>12.3f} {baseline / ms:>7.1f}x {len(func()):>10}")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000,5000", help="Comma-separated row counts")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time budget per measurement")
+    args = parser.parse_args()
+
+    main([int(s) for s in args.sizes.split(",")], args.seconds)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark the row-mode read path against per-document model validation.
+
+For a page of log documents, measures the CPU time spent after the
+server responds, per 1,000 rows:
+
+    model path   decode full BSON documents, build LogInDB, copy into
+                 LogResponse, serialize through FastAPI's response_model path
+    row path     decode projected BSON documents, normalize to rows
+                 (database/rows.py), encode with orjson (FastJSONResponse)
+
+Projection is applied on the server, so the row path decodes documents
+that were re-encoded without the unprojected fields (stack_trace, _id...).
+
+No database or server is needed.
+
+Usage:
+    python scripts/bench_rows.py [--rows 1000] [--seconds 1.0]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bson
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from database.rows import to_row
+from models.log import LogResponse, LogsListResponse
+from repositories.log_repository import LOG_LIST_FIELDS, LogRepository
+from services.json_response import FastJSONResponse
+
+
+def build_documents(rows: int) -> list:
+    """Build stored log documents as LogRepository.create writes them."""
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "log_id": f"LOG_20250101000000_{i:08x}",
+            "timestamp": start + timedelta(seconds=i),
+            "level": "error" if i % 10 == 0 else "info",
+            "message": f"GET /api/admin/solutions?page={i % 20} - 200",
+            "service": "admin-api",
+            "request_id": f"{i:016x}",
+            "endpoint": "/api/admin/solutions",
+            "method": "GET",
+            "status_code": 500 if i % 10 == 0 else 200,
+            "duration_ms": 12.5 + i % 40,
+            "ip_address": "10.0.0.1",
+            "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+            "admin_id": "ADM_20240101000000_abcd1234",
+            "error_type": "ValueError" if i % 10 == 0 else None,
+            "error_message": "invalid literal" if i % 10 == 0 else None,
+            "stack_trace": "Traceback (most recent call last):\n" * 20 if i % 10 == 0 else None,
+            "extra": {"query_params": f"page={i % 20}"},
+            "expires_at": start + timedelta(days=30),
+        }
+        for i in range(rows)
+    ]
+
+
+def measure(func, seconds: float) -> float:
+    """Return the mean CPU time per call in milliseconds."""
+    func()  # warm up
+    calls = 0
+    start = time.process_time()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        func()
+        calls += 1
+    return (time.process_time() - start) / calls * 1000
+
+
+def main(rows: int, seconds: float) -> None:
+    docs = build_documents(rows)
+    full_bson = [bson.encode(doc) for doc in docs]
+    projected_bson = [bson.encode({f: doc[f] for f in LOG_LIST_FIELDS if f in doc}) for doc in docs]
+    adapter = TypeAdapter(LogsListResponse)
+
+    def model_path() -> bytes:
+        logs = [LogRepository._doc_to_model(bson.decode(raw)) for raw in full_bson]
+        payload = LogsListResponse(
+            logs=[
+                LogResponse(
+                    log_id=log.log_id,
+                    timestamp=log.timestamp,
+                    level=log.level.value,
+                    message=log.message,
+                    service=log.service,
+                    request_id=log.request_id,
+                    endpoint=log.endpoint,
+                    method=log.method,
+                    status_code=log.status_code,
+                    duration_ms=log.duration_ms,
+                    ip_address=log.ip_address,
+                    user_agent=log.user_agent,
+                    admin_id=log.admin_id,
+                    error_type=log.error_type,
+                    error_message=log.error_message,
+                    extra=log.extra,
+                )
+                for log in logs
+            ],
+            total=rows, page=1, page_size=rows, total_pages=1,
+        )
+        content = adapter.dump_python(adapter.validate_python(payload), mode="json")
+        return json.dumps(content, separators=(",", ":")).encode()
+
+    def row_path() -> bytes:
+        page = [to_row(bson.decode(raw), LOG_LIST_FIELDS) for raw in projected_bson]
+        return FastJSONResponse(
+            {"logs": page, "total": rows, "page": 1, "page_size": rows, "total_pages": 1}
+        ).body
+
+    assert json.loads(model_path()) == json.loads(row_path()), "paths produce different output"
+
+    model_ms = measure(model_path, seconds)
+    row_ms = measure(row_path, seconds)
+    scale = 1000 / rows
+
+    print(f"{'path':<12} {'CPU ms / 1,000 rows':>20}")
+    print(f"{'model':<12} {model_ms * scale:>20.2f}")
+    print(f"{'row':<12} {row_ms * scale:>20.2f}")
+    print(f"saved {(model_ms - row_ms) * scale:.2f} ms CPU per 1,000 rows ({model_ms / row_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time budget per path")
+    args = parser.parse_args()
+
+    main(args.rows, args.seconds)
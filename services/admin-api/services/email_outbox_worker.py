@@ -0,0 +1,265 @@
+"""
+Background worker that drains the email outbox over a pooled SMTP connection.
+
+smtplib is blocking and not thread-safe, so the connection lives on a
+dedicated single-thread executor. It is opened lazily, reused across
+batches, and closed after ``email_outbox_idle_timeout`` seconds of
+inactivity. The event loop only ever awaits executor futures.
+"""
+
+import asyncio
+import logging
+import smtplib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from models.email_outbox import EmailOutboxInDB, EmailOutboxStats
+from repositories.email_outbox_repository import EmailOutboxRepository
+from services.email_service import EmailService
+from services.metrics import QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+# (email_ids, recipient, serialized message)
+_Envelope = Tuple[List[str], str, str]
+
+
+class EmailOutboxWorker:
+    """Singleton outbox worker bound to the application lifespan."""
+
+    _task: Optional[asyncio.Task] = None
+    _wake: Optional[asyncio.Event] = None
+    _stopping: bool = False
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    # Only touched from the executor thread
+    _smtp: Optional[smtplib.SMTP] = None
+    _last_used: float = 0.0
+
+    messages_sent: int = 0
+    connections_opened: int = 0
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the worker task. Should be called during application startup."""
+        if cls._task is not None and not cls._task.done():
+            logger.warning("Email outbox worker already running")
+            return
+
+        cls._stopping = False
+        cls._wake = asyncio.Event()
+        cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp-outbox")
+        cls._task = asyncio.create_task(cls._run(), name="email-outbox-worker")
+        logger.info("Email outbox worker started")
+
+    @classmethod
+    async def stop(cls, timeout: float = 10.0) -> None:
+        """Stop the worker and close the pooled SMTP connection."""
+        if cls._task is None:
+            return
+
+        cls._stopping = True
+        cls.notify()
+
+        try:
+            await asyncio.wait_for(cls._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            cls._task.cancel()
+            logger.warning("Email outbox worker did not stop in time - cancelled")
+        except asyncio.CancelledError:
+            pass
+
+        if cls._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(cls._executor, cls._close_connection)
+            cls._executor.shutdown(wait=False)
+
+        cls._task = None
+        cls._wake = None
+        cls._executor = None
+        logger.info("Email outbox worker stopped")
+
+    @classmethod
+    def notify(cls) -> None:
+        """Wake the worker so freshly queued mail goes out without waiting for the poll."""
+        if cls._wake is not None:
+            cls._wake.set()
+
+    @classmethod
+    async def get_stats(cls) -> EmailOutboxStats:
+        """Get queue depth from MongoDB plus in-process worker counters."""
+        stats = await EmailOutboxRepository.get_stats()
+        stats.worker_running = cls._task is not None and not cls._task.done()
+        stats.smtp_connected = cls._smtp is not None
+        stats.messages_sent = cls.messages_sent
+        stats.connections_opened = cls.connections_opened
+        return stats
+
+    # ------------------------------------------------------------------
+    # Event loop side
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def _run(cls) -> None:
+        """Main loop: drain due messages, then sleep until notified or polled."""
+        loop = asyncio.get_running_loop()
+
+        while not cls._stopping:
+            try:
+                processed = await cls._process_batch()
+            except Exception as e:
+                logger.error(f"Email outbox worker error: {e}")
+                processed = 0
+
+            # A full batch likely means more work is waiting
+            if processed >= settings.email_outbox_batch_size:
+                continue
+
+            cls._wake.clear()
+            try:
+                await asyncio.wait_for(cls._wake.wait(), timeout=settings.email_outbox_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            if cls._smtp is not None and time.monotonic() - cls._last_used > settings.email_outbox_idle_timeout:
+                await loop.run_in_executor(cls._executor, cls._close_connection)
+
+    @classmethod
+    async def _process_batch(cls) -> int:
+        """Claim, deliver and record one batch. Returns the number of messages claimed."""
+        if not EmailService.is_configured():
+            return 0
+
+        claimed = await EmailOutboxRepository.claim_batch(settings.email_outbox_batch_size)
+        if not claimed:
+            return 0
+
+        by_id = {email.email_id: email for email in claimed}
+        envelopes = cls._build_envelopes(claimed)
+
+        inflight = QUEUE_DEPTH.labels("email_outbox_inflight")
+        inflight.set(len(claimed))
+        try:
+            loop = asyncio.get_running_loop()
+            errors = await loop.run_in_executor(cls._executor, cls._deliver, envelopes)
+        finally:
+            inflight.set(0)
+
+        sent_ids = [email_id for email_id in by_id if email_id not in errors]
+        await EmailOutboxRepository.mark_sent(sent_ids)
+        for email_id, error in errors.items():
+            await EmailOutboxRepository.mark_failed(by_id[email_id], error)
+
+        logger.info(f"Email outbox batch: {len(sent_ids)} sent, {len(errors)} failed")
+        return len(claimed)
+
+    @classmethod
+    def _build_envelopes(cls, emails: List[EmailOutboxInDB]) -> List[_Envelope]:
+        """
+        Render claimed messages into SMTP envelopes.
+
+        Messages to the same recipient that share a ``digest_key`` are
+        merged into a single digest email.
+        """
+        groups: "OrderedDict[Tuple[str, str], List[EmailOutboxInDB]]" = OrderedDict()
+        for email in emails:
+            key = (email.to_email, email.digest_key or email.email_id)
+            groups.setdefault(key, []).append(email)
+
+        envelopes = []
+        for (to_email, _), group in groups.items():
+            if len(group) == 1:
+                email = group[0]
+                msg = EmailService.build_message(
+                    to_email, email.subject, email.html_content, email.text_content
+                )
+            else:
+                subject = f"{group[0].subject} (+{len(group) - 1} more)"
+                html_content = "\n<hr>\n".join(email.html_content for email in group)
+                text_content = "\n\n---\n\n".join(
+                    email.text_content or email.subject for email in group
+                )
+                msg = EmailService.build_message(to_email, subject, html_content, text_content)
+
+            envelopes.append(([email.email_id for email in group], to_email, msg.as_string()))
+
+        return envelopes
+
+    # ------------------------------------------------------------------
+    # Executor thread side
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _ensure_connection(cls) -> smtplib.SMTP:
+        """Return the pooled SMTP connection, opening a new one if needed."""
+        if cls._smtp is None:
+            cls._smtp = EmailService._get_smtp_connection()
+            cls.connections_opened += 1
+            logger.debug(f"Opened SMTP connection to {settings.smtp_host}:{settings.smtp_port}")
+        return cls._smtp
+
+    @classmethod
+    def _close_connection(cls) -> None:
+        """Close the pooled SMTP connection, ignoring errors from a dead socket."""
+        if cls._smtp is None:
+            return
+        try:
+            cls._smtp.quit()
+        except Exception:
+            try:
+                cls._smtp.close()
+            except Exception:
+                pass
+        cls._smtp = None
+        logger.debug("Closed pooled SMTP connection")
+
+    @classmethod
+    def _deliver(cls, envelopes: List[_Envelope]) -> Dict[str, str]:
+        """
+        Send envelopes over the pooled connection.
+
+        Returns a mapping of email_id to error message for failed deliveries.
+        """
+        errors: Dict[str, str] = {}
+
+        for email_ids, to_email, payload in envelopes:
+            error = cls._send_one(to_email, payload)
+            if error is None:
+                cls.messages_sent += len(email_ids)
+            else:
+                for email_id in email_ids:
+                    errors[email_id] = error
+
+        cls._last_used = time.monotonic()
+        return errors
+
+    @classmethod
+    def _send_one(cls, to_email: str, payload: str) -> Optional[str]:
+        """Send a single envelope, reconnecting once if the server dropped us."""
+        for attempt in range(2):
+            try:
+                smtp = cls._ensure_connection()
+                smtp.sendmail(settings.smtp_from_email, to_email, payload)
+                return None
+            except smtplib.SMTPRecipientsRefused as e:
+                # Connection is still healthy - only this recipient is bad
+                return f"Recipient refused: {e.recipients}"
+            except smtplib.SMTPException as e:
+                # SMTPException subclasses OSError, so it must be told apart
+                # from socket errors here; only a disconnect is worth a resend
+                cls._close_connection()
+                if isinstance(e, smtplib.SMTPServerDisconnected):
+                    if attempt == 0:
+                        continue
+                    return f"SMTP connection error: {e}"
+                return f"SMTP error: {e}"
+            except OSError as e:
+                # ConnectionError, timeouts and other socket failures
+                cls._close_connection()
+                if attempt == 0:
+                    continue
+                return f"SMTP connection error: {e}"
+
+        return "SMTP connection error"
@@ -1,5 +1,9 @@
 """
 Email service for sending emails via SMTP.
+
+Request handlers never talk to SMTP directly: messages are written to the
+``email_outbox`` collection and delivered by ``EmailOutboxWorker`` over a
+pooled, persistent SMTP connection.
 """
 
 import logging
@@ -9,6 +13,8 @@ from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
 from config import settings
+from models.email_outbox import EmailOutboxCreate
+from repositories.email_outbox_repository import EmailOutboxRepository
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +22,52 @@ logger = logging.getLogger(__name__)
 class EmailService:
     """Service for sending emails via SMTP."""
 
+    @classmethod
+    def is_configured(cls) -> bool:
+        """Check whether SMTP delivery is configured."""
+        if not settings.smtp_auth_required:
+            return bool(settings.smtp_host)
+        return bool(settings.smtp_username and settings.smtp_password)
+
     @classmethod
     def _get_smtp_connection(cls) -> smtplib.SMTP:
         """Create and return an SMTP connection."""
-        smtp = smtplib.SMTP(settings.smtp_host, settings.smtp_port)
-        smtp.starttls()
+        smtp = smtplib.SMTP(
+            settings.smtp_host,
+            settings.smtp_port,
+            timeout=settings.smtp_timeout,
+        )
+        if settings.smtp_starttls:
+            smtp.starttls()
         if settings.smtp_username and settings.smtp_password:
             smtp.login(settings.smtp_username, settings.smtp_password)
         return smtp
 
+    @classmethod
+    def build_message(
+        cls,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> MIMEMultipart:
+        """Build a multipart/alternative MIME message."""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
+        msg["To"] = to_email
+
+        # Add plain text version
+        if text_content:
+            text_part = MIMEText(text_content, "plain")
+            msg.attach(text_part)
+
+        # Add HTML version
+        html_part = MIMEText(html_content, "html")
+        msg.attach(html_part)
+
+        return msg
+
     @classmethod
     def send_email(
         cls,
@@ -34,7 +77,10 @@ class EmailService:
         text_content: Optional[str] = None,
     ) -> bool:
         """
-        Send an email via SMTP.
+        Send an email via SMTP synchronously.
+
+        Blocks for the whole SMTP exchange - use ``queue_email`` from
+        async code. Kept for scripts and one-off tooling.
 
         Args:
             to_email: Recipient email address
@@ -45,24 +91,12 @@ class EmailService:
         Returns:
             True if email was sent successfully, False otherwise
         """
-        if not settings.smtp_username or not settings.smtp_password:
+        if not cls.is_configured():
             logger.warning("SMTP credentials not configured - email not sent")
             return False
 
         try:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
-            msg["To"] = to_email
-
-            # Add plain text version
-            if text_content:
-                text_part = MIMEText(text_content, "plain")
-                msg.attach(text_part)
-
-            # Add HTML version
-            html_part = MIMEText(html_content, "html")
-            msg.attach(html_part)
+            msg = cls.build_message(to_email, subject, html_content, text_content)
 
             with cls._get_smtp_connection() as smtp:
                 smtp.sendmail(settings.smtp_from_email, to_email, msg.as_string())
@@ -81,14 +115,63 @@ class EmailService:
             return False
 
     @classmethod
-    def send_password_reset_email(
+    async def queue_email(
+        cls,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        digest_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Enqueue an email for background delivery.
+
+        Only performs a single insert into the outbox; the SMTP exchange
+        happens on the outbox worker.
+
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            html_content: HTML body content
+            text_content: Plain text content (optional fallback)
+            digest_key: Optional key for merging messages into a digest
+
+        Returns:
+            True if the email was queued, False otherwise
+        """
+        # Imported lazily - the worker depends on this module
+        from services.email_outbox_worker import EmailOutboxWorker
+
+        if not cls.is_configured():
+            logger.warning("SMTP credentials not configured - email not queued")
+            return False
+
+        try:
+            await EmailOutboxRepository.enqueue(
+                EmailOutboxCreate(
+                    to_email=to_email,
+                    subject=subject,
+                    html_content=html_content,
+                    text_content=text_content,
+                    digest_key=digest_key,
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error queueing email to {to_email}: {e}")
+            return False
+
+        EmailOutboxWorker.notify()
+        return True
+
+    @classmethod
+    async def send_password_reset_email(
         cls,
         to_email: str,
         username: str,
         reset_token: str,
     ) -> bool:
         """
-        Send a password reset email.
+        Queue a password reset email.
 
         Args:
             to_email: Recipient email address
@@ -96,7 +179,7 @@ class EmailService:
             reset_token: Password reset token
 
         Returns:
-            True if email was sent successfully, False otherwise
+            True if email was queued successfully, False otherwise
         """
         reset_url = f"{settings.base_url}/admin/reset-password?token={reset_token}"
 
@@ -231,23 +314,23 @@ If you didn't request a password reset, you can safely ignore this email. Your p
 MongoDB Solutions Library Admin Dashboard
 """
 
-        return cls.send_email(to_email, subject, html_content, text_content)
+        return await cls.queue_email(to_email, subject, html_content, text_content)
 
     @classmethod
-    def send_password_changed_email(
+    async def send_password_changed_email(
         cls,
         to_email: str,
         username: str,
     ) -> bool:
         """
-        Send a password changed confirmation email.
+        Queue a password changed confirmation email.
 
         Args:
             to_email: Recipient email address
             username: Admin username
 
         Returns:
-            True if email was sent successfully, False otherwise
+            True if email was queued successfully, False otherwise
         """
         subject = "Password Changed - MongoDB Solutions Library"
 
@@ -351,4 +434,4 @@ If you didn't make this change, please contact your system administrator immedia
 MongoDB Solutions Library Admin Dashboard
 """
 
-        return cls.send_email(to_email, subject, html_content, text_content)
+        return await cls.queue_email(to_email, subject, html_content, text_content)
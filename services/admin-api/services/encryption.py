@@ -6,7 +6,7 @@ Uses Fernet symmetric encryption from cryptography library.
 import base64
 import hashlib
 import logging
-from typing import Optional
+from typing import List, Optional
 from cryptography.fernet import Fernet, InvalidToken
 
 from config import settings
@@ -71,6 +71,26 @@ class EncryptionService:
             logger.error(f"Decryption error: {e}")
             raise ValueError("Failed to decrypt value")
 
+    @classmethod
+    def encrypt_many(cls, plaintexts: List[str]) -> List[str]:
+        """
+        Encrypt a batch of plaintext strings with a single Fernet instance.
+
+        CPU-bound for large batches - call via ``asyncio.to_thread`` from async code.
+
+        Args:
+            plaintexts: The strings to encrypt
+
+        Returns:
+            Encrypted strings in the same order
+        """
+        fernet = cls._get_fernet()
+        try:
+            return [fernet.encrypt(plaintext.encode()).decode() for plaintext in plaintexts]
+        except Exception as e:
+            logger.error(f"Batch encryption error: {e}")
+            raise ValueError("Failed to encrypt values")
+
     @classmethod
     def hash_value(cls, value: str) -> str:
         """
@@ -0,0 +1,139 @@
+"""
+Application-scoped outbound HTTP client pool.
+
+One httpx.AsyncClient is created in the lifespan and shared by every
+outbound call, so requests reuse keep-alive (and, when the h2 package is
+installed, multiplexed HTTP/2) connections instead of paying a TCP+TLS
+handshake each time. httpx only caps the pool globally, so concurrency
+towards any single host is bounded with per-host semaphores.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpClientPool:
+    """Singleton outbound HTTP client bound to the application lifespan."""
+
+    _client: Optional[httpx.AsyncClient] = None
+    _host_slots: Dict[str, asyncio.Semaphore] = {}
+    http2: bool = False
+
+    @classmethod
+    def start(cls) -> None:
+        """Create the shared client. Should be called during application startup."""
+        if cls._client is not None:
+            logger.warning("HTTP client pool already started")
+            return
+
+        cls.http2 = settings.http_client_http2 and _h2_available()
+        if settings.http_client_http2 and not cls.http2:
+            logger.warning("HTTP/2 requested but the h2 package is not installed - using HTTP/1.1")
+
+        cls._client = httpx.AsyncClient(
+            http2=cls.http2,
+            timeout=settings.http_client_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_keepalive,
+                keepalive_expiry=settings.http_client_keepalive_expiry,
+            ),
+        )
+        cls._host_slots = {}
+        logger.info(f"HTTP client pool started (http2={cls.http2})")
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Close the shared client and its pooled connections."""
+        if cls._client is None:
+            return
+        await cls._client.aclose()
+        cls._client = None
+        cls._host_slots = {}
+        logger.info("HTTP client pool closed")
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """
+        Get the shared client.
+        Raises RuntimeError if the pool has not been started.
+        """
+        if cls._client is None:
+            raise RuntimeError("HTTP client pool not started. Call start() first.")
+        return cls._client
+
+    @classmethod
+    @asynccontextmanager
+    async def host_slot(cls, host: str) -> AsyncIterator[None]:
+        """Hold one of the ``http_client_max_per_host`` request slots for ``host``."""
+        slot = cls._host_slots.get(host)
+        if slot is None:
+            slot = cls._host_slots[host] = asyncio.Semaphore(settings.http_client_max_per_host)
+        async with slot:
+            yield
+
+    @classmethod
+    async def timed_get(
+        cls, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[httpx.Response, Dict[str, object]]:
+        """
+        GET ``url`` through the pool and return the response with a latency breakdown.
+
+        Phases come from httpcore trace events only. httpcore resolves the
+        host inside ``connection.connect_tcp``, so ``connect_ms`` includes
+        the DNS lookup. ``connect_ms`` and ``tls_ms`` are None when a pooled
+        connection was reused, which costs neither.
+        """
+        client = cls.get_client()
+        host = urlsplit(url).hostname or ""
+        marks: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: dict) -> None:
+            # e.g. "connection.connect_tcp.started", "http2.receive_response_headers.complete"
+            phase, _, state = event_name.rpartition(".")
+            marks.setdefault(f"{phase.rsplit('.', 1)[-1]}.{state}", time.perf_counter())
+
+        start = time.perf_counter()
+        async with cls.host_slot(host):
+            response = await client.get(url, headers=headers, extensions={"trace": trace})
+
+        total_ms = (time.perf_counter() - start) * 1000
+
+        def span(name: str) -> Optional[float]:
+            if f"{name}.started" not in marks or f"{name}.complete" not in marks:
+                return None
+            return (marks[f"{name}.complete"] - marks[f"{name}.started"]) * 1000
+
+        ttfb_ms = None
+        if "send_request_headers.started" in marks and "receive_response_headers.complete" in marks:
+            ttfb_ms = (
+                marks["receive_response_headers.complete"] - marks["send_request_headers.started"]
+            ) * 1000
+
+        timings = {
+            "connect_ms": span("connect_tcp"),
+            "tls_ms": span("start_tls"),
+            "ttfb_ms": ttfb_ms,
+            "total_ms": total_ms,
+            "connection_reused": "connect_tcp.started" not in marks,
+            "http_version": response.http_version,
+        }
+        return response, timings
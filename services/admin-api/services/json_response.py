@@ -0,0 +1,108 @@
+"""
+Fast JSON responses for large admin API payloads.
+
+FastAPI's default path validates the returned object against the
+``response_model``, walks it into plain Python objects with
+``jsonable_encoder`` (or ``TypeAdapter.dump_python`` on newer releases)
+and finally encodes that with the stdlib ``json`` module. For list
+endpoints returning hundreds of rows that walk dominates request CPU.
+
+``FastJSONResponse`` is opt-in per route: the endpoint builds its
+response model as usual and returns ``FastJSONResponse(model)``.
+FastAPI passes Response instances through untouched, so:
+
+- Pydantic models (or lists of them) are serialized straight to bytes
+  by pydantic-core's Rust serializer, with no intermediate dict.
+- Anything else (dicts, raw MongoDB documents) is encoded with orjson,
+  which handles datetime, date, UUID and enums natively; ObjectId,
+  Decimal, Decimal128 and sets are converted by ``_default``.
+
+Keep ``response_model`` on the route so the OpenAPI schema is unchanged.
+See ``scripts/bench_json.py`` for a comparison with the default path.
+"""
+
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict
+
+import orjson
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Rows joined into each chunk of a streamed export
+EXPORT_CHUNK_ROWS = 500
+
+
+def _default(obj: Any) -> Any:
+    """Convert types orjson does not serialize natively."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        obj = obj.to_decimal()
+    if isinstance(obj, Decimal):
+        # Match jsonable_encoder: integral decimals become ints
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _is_model_payload(content: Any) -> bool:
+    """True for a Pydantic model or a non-empty list of them."""
+    if isinstance(content, BaseModel):
+        return True
+    return isinstance(content, list) and bool(content) and isinstance(content[0], BaseModel)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize a response payload to JSON bytes."""
+    if _is_model_payload(content):
+        return to_json(content, by_alias=True, fallback=_default)
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that renders with pydantic-core or orjson instead of stdlib json."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+async def stream_json_export(
+    header: Dict[str, Any],
+    items_key: str,
+    rows: AsyncIterator[Dict[str, Any]],
+) -> AsyncIterator[bytes]:
+    """
+    Stream ``{**header, items_key: [...rows], "total_records": n}`` as JSON.
+
+    Rows are encoded one per line as they arrive from the cursor and sent
+    in chunks of EXPORT_CHUNK_ROWS, so an export never holds the whole
+    result set (or its encoded form) in memory. The row count is only
+    known at the end, so ``total_records`` is written after the rows.
+    The header must not be empty.
+    """
+    head = orjson.dumps(header, default=_default, option=ORJSON_OPTIONS)
+    yield head[:-1] + b',"' + items_key.encode() + b'":['
+
+    count = 0
+    chunk = []
+    async for row in rows:
+        chunk.append((b",\n" if count else b"\n") + orjson.dumps(row, default=_default, option=ORJSON_OPTIONS))
+        count += 1
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield b"".join(chunk)
+            chunk = []
+
+    chunk.append(b'\n],"total_records":' + str(count).encode() + b"}\n")
+    yield b"".join(chunk)
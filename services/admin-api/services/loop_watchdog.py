@@ -0,0 +1,252 @@
+"""
+Event loop watchdog that catches blocking calls in async code.
+
+A heartbeat task on the event loop stamps a timestamp every
+``loop_watchdog_interval_ms``. A daemon thread watches that stamp; when
+it goes stale by more than ``loop_watchdog_threshold_ms`` the loop is
+stuck in a single callback, and the thread snapshots the event loop
+thread's stack with ``sys._current_frames()``. The snapshot is taken
+while the call is still blocking, so it names the actual culprit
+(``bcrypt.hashpw``, ``smtplib``, file reads...) rather than whatever ran
+next.
+
+Stalls are grouped by the outermost application coroutine on the stack
+(the route handler or task, not the library coroutine it was awaiting)
+and the innermost application frame, and ranked by total blocked time. Unlike asyncio
+debug mode (``slow_callback_duration``) this costs one timestamp per
+heartbeat and is safe to leave on in production.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from services.metrics import EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+# Frames from files under this directory count as application code
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _is_app_file(filename: str) -> bool:
+    """Whether a frame's file is application code (not an in-tree virtualenv)."""
+    return filename.startswith(APP_ROOT) and "site-packages" not in filename
+
+
+def _frame_line(filename: str, lineno: Optional[int], name: str) -> str:
+    """``file:line in name``; frames can report no line number."""
+    return f"{filename}:{lineno if lineno is not None else '?'} in {name}"
+
+
+# Innermost frames kept per captured stack
+MAX_STACK_FRAMES = 30
+
+# Distinct offenders kept; the least costly is evicted beyond this
+MAX_OFFENDERS = 100
+
+
+class _Offender:
+    """Aggregated stalls sharing a coroutine and application frame."""
+
+    __slots__ = ("key", "coroutine", "location", "blocking_call", "count",
+                 "total_ms", "max_ms", "last_seen", "stack")
+
+    def __init__(self, key: Tuple[str, str], blocking_call: str, stack: List[str]):
+        self.key = key
+        self.coroutine, self.location = key
+        self.blocking_call = blocking_call
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_seen = 0.0
+        self.stack = stack
+
+    def to_dict(self) -> dict:
+        return {
+            "coroutine": self.coroutine,
+            "location": self.location,
+            "blocking_call": self.blocking_call,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "last_seen": self.last_seen,
+            "stack": self.stack,
+        }
+
+
+class LoopWatchdog:
+    """Singleton watchdog bound to the application lifespan."""
+
+    _task: Optional[asyncio.Task] = None
+    _thread: Optional[threading.Thread] = None
+    _stop: Optional[threading.Event] = None
+    _loop_thread_id: Optional[int] = None
+    _heartbeat: float = 0.0
+
+    _lock = threading.Lock()
+    _offenders: Dict[Tuple[str, str], _Offender] = {}
+    _stalls: int = 0
+    _started_at: float = 0.0
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the heartbeat and watchdog thread. Call from the event loop."""
+        if cls._task is not None and not cls._task.done():
+            return
+
+        cls._loop_thread_id = threading.get_ident()
+        cls._heartbeat = time.monotonic()
+        cls._started_at = time.time()
+        cls._stop = threading.Event()
+        cls._task = asyncio.create_task(cls._beat(), name="loop-watchdog-heartbeat")
+        cls._thread = threading.Thread(target=cls._watch, name="loop-watchdog", daemon=True)
+        cls._thread.start()
+        logger.info(f"Event loop watchdog started (threshold {settings.loop_watchdog_threshold_ms} ms)")
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the heartbeat and watchdog thread."""
+        if cls._task is None:
+            return
+
+        cls._stop.set()
+        cls._task.cancel()
+        try:
+            await cls._task
+        except asyncio.CancelledError:
+            pass
+        cls._thread.join(timeout=1.0)
+        cls._task = None
+        cls._thread = None
+
+    @classmethod
+    def reset(cls) -> None:
+        """Clear collected offenders."""
+        with cls._lock:
+            cls._offenders = {}
+            cls._stalls = 0
+            cls._started_at = time.time()
+
+    @classmethod
+    def get_stats(cls, limit: int = 20) -> dict:
+        """Get the top offenders ranked by total blocked time."""
+        with cls._lock:
+            offenders = sorted(cls._offenders.values(), key=lambda o: o.total_ms, reverse=True)
+            top = [o.to_dict() for o in offenders[:limit]]
+            stalls = cls._stalls
+
+        return {
+            "enabled": settings.loop_watchdog_enabled,
+            "running": cls._task is not None and not cls._task.done(),
+            "threshold_ms": settings.loop_watchdog_threshold_ms,
+            "collecting_since": cls._started_at,
+            "stalls": stalls,
+            "offenders": top,
+        }
+
+    # ------------------------------------------------------------------
+    # Event loop side
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def _beat(cls) -> None:
+        interval = settings.loop_watchdog_interval_ms / 1000
+        while True:
+            cls._heartbeat = time.monotonic()
+            await asyncio.sleep(interval)
+
+    # ------------------------------------------------------------------
+    # Watchdog thread side
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _watch(cls) -> None:
+        interval = settings.loop_watchdog_interval_ms / 1000
+        threshold = settings.loop_watchdog_threshold_ms / 1000
+        poll = max(0.005, min(interval, threshold) / 2)
+
+        # Heartbeat value the current stall was detected at
+        stalled_at: Optional[float] = None
+        offender: Optional[_Offender] = None
+
+        while not cls._stop.wait(poll):
+            heartbeat = cls._heartbeat
+
+            if stalled_at is not None and heartbeat != stalled_at:
+                # Loop resumed: the gap between heartbeats is the stall length
+                blocked_ms = max(0.0, heartbeat - stalled_at - interval) * 1000
+                cls._record(offender, blocked_ms)
+                stalled_at = offender = None
+
+            if stalled_at is None and time.monotonic() - heartbeat > interval + threshold:
+                offender = cls._capture()
+                if offender is not None:
+                    stalled_at = heartbeat
+
+    @classmethod
+    def _capture(cls) -> Optional[_Offender]:
+        """Snapshot the event loop thread's stack and find its offender entry."""
+        frame = sys._current_frames().get(cls._loop_thread_id)
+        if frame is None:
+            return None
+
+        # Walk the whole stack: the innermost coroutine is often library code
+        # (a driver cursor, the ASGI server) awaited by the application
+        app_coroutine = None
+        any_coroutine = None
+        location = None
+        walk = frame
+        while walk is not None:
+            code = walk.f_code
+            is_coroutine = bool(code.co_flags & inspect.CO_COROUTINE)
+            name = code.co_qualname if hasattr(code, "co_qualname") else code.co_name
+            if is_coroutine and any_coroutine is None:
+                any_coroutine = name
+            if _is_app_file(code.co_filename):
+                if location is None:
+                    location = _frame_line(os.path.relpath(code.co_filename, APP_ROOT), walk.f_lineno, code.co_name)
+                if is_coroutine:
+                    # Keeps overwriting, so the outermost one wins
+                    app_coroutine = name
+            walk = walk.f_back
+        coroutine = app_coroutine or any_coroutine or "<callback>"
+
+        summary = traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+        innermost = summary[-1]
+        blocking_call = _frame_line(os.path.basename(innermost.filename), innermost.lineno, innermost.name)
+        stack = [_frame_line(fs.filename, fs.lineno, fs.name) for fs in summary]
+        key = (coroutine, location or blocking_call)
+
+        with cls._lock:
+            offender = cls._offenders.get(key)
+            if offender is None:
+                if len(cls._offenders) >= MAX_OFFENDERS:
+                    cheapest = min(cls._offenders.values(), key=lambda o: o.total_ms)
+                    del cls._offenders[cheapest.key]
+                offender = _Offender(key, blocking_call, stack)
+                cls._offenders[key] = offender
+        return offender
+
+    @classmethod
+    def _record(cls, offender: _Offender, blocked_ms: float) -> None:
+        with cls._lock:
+            offender.count += 1
+            offender.total_ms += blocked_ms
+            offender.max_ms = max(offender.max_ms, blocked_ms)
+            offender.last_seen = time.time()
+            cls._stalls += 1
+
+        EVENT_LOOP_STALLS.inc()
+        logger.warning(
+            f"Event loop blocked for {blocked_ms:.0f} ms in {offender.coroutine} "
+            f"({offender.location}; blocking call {offender.blocking_call})"
+        )
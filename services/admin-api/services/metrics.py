@@ -0,0 +1,443 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Counters and histograms are sharded per thread: each writer thread owns
+its own value array, so updates from the event loop and from driver
+listener threads never take a lock. Shards are summed at scrape time.
+Gauges hold a single value (assignment is atomic) or are refreshed by
+collector callbacks just before rendering.
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for API request and database command latencies
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Seconds; event loop lag is interesting from ~1ms upwards
+LAG_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Shards:
+    """Per-thread value arrays; writers never contend, readers sum all shards."""
+
+    __slots__ = ("_size", "_shards")
+
+    def __init__(self, size: int):
+        self._size = size
+        self._shards: Dict[int, List[float]] = {}
+
+    def local(self) -> List[float]:
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            # setdefault is atomic under the GIL
+            shard = self._shards.setdefault(ident, [0.0] * self._size)
+        return shard
+
+    def totals(self) -> List[float]:
+        totals = [0.0] * self._size
+        for shard in list(self._shards.values()):
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.local()[0] += amount
+
+    def get(self) -> float:
+        return self._shards.totals()[0]
+
+
+class _GaugeChild:
+    __slots__ = ("_value",)
+
+    def __init__(self):
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        # Gauges are only mutated from the event loop thread
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # One slot per bucket (including +Inf) followed by the running sum
+        self._shards = _Shards(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.local()
+        shard[bisect.bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+    def time(self) -> "_Timer":
+        """Context manager observing the elapsed wall time in seconds."""
+        return _Timer(self)
+
+    def get(self) -> Tuple[List[float], float, float]:
+        """Return (per-bucket counts, count, sum)."""
+        totals = self._shards.totals()
+        buckets = totals[:-1]
+        return buckets, sum(buckets), totals[-1]
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _MetricFamily:
+    """A named metric with a fixed set of label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Get the child metric for the given label values."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def clear(self) -> None:
+        """Drop all labelled children."""
+        if self.labelnames:
+            self._children.clear()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_MetricFamily):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Gauge(_MetricFamily):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Histogram(_MetricFamily):
+    """Fixed-bucket histogram."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            buckets, count, total = child.get()
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.bounds + (math.inf,), buckets):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} "
+                    f"{_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {_format_value(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        self._families: Dict[str, _MetricFamily] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, family: _MetricFamily) -> _MetricFamily:
+        existing = self._families.get(family.name)
+        if existing is not None:
+            return existing
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector!r} failed: {e}")
+
+        lines: List[str] = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ============================================
+# Core metrics
+# ============================================
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+)
+MONGO_COMMAND_DURATION = REGISTRY.histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency by command name",
+    ["command"],
+)
+MONGO_COMMAND_FAILURES = REGISTRY.counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error",
+    ["command"],
+)
+MONGO_POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+)
+MONGO_CONNECTIONS_IN_USE = REGISTRY.gauge(
+    "mongodb_pool_connections_in_use",
+    "Connections currently checked out of the MongoDB pool",
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "In-process cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "queue_depth",
+    "Items waiting or in flight in in-process queues",
+    ["queue"],
+)
+RATE_LIMIT_DECISIONS = REGISTRY.counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions by policy and result (allowed/rejected)",
+    ["policy", "decision"],
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event loop wake-up and when it actually ran",
+    buckets=LAG_BUCKETS,
+)
+EVENT_LOOP_LAG_LAST = REGISTRY.gauge(
+    "event_loop_lag_last_seconds",
+    "Most recently measured event loop lag",
+)
+EVENT_LOOP_STALLS = REGISTRY.counter(
+    "event_loop_stalls_total",
+    "Times a single callback blocked the event loop beyond the watchdog threshold",
+)
+EVENT_LOOP_TASKS = REGISTRY.gauge(
+    "event_loop_tasks",
+    "Number of asyncio tasks alive on the event loop",
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup result."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _collect_event_loop_tasks() -> None:
+    try:
+        EVENT_LOOP_TASKS.set(len(asyncio.all_tasks()))
+    except RuntimeError:
+        # Not called from within a running loop
+        pass
+
+
+REGISTRY.register_collector(_collect_event_loop_tasks)
+
+
+class EventLoopLagProbe:
+    """Background task measuring how late the event loop wakes up a sleeper."""
+
+    _task: Optional[asyncio.Task] = None
+    interval: float = 0.5
+
+    @classmethod
+    def start(cls, interval: float = 0.5) -> None:
+        """Start sampling. Should be called during application startup."""
+        if cls._task is not None and not cls._task.done():
+            return
+        cls.interval = interval
+        cls._task = asyncio.create_task(cls._run(), name="event-loop-lag-probe")
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop sampling."""
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        try:
+            await cls._task
+        except asyncio.CancelledError:
+            pass
+        cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            scheduled = time.perf_counter()
+            await asyncio.sleep(cls.interval)
+            lag = max(0.0, time.perf_counter() - scheduled - cls.interval)
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_LAG_LAST.set(lag)
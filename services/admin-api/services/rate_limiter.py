@@ -0,0 +1,199 @@
+"""
+Token-bucket rate limiting for public and auth endpoints.
+
+Routes call ``RateLimiter.enforce`` before doing any MongoDB work, so a
+rejected request costs a dictionary lookup rather than a write. Buckets
+live in a sharded in-process store: each shard has its own lock and LRU
+eviction, keeping contention and memory bounded under a flood of keys.
+
+With RATE_LIMIT_BACKEND=mongodb the local bucket still answers first;
+requests it admits are then counted in shared fixed-window ``$inc``
+buckets so the limit holds across API replicas.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+
+from config import settings
+from database.connection import get_rate_limits_collection
+from services.metrics import RATE_LIMIT_DECISIONS
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitPolicy:
+    """A limit of ``limit`` requests per ``period`` seconds, refilled continuously."""
+
+    __slots__ = ("name", "limit", "period", "rate")
+
+    def __init__(self, name: str, limit: int, period: float):
+        if limit < 1 or period <= 0:
+            raise ValueError(f"Invalid rate limit for {name}: {limit}/{period}")
+        self.name = name
+        self.limit = limit
+        self.period = period
+        self.rate = limit / period
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "RateLimitPolicy":
+        """Parse a 'requests/seconds' spec such as '20/60'."""
+        limit, _, period = spec.partition("/")
+        return cls(name, int(limit), float(period or 60))
+
+
+class _BucketShard:
+    """One lock-protected slice of the bucket store with LRU eviction."""
+
+    __slots__ = ("lock", "buckets", "max_keys")
+
+    def __init__(self, max_keys: int):
+        self.lock = threading.Lock()
+        # key -> [tokens, last refill time]
+        self.buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.max_keys = max_keys
+
+    def take(self, key: str, policy: RateLimitPolicy, now: float) -> Tuple[bool, float]:
+        """Take one token. Returns (allowed, seconds until a token is available)."""
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = [float(policy.limit), now]
+                self.buckets[key] = bucket
+                if len(self.buckets) > self.max_keys:
+                    self.buckets.popitem(last=False)
+            else:
+                self.buckets.move_to_end(key)
+                bucket[0] = min(policy.limit, bucket[0] + (now - bucket[1]) * policy.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0.0
+            return False, (1 - bucket[0]) / policy.rate
+
+
+class TokenBucketStore:
+    """Sharded in-process token buckets keyed by policy and client key."""
+
+    def __init__(self, shards: int, max_keys: int):
+        per_shard = max(1, max_keys // max(1, shards))
+        self._shards = [_BucketShard(per_shard) for _ in range(max(1, shards))]
+
+    def take(self, policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        """Take one token from the bucket for ``key`` under ``policy``."""
+        bucket_key = f"{policy.name}:{key}"
+        shard = self._shards[zlib.crc32(bucket_key.encode()) % len(self._shards)]
+        return shard.take(bucket_key, policy, time.monotonic())
+
+    def size(self) -> int:
+        """Number of tracked buckets."""
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+
+class RateLimiter:
+    """Process-wide rate limiter with named policies."""
+
+    _store: TokenBucketStore = TokenBucketStore(settings.rate_limit_shards, settings.rate_limit_max_keys)
+    _policies: Dict[str, RateLimitPolicy] = {
+        "login_ip": RateLimitPolicy.parse("login_ip", settings.rate_limit_login_ip),
+        "login_username": RateLimitPolicy.parse("login_username", settings.rate_limit_login_username),
+        "usage_enquiry_ip": RateLimitPolicy.parse("usage_enquiry_ip", settings.rate_limit_usage_enquiry_ip),
+    }
+
+    @classmethod
+    async def hit(cls, policy_name: str, key: str) -> Tuple[bool, float]:
+        """
+        Count one request for ``key`` under a policy.
+
+        Returns (allowed, retry_after_seconds).
+        """
+        policy = cls._policies[policy_name]
+        allowed, retry_after = cls._store.take(policy, key)
+
+        if allowed and settings.rate_limit_backend == "mongodb":
+            allowed, retry_after = await cls._hit_shared(policy, key)
+
+        RATE_LIMIT_DECISIONS.labels(policy_name, "allowed" if allowed else "rejected").inc()
+        return allowed, retry_after
+
+    @classmethod
+    async def enforce(cls, policy_name: str, key: str) -> None:
+        """
+        Count one request and raise HTTP 429 if the policy is exhausted.
+
+        Does nothing when RATE_LIMIT_ENABLED is false.
+        """
+        if not settings.rate_limit_enabled:
+            return
+
+        allowed, retry_after = await cls.hit(policy_name, key)
+        if not allowed:
+            logger.debug(f"Rate limit {policy_name} exceeded for {key}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+
+    @staticmethod
+    async def _hit_shared(policy: RateLimitPolicy, key: str) -> Tuple[bool, float]:
+        """Count the request in a shared fixed-window MongoDB bucket."""
+        now = time.time()
+        window = int(now // policy.period)
+        window_end = (window + 1) * policy.period
+        # Hash the client key so usernames and IPs are not stored in clear
+        key_hash = hashlib.sha256(key.encode()).hexdigest()[:32]
+
+        try:
+            doc = await get_rate_limits_collection().find_one_and_update(
+                {"_id": f"{policy.name}:{key_hash}:{window}"},
+                {
+                    "$inc": {"count": 1},
+                    "$setOnInsert": {"expires_at": datetime.utcfromtimestamp(window_end)},
+                },
+                projection={"count": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except Exception as e:
+            # Fail open: the local bucket still limits this replica
+            logger.error(f"Shared rate limit check failed for {policy.name}: {e}")
+            return True, 0.0
+
+        if doc["count"] <= policy.limit:
+            return True, 0.0
+        return False, window_end - now
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Get limiter configuration and per-policy decision counts."""
+        return {
+            "enabled": settings.rate_limit_enabled,
+            "backend": settings.rate_limit_backend,
+            "shards": cls._store.shard_count,
+            "tracked_keys": cls._store.size(),
+            "max_keys": settings.rate_limit_max_keys,
+            "policies": [
+                {
+                    "name": policy.name,
+                    "limit": policy.limit,
+                    "period_seconds": policy.period,
+                    "allowed": int(RATE_LIMIT_DECISIONS.labels(policy.name, "allowed").get()),
+                    "rejected": int(RATE_LIMIT_DECISIONS.labels(policy.name, "rejected").get()),
+                }
+                for policy in cls._policies.values()
+            ],
+        }
@@ -0,0 +1,143 @@
+"""
+Startup orchestration and readiness tracking.
+
+The lifespan only awaits what must happen before serving (MongoDB
+connection, index manifest check). Slower work such as solution seeding
+runs as a background task; readiness is reported through
+``/health/ready`` so load balancers only route traffic once it finishes.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupService:
+    """Process-wide startup phase timings and background readiness gates."""
+
+    started_at: Optional[datetime] = None
+    _t0: float = 0.0
+    _phases: List[Dict[str, Any]] = []
+    _pending: Dict[str, asyncio.Task] = {}
+    _errors: Dict[str, str] = {}
+    _serving_after_ms: Optional[float] = None
+    _ready_after_ms: Optional[float] = None
+
+    @classmethod
+    def begin(cls) -> None:
+        """Reset state and start the startup clock."""
+        cls.started_at = datetime.utcnow()
+        cls._t0 = time.perf_counter()
+        cls._phases = []
+        cls._pending = {}
+        cls._errors = {}
+        cls._serving_after_ms = None
+        cls._ready_after_ms = None
+
+    @classmethod
+    def _elapsed_ms(cls) -> float:
+        return round((time.perf_counter() - cls._t0) * 1000, 2)
+
+    @classmethod
+    @asynccontextmanager
+    async def phase(cls, name: str, background: bool = False):
+        """Time a startup phase and record it in the breakdown."""
+        offset_ms = cls._elapsed_ms()
+        start = time.perf_counter()
+        entry: Dict[str, Any] = {
+            "name": name,
+            "background": background,
+            "offset_ms": offset_ms,
+            "duration_ms": None,
+            "status": "running",
+            "detail": None,
+        }
+        cls._phases.append(entry)
+        try:
+            yield entry
+            entry["status"] = "completed"
+        except Exception as e:
+            entry["status"] = "failed"
+            entry["detail"] = str(e)
+            raise
+        finally:
+            entry["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+    @classmethod
+    def mark_serving(cls) -> None:
+        """Record the moment the lifespan yields and the app accepts traffic."""
+        cls._serving_after_ms = cls._elapsed_ms()
+        cls._check_ready()
+
+    @classmethod
+    def run_in_background(
+        cls,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+    ) -> asyncio.Task:
+        """
+        Run a startup phase as a background task that gates readiness.
+
+        Failures are logged and reported, but do not crash the process.
+        """
+
+        async def _runner():
+            try:
+                async with cls.phase(name, background=True) as entry:
+                    result = await func()
+                    if result is not None:
+                        entry["detail"] = str(result)
+                    return result
+            except Exception as e:
+                cls._errors[name] = str(e)
+                logger.error(f"Background startup phase '{name}' failed: {e}")
+            finally:
+                cls._pending.pop(name, None)
+                cls._check_ready()
+
+        task = asyncio.create_task(_runner(), name=f"startup-{name}")
+        cls._pending[name] = task
+        return task
+
+    @classmethod
+    def _check_ready(cls) -> None:
+        if cls._ready_after_ms is None and cls._serving_after_ms is not None and not cls._pending:
+            cls._ready_after_ms = cls._elapsed_ms()
+            logger.info(f"Admin Dashboard API ready after {cls._ready_after_ms:.0f}ms")
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Check whether all gating startup work has finished."""
+        return cls._ready_after_ms is not None
+
+    @classmethod
+    def pending(cls) -> List[str]:
+        """Get names of background phases still running."""
+        return list(cls._pending.keys())
+
+    @classmethod
+    async def cancel_pending(cls) -> None:
+        """Cancel background phases (used during shutdown)."""
+        tasks = list(cls._pending.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @classmethod
+    def get_report(cls) -> Dict[str, Any]:
+        """Get the startup timing breakdown."""
+        return {
+            "started_at": cls.started_at,
+            "ready": cls.is_ready(),
+            "serving_after_ms": cls._serving_after_ms,
+            "ready_after_ms": cls._ready_after_ms,
+            "pending": cls.pending(),
+            "errors": dict(cls._errors),
+            "phases": [dict(p) for p in cls._phases],
+        }
@@ -0,0 +1,210 @@
+"""
+Buffered intake for public usage enquiries.
+
+The public endpoint hands enquiries to ``UsageEnquiryIntake.submit`` and
+returns immediately. A background task writes the buffer with one
+unordered ``insert_many`` (plus one counter ``bulk_write``) every
+``usage_enquiry_batch_size`` enquiries or ``usage_enquiry_flush_interval``
+seconds, whichever comes first. Repeat submissions are answered with the
+original enquiry's ID and never reach MongoDB: from the buffer or the
+batch being written when the original is still pending, otherwise from
+one read on the ``dedupe_key`` unique index. Two instances racing on the
+same key are still settled by that index.
+
+Enquiries still buffered are written on shutdown. A hard crash can lose
+up to one flush interval of enquiries.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from config import settings
+from models.usage_enquiry import UsageEnquiryCreate
+from repositories.usage_enquiry_repository import UsageEnquiryRepository
+from services.metrics import QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+
+class UsageEnquiryIntake:
+    """Singleton enquiry buffer bound to the application lifespan."""
+
+    _task: Optional[asyncio.Task] = None
+    _wake: Optional[asyncio.Event] = None
+    _stopping: bool = False
+    _flush_lock: Optional[asyncio.Lock] = None
+
+    # dedupe_key -> document, in submission order
+    _buffer: Dict[str, dict] = {}
+    # dedupe_key -> document, for the batch currently being written
+    _in_flight: Dict[str, dict] = {}
+
+    submitted: int = 0
+    deduplicated: int = 0
+    inserted: int = 0
+    flushes: int = 0
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the flush task. Should be called during application startup."""
+        if cls._task is not None and not cls._task.done():
+            logger.warning("Usage enquiry intake already running")
+            return
+
+        cls._stopping = False
+        cls._wake = asyncio.Event()
+        cls._flush_lock = asyncio.Lock()
+        cls._task = asyncio.create_task(cls._run(), name="usage-enquiry-intake")
+        logger.info("Usage enquiry intake started")
+
+    @classmethod
+    async def stop(cls, timeout: float = 10.0) -> None:
+        """Stop the flush task and write anything still buffered."""
+        if cls._task is None:
+            return
+
+        cls._stopping = True
+        cls._wake.set()
+
+        try:
+            await asyncio.wait_for(cls._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            cls._task.cancel()
+            logger.warning("Usage enquiry intake did not stop in time - cancelled")
+        except asyncio.CancelledError:
+            pass
+
+        if cls._buffer:
+            await cls.flush()
+
+        cls._task = None
+        cls._wake = None
+        logger.info("Usage enquiry intake stopped")
+
+    @classmethod
+    async def submit(
+        cls,
+        enquiry_data: UsageEnquiryCreate,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> str:
+        """
+        Queue an enquiry for the next batch write.
+
+        Returns the enquiry ID. Falls back to a direct insert when the
+        intake task is not running (scripts, tests).
+        """
+        if cls._task is None:
+            enquiry = await UsageEnquiryRepository.create(enquiry_data, ip_address, user_agent)
+            return enquiry.enquiry_id
+
+        enquiry, doc = UsageEnquiryRepository.build(enquiry_data, ip_address, user_agent)
+        cls.submitted += 1
+
+        original = await cls._find_original(doc["dedupe_key"])
+        if original is not None:
+            cls.deduplicated += 1
+            return original
+
+        cls._buffer[doc["dedupe_key"]] = doc
+        QUEUE_DEPTH.labels("usage_enquiry_buffer").set(len(cls._buffer))
+
+        if len(cls._buffer) >= settings.usage_enquiry_max_buffer:
+            # Backpressure: MongoDB is not keeping up, so make callers wait
+            await cls.flush()
+        elif len(cls._buffer) >= settings.usage_enquiry_batch_size:
+            cls._wake.set()
+
+        return enquiry.enquiry_id
+
+    @classmethod
+    async def _find_original(cls, dedupe_key: str) -> Optional[str]:
+        """Enquiry ID of an earlier submission with the same dedupe key, if any."""
+        pending = cls._buffer.get(dedupe_key) or cls._in_flight.get(dedupe_key)
+        if pending is not None:
+            return pending["enquiry_id"]
+
+        stored = await UsageEnquiryRepository.get_by_dedupe_key(dedupe_key)
+        if stored is not None:
+            return stored.enquiry_id
+
+        # The original may have been buffered while the lookup was running
+        pending = cls._buffer.get(dedupe_key) or cls._in_flight.get(dedupe_key)
+        return pending["enquiry_id"] if pending is not None else None
+
+    @classmethod
+    def pending(cls) -> int:
+        """Number of enquiries waiting to be written."""
+        return len(cls._buffer)
+
+    @classmethod
+    async def flush(cls) -> int:
+        """Write the buffered enquiries in batches. Returns the number inserted."""
+        if cls._flush_lock is None:
+            cls._flush_lock = asyncio.Lock()
+
+        total = 0
+        async with cls._flush_lock:
+            while cls._buffer:
+                batch_size = settings.usage_enquiry_batch_size
+                keys = list(cls._buffer)[:batch_size]
+                docs: List[dict] = [cls._buffer.pop(key) for key in keys]
+                cls._in_flight = {doc["dedupe_key"]: doc for doc in docs}
+                QUEUE_DEPTH.labels("usage_enquiry_buffer").set(len(cls._buffer))
+
+                try:
+                    inserted = await UsageEnquiryRepository.insert_batch(docs)
+                except Exception as e:
+                    # insert_many failed (counter failures do not raise): put the
+                    # batch back in front so nothing is lost on a transient error
+                    cls._buffer = {**cls._in_flight, **cls._buffer}
+                    QUEUE_DEPTH.labels("usage_enquiry_buffer").set(len(cls._buffer))
+                    logger.error(f"Failed to write usage enquiry batch: {e}")
+                    break
+                finally:
+                    cls._in_flight = {}
+
+                cls.flushes += 1
+                cls.inserted += len(inserted)
+                cls.deduplicated += len(docs) - len(inserted)
+                total += len(inserted)
+
+            # A counter update failed after its enquiries were inserted
+            if UsageEnquiryRepository.counters_stale:
+                try:
+                    await UsageEnquiryRepository.rebuild_counters()
+                except Exception as e:
+                    logger.error(f"Failed to rebuild usage enquiry counters: {e}")
+
+        if total:
+            logger.info(f"Wrote {total} usage enquiries")
+        return total
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Get in-process intake counters."""
+        return {
+            "running": cls._task is not None and not cls._task.done(),
+            "pending": len(cls._buffer),
+            "submitted": cls.submitted,
+            "deduplicated": cls.deduplicated,
+            "inserted": cls.inserted,
+            "flushes": cls.flushes,
+            "counters_stale": UsageEnquiryRepository.counters_stale,
+        }
+
+    @classmethod
+    async def _run(cls) -> None:
+        """Flush whenever a batch fills up or the flush interval elapses."""
+        while not cls._stopping:
+            try:
+                await asyncio.wait_for(cls._wake.wait(), timeout=settings.usage_enquiry_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            cls._wake.clear()
+
+            try:
+                await cls.flush()
+            except Exception as e:
+                logger.error(f"Usage enquiry intake error: {e}")